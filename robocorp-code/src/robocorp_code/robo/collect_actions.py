@@ -1,19 +1,97 @@
 import ast as ast_module
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Iterator, List, Optional, Tuple, TypedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+)
 
 from robocorp_ls_core import uris
 from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.watchdog_wrapper import IFSObserver, IFSWatch
 
 log = get_logger(__name__)
 
+# Directories which never have actions (besides the ones ignored by
+# `load_ignored_dirs`). Directories with a `pyvenv.cfg` (virtual
+# environments) are also skipped.
+_IGNORED_DIR_NAMES = frozenset(
+    (".venv", "output", "site-packages", ".mypy_cache", ".pytest_cache")
+)
+
+# Parsing the files in worker processes only pays off when there are many
+# files to parse (each worker must parse at least this number of files).
+MIN_FILES_PER_WORKER = 20
+
+# The number of root directories whose actions are kept in the ActionsIndex
+# (the least recently used root is discarded when a new one is added).
+MAX_TRACKED_ROOTS = 5
+
+
+def _create_accept_directory() -> Callable[[str], bool]:
+    from robocorp_ls_core import load_ignored_dirs
+
+    accept_directory = load_ignored_dirs.create_accept_directory_callable()
+
+    def accept(dir_path: str) -> bool:
+        if os.path.basename(dir_path) in _IGNORED_DIR_NAMES:
+            return False
+        if os.path.exists(os.path.join(dir_path, "pyvenv.cfg")):
+            return False
+        return accept_directory(dir_path)
+
+    return accept
+
+
+def _iter_py_files_with_stat(
+    root_path: str,
+    accept_directory: Callable[[str], bool],
+    visited_dirs: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    :param visited_dirs:
+        If given, the directories walked (the root and the accepted
+        directories) are added to it.
+    """
+    try:
+        entries = sorted(os.scandir(root_path), key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    if visited_dirs is not None:
+        visited_dirs.append(root_path)
+
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                if accept_directory(entry.path):
+                    yield from _iter_py_files_with_stat(
+                        entry.path, accept_directory, visited_dirs
+                    )
+            elif entry.name.endswith(".py"):
+                yield entry.path, entry.stat()
+        except OSError:
+            pass
+
 
 def collect_py_files(root_path: Path) -> Iterator[Path]:
-    for item in root_path.iterdir():
-        if item.is_dir():
-            yield from collect_py_files(item)
-        elif item.suffix == ".py":
-            yield item
+    """
+    Provides the `.py` files in the given directory (skipping the ignored
+    directories, such as `.git`, `node_modules` and virtual environments).
+    """
+    accept_directory = _create_accept_directory()
+    for path, _stat in _iter_py_files_with_stat(str(root_path), accept_directory):
+        yield Path(path)
 
 
 def _iter_nodes(
@@ -99,6 +177,10 @@ class ActionInfoTypedDict(TypedDict):
     uri: str
 
 
+# normcased path -> (stat key, actions)
+_PathToActions = Dict[str, Tuple[Tuple[int, int], List[ActionInfoTypedDict]]]
+
+
 def _make_action_info(uri: str, node: ast_module.FunctionDef) -> ActionInfoTypedDict:
     coldelta = 4
 
@@ -115,12 +197,222 @@ def _make_action_info(uri: str, node: ast_module.FunctionDef) -> ActionInfoTyped
     }
 
 
-def iter_actions(root_directory: Path) -> Iterator[ActionInfoTypedDict]:
-    f: Path
-    for f in collect_py_files(root_directory):
-        if "action" in f.name:
-            try:
-                for funcdef in _collect_actions_from_file(f):
-                    yield _make_action_info(uris.from_fs_path(str(f)), funcdef)
-            except Exception:
-                log.error(f"Unable to collect @actions from {f}")
+def _is_action_file_candidate(path: str) -> bool:
+    return "action" in os.path.basename(path)
+
+
+def collect_actions_from_files(paths: Sequence[str]) -> List[Tuple[str, list]]:
+    """
+    :return:
+        A list with (path, actions) for each file (files which can't be parsed
+        have no actions).
+    """
+    ret: List[Tuple[str, list]] = []
+    for path in paths:
+        actions: List[ActionInfoTypedDict] = []
+        try:
+            uri = uris.from_fs_path(path)
+            for funcdef in _collect_actions_from_file(Path(path)):
+                actions.append(_make_action_info(uri, funcdef))
+        except Exception:
+            log.error(f"Unable to collect @actions from {path}")
+        ret.append((path, actions))
+    return ret
+
+
+def _collect_actions_in_pool(
+    paths: List[str], workers: int
+) -> Iterator[Tuple[str, list]]:
+    from robocorp_ls_core.process_pool import (
+        create_process_pool_executor,
+        iter_completed,
+    )
+
+    chunk_size = max(1, len(paths) // (workers * 4))
+    executor = create_process_pool_executor(workers, "collect-actions-worker")
+    try:
+        futures = [
+            executor.submit(collect_actions_from_files, paths[i : i + chunk_size])
+            for i in range(0, len(paths), chunk_size)
+        ]
+        for future in iter_completed(futures):
+            yield from iter(future.result())
+    finally:
+        executor.shutdown(wait=False)
+
+
+class ActionsIndex(object):
+    """
+    Keeps the actions found in each file (the file is only parsed again if
+    its mtime/size changed or if a change was notified by the filesystem
+    observer).
+
+    Only the directories accepted in the last walk of a root are watched (so,
+    ignored directories such as `.venv` or `node_modules` aren't tracked) and
+    only the files seen in that walk are kept.
+
+    Usage:
+
+        actions_index = ActionsIndex(observer)
+        actions = actions_index.get_actions(root_directory)
+        ...
+        actions_index.dispose()
+    """
+
+    def __init__(self, observer: Optional[IFSObserver] = None):
+        self._observer = observer
+        self._lock = threading.Lock()
+        self._accept_directory = _create_accept_directory()
+
+        # root -> path -> (stat key, actions) (ordered from the least to the
+        # most recently used root).
+        self._root_to_path_actions: "OrderedDict[str, _PathToActions]" = OrderedDict()
+        # root -> (watched directories, watch)
+        self._root_to_watch: Dict[str, Tuple[FrozenSet[str], IFSWatch]] = {}
+
+        # The number of files parsed (for tests/stats).
+        self.parsed_files = 0
+
+    def _on_file_changed(self, src_path: str, root: str, *args) -> None:
+        with self._lock:
+            path_to_actions = self._root_to_path_actions.get(root)
+            if path_to_actions is not None:
+                path_to_actions.pop(os.path.normcase(str(src_path)), None)
+
+    def _track_dirs(self, root: str, dirs: List[str]) -> None:
+        from robocorp_ls_core.watchdog_wrapper import PathInfo
+
+        if self._observer is None:
+            return
+
+        watched_dirs = frozenset(dirs)
+        with self._lock:
+            old = self._root_to_watch.get(root)
+            if old is not None and old[0] == watched_dirs:
+                return
+
+        try:
+            watch = self._observer.notify_on_any_change(
+                [PathInfo(d, recursive=False) for d in dirs],
+                self._on_file_changed,
+                call_args=(root,),
+                extensions=(".py",),
+            )
+        except Exception:
+            log.exception(f"Unable to track changes in: {root}")
+            return
+
+        with self._lock:
+            old = self._root_to_watch.get(root)
+            self._root_to_watch[root] = (watched_dirs, watch)
+
+        if old is not None:
+            old[1].stop_tracking()
+
+    def _get_root_path_to_actions(self, root: str) -> _PathToActions:
+        """
+        :note: must be called with the lock held.
+        """
+        path_to_actions = self._root_to_path_actions.get(root)
+        if path_to_actions is None:
+            path_to_actions = self._root_to_path_actions[root] = {}
+        self._root_to_path_actions.move_to_end(root)
+        return path_to_actions
+
+    def _discard_old_roots(self) -> None:
+        watches: List[IFSWatch] = []
+        with self._lock:
+            while len(self._root_to_path_actions) > MAX_TRACKED_ROOTS:
+                root, _ = self._root_to_path_actions.popitem(last=False)
+                old = self._root_to_watch.pop(root, None)
+                if old is not None:
+                    watches.append(old[1])
+
+        for watch in watches:
+            watch.stop_tracking()
+
+    def get_actions(
+        self, root_directory: Path, max_workers: Optional[int] = None
+    ) -> List[ActionInfoTypedDict]:
+        root = str(root_directory)
+
+        visited_dirs: List[str] = []
+        candidates: List[Tuple[str, Tuple[int, int]]] = []
+        for path, stat in _iter_py_files_with_stat(
+            root, self._accept_directory, visited_dirs
+        ):
+            if _is_action_file_candidate(path):
+                candidates.append((path, (stat.st_mtime_ns, stat.st_size)))
+
+        path_to_actions: Dict[str, List[ActionInfoTypedDict]] = {}
+        misses: List[str] = []
+        with self._lock:
+            root_path_to_actions = self._get_root_path_to_actions(root)
+
+            # Files not seen in this walk (removed or now in an ignored
+            # directory) are no longer kept.
+            seen = set(os.path.normcase(path) for path, _stat_key in candidates)
+            for key in [key for key in root_path_to_actions if key not in seen]:
+                del root_path_to_actions[key]
+
+            for path, stat_key in candidates:
+                cached = root_path_to_actions.get(os.path.normcase(path))
+                if cached is not None and cached[0] == stat_key:
+                    path_to_actions[path] = cached[1]
+                else:
+                    misses.append(path)
+
+        self._track_dirs(root, visited_dirs)
+        self._discard_old_roots()
+
+        if misses:
+            from robocorp_ls_core import process_pool
+
+            if max_workers is None:
+                max_workers = process_pool.get_default_max_workers()
+            workers = process_pool.compute_workers_count(
+                len(misses), MIN_FILES_PER_WORKER, max_workers
+            )
+
+            results: Iterator[Tuple[str, list]]
+            if workers > 1:
+                results = _collect_actions_in_pool(misses, workers)
+            else:
+                results = iter(collect_actions_from_files(misses))
+
+            stat_keys = dict(candidates)
+            for path, actions in results:
+                path_to_actions[path] = actions
+                with self._lock:
+                    self.parsed_files += 1
+                    root_path_to_actions[os.path.normcase(path)] = (
+                        stat_keys[path],
+                        actions,
+                    )
+
+        ret: List[ActionInfoTypedDict] = []
+        for path, _stat_key in candidates:
+            ret.extend(path_to_actions.get(path, ()))
+        return ret
+
+    def dispose(self) -> None:
+        with self._lock:
+            watches = [watch for _dirs, watch in self._root_to_watch.values()]
+            self._root_to_watch.clear()
+            self._root_to_path_actions.clear()
+
+        for watch in watches:
+            watch.stop_tracking()
+
+
+def iter_actions(
+    root_directory: Path, actions_index: Optional[ActionsIndex] = None
+) -> Iterator[ActionInfoTypedDict]:
+    """
+    :param actions_index:
+        If given, the actions are gotten from it (so, only the files changed
+        since the last call are parsed).
+    """
+    if actions_index is None:
+        actions_index = ActionsIndex()
+    yield from iter(actions_index.get_actions(root_directory))
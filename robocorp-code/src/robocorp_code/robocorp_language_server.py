@@ -20,6 +20,7 @@ from robocorp_ls_core.watchdog_wrapper import IFSObserver
 
 from robocorp_code import commands
 from robocorp_code.inspector.inspector_language_server import InspectorLanguageServer
+from robocorp_code.robo.collect_actions import ActionsIndex
 from robocorp_code.protocols import (
     ActionResultDict,
     ActionResultDictLocalRobotMetadata,
@@ -160,6 +161,7 @@ class RobocorpLanguageServer(PythonLanguageServer, InspectorLanguageServer):
             log.exception("There was an error injecting trustore into ssl.")
 
         self._fs_observer: Optional[IFSObserver] = None
+        self._actions_index: Optional[ActionsIndex] = None
 
         self._dir_cache = DirCache(cache_dir)
         self._rcc = Rcc(self)
@@ -211,7 +213,10 @@ class RobocorpLanguageServer(PythonLanguageServer, InspectorLanguageServer):
 
         self._prefix_to_last_run_number_and_time: Dict[str, Tuple[int, float]] = {}
 
-        self._pypi_cloud = PyPiCloud(weakref.WeakMethod(self._get_pypi_base_urls))  # type: ignore
+        self._pypi_cloud = PyPiCloud(
+            weakref.WeakMethod(self._get_pypi_base_urls),  # type: ignore
+            cache_dir=Path(cache_dir) / ".pypi_cache",
+        )
         self._cache_dir = cache_dir
         self._paths_remover = None
         self.__conda_cloud: Optional[ICondaCloud] = None
@@ -296,6 +301,8 @@ class RobocorpLanguageServer(PythonLanguageServer, InspectorLanguageServer):
         return ret
 
     def m_shutdown(self, **_kwargs):
+        if self._actions_index is not None:
+            self._actions_index.dispose()
         PythonLanguageServer.m_shutdown(self, **_kwargs)
 
     @overrides(PythonLanguageServer._obtain_fs_observer)
@@ -668,9 +675,6 @@ class RobocorpLanguageServer(PythonLanguageServer, InspectorLanguageServer):
     ) -> ActionResultDict:
         from robocorp_code.robo.collect_actions import iter_actions
 
-        # TODO: We should move this code somewhere else and have a cache of
-        # things so that when the user changes anything the client is notified
-        # about it.
         if not params:
             msg = f"Unable to collect actions because the target action package was not given."
             return dict(success=False, message=msg, result=None)
@@ -685,7 +689,9 @@ class RobocorpLanguageServer(PythonLanguageServer, InspectorLanguageServer):
             p = p.parent
 
         try:
-            actions = list(iter_actions(p))
+            if self._actions_index is None:
+                self._actions_index = ActionsIndex(self._obtain_fs_observer())
+            actions = list(iter_actions(p, self._actions_index))
         except Exception as e:
             log.exception("Error collecting actions.")
             return dict(
@@ -4,7 +4,18 @@ import sys
 import typing
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 # Hack so that we don't break the runtime on versions prior to Python 3.8.
 if sys.version_info[:2] < (3, 8):
@@ -93,6 +104,12 @@ class IPyPiCloud(Protocol):
     def get_package_data(self, package_name: str) -> Optional[IPackageData]:
         pass
 
+    def prefetch_package_data(self, package_names: Iterable[str]) -> None:
+        """
+        Gets the information on the given packages concurrently (so that
+        later calls to `get_package_data` for those packages are fast).
+        """
+
     def get_versions_newer_than(
         self, package_name: str, version: Union[Versions, VersionStr]
     ) -> List[VersionStr]:
@@ -179,6 +179,17 @@ class BaseAnalyzer:
     def iter_pip_issues(self):
         from .pip_impl import pip_packaging_version
 
+        # Get the information on the packages checked concurrently (instead of
+        # waiting for one request at a time in the loop below).
+        self._pypi_cloud.prefetch_package_data(
+            dep_info.name
+            for dep_info in self._pip_deps.iter_deps_infos()
+            if not dep_info.error_msg
+            and dep_info.constraints
+            and len(dep_info.constraints) == 1
+            and next(iter(dep_info.constraints))[0] == "=="
+        )
+
         for dep_info in self._pip_deps.iter_deps_infos():
             if dep_info.error_msg:
                 diagnostic = {
@@ -1,8 +1,12 @@
 import datetime
 import logging
+import os
+import threading
+import time
 import typing
 import weakref
-from typing import Dict, Iterator, List, Optional, Sequence, Union
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 from ._deps_protocols import PyPiInfoTypedDict, ReleaseData, Versions, VersionStr
 
@@ -94,13 +98,132 @@ class PackageData:
         return self._info
 
 
+def _compact_pypi_json(data: dict) -> dict:
+    """
+    Provides only the information we use from the json gotten from PyPI
+    (the releases have information on each file which isn't used and
+    may be quite big).
+    """
+    releases = data.get("releases")
+    if not isinstance(releases, dict):
+        return data
+
+    compact_releases = {}
+    for version_str, release_info in releases.items():
+        upload_times = []
+        if isinstance(release_info, list):
+            for dct in release_info:
+                if isinstance(dct, dict):
+                    upload_time = dct.get("upload_time")
+                    if upload_time:
+                        upload_times.append({"upload_time": upload_time})
+                        break
+        compact_releases[version_str] = upload_times
+
+    ret = dict(data)
+    ret["releases"] = compact_releases
+    return ret
+
+
+class _PyPiDiskCache:
+    """
+    Keeps the json gotten from PyPI in the disk along with the ETag/Last-Modified
+    headers so that the contents can be revalidated with a conditional request.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+
+    def _get_file(self, url: str) -> Path:
+        import hashlib
+
+        return self._cache_dir / (
+            hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def load(self, url: str) -> Optional[dict]:
+        """
+        Returns:
+            A dict with `url`, `data`, `etag`, `last_modified` and `timestamp`
+            or None if the url isn't cached.
+        """
+        import json
+
+        try:
+            contents = self._get_file(url).read_text("utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception:
+            log.debug(f"Unable to load: {url} from the pypi disk cache.")
+            return None
+
+        try:
+            entry = json.loads(contents)
+            if entry["url"] != url or not isinstance(entry["data"], dict):
+                return None
+            return entry
+        except Exception:
+            log.debug(f"Unable to load: {url} from the pypi disk cache.")
+            return None
+
+    def store(
+        self,
+        url: str,
+        data: dict,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        import json
+
+        entry = {
+            "url": url,
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "timestamp": time.time(),
+        }
+        target = self._get_file(url)
+        tmp = target.with_name(
+            f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(entry), "utf-8")
+            os.replace(tmp, target)
+        except Exception:
+            log.exception(f"Unable to store: {url} in the pypi disk cache.")
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+
+
 class PyPiCloud:
+    # Contents in the disk cache newer than this are used without checking
+    # the cloud (older contents are revalidated with a conditional request).
+    DISK_CACHE_TTL_IN_SECONDS = 60 * 60
+
+    # Max number of requests done at the same time when getting the
+    # information on multiple packages.
+    MAX_CONCURRENT_REQUESTS = 8
+
     def __init__(
-        self, get_base_urls_weak_method: Optional[weakref.WeakMethod] = None
+        self,
+        get_base_urls_weak_method: Optional[weakref.WeakMethod] = None,
+        cache_dir: Optional[Union[Path, str]] = None,
     ) -> None:
+        """
+        Args:
+            cache_dir: If given the information gotten from the cloud is
+            also kept in the disk (and reused among sessions).
+        """
         self._cached_package_data: Dict[str, PackageData] = {}
-        self._cached_cloud: Dict[str, PackageData] = {}
+        self._cached_cloud: Dict[str, dict] = {}
         self._last_base_urls: Sequence[str] = ()
+        self._base_urls_lock = threading.Lock()
+        self._disk_cache: Optional[_PyPiDiskCache] = (
+            _PyPiDiskCache(Path(cache_dir)) if cache_dir is not None else None
+        )
 
         if get_base_urls_weak_method is None:
             # use pypi.org
@@ -121,39 +244,140 @@ class PyPiCloud:
             pass
 
         import json
+        import urllib.error
         import urllib.request
 
+        disk_cache = self._disk_cache
+        entry: Optional[dict] = None
+        headers = {"User-Agent": "Mozilla"}
+        if disk_cache is not None:
+            entry = disk_cache.load(url)
+            if entry is not None:
+                timestamp = entry.get("timestamp")
+                if (
+                    isinstance(timestamp, (int, float))
+                    and 0 <= time.time() - timestamp < self.DISK_CACHE_TTL_IN_SECONDS
+                ):
+                    self._cached_cloud[url] = entry["data"]
+                    return typing.cast(dict, entry["data"])
+
+                # Revalidate what we have.
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
         try:
             request = urllib.request.urlopen(
-                urllib.request.Request(url, headers={"User-Agent": "Mozilla"})
+                urllib.request.Request(url, headers=headers)
             )
             if request.status == 200:
                 with request:
                     data = request.read().decode("utf-8", "replace")
-                self._cached_cloud[url] = json.loads(data)
+                    etag = request.headers.get("ETag")
+                    last_modified = request.headers.get("Last-Modified")
+                compact_data = _compact_pypi_json(json.loads(data))
+                self._cached_cloud[url] = compact_data
+                if disk_cache is not None:
+                    disk_cache.store(url, compact_data, etag, last_modified)
             else:
                 log.info(
                     f"Unable to get url (as json): {url}. Status code: {request.status}"
                 )
                 return None
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entry is not None:
+                # Not modified: the contents in the disk are still valid.
+                self._cached_cloud[url] = entry["data"]
+                if disk_cache is not None:
+                    disk_cache.store(
+                        url,
+                        entry["data"],
+                        entry.get("etag"),
+                        entry.get("last_modified"),
+                    )
+            else:
+                log.info(f"Unable to get url (as json): {url}. Error: {e}")
+                return None
         except Exception as e:
-            log.info(f"Unable to get url (as json): {url}. Error: {e}")
-            return None
+            if entry is not None:
+                # i.e.: offline: use what we have (even if old).
+                log.info(
+                    f"Unable to get url (as json): {url}. Using cached contents. Error: {e}"
+                )
+                self._cached_cloud[url] = entry["data"]
+            else:
+                log.info(f"Unable to get url (as json): {url}. Error: {e}")
+                return None
 
         return typing.cast(dict, self._cached_cloud[url])
 
-    def get_package_data(self, package_name: str) -> Optional[PackageData]:
+    def prefetch_package_data(self, package_names: Iterable[str]) -> None:
+        """
+        Gets the information on the given packages concurrently (so that
+        later calls to `get_package_data` for those packages are fast).
+        """
+        import functools
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The base urls are computed only once (before the threads start).
+        base_urls = self._get_base_urls()
+        if base_urls is None:
+            return
+
+        package_names = [
+            name
+            for name in dict.fromkeys(package_names)
+            if name not in self._cached_package_data
+        ]
+        if len(package_names) <= 1:
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(package_names)),
+            thread_name_prefix="PyPiCloud",
+        ) as executor:
+            prefetch = functools.partial(
+                self._prefetch_package_data, base_urls=base_urls
+            )
+            for _ in executor.map(prefetch, package_names):
+                pass
+
+    def _prefetch_package_data(
+        self, package_name: str, base_urls: Sequence[str]
+    ) -> None:
+        try:
+            self._get_package_data(package_name, base_urls)
+        except Exception:
+            log.exception(f"Error getting pypi information for: {package_name}")
+
+    def _get_base_urls(self) -> Optional[Sequence[str]]:
+        """
+        Provides the base urls to be used (clearing the caches if those
+        changed since the last call).
+        """
         get_base_urls = self.get_base_urls_weak_method()
         if get_base_urls is None:
             return None
 
         base_urls = get_base_urls()
-        if base_urls != self._last_base_urls:
-            # We need to clear packages if urls changed.
-            self._last_base_urls = base_urls
-            self._cached_package_data.clear()
-            self._cached_cloud.clear()
+        with self._base_urls_lock:
+            if base_urls != self._last_base_urls:
+                # We need to clear packages if urls changed.
+                self._last_base_urls = base_urls
+                self._cached_package_data.clear()
+                self._cached_cloud.clear()
+        return base_urls
+
+    def get_package_data(self, package_name: str) -> Optional[PackageData]:
+        base_urls = self._get_base_urls()
+        if base_urls is None:
+            return None
+        return self._get_package_data(package_name, base_urls)
 
+    def _get_package_data(
+        self, package_name: str, base_urls: Sequence[str]
+    ) -> Optional[PackageData]:
         try:
             return self._cached_package_data[package_name]
         except KeyError:
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _PyPiStandIn:
+    def __init__(self):
+        self.requests = []
+        self.not_modified_count = 0
+        self.running = 0
+        self.max_running = 0
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def get_json(self, package_name):
+        return {
+            "info": {"version": "2.0", "requires_dist": None, "description": ""},
+            "releases": {
+                "1.0": [
+                    {
+                        "upload_time": "2022-01-01T10:00:00",
+                        "filename": f"{package_name}-1.0.tar.gz",
+                        "digests": {"sha256": "0" * 64},
+                    }
+                ],
+                "2.0": [{"upload_time": "2023-01-01T10:00:00"}],
+            },
+        }
+
+
+@pytest.fixture
+def pypi_stand_in():
+    stand_in = _PyPiStandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with stand_in._lock:
+                stand_in.requests.append(self.path)
+                stand_in.running += 1
+                stand_in.max_running = max(stand_in.max_running, stand_in.running)
+            try:
+                time.sleep(stand_in.delay)
+                package_name = self.path.split("/")[2]
+                etag = f'"{package_name}-etag"'
+                if self.headers.get("If-None-Match") == etag:
+                    with stand_in._lock:
+                        stand_in.not_modified_count += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                contents = json.dumps(stand_in.get_json(package_name)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(contents)))
+                self.end_headers()
+                self.wfile.write(contents)
+            finally:
+                with stand_in._lock:
+                    stand_in.running -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    stand_in.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield stand_in
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _create_pypi_cloud(stand_in, cache_dir):
+    import weakref
+
+    from robocorp_code.vendored_deps.package_deps.pypi_cloud import PyPiCloud
+
+    class _BaseUrls:
+        def get_base_urls(self):
+            return (stand_in.base_url,)
+
+    base_urls = _BaseUrls()
+    pypi_cloud = PyPiCloud(weakref.WeakMethod(base_urls.get_base_urls), cache_dir)
+    # Keep it alive while the cloud is alive.
+    pypi_cloud._base_urls = base_urls  # type: ignore
+    return pypi_cloud
+
+
+def test_pypi_cloud_disk_cache(pypi_stand_in, tmpdir):
+    cache_dir = str(tmpdir.join("pypi_cache"))
+
+    pypi_cloud = _create_pypi_cloud(pypi_stand_in, cache_dir)
+    assert pypi_cloud.get_versions_newer_than("my-package", "1.0") == ["2.0"]
+    assert pypi_cloud.get_versions_newer_than("my-package", "1.0") == ["2.0"]
+    assert len(pypi_stand_in.requests) == 1
+
+    # A new session uses what's in the disk.
+    pypi_cloud = _create_pypi_cloud(pypi_stand_in, cache_dir)
+    package_data = pypi_cloud.get_package_data("my-package")
+    assert package_data is not None
+    release_data = package_data.get_release_data("1.0")
+    assert release_data is not None
+    assert release_data.upload_time == "2022-01-01T10:00:00"
+    assert len(pypi_stand_in.requests) == 1
+
+    # After the TTL the contents are revalidated.
+    pypi_cloud = _create_pypi_cloud(pypi_stand_in, cache_dir)
+    pypi_cloud.DISK_CACHE_TTL_IN_SECONDS = 0
+    assert pypi_cloud.get_versions_newer_than("my-package", "1.0") == ["2.0"]
+    assert len(pypi_stand_in.requests) == 2
+    assert pypi_stand_in.not_modified_count == 1
+
+
+def test_pypi_cloud_prefetch_concurrently(pypi_stand_in, tmpdir):
+    pypi_stand_in.delay = 0.2
+    pypi_cloud = _create_pypi_cloud(pypi_stand_in, str(tmpdir.join("pypi_cache")))
+
+    package_names = [f"package-{i}" for i in range(16)]
+    pypi_cloud.prefetch_package_data(package_names)
+    assert len(pypi_stand_in.requests) == 16
+    assert pypi_stand_in.max_running > 1
+
+    for name in package_names:
+        assert pypi_cloud.get_package_data(name) is not None
+    assert len(pypi_stand_in.requests) == 16
@@ -22,3 +22,141 @@ def test_list_actions(
     for entry in result:
         entry["uri"] = os.path.basename(entry["uri"])
     data_regression.check(result)
+
+
+def test_actions_index(tmpdir):
+    from pathlib import Path
+
+    from robocorp_code.robo import collect_actions
+    from robocorp_code.robo.collect_actions import ActionsIndex
+
+    root = Path(str(tmpdir))
+    action_contents = """
+from robocorp.actions import action
+
+@action
+def {name}():
+    pass
+"""
+
+    def write_action(path: Path, name: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(action_contents.format(name=name), encoding="utf-8")
+
+    write_action(root / "my_action.py", "action1")
+    write_action(root / "sub" / "other_action.py", "action2")
+    write_action(root / "not_checked.py", "not_checked")
+
+    # Ignored directories.
+    write_action(root / ".venv" / "lib" / "venv_action.py", "venv_action")
+    write_action(root / "node_modules" / "nm_action.py", "nm_action")
+    write_action(root / "output" / "out_action.py", "out_action")
+    write_action(root / "env" / "env_action.py", "env_action")
+    (root / "env" / "pyvenv.cfg").write_text("", encoding="utf-8")
+
+    def get_names():
+        return [a["name"] for a in actions_index.get_actions(root)]
+
+    actions_index = ActionsIndex()
+    try:
+        assert get_names() == ["action1", "action2"]
+        assert actions_index.parsed_files == 2
+
+        # Cached (no new parsing).
+        assert get_names() == ["action1", "action2"]
+        assert actions_index.parsed_files == 2
+
+        # Changed file is parsed again.
+        write_action(root / "sub" / "other_action.py", "action2_renamed")
+        assert get_names() == ["action1", "action2_renamed"]
+        assert actions_index.parsed_files == 3
+
+        # A notified change also makes it be parsed again.
+        actions_index._on_file_changed(str(root / "my_action.py"), str(root))
+        assert get_names() == ["action1", "action2_renamed"]
+        assert actions_index.parsed_files == 4
+
+        # Many files are parsed in worker processes.
+        for i in range(2 * collect_actions.MIN_FILES_PER_WORKER):
+            write_action(root / "many" / f"action_{i:03}.py", f"many_{i:03}")
+        names = [a["name"] for a in actions_index.get_actions(root, max_workers=2)]
+        # Note: files are sorted by path ("many" < "my_action.py" < "sub").
+        assert names == [
+            f"many_{i:03}" for i in range(2 * collect_actions.MIN_FILES_PER_WORKER)
+        ] + ["action1", "action2_renamed"]
+        assert (
+            actions_index.parsed_files == 4 + 2 * collect_actions.MIN_FILES_PER_WORKER
+        )
+    finally:
+        actions_index.dispose()
+
+
+def test_actions_index_watched_dirs_and_pruning(tmpdir):
+    import os
+    from pathlib import Path
+
+    from robocorp_code.robo import collect_actions
+    from robocorp_code.robo.collect_actions import ActionsIndex
+    from robocorp_ls_core.watchdog_wrapper import _DummyWatchList
+
+    class _Observer(object):
+        def __init__(self):
+            self.tracked = []
+            self.stopped = []
+
+        def notify_on_any_change(self, paths, on_change, call_args=(), extensions=None):
+            tracked = sorted((p.path, p.recursive) for p in paths)
+            self.tracked.append(tracked)
+            watch = _DummyWatchList()
+            watch.stop_tracking = lambda: self.stopped.append(tracked)
+            return watch
+
+        def notifies_changes(self):
+            return True
+
+    root = Path(str(tmpdir)) / "root"
+    for path in (
+        root / "my_action.py",
+        root / "sub" / "other_action.py",
+        root / ".venv" / "venv_action.py",
+        root / "node_modules" / "nm_action.py",
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+
+    observer = _Observer()
+    actions_index = ActionsIndex(observer)
+    try:
+        assert actions_index.get_actions(root) == []
+
+        # Only the accepted directories are watched (not recursively).
+        assert observer.tracked == [[(str(root), False), (str(root / "sub"), False)]]
+
+        # Same directories: the watch is kept.
+        actions_index.get_actions(root)
+        assert len(observer.tracked) == 1
+
+        # Removed files are no longer kept (and the removed directory is no
+        # longer watched).
+        (root / "sub" / "other_action.py").unlink()
+        (root / "sub").rmdir()
+        actions_index.get_actions(root)
+        assert list(actions_index._root_to_path_actions[str(root)]) == [
+            os.path.normcase(str(root / "my_action.py"))
+        ]
+        assert observer.tracked[-1] == [(str(root), False)]
+        assert observer.stopped == observer.tracked[:1]
+
+        # Only the most recently used roots are kept.
+        other_roots = []
+        for i in range(collect_actions.MAX_TRACKED_ROOTS):
+            other_root = Path(str(tmpdir)) / f"other_{i}"
+            other_root.mkdir()
+            other_roots.append(str(other_root))
+            actions_index.get_actions(other_root)
+
+        assert list(actions_index._root_to_path_actions) == other_roots
+        assert sorted(actions_index._root_to_watch) == other_roots
+        assert observer.stopped[-1] == [(str(root), False)]
+    finally:
+        actions_index.dispose()
@@ -5,7 +5,7 @@ from robocorp_ls_core.robotframework_log import get_logger
 
 from collections import namedtuple
 from pathlib import Path
-from typing import Any, Generic, Callable, Optional, TypeVar
+from typing import Any, Generic, Callable, Optional, Set, TypeVar
 import functools
 import os
 import collections
@@ -170,6 +170,113 @@ class DirCache(object):
         _: IDirCache = check_implements(self)
 
 
+class CompactDirCache(DirCache):
+    """
+    A DirCache which saves its contents as a compressed (zlib) compact json.
+
+    Writes are done to a temporary file which is then renamed to the final
+    location, so, it's safe to have multiple processes writing to the same
+    cache (the last one to write wins and readers never see a partial file).
+    """
+
+    @implements(IDirCache.store)
+    def store(self, key, value):
+        import json
+        import zlib
+        import threading
+
+        contents = zlib.compress(
+            json.dumps({"key": key, "value": value}, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        )
+
+        filename = self._get_file_for_key(key)
+        tmp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_filename, "wb") as stream:
+                stream.write(contents)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            log.debug("Unable to store key: %s in cache.", key)
+            try:
+                os.remove(tmp_filename)
+            except Exception:
+                pass
+
+    @implements(IDirCache.load)
+    def load(self, key, expected_class):
+        import json
+        import zlib
+
+        filename = self._get_file_for_key(key)
+        try:
+            with open(filename, "rb") as stream:
+                contents = json.loads(zlib.decompress(stream.read()).decode("utf-8"))
+            value = contents["value"]
+
+        except FileNotFoundError:
+            raise KeyError(f"Key: {key} not found in cache.")
+
+        except Exception:
+            msg = f"Unable to load key: {key} from cache."
+            log.debug(msg)
+            raise KeyError(msg)
+
+        if not isinstance(value, expected_class):
+            raise KeyError(
+                f"Unable to load key: {key} from cache (expected it to be a {expected_class} was {type(value)}."
+            )
+        return value
+
+    def prune(self, max_size: int, max_age: float) -> int:
+        """
+        Removes the entries which weren't stored in the last `max_age` seconds
+        and then the oldest entries until the entries remaining use at most
+        `max_size` bytes (temporary files left behind by a process which
+        died while storing are also removed once they're older than
+        `max_age`).
+
+        :return: the number of files removed.
+        """
+        import time
+
+        now = time.time()
+        entries = []
+        removed = 0
+        try:
+            dir_entries = list(os.scandir(self._cache_dir))
+        except Exception:
+            log.debug("Unable to list cache dir: %s", self._cache_dir)
+            return 0
+
+        for entry in dir_entries:
+            try:
+                stat = entry.stat()
+                if now - stat.st_mtime > max_age:
+                    os.remove(entry.path)
+                    removed += 1
+                elif not entry.name.endswith(".tmp"):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except Exception:
+                pass  # Removed or being replaced by another process.
+
+        total_size = sum(size for _mtime, size, _path in entries)
+        if total_size > max_size:
+            entries.sort()
+            for _mtime, size, path in entries:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except Exception:
+                    pass
+                total_size -= size
+                if total_size <= max_size:
+                    break
+
+        return removed
+
+
 CachedFileMTimeInfo = namedtuple("CachedFileMTimeInfo", "st_mtime, st_size, path")
 
 
@@ -314,3 +421,94 @@ class LRUCache(Generic[KT, VT]):
         while self._current_size_usage > self.resize_to:
             _key, entry = self._dict.popitem(last=False)
             self._current_size_usage -= entry[-1]
+
+
+def get_deep_size(obj: Any, max_objects: int = 1000000) -> int:
+    """
+    :return:
+        The memory (in bytes) used by the given object and the objects
+        reachable from it (types, modules and functions aren't followed).
+
+    Note: objects shared with other structures (i.e.: interned strings) are
+    also accounted, so, this is an upper bound of the memory which would be
+    released if the object was collected.
+    """
+    import gc
+    import sys
+    import types
+
+    skip_types = (
+        type,
+        types.ModuleType,
+        types.FunctionType,
+        types.BuiltinFunctionType,
+        types.MethodType,
+    )
+
+    seen: Set[int] = set()
+    size = 0
+    pending = [obj]
+    while pending and len(seen) < max_objects:
+        new_pending = []
+        for o in pending:
+            if isinstance(o, skip_types):
+                continue
+            o_id = id(o)
+            if o_id in seen:
+                continue
+            seen.add(o_id)
+            size += sys.getsizeof(o, 0)
+            new_pending.extend(gc.get_referents(o))
+        pending = new_pending
+    return size
+
+
+class SizeEstimator(object):
+    """
+    Estimates the memory used by objects derived from some other object (for
+    instance, the AST generated from a source) based on a cost per unit (i.e.:
+    chars in the source).
+
+    Measuring the deep size of each object is too slow, so, the cost per unit
+    is calibrated by measuring only some samples (the first ones and then one
+    from time to time).
+    """
+
+    def __init__(
+        self,
+        initial_bytes_per_unit: float,
+        sample_first: int = 10,
+        sample_every: int = 50,
+    ):
+        import threading
+
+        self._lock = threading.Lock()
+        self._initial_bytes_per_unit = initial_bytes_per_unit
+        self._sample_first = sample_first
+        self._sample_every = sample_every
+
+        self._estimate_count = 0
+        self._measured_bytes = 0
+        self._measured_units = 0
+
+    @property
+    def bytes_per_unit(self) -> float:
+        measured_units = self._measured_units
+        if measured_units <= 0:
+            return self._initial_bytes_per_unit
+        return self._measured_bytes / measured_units
+
+    def estimate(self, obj: Any, units: int) -> int:
+        with self._lock:
+            self._estimate_count += 1
+            count = self._estimate_count
+
+        if count <= self._sample_first or count % self._sample_every == 0:
+            size = get_deep_size(obj)
+            if units > 0:
+                with self._lock:
+                    self._measured_bytes += size
+                    self._measured_units += units
+            return size
+
+        return int(units * self.bytes_per_unit)
@@ -0,0 +1,108 @@
+"""
+The codec used to convert the JSON-RPC messages from/to json.
+
+If `orjson` is available it's used (it's much faster than the `json` module
+from the standard library), otherwise the standard library is used.
+
+The codec may be forced by setting the `ROBOCORP_LS_JSON_CODEC` environment
+variable to `json` or `orjson`.
+
+Note: the output of `orjson` isn't the same as the output of `json` (it's more
+compact and non-ascii chars aren't escaped), but it's still valid json and
+the same objects are accepted (objects which are only accepted by `orjson`,
+such as dataclasses and datetime, fail just as in the standard library and
+objects which it doesn't accept, such as integers bigger than 64 bits, are
+converted with the standard library).
+"""
+import json
+import os
+from typing import Any, Optional, Union
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+ENV_JSON_CODEC = "ROBOCORP_LS_JSON_CODEC"
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+
+class StdlibJsonCodec(object):
+    name = "json"
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonCodec(object):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        self._sort_keys_options = self._options | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        try:
+            return self._orjson.dumps(
+                obj, option=self._sort_keys_options if sort_keys else self._options
+            )
+        except TypeError:
+            # Not supported by orjson (i.e.: big ints): use the standard
+            # library (which raises an error if it's also not supported).
+            return json.dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            # i.e.: NaN/Infinity or lone surrogates which are accepted by the
+            # standard library.
+            if isinstance(data, memoryview):
+                data = bytes(data)
+            return json.loads(data)
+
+
+_codec: Optional[Any] = None
+
+
+def create_codec(name: Optional[str] = None):
+    """
+    :param name:
+        The name of the codec (`json` or `orjson`). If not given the fastest
+        codec available is used.
+    """
+    if name is None:
+        name = os.environ.get(ENV_JSON_CODEC, "").strip().lower()
+
+    if name == StdlibJsonCodec.name:
+        return StdlibJsonCodec()
+
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        if name == OrjsonCodec.name:
+            log.info("Unable to use orjson (not installed). Using json instead.")
+        return StdlibJsonCodec()
+
+
+def get_codec():
+    """
+    :return: The codec to be used to read/write the messages.
+    """
+    global _codec
+    if _codec is None:
+        _codec = create_codec()
+        log.debug("Using json codec: %s", _codec.name)
+    return _codec
@@ -29,8 +29,13 @@ from .exceptions import (
 
 from concurrent import futures
 from robocorp_ls_core.basic import implements
+from robocorp_ls_core.jsonrpc.scheduler import (
+    PriorityScheduler,
+    get_coalesce_key,
+    get_method_priority,
+)
 from robocorp_ls_core.protocols import IEndPoint, IFuture, IMonitor
-from typing import Optional
+from typing import Any, Dict, Optional
 
 log = get_logger(__name__)
 JSONRPC_VERSION = "2.0"
@@ -73,7 +78,7 @@ class Endpoint(object):
 
         # i.e.: 5 to 15 workers.
         max_workers = min(15, (os.cpu_count() or 1) + 4)
-        self._executor_service = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._executor_service = PriorityScheduler(max_workers=max_workers)
 
         # Also put it in the public API.
         self.executor_service = self._executor_service
@@ -81,6 +86,14 @@ class Endpoint(object):
     def shutdown(self):
         self._executor_service.shutdown(wait=False)
 
+    def get_scheduler_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return:
+            The metrics (queue depth, wait time, etc.) of each priority class
+            of the requests handled in threads.
+        """
+        return self._executor_service.get_metrics()
+
     @implements(IEndPoint.notify)
     def notify(self, method: str, params=None):
         log.debug("Sending notification: %s %s", method, params)
@@ -182,7 +195,9 @@ class Endpoint(object):
 
         if callable(handler_result):
             log.debug("Executing async notification handler %s", handler_result)
-            notification_future = self._executor_service.submit(handler_result)
+            notification_future = self._executor_service.submit_with_priority(
+                get_method_priority(method), None, handler_result
+            )
             notification_future.add_done_callback(
                 self._notification_callback(method, params)
             )
@@ -301,8 +316,12 @@ class Endpoint(object):
                 )
 
             else:
-                request_future = self._executor_service.submit(
-                    self._call_checking_time, handler_result, **kwargs
+                request_future = self._executor_service.submit_with_priority(
+                    get_method_priority(method),
+                    get_coalesce_key(method, params),
+                    self._call_checking_time,
+                    handler_result,
+                    **kwargs,
                 )
                 if monitor is not None:
                     request_future.__monitor__ = monitor
@@ -0,0 +1,384 @@
+"""
+Scheduler for the requests/notifications handled in threads by the `Endpoint`.
+
+Each request is scheduled in a priority class:
+
+- interactive: requests where the user is waiting for the result as they type
+  (completion, hover, signature help, ...).
+- background: requests which update the editor in the background (code
+  lens, semantic tokens, document symbols, lint, ...). This is the default.
+- bulk: requests which may take a long time and which usually come in bursts
+  or analyze the whole workspace (workspace symbols, lint many files,
+  references, ...).
+
+Workers always pick the queued request with the highest priority and at most
+`max_workers - 2` workers may be busy with background/bulk requests (and
+about half of those -- but at least 2 if possible -- with bulk requests),
+so, a burst of background requests can't starve the interactive requests.
+
+Note: requests which just wait for some other work to finish (i.e.:
+`waitForFullTestCollection`) must not be in the bulk class (as they'd be
+holding one of the few bulk slots while doing nothing).
+
+Queued requests with a coalesce key (i.e.: method + document uri) are
+cancelled when a newer request with the same key is scheduled and cancelled
+requests are dropped without being started.
+"""
+from collections import deque
+from concurrent import futures
+import itertools
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_BULK = 2
+
+PRIORITY_NAMES = ("interactive", "background", "bulk")
+
+# Requests with the given method are scheduled with the given priority
+# (methods not here are scheduled as background). Both the methods from the
+# language server protocol and the ones used internally among the language
+# server and its server api processes are here.
+METHOD_PRIORITIES: Dict[str, int] = {
+    # Interactive
+    "textDocument/completion": PRIORITY_INTERACTIVE,
+    "completionItem/resolve": PRIORITY_INTERACTIVE,
+    "textDocument/hover": PRIORITY_INTERACTIVE,
+    "textDocument/signatureHelp": PRIORITY_INTERACTIVE,
+    "textDocument/definition": PRIORITY_INTERACTIVE,
+    "textDocument/documentHighlight": PRIORITY_INTERACTIVE,
+    "textDocument/onTypeFormatting": PRIORITY_INTERACTIVE,
+    "textDocument/formatting": PRIORITY_INTERACTIVE,
+    "textDocument/rangeFormatting": PRIORITY_INTERACTIVE,
+    "textDocument/prepareRename": PRIORITY_INTERACTIVE,
+    "textDocument/rename": PRIORITY_INTERACTIVE,
+    "textDocument/selectionRange": PRIORITY_INTERACTIVE,
+    "textDocument/codeAction": PRIORITY_INTERACTIVE,
+    "completeAll": PRIORITY_INTERACTIVE,
+    "resolveCompletionItem": PRIORITY_INTERACTIVE,
+    "hover": PRIORITY_INTERACTIVE,
+    "signatureHelp": PRIORITY_INTERACTIVE,
+    "findDefinition": PRIORITY_INTERACTIVE,
+    "onTypeFormatting": PRIORITY_INTERACTIVE,
+    "codeFormat": PRIORITY_INTERACTIVE,
+    "prepareRename": PRIORITY_INTERACTIVE,
+    "rename": PRIORITY_INTERACTIVE,
+    "selectionRange": PRIORITY_INTERACTIVE,
+    "evaluatableExpression": PRIORITY_INTERACTIVE,
+    "monacoCompletionsFromCodeFull": PRIORITY_INTERACTIVE,
+    "monacoResolveCompletion": PRIORITY_INTERACTIVE,
+    # Bulk
+    "workspace/symbol": PRIORITY_BULK,
+    "textDocument/references": PRIORITY_BULK,
+    "workspaceSymbols": PRIORITY_BULK,
+    "references": PRIORITY_BULK,
+    "lintBatch": PRIORITY_BULK,
+    "listTests": PRIORITY_BULK,
+    "collectRobotDocumentation": PRIORITY_BULK,
+    "flowExplorerModel": PRIORITY_BULK,
+}
+
+# Requests with the given methods are coalesced (a queued request is
+# cancelled if a newer request with the same method is received for the same
+# document).
+COALESCE_METHODS = frozenset(
+    (
+        "textDocument/completion",
+        "textDocument/hover",
+        "textDocument/signatureHelp",
+        "textDocument/documentHighlight",
+        "textDocument/codeLens",
+        "textDocument/documentSymbol",
+        "textDocument/foldingRange",
+        "textDocument/semanticTokens/full",
+        "textDocument/semanticTokens/full/delta",
+        "textDocument/semanticTokens/range",
+        "completeAll",
+        "hover",
+        "signatureHelp",
+        "codeLens",
+        "documentSymbol",
+        "foldingRange",
+        "lint",
+    )
+)
+
+
+def get_method_priority(method: str) -> int:
+    return METHOD_PRIORITIES.get(method, PRIORITY_BACKGROUND)
+
+
+def get_coalesce_key(method: str, params: Any) -> Optional[Hashable]:
+    """
+    :return:
+        The key used to coalesce the request or None if it shouldn't be
+        coalesced.
+    """
+    if method not in COALESCE_METHODS or not isinstance(params, dict):
+        return None
+
+    doc_uri = params.get("doc_uri")
+    if doc_uri is None:
+        text_document = params.get("textDocument")
+        if isinstance(text_document, dict):
+            doc_uri = text_document.get("uri")
+
+    if not isinstance(doc_uri, str):
+        return None
+    return (method, doc_uri)
+
+
+class _Task(object):
+    __slots__ = ["future", "func", "args", "kwargs", "coalesce_key", "queued_time"]
+
+    def __init__(self, future, func, args, kwargs, coalesce_key, queued_time):
+        self.future: futures.Future = future
+        self.func: Callable = func
+        self.args = args
+        self.kwargs = kwargs
+        self.coalesce_key: Optional[Hashable] = coalesce_key
+        self.queued_time: float = queued_time
+
+
+class _ClassMetrics(object):
+    def __init__(self):
+        self.running = 0
+        self.submitted = 0
+        self.started = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+
+class PriorityScheduler(object):
+    """
+    Executes callables in worker threads (the api is compatible with the
+    `submit` and `shutdown` of a `concurrent.futures.ThreadPoolExecutor`).
+    """
+
+    # Number of workers which may only be used by interactive requests.
+    RESERVED_INTERACTIVE_WORKERS = 2
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "Endpoint"):
+        assert max_workers >= 1
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+
+        # Max number of workers running requests with the given priority or
+        # a lower priority (i.e.: the background limit also applies to bulk
+        # requests).
+        background_limit = max(1, max_workers - self.RESERVED_INTERACTIVE_WORKERS)
+        self._limits = (
+            max_workers,
+            background_limit,
+            min(background_limit, max(2, background_limit // 2)),
+        )
+
+        self._queues: List[Deque[_Task]] = [deque() for _ in PRIORITY_NAMES]
+        self._metrics = [_ClassMetrics() for _ in PRIORITY_NAMES]
+        self._coalesce: Dict[Hashable, _Task] = {}
+
+        self._condition = threading.Condition(threading.Lock())
+        self._threads: List[threading.Thread] = []
+        self._idle_workers = 0
+        # Number of idle workers which were notified about a new task but
+        # still didn't wake up (so, new tasks don't count on those).
+        self._pending_wakeups = 0
+        self._shutdown = False
+        self._thread_counter = itertools.count()
+
+    def submit(self, func: Callable, *args, **kwargs) -> futures.Future:
+        """
+        Same as `ThreadPoolExecutor.submit`.
+
+        Note: the callable is scheduled as interactive (callables submitted
+        directly are usually helpers whose result some running request is
+        waiting for, so, they must not be limited to the workers available to
+        background/bulk requests).
+        """
+        return self.submit_with_priority(
+            PRIORITY_INTERACTIVE, None, func, *args, **kwargs
+        )
+
+    def submit_with_priority(
+        self,
+        priority: int,
+        coalesce_key: Optional[Hashable],
+        func: Callable,
+        *args,
+        **kwargs,
+    ) -> futures.Future:
+        """
+        :param coalesce_key:
+            If given, a queued callable submitted with the same key is
+            cancelled (as it was superseded by this one).
+        """
+        future: futures.Future = futures.Future()
+        task = _Task(future, func, args, kwargs, coalesce_key, time.time())
+
+        superseded = None
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule new tasks after shutdown.")
+
+            if coalesce_key is not None:
+                superseded = self._coalesce.get(coalesce_key)
+                self._coalesce[coalesce_key] = task
+
+            self._queues[priority].append(task)
+            self._metrics[priority].submitted += 1
+
+            if self._idle_workers > self._pending_wakeups:
+                self._pending_wakeups += 1
+                self._condition.notify_all()
+            elif len(self._threads) < self._max_workers:
+                self._start_worker()
+            else:
+                self._condition.notify_all()
+
+        # Cancel outside of the lock (as the future callbacks are called
+        # in the cancel).
+        if superseded is not None and superseded.future.cancel():
+            log.debug("Request superseded (coalesced): %s", coalesce_key)
+            with self._condition:
+                self._metrics[priority].coalesced += 1
+
+        return future
+
+    def _start_worker(self) -> None:
+        # Note: must be called with the lock held.
+        t = threading.Thread(
+            target=self._worker,
+            name=f"{self._thread_name_prefix} worker {next(self._thread_counter)}",
+        )
+        t.daemon = True
+        self._threads.append(t)
+        t.start()
+
+    def _can_start(self, priority: int) -> bool:
+        # A task may only start if the limit of its class and of the classes
+        # with a higher priority (which include it) aren't reached.
+        for p in range(priority + 1):
+            running = sum(m.running for m in self._metrics[p:])
+            if running >= self._limits[p]:
+                return False
+        return True
+
+    def _pop_next_task(self):
+        """
+        :return:
+            A tuple(priority, task) of the next task to run or None if no task
+            can be started right now.
+
+        Note: must be called with the lock held.
+        """
+        for priority, queue in enumerate(self._queues):
+            while queue:
+                if not self._can_start(priority):
+                    break
+
+                task = queue.popleft()
+                if task.coalesce_key is not None:
+                    if self._coalesce.get(task.coalesce_key) is task:
+                        del self._coalesce[task.coalesce_key]
+
+                if not task.future.set_running_or_notify_cancel():
+                    # Cancelled before starting (just drop it).
+                    self._metrics[priority].dropped += 1
+                    continue
+
+                metrics = self._metrics[priority]
+                wait_time = time.time() - task.queued_time
+                metrics.running += 1
+                metrics.started += 1
+                metrics.total_wait_time += wait_time
+                if wait_time > metrics.max_wait_time:
+                    metrics.max_wait_time = wait_time
+                return priority, task
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._shutdown:
+                        return
+                    next_task = self._pop_next_task()
+                    if next_task is not None:
+                        break
+                    self._idle_workers += 1
+                    try:
+                        self._condition.wait()
+                    finally:
+                        self._idle_workers -= 1
+                        if self._pending_wakeups > 0:
+                            self._pending_wakeups -= 1
+
+            priority, task = next_task
+            next_task = None
+            try:
+                result = task.func(*task.args, **task.kwargs)
+            except BaseException as e:
+                task.future.set_exception(e)
+            else:
+                task.future.set_result(result)
+            # Don't keep references while waiting.
+            task = result = None
+
+            with self._condition:
+                self._metrics[priority].running -= 1
+                # A worker may be waiting due to the limit of running tasks.
+                self._condition.notify_all()
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return:
+            A dict with the priority class name -> metrics for the class
+            (queue depth, running tasks and times in seconds waiting in the
+            queue until being started).
+        """
+        ret = {}
+        with self._condition:
+            for name, queue, metrics in zip(
+                PRIORITY_NAMES, self._queues, self._metrics
+            ):
+                ret[name] = {
+                    "queued": sum(1 for task in queue if not task.future.done()),
+                    "running": metrics.running,
+                    "submitted": metrics.submitted,
+                    "started": metrics.started,
+                    "dropped": metrics.dropped,
+                    "coalesced": metrics.coalesced,
+                    "average_wait_time": (
+                        metrics.total_wait_time / metrics.started
+                        if metrics.started
+                        else 0.0
+                    ),
+                    "max_wait_time": metrics.max_wait_time,
+                }
+        return ret
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._condition:
+            self._shutdown = True
+            tasks = [task for queue in self._queues for task in queue]
+            for queue in self._queues:
+                queue.clear()
+            self._coalesce.clear()
+            self._condition.notify_all()
+            threads = self._threads[:]
+
+        for task in tasks:
+            task.future.cancel()
+
+        if wait:
+            for t in threads:
+                if t is not threading.current_thread():
+                    t.join()
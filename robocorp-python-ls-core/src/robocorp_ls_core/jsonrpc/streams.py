@@ -14,8 +14,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
 import threading
-from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.robotframework_log import get_logger, get_log_level
 from typing import Optional
 import json
 from robocorp_ls_core.options import BaseOptions
@@ -23,6 +24,13 @@ import queue
 
 log = get_logger(__name__)
 
+# The size of the chunks read from the stream while looking for the headers.
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Messages bigger than this are written with `os.writev` (if available)
+# instead of concatenating the headers and the body.
+_WRITEV_MIN_SIZE = 64 * 1024
+
 
 def read(stream) -> Optional[str]:
     """
@@ -82,6 +90,89 @@ def _read_len(stream, content_length) -> bytes:
         # len(buf) < content_length (just keep on going).
 
 
+class _BufferedMessageReader(object):
+    """
+    Reads the messages from a stream which provides `read1` (i.e.: a
+    `BufferedReader`) keeping the contents read after the message in a buffer
+    (so, the headers don't need to be read line by line).
+
+    The body of a message is read directly into a `bytearray` with the
+    message size (which is then given to the json codec without any copy).
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = bytearray()
+
+    def _read_more(self) -> bool:
+        data = self._stream.read1(_READ_CHUNK_SIZE)
+        if not data:
+            return False
+        self._buffer += data
+        return True
+
+    def read_body(self) -> Optional[bytearray]:
+        """
+        :return:
+            The body of the next message or None if EOF was reached.
+        """
+        buf = self._buffer
+        headers = {}
+        pos = 0
+        while True:
+            new_line = buf.find(b"\n", pos)
+            if new_line == -1:
+                if not self._read_more():
+                    return None  # EOF
+                buf = self._buffer
+                continue
+
+            line = bytes(buf[pos:new_line]).strip().decode("ascii")
+            pos = new_line + 1
+            if not line:  # Empty line: end of headers.
+                break
+            try:
+                name, value = line.split(": ", 1)
+            except ValueError:
+                raise RuntimeError("Invalid header line: {}.".format(line))
+            headers[name.strip()] = value.strip()
+
+        if not headers:
+            raise RuntimeError("Got message without headers.")
+
+        content_length = int(headers["Content-Length"])
+        end = pos + content_length
+        if len(buf) >= end:
+            if len(buf) == end:
+                # Common case: just the message is in the buffer.
+                self._buffer = bytearray()
+                del buf[:pos]
+                return buf
+            body = buf[pos:end]
+            del buf[:end]
+            return body
+
+        body = bytearray(content_length)
+        view = memoryview(body)
+        read = len(buf) - pos
+        view[:read] = buf[pos:]
+        self._buffer = bytearray()
+
+        readinto = self._stream.readinto
+        while read < content_length:
+            n = readinto(view[read:])
+            if not n:
+                return None  # EOF
+            read += n
+        return body
+
+
+def _decode_for_log(data) -> str:
+    if isinstance(data, str):
+        return data
+    return bytes(data).decode("utf-8", "replace")
+
+
 class _JsonRpcStreamReaderThread(threading.Thread):
     def __init__(self, rfile, queue, message_consumer):
         threading.Thread.__init__(self)
@@ -92,17 +183,27 @@ class _JsonRpcStreamReaderThread(threading.Thread):
         self.daemon = True
 
     def run(self):
+        from robocorp_ls_core.jsonrpc.codec import get_codec
+
+        codec = get_codec()
+        if hasattr(self._rfile, "read1") and hasattr(self._rfile, "readinto"):
+            read_body = _BufferedMessageReader(self._rfile).read_body
+        else:
+            read_body = lambda: read(self._rfile)
+
         try:
             while not self._rfile.closed:
-                data = read(self._rfile)
+                data = read_body()
                 if data is None:
                     log.debug("Read: %s", data)
                     return
 
                 try:
-                    msg = json.loads(data)
+                    msg = codec.loads(data)
                 except:
-                    log.exception("Failed to parse JSON message %s", data)
+                    log.exception(
+                        "Failed to parse JSON message %s", _decode_for_log(data)
+                    )
                     continue
 
                 if isinstance(msg, dict):
@@ -116,10 +217,11 @@ class _JsonRpcStreamReaderThread(threading.Thread):
                             log.exception("Error processing JSON message %s", msg)
                         continue
 
-                    if msg.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
-                        log.debug("Read: %s", data)
+                    if get_log_level() >= 2:
+                        if msg.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
+                            log.debug("Read: %s", _decode_for_log(data))
                 else:
-                    log.debug("Read (non dict data): %s", data)
+                    log.debug("Read (non dict data): %s", _decode_for_log(data))
 
                 self._queue.put(msg)
 
@@ -193,12 +295,50 @@ class JsonRpcStreamReader(object):
             log.debug("Exited JsonRpcStreamReader.")
 
 
+def _write_message(stream, header: bytes, body: bytes) -> None:
+    writev = getattr(os, "writev", None)
+    if writev is not None and len(body) >= _WRITEV_MIN_SIZE:
+        try:
+            fileno = stream.fileno()
+        except Exception:
+            pass  # i.e.: BytesIO
+        else:
+            stream.flush()
+            views = [memoryview(header), memoryview(body)]
+            while views:
+                written = writev(fileno, views)
+                while views and written >= len(views[0]):
+                    written -= len(views.pop(0))
+                if written:
+                    views[0] = views[0][written:]
+            return
+
+    stream.write(header + body)
+    stream.flush()
+
+
 class JsonRpcStreamWriter(object):
     def __init__(self, wfile, **json_dumps_args):
+        from robocorp_ls_core.jsonrpc.codec import StdlibJsonCodec, get_codec
+
         assert wfile is not None
         self._wfile = wfile
         self._wfile_lock = threading.Lock()
+
+        self._sort_keys = bool(json_dumps_args.pop("sort_keys", False))
         self._json_dumps_args = json_dumps_args
+        if json_dumps_args:
+            # Custom arguments: use the standard library.
+            self._codec = StdlibJsonCodec()
+        else:
+            self._codec = get_codec()
+
+    def _dumps(self, message) -> bytes:
+        if self._json_dumps_args:
+            return json.dumps(
+                message, sort_keys=self._sort_keys, **self._json_dumps_args
+            ).encode("utf-8")
+        return self._codec.dumps(message, sort_keys=self._sort_keys)
 
     def close(self):
         log.debug("Will close writer")
@@ -211,22 +351,19 @@ class JsonRpcStreamWriter(object):
                 log.debug("Unable to write %s (file already closed).", (message,))
                 return False
             try:
-                if isinstance(message, dict):
-                    if message.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
-                        log.debug("Writing: %s", message)
-                else:
-                    log.debug("Writing (non dict message): %s", message)
-
-                body = json.dumps(message, **self._json_dumps_args)
-
-                as_bytes = body.encode("utf-8")
-                stream = self._wfile
-                content_len_as_str = "Content-Length: %s\r\n\r\n" % len(as_bytes)
-                content_len_bytes = content_len_as_str.encode("ascii")
+                if get_log_level() >= 2:
+                    if isinstance(message, dict):
+                        if (
+                            message.get("command")
+                            not in BaseOptions.HIDE_COMMAND_MESSAGES
+                        ):
+                            log.debug("Writing: %s", message)
+                    else:
+                        log.debug("Writing (non dict message): %s", message)
 
-                stream.write(content_len_bytes)
-                stream.write(as_bytes)
-                stream.flush()
+                as_bytes = self._dumps(message)
+                header = b"Content-Length: %d\r\n\r\n" % len(as_bytes)
+                _write_message(self._wfile, header, as_bytes)
                 return True
             except Exception:  # pylint: disable=broad-except
                 log.exception(
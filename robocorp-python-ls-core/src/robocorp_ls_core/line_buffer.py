@@ -0,0 +1,299 @@
+"""
+A line-indexed text buffer used by the `Document` to apply incremental changes
+without rebuilding the whole source on each change.
+
+The lines are kept in chunks (tuples of lines, each tuple with at most
+`_MAX_CHUNK_LINES` lines) along with the number of chars in each chunk, so:
+
+- Finding a line (or the line of an offset) is a bisect in the chunks (and then
+  a bisect inside the chunk).
+- Applying a change only recreates the chunk(s) affected by the change.
+- Copying the buffer only copies the list of chunks (chunks are never mutated,
+  so, they're shared among copies).
+
+The full text is only built when requested.
+
+References:
+https://code.visualstudio.com/blogs/2018/03/23/text-buffer-reimplementation
+https://raphlinus.github.io/xi/2020/06/27/xi-retrospective.html
+"""
+import bisect
+import itertools
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Max number of lines in a chunk (when a chunk becomes bigger it's split).
+_MAX_CHUNK_LINES = 256
+
+# If a chunk becomes smaller than this it's merged with the next one.
+_MIN_CHUNK_LINES = _MAX_CHUNK_LINES // 4
+
+# Max number of lines kept in the cache with the utf-16 offsets.
+_MAX_UTF16_CACHE_SIZE = 200
+
+# The chars considered line ends by `str.splitlines`.
+_LINE_ENDS = "\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _compute_utf16_offsets(line: str) -> List[int]:
+    """
+    :return:
+        A list where the index is the python col and the value is the utf-16
+        code unit offset (with an additional entry for the end of the line).
+    """
+    offsets = [0]
+    tot = 0
+    for c in line:
+        tot += 1 if ord(c) < 65536 else 2
+        offsets.append(tot)
+    return offsets
+
+
+class LineBuffer(object):
+    _line_starts: Optional[List[int]]
+    _char_starts: Optional[List[int]]
+
+    def __init__(self, text: str = ""):
+        self._chunks: List[Tuple[str, ...]] = []
+        self._chunk_chars: List[int] = []
+        self._set_lines_at(0, 0, text.splitlines(True))
+
+        self._utf16_offsets_cache: Dict[str, List[int]] = {}
+
+    def copy(self) -> "LineBuffer":
+        new = LineBuffer.__new__(LineBuffer)
+        new._chunks = self._chunks[:]
+        new._chunk_chars = self._chunk_chars[:]
+        new._line_starts = self._line_starts
+        new._char_starts = self._char_starts
+        new._utf16_offsets_cache = {}
+        return new
+
+    # --- Queries
+
+    def _get_line_starts(self) -> List[int]:
+        line_starts = self._line_starts
+        if line_starts is None:
+            line_starts = [0]
+            line_starts.extend(itertools.accumulate(len(c) for c in self._chunks))
+            self._line_starts = line_starts
+        return line_starts
+
+    def _get_char_starts(self) -> List[int]:
+        char_starts = self._char_starts
+        if char_starts is None:
+            char_starts = [0]
+            char_starts.extend(itertools.accumulate(self._chunk_chars))
+            self._char_starts = char_starts
+        return char_starts
+
+    def get_line_count(self) -> int:
+        return self._get_line_starts()[-1]
+
+    def get_char_count(self) -> int:
+        return self._get_char_starts()[-1]
+
+    def get_line(self, line: int) -> str:
+        """
+        :return:
+            The contents of the given line (with the line ending).
+        :raises IndexError:
+            If the line is not valid.
+        """
+        if line < 0:
+            line += self.get_line_count()
+        line_starts = self._get_line_starts()
+        if line < 0 or line >= line_starts[-1]:
+            raise IndexError(f"Line out of range: {line}")
+        chunk_index = bisect.bisect_right(line_starts, line) - 1
+        return self._chunks[chunk_index][line - line_starts[chunk_index]]
+
+    def iter_lines(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def get_text(self) -> str:
+        return "".join(self.iter_lines())
+
+    def get_line_start_offset(self, line: int) -> int:
+        line_starts = self._get_line_starts()
+        if line >= line_starts[-1]:
+            return self._get_char_starts()[-1]
+        chunk_index = bisect.bisect_right(line_starts, line) - 1
+        chunk = self._chunks[chunk_index]
+        offset = self._get_char_starts()[chunk_index]
+        for i in range(line - line_starts[chunk_index]):
+            offset += len(chunk[i])
+        return offset
+
+    def offset_to_line_col(self, offset: int) -> Tuple[int, int]:
+        """
+        Same semantics as `Document.offset_to_line_col` (if the text ends with a
+        new line, the offset at the end of the text is at a new line).
+        """
+        if offset < 0:
+            raise ValueError("Expected offset to be >0. Found: %s" % (offset,))
+
+        chunks = self._chunks
+        if not chunks:
+            return (0, offset)
+
+        char_starts = self._get_char_starts()
+        line_starts = self._get_line_starts()
+        if offset >= char_starts[-1]:
+            last_line = chunks[-1][-1]
+            if last_line.endswith("\r") or last_line.endswith("\n"):
+                return (line_starts[-1], offset - char_starts[-1])
+            return (
+                line_starts[-1] - 1,
+                offset - (char_starts[-1] - len(last_line)),
+            )
+
+        chunk_index = bisect.bisect_right(char_starts, offset) - 1
+        chunk = chunks[chunk_index]
+        offset_in_chunk = offset - char_starts[chunk_index]
+        line_ends = list(itertools.accumulate(len(line) for line in chunk))
+        i = bisect.bisect_right(line_ends, offset_in_chunk)
+        line_start = line_ends[i - 1] if i > 0 else 0
+        return (line_starts[chunk_index] + i, offset_in_chunk - line_start)
+
+    def utf16_to_python_col(self, line_contents: str, col: int) -> int:
+        """
+        Converts a column in utf-16 code units to a python column (the offsets
+        of lines which aren't ascii are cached).
+        """
+        if line_contents.isascii():
+            return col
+
+        if col == 0:
+            return 0
+
+        cache = self._utf16_offsets_cache
+        offsets = cache.get(line_contents)
+        if offsets is None:
+            if len(cache) >= _MAX_UTF16_CACHE_SIZE:
+                cache.clear()
+            offsets = cache[line_contents] = _compute_utf16_offsets(line_contents)
+
+        # Note: if the col doesn't match the start of a char (or if it's out of
+        # range) the end of the line is returned (the same semantics of
+        # `convert_utf16_code_unit_to_python`).
+        i = bisect.bisect_left(offsets, col)
+        if i < len(offsets) and offsets[i] == col:
+            return i
+        return len(line_contents)
+
+    # --- Changes
+
+    def _set_lines_at(self, chunk_start: int, chunk_end: int, lines: Sequence[str]):
+        """
+        Replaces the chunks from chunk_start to chunk_end with new chunks
+        containing the given lines.
+        """
+        # Split in chunks with about the same size (so that a chunk which
+        # becomes a bit bigger than the max doesn't leave a tiny chunk behind).
+        n_chunks = max(1, -(-len(lines) // _MAX_CHUNK_LINES))
+        chunk_size = max(1, -(-len(lines) // n_chunks))
+        new_chunks = [
+            tuple(lines[i : i + chunk_size]) for i in range(0, len(lines), chunk_size)
+        ]
+        self._chunks[chunk_start:chunk_end] = new_chunks
+        self._chunk_chars[chunk_start:chunk_end] = [
+            sum(len(line) for line in chunk) for chunk in new_chunks
+        ]
+        self._line_starts = None
+        self._char_starts = None
+
+    def _replace_lines(self, start: int, end: int, new_lines: List[str]) -> None:
+        """
+        Replaces the lines from start to end (exclusive) with the new lines.
+        """
+        line_starts = self._get_line_starts()
+        chunks = self._chunks
+
+        chunk_start = bisect.bisect_right(line_starts, start) - 1
+        chunk_end = max(chunk_start, bisect.bisect_right(line_starts, end - 1) - 1)
+        chunk_end += 1
+
+        lines: List[str] = list(chunks[chunk_start][: start - line_starts[chunk_start]])
+        lines.extend(new_lines)
+        lines.extend(chunks[chunk_end - 1][end - line_starts[chunk_end - 1] :])
+
+        if len(lines) < _MIN_CHUNK_LINES and chunk_end < len(chunks):
+            # Merge with the next chunk so that chunks don't become too small.
+            lines.extend(chunks[chunk_end])
+            chunk_end += 1
+
+        self._set_lines_at(chunk_start, chunk_end, lines)
+
+    def replace(
+        self,
+        start_line: int,
+        start_col: int,
+        end_line: int,
+        end_col: int,
+        text: str,
+        utf16_cols: bool = False,
+    ) -> None:
+        """
+        Replaces the contents in the given range with the given text.
+
+        :param utf16_cols:
+            If True the columns are in utf-16 code units (as received from
+            the client), otherwise they're python columns.
+        """
+        line_count = self.get_line_count()
+        if line_count == 0:
+            self._set_lines_at(0, len(self._chunks), text.splitlines(True))
+            return
+
+        if start_line >= line_count:
+            # Edit at the end of the file.
+            start_line = end_line = line_count - 1
+            start_col = end_col = len(self.get_line(start_line))
+            utf16_cols = False
+
+        start_contents = self.get_line(start_line)
+        if utf16_cols:
+            start_col = self.utf16_to_python_col(start_contents, start_col)
+
+        if end_line < start_line:
+            # Invalid range (ignored).
+            return
+
+        if end_line >= line_count:
+            end_line = line_count - 1
+            end_contents = self.get_line(end_line)
+            end_col = len(end_contents)
+        else:
+            end_contents = self.get_line(end_line)
+            if utf16_cols:
+                end_col = self.utf16_to_python_col(end_contents, end_col)
+
+        segment = start_contents[:start_col] + text + end_contents[end_col:]
+        first = start_line
+        last = end_line
+
+        # The lines must be split the same way `str.splitlines` would split the
+        # full text, so, lines which could be joined by the change (i.e.: the
+        # line ending was removed or '\r' and '\n' were put together) are
+        # added to the segment.
+        while last + 1 < line_count:
+            if segment and segment[-1] in _LINE_ENDS:
+                if not segment.endswith("\r"):
+                    break
+                next_line = self.get_line(last + 1)
+                if not next_line.startswith("\n"):
+                    break
+            else:
+                next_line = self.get_line(last + 1)
+            segment += next_line
+            last += 1
+
+        while first > 0 and segment.startswith("\n"):
+            prev_line = self.get_line(first - 1)
+            if not prev_line.endswith("\r"):
+                break
+            segment = prev_line + segment
+            first -= 1
+
+        self._replace_lines(first, last + 1, segment.splitlines(True))
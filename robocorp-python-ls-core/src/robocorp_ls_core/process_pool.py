@@ -0,0 +1,147 @@
+"""
+Helpers to do work in a pool of worker processes (used when many files must be
+handled at once, i.e.: linting the whole workspace, listing the tests of a
+directory, collecting actions, etc.).
+
+Usage:
+
+    executor = create_process_pool_executor(
+        max_workers, "my-worker", initializer=_initialize, initargs=(...)
+    )
+    try:
+        futures = [executor.submit(work, chunk) for chunk in chunks]
+        for future in iter_completed(futures, monitor):
+            try:
+                result = future.result()
+            except Exception:
+                log.exception("Error in worker.")
+                continue
+            ...
+    finally:
+        executor.shutdown(wait=False)
+"""
+import os
+import sys
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from robocorp_ls_core.protocols import IMonitor
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+
+def get_default_max_workers(env_var: Optional[str] = None) -> int:
+    """
+    :param env_var:
+        An environment variable with the number of workers (if not given or
+        not set, the number of cpus is used).
+    """
+    if env_var:
+        try:
+            return int(os.environ[env_var])
+        except (KeyError, ValueError):
+            pass
+    return os.cpu_count() or 1
+
+
+def compute_workers_count(
+    items_count: int, min_items_per_worker: int, max_workers: int
+) -> int:
+    """
+    Starting a worker is expensive, so, a worker is only started if it'll
+    handle at least `min_items_per_worker` items.
+
+    :return:
+        The number of workers which should be used (if <= 1 the items should
+        be handled in the current process).
+    """
+    return max(0, min(max_workers, items_count // min_items_per_worker))
+
+
+def _initialize_worker(
+    worker_name: str,
+    log_level: int,
+    log_file: Optional[str],
+    initializer: Optional[Callable[..., None]],
+    initargs: Sequence[Any],
+) -> None:
+    from robocorp_ls_core.robotframework_log import configure_logger
+
+    # The stdout of the process which started the pool may be used for the
+    # communication with the client (so, nothing can be written there).
+    null_fd = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(null_fd, 1)
+    os.close(null_fd)
+    sys.stdout = open(os.devnull, "w")
+
+    configure_logger(worker_name, log_level, log_file)
+    log.debug("Initializing %s (pid: %s).", worker_name, os.getpid())
+
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def create_process_pool_executor(
+    max_workers: int,
+    worker_name: str,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+):
+    """
+    Creates a `ProcessPoolExecutor` whose workers don't write to the stdout
+    and log with the same log level/file of the current process.
+
+    :param initializer:
+        A (module-level) function called in each worker with `initargs` after
+        it's bootstrapped.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from robocorp_ls_core.robotframework_log import get_log_file, get_log_level
+    import multiprocessing
+
+    assert max_workers >= 1
+
+    # Note: spawn is used because forking the language server (which has
+    # many threads running) isn't safe.
+    return ProcessPoolExecutor(
+        max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=(
+            worker_name,
+            get_log_level(),
+            get_log_file(),
+            initializer,
+            tuple(initargs),
+        ),
+    )
+
+
+def iter_completed(
+    futures: Iterable[Future], monitor: Optional[IMonitor] = None
+) -> Iterator[Future]:
+    """
+    Provides the futures as those are completed.
+
+    :raises JsonRpcRequestCancelled:
+        If the monitor is cancelled (in which case the futures still pending
+        are cancelled).
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+
+    pending = set(futures)
+    try:
+        while pending:
+            if monitor is not None:
+                monitor.check_cancelled()
+
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            yield from iter(done)
+    except JsonRpcRequestCancelled:
+        log.info("Work in pool cancelled (%s tasks skipped).", len(pending))
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
@@ -12,6 +12,7 @@ from typing import (
     Type,
     Iterable,
     Tuple,
+    Hashable,
 )
 from typing import TypeVar
 import typing
@@ -316,6 +317,9 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
     def request_lint(self, doc_uri: str) -> Optional[IIdMessageMatcher]:
         pass
 
+    def request_lint_batch(self, doc_uris: List[str]) -> Optional[IIdMessageMatcher]:
+        pass
+
     def request_semantic_tokens_full(
         self, text_document: "TextDocumentTypedDict"
     ) -> Optional[IIdMessageMatcher]:
@@ -456,6 +460,11 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
         :Note: async complete.
         """
 
+    def request_memory_stats(self) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+
 
 class EvaluatableExpressionTypedDict(TypedDict):
     """
@@ -836,6 +845,28 @@ class IDocument(Protocol):
     def find_line_with_contents(self, contents: str) -> int:
         pass
 
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        :return:
+            The (estimated) memory in bytes used by the document (the key is
+            the category, i.e.: 'source', 'ast', ...).
+        """
+
+    def release_derived_caches(self) -> None:
+        """
+        Releases the caches which can be recomputed from the source (i.e.:
+        the AST) to save memory.
+
+        Note: may be called from any thread.
+        """
+
+    def set_memory_usage_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """
+        Sets a callable which is called (from any thread) whenever the memory
+        used by the caches of the document may have changed (so, whoever
+        keeps track of the memory used doesn't need to poll the document).
+        """
+
 
 class IWorkspaceFolder(Protocol):
     uri: str
@@ -884,6 +915,20 @@ class IWorkspace(Protocol):
         Retuns the folders which are set as workspace folders.
         """
 
+    def get_files_version(self) -> Hashable:
+        """
+        :return:
+            A value which changes whenever files are added/removed in the
+            workspace folders (or when folders are added/removed), so, clients
+            can check whether the files in the workspace need to be listed
+            again (it's thread-safe).
+        """
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Provides the (estimated) memory used by the documents in the workspace.
+        """
+
     def dispose(self):
         pass
 
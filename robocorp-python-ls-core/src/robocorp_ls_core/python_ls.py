@@ -22,7 +22,7 @@ import threading
 import weakref
 from functools import partial
 from pathlib import Path
-from typing import ContextManager, Dict, Optional, Sequence, Set
+from typing import ContextManager, Dict, Iterable, Optional, Sequence, Set
 
 from robocorp_ls_core import uris
 from robocorp_ls_core.jsonrpc.dispatchers import MethodDispatcher
@@ -416,6 +416,22 @@ class BaseLintManager(object):
 
         :param lint_paths: The paths that should be linted.
         """
+        new_uris_to_lint_set = self._collect_uris_to_lint(lint_paths)
+
+        next_uri_to_lint = None
+        with self._lock:
+            self._uris_to_lint.update(new_uris_to_lint_set)
+            if new_uris_to_lint_set:
+                next_uri_to_lint = new_uris_to_lint_set.pop()
+
+        if next_uri_to_lint:
+            self.schedule_lint(next_uri_to_lint, True, 0.0)
+
+    def _collect_uris_to_lint(self, lint_paths: Iterable[str]) -> Set[str]:
+        """
+        :return: The uris of the .robot and .resource files in the given paths
+            (folders are recursively checked).
+        """
         new_uris_to_lint_set = set()
 
         for path in lint_paths:
@@ -432,15 +448,7 @@ class BaseLintManager(object):
                 if f.suffix.lower() in (".robot", ".resource"):
                     uri = uris.from_fs_path(str(f))
                     new_uris_to_lint_set.add(uri)
-
-        next_uri_to_lint = None
-        with self._lock:
-            self._uris_to_lint.update(new_uris_to_lint_set)
-            if new_uris_to_lint_set:
-                next_uri_to_lint = new_uris_to_lint_set.pop()
-
-        if next_uri_to_lint:
-            self.schedule_lint(next_uri_to_lint, True, 0.0)
+        return new_uris_to_lint_set
 
 
 class PythonLanguageServer(MethodDispatcher):
@@ -310,6 +310,9 @@ class RemoteFSObserver(object):
                 src_path = msg["src_path"]
                 remote_fs_watch.on_change(src_path, *remote_fs_watch.call_args)
 
+    def notifies_changes(self) -> bool:
+        return True
+
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
         from robocorp_ls_core.watchdog_wrapper import IFSObserver
@@ -1,7 +1,8 @@
 import os.path
 from pathlib import Path
 import sys
-from typing import List
+import threading
+from typing import Dict, List, Optional, Tuple
 
 from robocorp_ls_core.robotframework_log import get_logger
 from robocorp_ls_core.lsp import DiagnosticsTypedDict
@@ -10,6 +11,13 @@ import typing
 
 log = get_logger(__name__)
 
+# Max number of configured Robocop runners kept in the cache.
+_MAX_CACHED_RUNNERS = 20
+
+# The files which Robocop searches (in the project root or its parents) to
+# load its configuration.
+_CONFIG_FILENAMES = (".robocop", "pyproject.toml")
+
 
 def _import_robocop():
     try:
@@ -27,36 +35,144 @@ def _import_robocop():
     log.info("Robocop module: %s", robocop)
 
 
+def _get_mtime(path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _iter_ext_rules_files(ext_rules):
+    for ext_rule in ext_rules:
+        path = Path(ext_rule)
+        yield path
+        if path.is_dir():
+            for f in path.iterdir():
+                if f.suffix == ".py":
+                    yield f
+
+
+class _CachedRunner(object):
+    def __init__(self, robocop_runner, watched_files: Dict[str, object]):
+        self.robocop_runner = robocop_runner
+
+        # The runner (its checkers) keeps state while checking a file, so,
+        # only one file may be checked at a time.
+        self.lock = threading.Lock()
+
+        # path -> mtime of the files which were used to configure the runner
+        # (argument files and external rules).
+        self.watched_files = watched_files
+
+    def is_up_to_date(self) -> bool:
+        for path, mtime in self.watched_files.items():
+            if _get_mtime(path) != mtime:
+                return False
+        return True
+
+
+class _RobocopRunnersCache(object):
+    """
+    Keeps the Robocop runners already configured (creating a runner requires
+    reading the config files and importing all the rules, which is much
+    slower than actually checking a file).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, _CachedRunner] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _compute_key(self, project_root: Path, config_root: Path) -> tuple:
+        from robocop.files import find_file_in_project_root
+
+        key: list = [str(project_root)]
+        for config_name in _CONFIG_FILENAMES:
+            config_path = find_file_in_project_root(config_name, config_root)
+            key.append(str(config_path))
+            key.append(_get_mtime(config_path))
+        return tuple(key)
+
+    def _create_runner(self, project_root: Path, config_root: Path) -> _CachedRunner:
+        import robocop
+        from robocop.config import Config
+
+        config = Config(root=config_root)
+
+        # Robocop relies on the cwd to resolve the --ext-rules which aren't
+        # relative to the config file and to set the `exec_dir`: resolve those
+        # based on the project root instead of changing the cwd (which is
+        # global to the process and lint happens in threads).
+        # See: https://github.com/robocorp/robotframework-lsp/issues/703
+        ext_rules = set()
+        for ext_rule in config.ext_rules:
+            if not os.path.isabs(ext_rule):
+                in_project_root = project_root / ext_rule
+                if in_project_root.exists():
+                    ext_rule = str(in_project_root)
+            ext_rules.add(ext_rule)
+        config.ext_rules = ext_rules
+        config.exec_dir = str(project_root)
+
+        robocop_runner = robocop.Robocop(config=config)
+        robocop_runner.root = str(project_root)
+        robocop_runner.reload_config()
+
+        watched_files: Dict[str, object] = {}
+        for path in _iter_ext_rules_files(ext_rules):
+            watched_files[str(path)] = _get_mtime(path)
+        config_from = config.config_from
+        if config_from:
+            watched_files[str(config_from)] = _get_mtime(config_from)
+
+        return _CachedRunner(robocop_runner, watched_files)
+
+    def get_runner(self, project_root: Path, config_root: Path) -> _CachedRunner:
+        key = self._compute_key(project_root, config_root)
+        with self._lock:
+            cached = self._cache.pop(key, None)
+            if cached is not None:
+                if cached.is_up_to_date():
+                    # Reinsert to keep the most recently used at the end.
+                    self._cache[key] = cached
+                    return cached
+                log.debug("Robocop configuration changed (recreating runner).")
+
+        cached = self._create_runner(project_root, config_root)
+        with self._lock:
+            self._cache[key] = cached
+            while len(self._cache) > _MAX_CACHED_RUNNERS:
+                del self._cache[next(iter(self._cache))]
+        return cached
+
+
+_runners_cache = _RobocopRunnersCache()
+
+
+def clear_robocop_runners_cache() -> None:
+    _runners_cache.clear()
+
+
 def collect_robocop_diagnostics(
     project_root: Path, ast_model, filename: str, source: str
 ) -> List[DiagnosticsTypedDict]:
     _import_robocop()
 
-    import robocop
-    from robocop.config import Config
     from robocop.utils import issues_to_lsp_diagnostic
 
+    project_root = Path(os.path.abspath(project_root))
     filename_parent = Path(filename).parent
-    # Set the working directory to the project root (tricky handling: Robocop
-    # relies on cwd to deal with the --ext-rules
-    # See: https://github.com/robocorp/robotframework-lsp/issues/703).
-    initial_cwd = os.getcwd()
-    try:
-        if os.path.exists(project_root):
-            os.chdir(project_root)
-
-        if filename_parent.exists():
-            config = Config(root=filename_parent)
-        else:
-            # Unsaved files.
-            config = Config(root=project_root)
-        robocop_runner = robocop.Robocop(config=config)
-        robocop_runner.reload_config()
+    if filename_parent.exists():
+        config_root = filename_parent
+    else:
+        # Unsaved files.
+        config_root = project_root
 
-        issues = robocop_runner.run_check(ast_model, filename, source)
-        diag_issues = typing.cast(
-            List[DiagnosticsTypedDict], issues_to_lsp_diagnostic(issues)
-        )
-    finally:
-        os.chdir(initial_cwd)
-    return diag_issues
+    cached = _runners_cache.get_runner(project_root, config_root)
+    with cached.lock:
+        issues = cached.robocop_runner.run_check(ast_model, filename, source)
+    return typing.cast(List[DiagnosticsTypedDict], issues_to_lsp_diagnostic(issues))
@@ -70,6 +70,13 @@ class IFSObserver(Protocol):
     ) -> IFSWatch:
         pass
 
+    def notifies_changes(self) -> bool:
+        """
+        :return:
+            Whether changes are actually notified by this observer (if False,
+            users must check the filesystem themselves to detect changes).
+        """
+
     def dispose(self):
         pass
 
@@ -385,6 +392,9 @@ class _FSNotifyObserver(threading.Thread):
 
         return _FSNotifyWatchList(new_paths_to_track, new_notifications, self)
 
+    def notifies_changes(self) -> bool:
+        return True
+
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
 
@@ -527,6 +537,9 @@ class _WatchdogObserver(object):
         self._start()
         return _WatchdogWatchList(watches, self._observer, self._info_to_count)
 
+    def notifies_changes(self) -> bool:
+        return True
+
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
 
@@ -546,6 +559,9 @@ class _DummyFSObserver(object):
     def dispose(self):
         pass
 
+    def notifies_changes(self) -> bool:
+        return False
+
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
 
@@ -17,7 +17,19 @@
 # limitations under the License.
 import io
 import os
-from typing import Optional, Dict, List, Iterable, Tuple, Set, Union, Any
+import sys
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Iterable,
+    Tuple,
+    Set,
+    Union,
+    Any,
+    Callable,
+    Hashable,
+)
 
 from robocorp_ls_core import uris
 from robocorp_ls_core.basic import implements
@@ -41,14 +53,19 @@ from robocorp_ls_core.lsp import (
 import weakref
 from collections import namedtuple
 import time
+import functools
 from robocorp_ls_core.watchdog_wrapper import IFSObserver
-from robocorp_ls_core.code_units import convert_utf16_code_unit_to_python
+from robocorp_ls_core.line_buffer import LineBuffer
 from robocorp_ls_core.callbacks import Callback
 
 log = get_logger(__name__)
 
 _FileMTimeInfo = namedtuple("_FileMTimeInfo", "st_mtime, st_size")
 
+# The memory used by each (non-empty) str object apart from its chars.
+_STR_OVERHEAD = sys.getsizeof("a") - 1
+_INT_SIZE = sys.getsizeof(2**20)
+
 
 def _text_edit_key(text_edit: Union[TextEditTypedDict, TextEdit]):
     start = text_edit["range"]["start"]
@@ -137,7 +154,7 @@ class _VirtualFSThread(threading.Thread):
             virtual_fs = self._virtual_fs()
             if virtual_fs is None:
                 return
-            virtual_fs._dir_to_info[dir_path] = dir_info
+            virtual_fs._set_dir_info(dir_path, dir_info)
         except OSError:
             pass  # Directory was removed in the meanwhile.
 
@@ -206,9 +223,9 @@ class _VirtualFSThread(threading.Thread):
                 except OSError:
                     if not os.path.exists(dir_path):
                         # Directory was removed.
-                        virtual_fs._dir_to_info.pop(dir_path, None)
+                        virtual_fs._remove_dir_info(dir_path)
                 else:
-                    virtual_fs._dir_to_info[dir_path] = dir_info
+                    virtual_fs._set_dir_info(dir_path, dir_info)
 
             virtual_fs = None
 
@@ -221,6 +238,14 @@ class _VirtualFSThread(threading.Thread):
         self._trigger_loop.set()
         self.on_file_changed(src_path)
 
+    def is_tracking_changes(self) -> bool:
+        """
+        :return:
+            Whether changes are being tracked (i.e.: the filesystem watch was
+            already started and the thread wasn't disposed).
+        """
+        return self._fs_watch is not None
+
     def dispose(self):
         fs_watch = self._fs_watch
         if fs_watch is not None:
@@ -249,7 +274,12 @@ class _VirtualFS(object):
 
         self._dir_to_info: Dict[str, _DirInfo] = {}
 
+        # Incremented whenever files are added/removed (changes in the contents
+        # of the files don't change it).
+        self.files_version = 0
+
         self._extensions = set(extensions)
+        self._extensions_tuple = tuple(ext.lower() for ext in self._extensions)
         self._fs_observer = fs_observer
 
         # Do initial scan and then start tracking changes.
@@ -260,6 +290,18 @@ class _VirtualFS(object):
     def wait_for_check_done(self, timeout):
         self._virtual_fsthread.wait_for_check_done(timeout)
 
+    def _set_dir_info(self, dir_path: str, dir_info: _DirInfo) -> None:
+        # Note: only called from the virtual fs thread.
+        old = self._dir_to_info.get(dir_path)
+        self._dir_to_info[dir_path] = dir_info
+        if old is None or old.files_in_directory != dir_info.files_in_directory:
+            self.files_version += 1
+
+    def _remove_dir_info(self, dir_path: str) -> None:
+        # Note: only called from the virtual fs thread.
+        if self._dir_to_info.pop(dir_path, None) is not None:
+            self.files_version += 1
+
     def _iter_all_doc_uris(self, extensions: Tuple[str, ...]) -> Iterable[str]:
         """
         :param extensions:
@@ -272,6 +314,22 @@ class _VirtualFS(object):
                 if f.endswith(extensions):
                     yield uris.from_fs_path(f)
 
+    def is_watched_path(self, path: str) -> bool:
+        """
+        :return:
+            Whether changes to the given file are notified (i.e.: its directory
+            was scanned and changes are being tracked and the file has one of
+            the extensions being tracked).
+        """
+        virtual_fsthread = self._virtual_fsthread
+        if not virtual_fsthread.first_check_done.is_set():
+            return False
+        if not virtual_fsthread.is_tracking_changes():
+            return False  # Disposed.
+        if not path.lower().endswith(self._extensions_tuple):
+            return False
+        return normalize_drive(os.path.dirname(path)) in self._dir_to_info
+
     def dispose(self):
         self._virtual_fsthread.dispose()
         self._dir_to_info.clear()
@@ -310,6 +368,12 @@ class _WorkspaceFolderWithVirtualFS(object):
     def wait_for_check_done(self, timeout):
         self._vs.wait_for_check_done(timeout)
 
+    def get_files_version(self) -> int:
+        return self._vs.files_version
+
+    def is_watched_path(self, path: str) -> bool:
+        return self._vs.is_watched_path(path)
+
     def dispose(self):
         self._vs.dispose()
 
@@ -319,12 +383,254 @@ class _WorkspaceFolderWithVirtualFS(object):
         _: IWorkspaceFolder = check_implements(self)
 
 
+class _FilesystemDocEntry(object):
+    __slots__ = ["doc", "size", "usage", "watched", "last_access", "last_validation"]
+
+    def __init__(self, doc: IDocument, watched: bool, curtime: float):
+        self.doc = doc
+        self.usage: Dict[str, int] = doc.get_memory_usage()
+        self.size = sum(self.usage.values())
+
+        # Whether changes to the file are notified by the filesystem observer
+        # (in which case the mtime is just checked from time to time as a
+        # safety measure).
+        self.watched = watched
+
+        self.last_access = curtime
+        self.last_validation = curtime
+
+
+class _FilesystemDocsCache(object):
+    """
+    Keeps the documents loaded from the filesystem (keyed by the normalized
+    uri) with a max size based on the memory used by the documents.
+
+    When the max size is reached the caches which may be recomputed (i.e.:
+    the AST) are released from the least recently accessed documents and
+    only if that isn't enough those documents are removed (until the size
+    is below `resize_to`).
+
+    Reads are lock-free (the dict is only mutated with the lock held and the
+    GIL makes the lookup safe), so, threads getting documents don't contend
+    with each other (the lock is only held to add/remove entries and the
+    document is loaded from the disk without holding it).
+    """
+
+    def __init__(self, max_size: int):
+        self._entries: Dict[str, _FilesystemDocEntry] = {}
+        self._lock = threading.Lock()
+        self._current_size_usage = 0
+
+        # The memory used by a document grows after it's added (as the AST and
+        # other caches are computed on demand): the document notifies when
+        # that happens and only the size of those entries is updated (the
+        # current size is a running total of the size of the entries).
+        # Note: a different lock is used because the notification may happen
+        # while `_lock` is held (i.e.: when releasing the caches).
+        self._entries_with_size_changed: Dict[str, _FilesystemDocEntry] = {}
+        self._size_changed_lock = threading.Lock()
+        self.set_max_size(max_size)
+
+        # Incremented whenever an entry is invalidated (used to detect whether
+        # a document which was being loaded may be outdated).
+        self.invalidation_count = 0
+
+        self.released_count = 0
+        self.evicted_count = 0
+
+    def set_max_size(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+            self.resize_to = int(max_size * 0.7)
+            if self._current_size_usage > self.max_size:
+                self._resize()
+
+    @property
+    def current_size_usage(self) -> int:
+        return self._current_size_usage
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_FilesystemDocEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_access = time.monotonic()
+        return entry
+
+    def put(
+        self, key: str, doc: IDocument, watched: bool, invalidation_count: int
+    ) -> IDocument:
+        """
+        :param invalidation_count:
+            The `invalidation_count` before the document started being loaded.
+
+        :return:
+            The document which should be used (if some other thread already
+            added an entry for the key while the document was being loaded,
+            the document from that entry is kept and returned so that there
+            aren't multiple instances for the same key).
+        """
+        curtime = time.monotonic()
+        with self._lock:
+            changed = invalidation_count != self.invalidation_count
+
+            existing_entry = self._entries.get(key)
+            if existing_entry is not None:
+                if changed:
+                    # Something changed while it was being loaded: make sure
+                    # that the mtime is checked in the next access.
+                    existing_entry.last_validation = 0
+                return existing_entry.doc
+
+            entry = _FilesystemDocEntry(doc, watched, curtime)
+            if changed:
+                entry.last_validation = 0
+
+            self._entries[key] = entry
+            self._current_size_usage += entry.size
+            doc.set_memory_usage_listener(
+                functools.partial(self._on_memory_usage_changed, key, entry)
+            )
+
+            self._update_sizes()
+            if self._current_size_usage > self.max_size:
+                self._resize()
+        return doc
+
+    def _on_memory_usage_changed(self, key: str, entry: _FilesystemDocEntry) -> None:
+        with self._size_changed_lock:
+            self._entries_with_size_changed[key] = entry
+
+    def _update_entry_size(self, entry: _FilesystemDocEntry) -> None:
+        # Note: must be called with the lock held.
+        usage = entry.doc.get_memory_usage()
+        size = sum(usage.values())
+        self._current_size_usage += size - entry.size
+        entry.usage = usage
+        entry.size = size
+
+    def _update_sizes(self) -> None:
+        # Note: must be called with the lock held.
+        with self._size_changed_lock:
+            if not self._entries_with_size_changed:
+                return
+            changed = self._entries_with_size_changed
+            self._entries_with_size_changed = {}
+
+        for key, entry in changed.items():
+            # Only update the entries which are still in the cache.
+            if self._entries.get(key) is entry:
+                self._update_entry_size(entry)
+
+    def _resize(self) -> None:
+        # Note: must be called with the lock held.
+        self._update_sizes()
+        if self._current_size_usage <= self.max_size:
+            return
+
+        entries = sorted(self._entries.items(), key=lambda item: item[1].last_access)
+
+        # First release the caches which can be recomputed from the source
+        # (keeping the source and the symbols)...
+        for _key, entry in entries:
+            if self._current_size_usage <= self.resize_to:
+                return
+            size = entry.size
+            entry.doc.release_derived_caches()
+            self._update_entry_size(entry)
+            if entry.size < size:
+                self.released_count += 1
+
+        # ... and only remove the documents if it's still not enough.
+        for key, entry in entries:
+            if self._current_size_usage <= self.resize_to:
+                return
+            del self._entries[key]
+            self._current_size_usage -= entry.size
+            self.evicted_count += 1
+
+    def pop(self, key: str, entry: Optional[_FilesystemDocEntry] = None) -> None:
+        """
+        :param entry:
+            If given the key is only removed if it still maps to the given
+            entry.
+        """
+        with self._lock:
+            self.invalidation_count += 1
+            current = self._entries.get(key)
+            if current is None or (entry is not None and current is not entry):
+                return
+            del self._entries[key]
+            self._current_size_usage -= current.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidation_count += 1
+            self._entries = {}
+            self._current_size_usage = 0
+            with self._size_changed_lock:
+                self._entries_with_size_changed = {}
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._update_sizes()
+            usage: Dict[str, int] = {}
+            for entry in self._entries.values():
+                for category, size in entry.usage.items():
+                    usage[category] = usage.get(category, 0) + size
+
+            return {
+                "documents": len(self._entries),
+                "max_size": self.max_size,
+                "resize_to": self.resize_to,
+                "current_size": self._current_size_usage,
+                "usage": usage,
+                "released_count": self.released_count,
+                "evicted_count": self.evicted_count,
+            }
+
+
+_MIN_FILESYSTEM_DOCS_TARGET_MEMORY_IN_BYTES = int(5e7)  # 50 MB
+
+
+def _get_filesystem_docs_target_memory(target_memory_in_bytes: Optional[int]) -> int:
+    """
+    :param target_memory_in_bytes:
+        The target memory for the documents loaded from the filesystem. If not
+        given, `RFLS_FILES_TARGET_MEMORY_IN_BYTES` is used (if also not given
+        the default is 1 GB).
+    """
+    if not target_memory_in_bytes:
+        target_memory_in_bytes = int(1e9)  # Default value
+
+        target_memory_in_bytes_str = os.environ.get(
+            "RFLS_FILES_TARGET_MEMORY_IN_BYTES", None
+        )
+        if target_memory_in_bytes_str:
+            try:
+                target_memory_in_bytes = int(target_memory_in_bytes_str)
+            except:
+                log.critical(
+                    "Expected RFLS_FILES_TARGET_MEMORY_IN_BYTES to evaluate to an int. Found: %s",
+                    target_memory_in_bytes_str,
+                )
+
+    return max(target_memory_in_bytes, _MIN_FILESYSTEM_DOCS_TARGET_MEMORY_IN_BYTES)
+
+
 class Workspace(object):
     """
     Note: only a single thread can mutate the workspace, but multiple threads
     may read from it.
     """
 
+    # Documents loaded from the filesystem whose changes are notified by the
+    # filesystem observer only have their mtime checked again after this
+    # timeout (in seconds) elapses (just as a safety measure in case some
+    # notification was lost).
+    WATCHED_DOCS_REVALIDATION_TIMEOUT = 3.0
+
     def __init__(
         self,
         root_uri: str,
@@ -334,7 +640,6 @@ class Workspace(object):
     ) -> None:
         from robocorp_ls_core.lsp import WorkspaceFolder
         from robocorp_ls_core.callbacks import Callback
-        from robocorp_ls_core.cache import LRUCache
 
         self._main_thread = threading.current_thread()
 
@@ -345,42 +650,20 @@ class Workspace(object):
         self._track_file_extensions = track_file_extensions
         self._fs_observer = fs_observer
 
+        # When the observer doesn't notify changes the mtime of documents
+        # loaded from the filesystem must be checked on each access.
+        self._fs_observer_notifies_changes = fs_observer.notifies_changes()
+
         # Contains the docs with files considered open.
         self._docs: Dict[str, IDocument] = {}
 
         # Contains the docs pointing to the filesystem.
-        def _get_size(doc: IDocument):
-            # In a simplistic way we say that each char in a document occupies
-            # 8 bytes and then multiply this by 7.5 to account for the supposed
-            # amount of memory used by the AST which is cached along in the document
-            return 8 * len(doc.source) * 7.5
-
-        one_gb_in_bytes = int(1e9)
-        target_memory_in_bytes: int = one_gb_in_bytes  # Default value
-
-        target_memory_in_bytes_str = os.environ.get(
-            "RFLS_FILES_TARGET_MEMORY_IN_BYTES", None
-        )
-        if target_memory_in_bytes_str:
-            try:
-                target_memory_in_bytes = int(target_memory_in_bytes_str)
-            except:
-                log.critical(
-                    "Expected RFLS_FILES_TARGET_MEMORY_IN_BYTES to evaluate to an int. Found: %s",
-                    target_memory_in_bytes,
-                )
-
-        fifty_mb_in_bytes = int(5e7)
-        if target_memory_in_bytes <= fifty_mb_in_bytes:
-            target_memory_in_bytes = fifty_mb_in_bytes
-
-        # Whenever we reach 1GB of used memory we clear up to use 700 MB.
-        self._filesystem_docs: LRUCache[str, IDocument] = LRUCache(
-            target_memory_in_bytes, get_size=_get_size
+        self._filesystem_docs = _FilesystemDocsCache(
+            _get_filesystem_docs_target_memory(None)
         )
-        self._filesystem_docs_lock = threading.Lock()
 
         self.on_file_changed = Callback()
+        self.on_file_changed.register(self._on_file_changed)
 
         if workspace_folders is not None:
             for folder in workspace_folders:
@@ -461,35 +744,115 @@ class Workspace(object):
         folders = self._folders  # Ok, thread-safe (folders are always set as a whole)
         return [uris.to_fs_path(ws_folder.uri) for ws_folder in folders.values()]
 
+    def _on_file_changed(self, src_path: str) -> None:
+        # Called from the filesystem observer thread.
+        try:
+            doc_uri = normalize_uri(uris.from_fs_path(src_path))
+        except Exception:
+            log.exception("Error handling change in: %s", src_path)
+            return
+        self._filesystem_docs.pop(doc_uri)
+
+    def _is_watched_path(self, path: str) -> bool:
+        """
+        :return:
+            Whether changes to the given path are notified by the filesystem
+            observer (i.e.: it's a file with a tracked extension in a
+            directory being tracked in one of the workspace folders).
+        """
+        if not self._fs_observer_notifies_changes:
+            return False
+
+        # Folders are set as a whole, so, this is thread safe.
+        for folder in self._folders.values():
+            if folder.is_watched_path(path):
+                return True
+        return False
+
     @implements(IWorkspace.get_document)
     def get_document(self, doc_uri: str, accept_from_file: bool) -> Optional[IDocument]:
         # Ok, thread-safe (does not mutate the _docs dict so the GIL keeps us
-        # safe -- contents in the _filesystem_docs need a lock though).
-        doc = self._docs.get(normalize_uri(doc_uri))
+        # safe -- the _filesystem_docs is also safe for reads and only locks
+        # to add/remove entries).
+        normalized_doc_uri = normalize_uri(doc_uri)
+        doc = self._docs.get(normalized_doc_uri)
         if doc is not None:
             return doc
 
-        if accept_from_file:
-            with self._filesystem_docs_lock:
-                doc = self._filesystem_docs.get(doc_uri)
-
-                if doc is not None:
-                    if not doc.is_source_in_sync():
-                        self._filesystem_docs.pop(doc_uri, None)
-                        doc = None
-
-                if doc is None:
-                    try:
-                        doc = self._create_document(doc_uri, force_load_source=True)
-                    except:
-                        log.debug("Unable to load contents from: %s", doc_uri)
-                        # Unable to load contents: file does not exist.
-                        doc = None
-                    else:
-                        doc.immutable = True
-                        self._filesystem_docs[doc_uri] = doc
+        if not accept_from_file:
+            return None
+
+        filesystem_docs = self._filesystem_docs
+        entry = filesystem_docs.get(normalized_doc_uri)
+        if entry is not None:
+            if entry.watched:
+                # Changes are notified (which removes the entry), so, the mtime
+                # is just checked from time to time.
+                curtime = time.monotonic()
+                if (
+                    curtime - entry.last_validation
+                    < self.WATCHED_DOCS_REVALIDATION_TIMEOUT
+                ):
+                    return entry.doc
+
+                if entry.doc.is_source_in_sync():
+                    entry.last_validation = curtime
+                    return entry.doc
+
+            elif entry.doc.is_source_in_sync():
+                return entry.doc
+
+            filesystem_docs.pop(normalized_doc_uri, entry)
+
+        # Note: the document is loaded without holding any lock (if 2 threads
+        # load it at the same time, the first one added to the cache is used).
+        invalidation_count = filesystem_docs.invalidation_count
+        try:
+            doc = self._create_document(doc_uri, force_load_source=True)
+        except:
+            log.debug("Unable to load contents from: %s", doc_uri)
+            # Unable to load contents: file does not exist.
+            return None
 
-        return doc
+        doc.immutable = True
+        path = doc.path
+        watched = bool(path) and self._is_watched_path(path)
+        return filesystem_docs.put(normalized_doc_uri, doc, watched, invalidation_count)
+
+    def set_filesystem_docs_target_memory(
+        self, target_memory_in_bytes: Optional[int]
+    ) -> None:
+        """
+        :param target_memory_in_bytes:
+            The memory which the documents loaded from the filesystem may use
+            (when it's reached the caches of the least recently used documents
+            are released until 70% of it is used). If None the default is used.
+        """
+        self._filesystem_docs.set_max_size(
+            _get_filesystem_docs_target_memory(target_memory_in_bytes)
+        )
+
+    @implements(IWorkspace.get_memory_stats)
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        :return:
+            The (estimated) memory in bytes used by the documents opened in
+            the editor and the documents loaded from the filesystem.
+        """
+        open_docs_usage: Dict[str, int] = {}
+        open_docs = list(self._docs.values())
+        for doc in open_docs:
+            for category, size in doc.get_memory_usage().items():
+                open_docs_usage[category] = open_docs_usage.get(category, 0) + size
+
+        return {
+            "open_documents": {
+                "documents": len(open_docs),
+                "current_size": sum(open_docs_usage.values()),
+                "usage": open_docs_usage,
+            },
+            "filesystem_documents": self._filesystem_docs.get_memory_stats(),
+        }
 
     def is_local(self):
         # Thread-safe (only accesses immutable data).
@@ -514,8 +877,7 @@ class Workspace(object):
             _source = doc.source
         except:
             doc.source = ""
-        with self._filesystem_docs_lock:
-            self._filesystem_docs.pop(normalized_doc_uri, None)
+        self._filesystem_docs.pop(normalized_doc_uri)
         return doc
 
     @implements(IWorkspace.remove_document)
@@ -543,7 +905,11 @@ class Workspace(object):
 
         # Note: don't mutate an existing doc, always create a new one based on it
         # (so, existing references won't have racing conditions).
-        new_doc = self._create_document(doc_uri, doc.source, text_doc["version"])
+        if isinstance(doc, Document):
+            new_doc = self._create_document(doc_uri, "", text_doc["version"])
+            new_doc._set_contents_from(doc)
+        else:
+            new_doc = self._create_document(doc_uri, doc.source, text_doc["version"])
         new_doc.apply_change(change)
         self._docs[normalized_uri] = new_doc
         return new_doc
@@ -562,6 +928,15 @@ class Workspace(object):
         for folder in folders:
             yield from folder._iter_all_doc_uris(extensions)
 
+    @implements(IWorkspace.get_files_version)
+    def get_files_version(self) -> Hashable:
+        # Folders are set as a whole, so, this is thread safe.
+        folders = self._folders
+        return tuple(
+            (folder_uri, folder.get_files_version())
+            for folder_uri, folder in folders.items()
+        )
+
     def dispose(self):
         self._check_in_mutate_thread()
 
@@ -570,8 +945,7 @@ class Workspace(object):
             self.remove_folder(folder_uri)
 
         self._docs = {}
-        with self._filesystem_docs_lock:
-            self._filesystem_docs.clear()
+        self._filesystem_docs.clear()
 
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
@@ -589,6 +963,8 @@ class Document(object):
     once, but that should not corrupt internal structures).
     """
 
+    __source: Optional[str]
+
     def __init__(
         self,
         uri: str,
@@ -606,8 +982,12 @@ class Document(object):
         self.version = version
         self.path = uris.to_fs_path(uri)  # Note: may be None.
 
+        # When changes are applied, the contents are kept in a LineBuffer and
+        # the source is only built when requested.
+        self.__buffer: Optional[LineBuffer] = None
         self._source = source
         self.__line_start_offsets = None
+        self._memory_usage_listener: Optional[Callable[[], None]] = None
 
         # Only set when the source is read from disk.
         self._source_mtime = -1
@@ -645,11 +1025,16 @@ class Document(object):
         return DocumentSelection(self, line, col)
 
     @property
-    def _source(self) -> str:
-        return self.__source
+    def _source(self) -> Optional[str]:
+        source = self.__source
+        if source is None:
+            buffer = self.__buffer
+            if buffer is not None:
+                source = self.__source = buffer.get_text()
+        return source
 
     @_source.setter
-    def _source(self, source: str) -> None:
+    def _source(self, source: Optional[str]) -> None:
         # i.e.: when the source is set, reset the lines.
         self._check_in_mutate_thread()
         if self.immutable:
@@ -657,18 +1042,97 @@ class Document(object):
                 "This document is immutable, so, its source cannot be changed."
             )
         self.__source = source
+        self.__buffer = None
         self._clear_caches()
 
+    def _get_buffer(self) -> LineBuffer:
+        self._check_in_mutate_thread()
+        buffer = self.__buffer
+        if buffer is None:
+            buffer = self.__buffer = LineBuffer(self.source)
+        return buffer
+
+    def _set_contents_from(self, doc: "Document") -> None:
+        """
+        Sets the contents of this document to be the same contents of the
+        given document (sharing its buffer if available -- the buffer is
+        copied, but as chunks are never mutated, that's cheap).
+        """
+        buffer = doc.__buffer
+        self._source = doc.__source
+        if buffer is not None:
+            self.__buffer = buffer.copy()
+
     def _clear_caches(self):
         self._check_in_mutate_thread()
         self.__lines = None
         self.__line_start_offsets = None
 
+    @implements(IDocument.release_derived_caches)
+    def release_derived_caches(self) -> None:
+        # Note: may be called from any thread (caches are only cleared, so,
+        # they're just recomputed if needed again).
+        self.__lines = None
+        self.__line_start_offsets = None
+
+    def _get_char_count(self) -> int:
+        source = self.__source
+        if source is not None:
+            return len(source)
+        buffer = self.__buffer
+        if buffer is not None:
+            return buffer.get_char_count()
+        return len(self.source)
+
+    @implements(IDocument.set_memory_usage_listener)
+    def set_memory_usage_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        self._memory_usage_listener = listener
+
+    def _notify_memory_usage_changed(self) -> None:
+        listener = self._memory_usage_listener
+        if listener is not None:
+            listener()
+
+    @implements(IDocument.get_memory_usage)
+    def get_memory_usage(self) -> Dict[str, int]:
+        source = self.__source
+        if source is not None:
+            source_size = sys.getsizeof(source)
+        else:
+            buffer = self.__buffer
+            if buffer is None:
+                source_size = 0
+            else:
+                # The buffer keeps the source split in lines.
+                source_size = buffer.get_char_count() + (
+                    _STR_OVERHEAD * buffer.get_line_count()
+                )
+
+        lines_size = 0
+        lines = self.__lines
+        if lines is not None:
+            lines_size = sys.getsizeof(lines) + _STR_OVERHEAD * len(lines)
+            if source is not None:
+                lines_size += len(source)
+
+        line_start_offsets = self.__line_start_offsets
+        if line_start_offsets is not None:
+            lines_size += sys.getsizeof(line_start_offsets) + (
+                _INT_SIZE * len(line_start_offsets)
+            )
+
+        return {"source": source_size, "lines": lines_size}
+
     @property
     def _lines(self):
         lines = self.__lines
         if lines is None:
-            lines = self.__lines = tuple(self.source.splitlines(True))
+            buffer = self.__buffer
+            if buffer is not None:
+                lines = self.__lines = tuple(buffer.iter_lines())
+            else:
+                lines = self.__lines = tuple(self.source.splitlines(True))
+            self._notify_memory_usage_changed()
         return lines
 
     def get_internal_lines(self):
@@ -696,13 +1160,18 @@ class Document(object):
                 line_start_offset_to_info.append(offset)
                 offset += len(line)
 
-        self.__line_start_offsets = line_start_offset_to_info
+            self.__line_start_offsets = line_start_offset_to_info
+            self._notify_memory_usage_changed()
         return line_start_offset_to_info
 
     def offset_to_line_col(self, offset: int) -> Tuple[int, int]:
         if offset < 0:
             raise ValueError("Expected offset to be >0. Found: %s" % (offset,))
 
+        buffer = self.__buffer
+        if buffer is not None and self.__line_start_offsets is None:
+            return buffer.offset_to_line_col(offset)
+
         import bisect
 
         line_start_offset_to_info = self._compute_line_start_offsets()
@@ -768,6 +1237,9 @@ class Document(object):
     @implements(IDocument.get_line)
     def get_line(self, line: int) -> str:
         try:
+            buffer = self.__buffer
+            if buffer is not None and self.__lines is None:
+                return buffer.get_line(line).rstrip("\r\n")
             return self._lines[line].rstrip("\r\n")
         except IndexError:
             return ""
@@ -801,6 +1273,9 @@ class Document(object):
         raise RuntimeError(f"Unable to find line with contents: {contents}.")
 
     def get_line_count(self) -> int:
+        buffer = self.__buffer
+        if buffer is not None and self.__lines is None:
+            return buffer.get_line_count()
         lines = self._lines
         return len(lines)
 
@@ -824,44 +1299,18 @@ class Document(object):
         end_line = change_range["end"]["line"]
         end_col = change_range["end"]["character"]
 
-        # Check for an edit occurring at the very end of the file
-        if start_line == len(self._lines):
-            self._source = self.source + text
-            return
+        if self.immutable:
+            raise RuntimeError(
+                "This document is immutable, so, its source cannot be changed."
+            )
 
-        new = io.StringIO()
-
-        # Note: we could probably improve this sometime to work better with big documents
-        # (but the link with the AST must be well thought out too).
-        # References:
-        # https://news.ycombinator.com/item?id=30415868
-        # https://news.ycombinator.com/item?id=15381886
-        # https://code.visualstudio.com/blogs/2018/03/23/text-buffer-reimplementation
-        # https://blog.jetbrains.com/fleet/2022/02/fleet-below-deck-part-ii-breaking-down-the-editor/
-        # https://raphlinus.github.io/xi/2020/06/27/xi-retrospective.html
-
-        # Iterate over the existing document until we hit the edit range,
-        # at which point we write the new text, then loop until we hit
-        # the end of the range and continue writing.
-        for i, line in enumerate(self._lines):
-            if i < start_line:
-                new.write(line)
-                continue
-
-            if i > end_line:
-                new.write(line)
-                continue
-
-            if i == start_line:
-                start_col = convert_utf16_code_unit_to_python(line, start_col)
-                new.write(line[:start_col])
-                new.write(text)
-
-            if i == end_line:
-                end_col = convert_utf16_code_unit_to_python(line, end_col)
-                new.write(line[end_col:])
-
-        self._source = new.getvalue()
+        # The change is applied to a buffer with the lines (only the affected
+        # lines are changed and the source is only built again when requested).
+        # See: line_buffer.py for details.
+        buffer = self._get_buffer()
+        buffer.replace(start_line, start_col, end_line, end_col, text, utf16_cols=True)
+        self.__source = None
+        self._clear_caches()
 
     def apply_text_edits(
         self, text_edits: Union[List[TextEditTypedDict], List[TextEdit]]
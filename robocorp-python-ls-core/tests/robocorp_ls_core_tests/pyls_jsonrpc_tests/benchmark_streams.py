@@ -0,0 +1,94 @@
+"""
+Benchmark for the throughput of the JSON-RPC reader/writer with each codec
+available (writes and then reads 10k completion responses).
+
+Usage:
+
+    python -m robocorp_ls_core_tests.pyls_jsonrpc_tests.benchmark_streams [n_messages]
+"""
+import sys
+import time
+
+
+def create_completion_response(msg_id, n_items=50):
+    items = []
+    for i in range(n_items):
+        items.append(
+            {
+                "label": f"My Keyword {i}",
+                "kind": 3,
+                "detail": "my_library",
+                "documentation": {
+                    "kind": "markdown",
+                    "value": f"Documentation for **My Keyword {i}**\n\nArguments: `arg1`, `arg2`",
+                },
+                "textEdit": {
+                    "range": {
+                        "start": {"line": 10, "character": 4},
+                        "end": {"line": 10, "character": 7},
+                    },
+                    "newText": f"My Keyword {i}    ${{arg1}}    ${{arg2}}",
+                },
+                "insertTextFormat": 2,
+                "data": {"uri": "file:///workspace/tests/my.robot", "index": i},
+            }
+        )
+    return {"jsonrpc": "2.0", "id": msg_id, "result": items}
+
+
+def run_benchmark(codec_name, n_messages):
+    from io import BytesIO
+    import tempfile
+
+    from robocorp_ls_core.jsonrpc import codec
+    from robocorp_ls_core.jsonrpc.streams import (
+        JsonRpcStreamReader,
+        JsonRpcStreamWriter,
+    )
+
+    codec._codec = codec.create_codec(codec_name)
+    name = codec._codec.name
+    try:
+        messages = [create_completion_response(i) for i in range(n_messages)]
+
+        with tempfile.TemporaryFile() as stream:
+            writer = JsonRpcStreamWriter(stream, sort_keys=True)
+            initial_time = time.time()
+            for msg in messages:
+                writer.write(msg)
+            write_time = time.time() - initial_time
+            total_bytes = stream.tell()
+            stream.seek(0)
+            contents = stream.read()
+        del messages
+
+        read_count = [0]
+
+        def on_message(msg):
+            read_count[0] += 1
+
+        reader = JsonRpcStreamReader(BytesIO(contents))
+        initial_time = time.time()
+        reader.listen(on_message)
+        read_time = time.time() - initial_time
+        assert read_count[0] == n_messages
+    finally:
+        codec._codec = None
+
+    mb = total_bytes / (1024 * 1024)
+    print(
+        f"{name:>6}: "
+        f"write: {write_time:.2f}s ({n_messages / write_time:.0f} msgs/s, {mb / write_time:.1f} MB/s) | "
+        f"read: {read_time:.2f}s ({n_messages / read_time:.0f} msgs/s, {mb / read_time:.1f} MB/s) | "
+        f"total: {mb:.1f} MB"
+    )
+
+
+def main():
+    n_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for codec_name in ("json", "orjson"):
+        run_benchmark(codec_name, n_messages)
+
+
+if __name__ == "__main__":
+    main()
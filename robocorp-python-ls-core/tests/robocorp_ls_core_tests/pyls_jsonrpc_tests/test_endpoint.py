@@ -460,3 +460,181 @@ def await_assertion(condition, timeout=3.0, interval=0.1):
                 raise e
         else:
             return
+
+
+def test_scheduler_interactive_not_starved():
+    import threading
+    from robocorp_ls_core.jsonrpc.scheduler import (
+        PriorityScheduler,
+        PRIORITY_BULK,
+        PRIORITY_BACKGROUND,
+        PRIORITY_INTERACTIVE,
+    )
+
+    scheduler = PriorityScheduler(max_workers=6)
+    try:
+        release = threading.Event()
+        started = []
+
+        def work(name):
+            started.append(name)
+            release.wait(5)
+            return name
+
+        # Only 4 workers may be used by background/bulk work (and 2 by bulk).
+        bulk_futures = [
+            scheduler.submit_with_priority(PRIORITY_BULK, None, work, f"bulk{i}")
+            for i in range(3)
+        ]
+        background_futures = [
+            scheduler.submit_with_priority(
+                PRIORITY_BACKGROUND, None, work, f"background{i}"
+            )
+            for i in range(3)
+        ]
+        interactive_future = scheduler.submit_with_priority(
+            PRIORITY_INTERACTIVE, None, lambda: "interactive"
+        )
+        assert interactive_future.result(timeout=3) == "interactive"
+
+        def check_started():
+            assert len(started) == 4
+
+        await_assertion(check_started)
+        # Background requests have a higher priority than bulk requests.
+        assert "background0" in started
+        metrics = scheduler.get_metrics()
+        assert metrics["bulk"]["running"] <= 2
+        assert metrics["bulk"]["running"] + metrics["background"]["running"] == 4
+        assert metrics["bulk"]["queued"] + metrics["background"]["queued"] == 2
+        assert metrics["interactive"]["started"] == 1
+
+        release.set()
+        for f in bulk_futures + background_futures:
+            f.result(timeout=3)
+
+        def check_finished():
+            # Note: the future is finished before the metrics are updated.
+            metrics = scheduler.get_metrics()
+            for name in ("interactive", "background", "bulk"):
+                assert metrics[name]["queued"] == 0
+                assert metrics[name]["running"] == 0
+            assert metrics["bulk"]["max_wait_time"] > 0
+
+        await_assertion(check_finished)
+    finally:
+        scheduler.shutdown()
+
+
+def test_scheduler_concurrent_bulk():
+    import threading
+    from robocorp_ls_core.jsonrpc.scheduler import (
+        PriorityScheduler,
+        PRIORITY_BULK,
+        get_method_priority,
+    )
+
+    # Waiting for some other work isn't bulk work.
+    assert get_method_priority("waitForFullTestCollection") != PRIORITY_BULK
+
+    for max_workers in (4, 6):
+        scheduler = PriorityScheduler(max_workers=max_workers)
+        try:
+            # i.e.: a bulk request which waits for another bulk request.
+            barrier = threading.Barrier(2, timeout=5)
+            bulk_futures = [
+                scheduler.submit_with_priority(PRIORITY_BULK, None, barrier.wait)
+                for _i in range(2)
+            ]
+            for f in bulk_futures:
+                f.result(timeout=5)
+        finally:
+            scheduler.shutdown()
+
+
+def test_scheduler_coalesce_and_drop_cancelled():
+    import threading
+    from robocorp_ls_core.jsonrpc.scheduler import PriorityScheduler, PRIORITY_BULK
+
+    scheduler = PriorityScheduler(max_workers=3)
+    try:
+        release = threading.Event()
+        blocker = scheduler.submit_with_priority(
+            PRIORITY_BULK, None, lambda: release.wait(5)
+        )
+
+        called = []
+        f1 = scheduler.submit_with_priority(
+            PRIORITY_BULK, ("lint", "uri"), called.append, 1
+        )
+        f2 = scheduler.submit_with_priority(
+            PRIORITY_BULK, ("lint", "uri"), called.append, 2
+        )
+        f3 = scheduler.submit_with_priority(PRIORITY_BULK, None, called.append, 3)
+        assert f1.cancelled()
+        assert f3.cancel()
+
+        release.set()
+        blocker.result(timeout=3)
+        f2.result(timeout=3)
+        assert called == [2]
+
+        def check_metrics():
+            metrics = scheduler.get_metrics()["bulk"]
+            assert metrics["coalesced"] == 1
+            assert metrics["dropped"] == 2
+            assert metrics["started"] == 2
+
+        await_assertion(check_metrics)
+    finally:
+        scheduler.shutdown()
+
+
+def test_consume_request_coalesced(endpoint, dispatcher, consumer):
+    import threading
+
+    release = threading.Event()
+
+    def blocking_handler():
+        release.wait(5)
+        return "blocked"
+
+    # Fill the workers available for background requests.
+    dispatcher["blockingMethod"] = mock.Mock(return_value=blocking_handler)
+    for i in range(15):
+        endpoint.consume(
+            {
+                "jsonrpc": "2.0",
+                "id": f"block{i}",
+                "method": "blockingMethod",
+                "params": {},
+            }
+        )
+
+    dispatcher["lint"] = lambda params: lambda: params["version"]
+    for version in range(3):
+        endpoint.consume(
+            {
+                "jsonrpc": "2.0",
+                "id": f"lint{version}",
+                "method": "lint",
+                "params": {"doc_uri": "uri", "version": version},
+            }
+        )
+    release.set()
+
+    def check_results():
+        calls = [c[0][0] for c in consumer.call_args_list]
+        lint_results = dict(
+            (c["id"], c.get("result", c.get("error", {}).get("code")))
+            for c in calls
+            if c["id"].startswith("lint")
+        )
+        cancelled_code = exceptions.JsonRpcRequestCancelled().code
+        assert lint_results == {
+            "lint0": cancelled_code,
+            "lint1": cancelled_code,
+            "lint2": 2,
+        }
+
+    await_assertion(check_results, timeout=5)
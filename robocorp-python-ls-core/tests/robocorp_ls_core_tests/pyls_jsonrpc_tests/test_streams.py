@@ -105,3 +105,85 @@ def test_writer_bad_message(wfile, writer):
     )
 
     assert wfile.getvalue() in (b"", (b"Content-Length: 10\r\n" b"\r\n" b"1546304461"))
+
+
+class _ChunkedStream(object):
+    """
+    Stream which provides the contents in small chunks (as a pipe would do).
+    """
+
+    def __init__(self, contents, chunk_size):
+        self._stream = BytesIO(contents)
+        self._chunk_size = chunk_size
+        self.closed = False
+
+    def read1(self, size):
+        return self._stream.read(min(size, self._chunk_size))
+
+    def readinto(self, buf):
+        data = self._stream.read(min(len(buf), self._chunk_size))
+        buf[: len(data)] = data
+        return len(data)
+
+
+def _create_message_bytes(msg):
+    import json
+
+    body = json.dumps(msg).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100000])
+def test_reader_multiple_messages(chunk_size):
+    messages = [
+        {"id": 1, "method": "method", "params": {"text": "ação 🦘"}},
+        {"id": 2, "method": "method", "params": {"data": "x" * 5000}},
+        {"id": 3, "method": "method", "params": {}},
+    ]
+    contents = b"".join(_create_message_bytes(msg) for msg in messages)
+
+    reader = JsonRpcStreamReader(_ChunkedStream(contents, chunk_size))
+    consumer = mock.Mock()
+    reader.listen(consumer)
+    assert [c[0][0] for c in consumer.call_args_list] == messages
+
+
+@pytest.mark.parametrize("codec_name", ["json", "orjson"])
+def test_codec(codec_name):
+    from robocorp_ls_core.jsonrpc.codec import create_codec
+    import json
+
+    codec = create_codec(codec_name)
+    msg = {"b": [1, 2.5, None, True], "a": "ação 🦘", "big": 2**70}
+    encoded = codec.dumps(msg, sort_keys=True)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == msg
+    assert codec.loads(encoded) == msg
+    assert codec.loads(codec.dumps({1: "int key"})) == {"1": "int key"}
+    assert codec.loads(memoryview(bytearray(encoded))) == codec.loads(encoded)
+
+    # Accepted by the standard library.
+    assert codec.loads(b'{"a": NaN}')["a"] != 0
+
+    import datetime
+
+    with pytest.raises(TypeError):
+        codec.dumps({"date": datetime.datetime.now()})
+
+
+def test_writer_big_message():
+    import tempfile
+
+    msg = {"id": 1, "result": ["item %s" % i for i in range(20000)]}
+    with tempfile.TemporaryFile() as stream:
+        writer = JsonRpcStreamWriter(stream, sort_keys=True)
+        assert writer.write(msg)
+        assert writer.write({"id": 2})
+        stream.seek(0)
+        contents = stream.read()
+
+    assert contents.startswith(b"Content-Length: ")
+    reader = JsonRpcStreamReader(BytesIO(contents))
+    consumer = mock.Mock()
+    reader.listen(consumer)
+    assert [c[0][0] for c in consumer.call_args_list] == [msg, {"id": 2}]
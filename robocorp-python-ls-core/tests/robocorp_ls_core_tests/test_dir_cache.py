@@ -28,3 +28,71 @@ def test_dir_cache(tmpdir):
 
     assert dir_cache.load(("some key", 10), list) == ["some", "val"]
     dir_cache.discard(("some key", 10))
+
+
+def test_compact_dir_cache(tmpdir):
+    from robocorp_ls_core.cache import CompactDirCache
+
+    dir_cache = CompactDirCache(str(tmpdir))
+    dir_cache.store("key", {"a": [1, 2, 3]})
+
+    assert dir_cache.load("key", dict) == {"a": [1, 2, 3]}
+    with pytest.raises(KeyError):
+        dir_cache.load("key", list)
+
+    with pytest.raises(KeyError):
+        dir_cache.load("key does not exist", dict)
+
+    filename = dir_cache._get_file_for_key("key")
+    assert os.path.exists(filename)
+
+    # No temporary files must be left behind.
+    assert os.listdir(str(tmpdir)) == [os.path.basename(filename)]
+
+    with open(filename, "w") as stream:
+        stream.write("corrupted file")
+    with pytest.raises(KeyError):
+        assert dir_cache.load("key", dict)
+
+    dir_cache.store("key", [1])
+    assert dir_cache.load("key", list) == [1]
+    dir_cache.discard("key")
+    with pytest.raises(KeyError):
+        dir_cache.load("key", list)
+
+
+def test_compact_dir_cache_prune(tmpdir):
+    import time
+    from robocorp_ls_core.cache import CompactDirCache
+
+    dir_cache = CompactDirCache(str(tmpdir))
+    now = time.time()
+    for i in range(10):
+        dir_cache.store(("key", i), {"contents": "x" * 100})
+        # Entries stored from oldest (0) to newest (9).
+        filename = dir_cache._get_file_for_key(("key", i))
+        os.utime(filename, (now - 100 + i, now - 100 + i))
+
+    # A temporary file left behind by a process which died.
+    tmp_filename = os.path.join(str(tmpdir), "some.tmp")
+    with open(tmp_filename, "w") as stream:
+        stream.write("tmp")
+    os.utime(tmp_filename, (now - 200, now - 200))
+
+    # Nothing to prune.
+    assert dir_cache.prune(max_size=1000000, max_age=1000) == 0
+
+    # Older than the max age.
+    assert dir_cache.prune(max_size=1000000, max_age=95.5) == 6
+    assert not os.path.exists(tmp_filename)
+    for i in range(5):
+        with pytest.raises(KeyError):
+            dir_cache.load(("key", i), dict)
+
+    # Over the max size: the oldest are removed first.
+    entry_size = os.path.getsize(dir_cache._get_file_for_key(("key", 9)))
+    assert dir_cache.prune(max_size=entry_size * 2, max_age=1000) == 3
+    assert sorted(os.listdir(str(tmpdir))) == sorted(
+        os.path.basename(dir_cache._get_file_for_key(("key", i))) for i in (8, 9)
+    )
+    assert dir_cache.load(("key", 9), dict) == {"contents": "x" * 100}
@@ -0,0 +1,205 @@
+import random
+
+import pytest
+
+
+def _apply_change_full_rebuild(source, start_line, start_col, end_line, end_col, text):
+    """
+    The previous approach (rebuilding the whole source) used as a reference.
+    """
+    import io
+    from robocorp_ls_core.code_units import convert_utf16_code_unit_to_python
+
+    lines = source.splitlines(True)
+    if start_line == len(lines):
+        return source + text
+
+    new = io.StringIO()
+    for i, line in enumerate(lines):
+        if i < start_line:
+            new.write(line)
+            continue
+
+        if i > end_line:
+            new.write(line)
+            continue
+
+        if i == start_line:
+            new.write(line[: convert_utf16_code_unit_to_python(line, start_col)])
+            new.write(text)
+
+        if i == end_line:
+            new.write(line[convert_utf16_code_unit_to_python(line, end_col) :])
+    return new.getvalue()
+
+
+def _check_offsets(doc, source):
+    from robocorp_ls_core.workspace import Document
+
+    expected_doc = Document(doc.uri, source)
+    for offset in range(len(source) + 2):
+        assert doc.offset_to_line_col(offset) == expected_doc.offset_to_line_col(
+            offset
+        ), f"Offset: {offset}, source: {source!r}"
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_line_buffer_differential(seed):
+    from robocorp_ls_core.workspace import Document
+    from robocorp_ls_core import line_buffer
+
+    rnd = random.Random(seed)
+    texts = ["a", "\n", "\r", "\r\n", "b\nc", " ", "ção", "\U0001F600", ""]
+    source = "".join(rnd.choice(texts) for _ in range(200))
+
+    # Use small chunks so that splits/merges of chunks are exercised.
+    original_max_chunk_lines = line_buffer._MAX_CHUNK_LINES
+    original_min_chunk_lines = line_buffer._MIN_CHUNK_LINES
+    line_buffer._MAX_CHUNK_LINES = 4
+    line_buffer._MIN_CHUNK_LINES = 1
+    try:
+        doc = Document("file:///uri", source)
+        for i in range(500):
+            lines = source.splitlines(True)
+            start_line = rnd.randint(0, len(lines))
+            end_line = rnd.randint(start_line, min(start_line + 3, len(lines)))
+            start_col = rnd.randint(0, 4)
+            end_col = rnd.randint(0, 4)
+            if start_line == end_line:
+                end_col = max(start_col, end_col)
+            text = "".join(rnd.choice(texts) for _ in range(rnd.randint(0, 3)))
+
+            source = _apply_change_full_rebuild(
+                source, start_line, start_col, end_line, end_col, text
+            )
+            doc.apply_change(
+                {
+                    "range": {
+                        "start": {"line": start_line, "character": start_col},
+                        "end": {"line": end_line, "character": end_col},
+                    },
+                    "text": text,
+                }
+            )
+
+            if i % 50 == 0:
+                _check_offsets(doc, source)
+
+            line_count = len(source.splitlines())
+            assert doc.get_line_count() == line_count
+            for line in range(line_count + 1):
+                assert doc.get_line(line) == Document("", source).get_line(line)
+
+            if i % 3 == 0:
+                # Sometimes request the source (which builds it again).
+                assert doc.source == source
+                assert doc.get_internal_lines() == tuple(source.splitlines(True))
+    finally:
+        line_buffer._MAX_CHUNK_LINES = original_max_chunk_lines
+        line_buffer._MIN_CHUNK_LINES = original_min_chunk_lines
+
+    assert doc.source == source
+
+
+def test_line_buffer_copy_is_independent():
+    from robocorp_ls_core.line_buffer import LineBuffer
+
+    buffer = LineBuffer("a\nb\nc\n" * 1000)
+    copy = buffer.copy()
+    copy.replace(1501, 0, 1501, 1, "changed")
+    assert buffer.get_line(1501) == "b\n"
+    assert copy.get_line(1501) == "changed\n"
+    assert buffer.get_line_count() == copy.get_line_count() == 3000
+    assert copy.get_text().count("changed") == 1
+    assert buffer.get_text().count("changed") == 0
+
+
+def test_workspace_update_document_shares_buffer(tmpdir):
+    from robocorp_ls_core.workspace import Workspace
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robocorp_ls_core.watchdog_wrapper import create_observer
+    from robocorp_ls_core import uris
+
+    root_uri = uris.from_fs_path(str(tmpdir))
+    ws = Workspace(
+        root_uri,
+        fs_observer=create_observer("dummy", ()),
+        workspace_folders=[],
+        track_file_extensions=(".txt",),
+    )
+    uri = uris.from_fs_path(str(tmpdir.join("doc.txt")))
+    ws.put_document(TextDocumentItem(uri, text="line\n" * 100))
+
+    doc = ws.get_document(uri, accept_from_file=False)
+    for i in range(10):
+        doc = ws.update_document(
+            TextDocumentItem(uri, version=i),
+            {
+                "range": {
+                    "start": {"line": i, "character": 0},
+                    "end": {"line": i, "character": 4},
+                },
+                "text": f"changed {i}",
+            },
+        )
+    assert doc.get_line(9) == "changed 9"
+    assert doc.get_line(10) == "line"
+    assert doc.source.count("changed") == 10
+    ws.dispose()
+
+
+def test_line_buffer_benchmark():
+    """
+    Applies 10k small edits on a 20k lines document (the time is printed,
+    run with `-s` to see it).
+    """
+    import time
+    from robocorp_ls_core.workspace import Document
+
+    source = "".join(f"    Log    Some line {i}\n" for i in range(20000))
+    rnd = random.Random(0)
+    changes = []
+    for _i in range(10000):
+        line = rnd.randint(0, 19999)
+        col = rnd.randint(0, 10)
+        changes.append(
+            {
+                "range": {
+                    "start": {"line": line, "character": col},
+                    "end": {"line": line, "character": col},
+                },
+                "text": rnd.choice(("x", "\n", "")),
+            }
+        )
+
+    doc = Document("file:///uri", source)
+    initial_time = time.perf_counter()
+    for change in changes:
+        doc.apply_change(change)
+        doc.get_line(0)
+        doc.offset_to_line_col(100)
+    elapsed = time.perf_counter() - initial_time
+    final_source = doc.source
+
+    # Compare with the previous approach (only a sample of the edits as it's
+    # much slower).
+    sample = 500
+    reference = source
+    initial_time = time.perf_counter()
+    for change in changes[:sample]:
+        r = change["range"]
+        reference = _apply_change_full_rebuild(
+            reference,
+            r["start"]["line"],
+            r["start"]["character"],
+            r["end"]["line"],
+            r["end"]["character"],
+            change["text"],
+        )
+    reference_elapsed = (time.perf_counter() - initial_time) * (len(changes) / sample)
+
+    print(
+        f"Line buffer: {elapsed:.3f}s, full rebuild (estimated): {reference_elapsed:.3f}s"
+    )
+    assert len(final_source.splitlines()) >= 20000
+    assert elapsed < reference_elapsed
@@ -78,3 +78,21 @@ def test_lru_unitary_size():
     with pytest.raises(KeyError):
         cache.pop(4)
     assert cache.pop(4, "foo") == "foo"
+
+
+def test_size_estimator():
+    from robocorp_ls_core.cache import SizeEstimator
+    from robocorp_ls_core.cache import get_deep_size
+
+    obj = [str(i) * 10 for i in range(100)]
+    deep_size = get_deep_size(obj)
+    assert deep_size > sum(len(s) for s in obj)
+
+    estimator = SizeEstimator(initial_bytes_per_unit=1, sample_first=2)
+    # The first ones are measured and used to calibrate the cost per unit.
+    assert estimator.estimate(obj, 100) == deep_size
+    assert estimator.estimate(obj, 100) == deep_size
+    assert estimator.bytes_per_unit == deep_size / 100
+
+    # The next ones are estimated.
+    assert estimator.estimate(None, 200) == int(deep_size * 2)
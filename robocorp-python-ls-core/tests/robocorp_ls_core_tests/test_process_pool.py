@@ -0,0 +1,78 @@
+import pytest
+
+
+def test_process_pool_workers_count(monkeypatch):
+    from robocorp_ls_core import process_pool
+
+    monkeypatch.setenv("TEST_PROCESS_POOL_WORKERS", "3")
+    assert process_pool.get_default_max_workers("TEST_PROCESS_POOL_WORKERS") == 3
+
+    monkeypatch.setenv("TEST_PROCESS_POOL_WORKERS", "invalid")
+    assert process_pool.get_default_max_workers("TEST_PROCESS_POOL_WORKERS") >= 1
+
+    assert process_pool.compute_workers_count(9, 10, 4) == 0
+    assert process_pool.compute_workers_count(25, 10, 4) == 2
+    assert process_pool.compute_workers_count(1000, 10, 4) == 4
+
+
+def test_process_pool_iter_completed_cancelled():
+    from concurrent.futures import ThreadPoolExecutor
+    from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+    from robocorp_ls_core.process_pool import iter_completed
+    import threading
+
+    event = threading.Event()
+    monitor = Monitor()
+    executor = ThreadPoolExecutor(1)
+    try:
+        futures = [executor.submit(lambda: 1)] + [
+            executor.submit(event.wait) for _i in range(3)
+        ]
+
+        found = []
+        with pytest.raises(JsonRpcRequestCancelled):
+            for future in iter_completed(futures, monitor):
+                found.append(future.result())
+                monitor.cancel()
+
+        assert found == [1]
+        # The ones still not started are cancelled.
+        assert [f.cancelled() for f in futures[2:]] == [True, True]
+    finally:
+        event.set()
+        executor.shutdown(wait=True)
+
+
+def _get_pid_and_initialized():
+    import os
+
+    return os.getpid(), _initialized
+
+
+_initialized = None
+
+
+def _initialize(value):
+    global _initialized
+    _initialized = value
+
+
+def test_process_pool_executor():
+    from robocorp_ls_core.process_pool import (
+        create_process_pool_executor,
+        iter_completed,
+    )
+    import os
+
+    executor = create_process_pool_executor(
+        1, "test-worker", initializer=_initialize, initargs=("initialized",)
+    )
+    try:
+        futures = [executor.submit(_get_pid_and_initialized) for _i in range(2)]
+        results = [future.result() for future in iter_completed(futures)]
+        for pid, initialized in results:
+            assert pid != os.getpid()
+            assert initialized == "initialized"
+    finally:
+        executor.shutdown(wait=True)
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def robocop_cache():
+    from robocorp_ls_core import robocop_wrapper
+
+    robocop_wrapper.clear_robocop_runners_cache()
+    yield robocop_wrapper._runners_cache
+    robocop_wrapper.clear_robocop_runners_cache()
+
+
+_CONTENTS = """
+*** Test Cases ***
+Test
+    Fail
+"""
+
+
+def _collect(project_root, filename, source=_CONTENTS):
+    from robot.api import get_model
+    from robocorp_ls_core.robocop_wrapper import collect_robocop_diagnostics
+
+    ast_model = get_model(source, data_only=False, curdir=os.path.dirname(filename))
+    return collect_robocop_diagnostics(project_root, ast_model, filename, source)
+
+
+def _rule_name(diagnostic):
+    return diagnostic["codeDescription"]["href"].split("#")[-1]
+
+
+def _rule_names(diagnostics):
+    return set(_rule_name(d) for d in diagnostics)
+
+
+def test_robocop_runners_cache(tmpdir, robocop_cache):
+    project_root = tmpdir.join("project")
+    src = project_root.join("src")
+    src.ensure(dir=True)
+    project_root.join(".git").ensure(dir=True)
+    filename = str(src.join("target.robot"))
+
+    diagnostics = _collect(str(project_root), filename)
+    assert "missing-doc-test-case" in _rule_names(diagnostics)
+    assert len(robocop_cache._cache) == 1
+    (runner,) = robocop_cache._cache.values()
+
+    # Same config: runner reused (also for files in other dirs).
+    _collect(str(project_root), filename)
+    _collect(str(project_root), str(project_root.join("another.robot")))
+    assert list(robocop_cache._cache.values()) == [runner]
+
+    # New config file: runner recreated.
+    config_file = project_root.join(".robocop")
+    config_file.write_text("--exclude missing-doc-test-case\n", encoding="utf-8")
+    diagnostics = _collect(str(project_root), filename)
+    assert "missing-doc-test-case" not in _rule_names(diagnostics)
+
+    # Config file changed: runner recreated.
+    config_file.write_text("--include missing-doc-suite\n", encoding="utf-8")
+    os.utime(str(config_file), (1, 1))
+    diagnostics = _collect(str(project_root), filename)
+    assert _rule_names(diagnostics) == {"missing-doc-suite"}
+
+
+def test_robocop_ext_rules_relative_to_project_root(tmpdir, robocop_cache):
+    project_root = tmpdir.join("project")
+    project_root.join(".git").ensure(dir=True)
+    rules_dir = project_root.join("rules")
+    rules_dir.ensure(dir=True)
+    rule_file = rules_dir.join("custom_rule.py")
+
+    def write_rule(msg):
+        rule_file.write_text(
+            f"""
+from robocop.checkers import VisitorChecker
+from robocop.rules import Rule, RuleSeverity
+
+rules = {{
+    "9901": Rule(
+        rule_id="9901",
+        name="custom-rule",
+        msg="{msg}",
+        severity=RuleSeverity.WARNING,
+    ),
+}}
+
+
+class CustomChecker(VisitorChecker):
+    reports = ("custom-rule",)
+
+    def visit_TestCaseName(self, node):
+        self.report("custom-rule", node=node)
+""",
+            encoding="utf-8",
+        )
+
+    write_rule("Custom message")
+    # The --ext-rules path in the config is relative to the project root
+    # (not to the config file).
+    config_dir = project_root.join("config")
+    config_dir.ensure(dir=True)
+    config_dir.join(".robocop").write_text(
+        "--ext-rules rules/custom_rule.py\n", encoding="utf-8"
+    )
+
+    initial_cwd = os.getcwd()
+    filename = str(config_dir.join("target.robot"))
+    diagnostics = _collect(str(project_root), filename)
+    assert os.getcwd() == initial_cwd
+
+    messages = [d["message"] for d in diagnostics if _rule_name(d) == "custom-rule"]
+    assert messages == ["Custom message"]
+
+    # Changing the rule recreates the runner.
+    write_rule("Changed message")
+    os.utime(str(rule_file), (1, 1))
+    diagnostics = _collect(str(project_root), filename)
+    messages = [d["message"] for d in diagnostics if _rule_name(d) == "custom-rule"]
+    assert messages == ["Changed message"]
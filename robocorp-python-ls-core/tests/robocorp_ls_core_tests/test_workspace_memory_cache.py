@@ -90,6 +90,7 @@ def test_workspace_memory_cache(tmpdir, small_vs_sleep):
         lambda: list(ws.iter_all_doc_uris_in_workspace((".py", ".txt"))) == []
     )
     # If the change is too fast the mtime may end up being the same...
+    files_version = ws.get_files_version()
 
     f = tmpdir.join("my.txt")
     f.write_text("foo", "utf-8")
@@ -98,6 +99,13 @@ def test_workspace_memory_cache(tmpdir, small_vs_sleep):
         lambda: list(ws.iter_all_doc_uris_in_workspace((".py", ".txt")))
         == [uris.from_fs_path(str(f))]
     )
+    assert ws.get_files_version() != files_version
+
+    # Changing the contents of a file doesn't change the files version.
+    files_version = ws.get_files_version()
+    f.write_text("bar", "utf-8")
+    ws.wait_for_check_done(5)
+    assert ws.get_files_version() == files_version
 
     dir1 = tmpdir.join("dir1")
     dir1.mkdir()
@@ -128,7 +136,194 @@ def test_workspace_memory_cache(tmpdir, small_vs_sleep):
         == {uris.from_fs_path(str(f))}
     )
 
+    assert ws.get_files_version() != files_version
+
     ws.remove_folder(root_uri)
     assert set(ws.iter_all_doc_uris_in_workspace((".py", ".txt"))) == set()
+    assert ws.get_files_version() == ()
     vs._virtual_fsthread.join(0.5)
     assert not vs._virtual_fsthread.is_alive()
+
+
+def test_workspace_filesystem_docs_freshness(tmpdir, small_vs_sleep):
+    from robocorp_ls_core.workspace import Workspace
+    from robocorp_ls_core.workspace import Document
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import WorkspaceFolder
+    from robocorp_ls_core import watchdog_wrapper
+    from robocorp_ls_core.basic import wait_for_condition
+    import os
+
+    root_uri = uris.from_fs_path(str(tmpdir))
+    fs_observer = watchdog_wrapper.create_observer(
+        "watchdog", extensions=(".py", ".txt")
+    )
+    ws = Workspace(
+        root_uri,
+        fs_observer,
+        [WorkspaceFolder(root_uri, os.path.basename(str(tmpdir)))],
+        track_file_extensions=(".py", ".txt"),
+    )
+    ws.wait_for_check_done(5)
+
+    f = tmpdir.join("my.txt")
+    f.write_text("foo", "utf-8")
+    doc_uri = uris.from_fs_path(str(f))
+    not_watched = tmpdir.join("not_watched.other")
+    not_watched.write_text("foo", "utf-8")
+    not_watched_uri = uris.from_fs_path(str(not_watched))
+
+    checked = []
+    original_is_source_in_sync = Document.is_source_in_sync
+
+    def is_source_in_sync(doc):
+        checked.append(doc.uri)
+        return original_is_source_in_sync(doc)
+
+    Document.is_source_in_sync = is_source_in_sync
+    try:
+        doc = ws.get_document(doc_uri, accept_from_file=True)
+        assert doc.source == "foo"
+
+        # Changes are notified: the mtime isn't checked on each access.
+        for _i in range(10):
+            assert ws.get_document(doc_uri, accept_from_file=True) is doc
+        assert checked == []
+
+        # Not tracked by the observer: checked on each access.
+        for _i in range(3):
+            assert ws.get_document(not_watched_uri, accept_from_file=True)
+        assert len(checked) == 2
+
+        f.write_text("bar", "utf-8")
+        wait_for_condition(
+            lambda: ws.get_document(doc_uri, accept_from_file=True).source == "bar"
+        )
+
+        # Simulate a notification which was lost: the safety revalidation
+        # still picks up the change.
+        ws.on_file_changed.unregister(ws._on_file_changed)
+        f.write_text("baz", "utf-8")
+        os.utime(str(f), (1, 1))
+        assert ws.get_document(doc_uri, accept_from_file=True).source == "bar"
+        ws.WATCHED_DOCS_REVALIDATION_TIMEOUT = 0
+        assert ws.get_document(doc_uri, accept_from_file=True).source == "baz"
+
+        f.remove()
+        assert ws.get_document(doc_uri, accept_from_file=True) is None
+    finally:
+        Document.is_source_in_sync = original_is_source_in_sync
+        ws.dispose()
+        fs_observer.dispose()
+
+
+class _DocWithCaches(object):
+    def __init__(self, source_size, caches_size):
+        self.source_size = source_size
+        self.caches_size = caches_size
+        self.memory_usage_calls = 0
+        self._listener = None
+
+    def get_memory_usage(self):
+        self.memory_usage_calls += 1
+        return {"source": self.source_size, "ast": self.caches_size}
+
+    def set_caches_size(self, caches_size):
+        self.caches_size = caches_size
+        if self._listener is not None:
+            self._listener()
+
+    def release_derived_caches(self):
+        self.set_caches_size(0)
+
+    def set_memory_usage_listener(self, listener):
+        self._listener = listener
+
+
+def test_filesystem_docs_cache_tiered_eviction():
+    from robocorp_ls_core.workspace import _FilesystemDocsCache
+
+    cache = _FilesystemDocsCache(1000)
+    docs = {}
+    for i in range(4):
+        key = f"doc{i}"
+        docs[key] = _DocWithCaches(100, 0)
+        cache.put(key, docs[key], False, cache.invalidation_count)
+        cache.get(key).last_access = i
+    assert cache.current_size_usage == 400
+
+    # The AST is computed after the doc is added (the size is updated when
+    # needed).
+    for doc in docs.values():
+        doc.set_caches_size(150)
+    stats = cache.get_memory_stats()
+    assert stats["current_size"] == 1000
+    assert stats["usage"] == {"source": 400, "ast": 600}
+
+    # Over the limit: the caches of the least recently used are released
+    # (until it's 70% of the max size) but the docs are kept.
+    docs["doc4"] = _DocWithCaches(100, 0)
+    cache.put("doc4", docs["doc4"], False, cache.invalidation_count)
+    stats = cache.get_memory_stats()
+    assert stats["documents"] == 5
+    assert stats["released_count"] == 3
+    assert stats["evicted_count"] == 0
+    assert stats["current_size"] == 650
+    assert [docs[f"doc{i}"].caches_size for i in range(5)] == [0, 0, 0, 150, 0]
+
+    # When releasing caches isn't enough, the docs are evicted.
+    cache.set_max_size(400)
+    stats = cache.get_memory_stats()
+    assert stats["evicted_count"] == 3
+    assert stats["current_size"] == 200
+    assert sorted(cache._entries) == ["doc3", "doc4"]
+    assert docs["doc3"].caches_size == 0
+
+
+def test_filesystem_docs_cache_concurrent_load():
+    from robocorp_ls_core.workspace import _FilesystemDocsCache
+
+    cache = _FilesystemDocsCache(1000)
+
+    # 2 threads started loading the same doc at the same time: the first one
+    # added is used by both.
+    invalidation_count = cache.invalidation_count
+    doc1 = _DocWithCaches(100, 0)
+    doc2 = _DocWithCaches(100, 0)
+    assert cache.put("doc", doc1, True, invalidation_count) is doc1
+    assert cache.put("doc", doc2, True, invalidation_count) is doc1
+    assert len(cache) == 1
+    assert cache.current_size_usage == 100
+    assert cache.get("doc").last_validation != 0
+
+    # If something changed while loading, the entry kept must be validated
+    # in the next access.
+    cache.pop("other")
+    assert cache.put("doc", doc2, True, invalidation_count) is doc1
+    assert cache.get("doc").last_validation == 0
+
+
+def test_filesystem_docs_cache_running_totals():
+    from robocorp_ls_core.workspace import _FilesystemDocsCache
+
+    cache = _FilesystemDocsCache(100000)
+    docs = [_DocWithCaches(100, 0) for _i in range(50)]
+    for i, doc in enumerate(docs):
+        cache.put(f"doc{i}", doc, False, cache.invalidation_count)
+    assert cache.current_size_usage == 5000
+
+    # Adding entries doesn't measure the documents already in the cache
+    # again (only the ones which notified that their size changed).
+    assert [doc.memory_usage_calls for doc in docs] == [1] * 50
+
+    docs[10].set_caches_size(150)
+    cache.put("new", _DocWithCaches(100, 0), False, cache.invalidation_count)
+    assert cache.current_size_usage == 5250
+    assert docs[10].memory_usage_calls == 2
+    assert sum(doc.memory_usage_calls for doc in docs) == 51
+
+    # Notifications from documents no longer in the cache are ignored.
+    cache.pop("doc10")
+    docs[10].set_caches_size(300)
+    assert cache.get_memory_stats()["current_size"] == 5000
+    assert docs[10].memory_usage_calls == 2
@@ -53,6 +53,7 @@ class RobotProjectState {
     public String robotCompletionsKeywordsPrefixImportNameIgnore = "";
     public String robotCompletionsKeywordsArgumentsSeparator = "";
     public String robotWorkspaceSymbolsOnlyForOpenDocs = "";
+    public String robotWorkspaceFilesMemoryBudgetMb = "";
     public String robotQuickFixKeywordTemplate = "";
     public String robotLanguage = "";
     public String robotTimeoutUse = "";
@@ -104,6 +105,7 @@ public class RobotProjectPreferences implements PersistentStateComponent<RobotSt
     public static final String ROBOT_COMPLETIONS_KEYWORDS_PREFIX_IMPORT_NAME_IGNORE = "robot.completions.keywords.prefixImportNameIgnore";
     public static final String ROBOT_COMPLETIONS_KEYWORDS_ARGUMENTS_SEPARATOR = "robot.completions.keywords.argumentsSeparator";
     public static final String ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS = "robot.workspaceSymbolsOnlyForOpenDocs";
+    public static final String ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB = "robot.workspace.filesMemoryBudgetMB";
     public static final String ROBOT_QUICK_FIX_KEYWORD_TEMPLATE = "robot.quickFix.keywordTemplate";
     public static final String ROBOT_LANGUAGE = "robot.language";
     public static final String ROBOT_TIMEOUT_USE = "robot.timeout.use";
@@ -157,6 +159,7 @@ public class RobotProjectPreferences implements PersistentStateComponent<RobotSt
         robotState.robotCompletionsKeywordsPrefixImportNameIgnore = getRobotCompletionsKeywordsPrefixImportNameIgnore();
         robotState.robotCompletionsKeywordsArgumentsSeparator = getRobotCompletionsKeywordsArgumentsSeparator();
         robotState.robotWorkspaceSymbolsOnlyForOpenDocs = getRobotWorkspaceSymbolsOnlyForOpenDocs();
+        robotState.robotWorkspaceFilesMemoryBudgetMb = getRobotWorkspaceFilesMemoryBudgetMb();
         robotState.robotQuickFixKeywordTemplate = getRobotQuickFixKeywordTemplate();
         robotState.robotLanguage = getRobotLanguage();
         robotState.robotTimeoutUse = getRobotTimeoutUse();
@@ -208,6 +211,7 @@ public class RobotProjectPreferences implements PersistentStateComponent<RobotSt
         setRobotCompletionsKeywordsPrefixImportNameIgnore(robotState.robotCompletionsKeywordsPrefixImportNameIgnore);
         setRobotCompletionsKeywordsArgumentsSeparator(robotState.robotCompletionsKeywordsArgumentsSeparator);
         setRobotWorkspaceSymbolsOnlyForOpenDocs(robotState.robotWorkspaceSymbolsOnlyForOpenDocs);
+        setRobotWorkspaceFilesMemoryBudgetMb(robotState.robotWorkspaceFilesMemoryBudgetMb);
         setRobotQuickFixKeywordTemplate(robotState.robotQuickFixKeywordTemplate);
         setRobotLanguage(robotState.robotLanguage);
         setRobotTimeoutUse(robotState.robotTimeoutUse);
@@ -538,6 +542,15 @@ public class RobotProjectPreferences implements PersistentStateComponent<RobotSt
             }
         }
         
+        if(!robotWorkspaceFilesMemoryBudgetMb.isEmpty()){
+            
+            try {
+                jsonObject.add(ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB, new JsonPrimitive(Integer.parseInt(robotWorkspaceFilesMemoryBudgetMb)));
+            } catch(Exception e) {
+                LOG.error(e);
+            }
+        }
+        
         if(!robotQuickFixKeywordTemplate.isEmpty()){
             
             try {
@@ -2301,6 +2314,53 @@ public class RobotProjectPreferences implements PersistentStateComponent<RobotSt
         }
     }
     
+    private String robotWorkspaceFilesMemoryBudgetMb = "";
+
+    public @NotNull String getRobotWorkspaceFilesMemoryBudgetMb() {
+        return robotWorkspaceFilesMemoryBudgetMb;
+    }
+
+    public @Nullable JsonPrimitive getRobotWorkspaceFilesMemoryBudgetMbAsJson() {
+        if(robotWorkspaceFilesMemoryBudgetMb.isEmpty()){
+            return null;
+        }
+        
+        return new JsonPrimitive(Integer.parseInt(robotWorkspaceFilesMemoryBudgetMb));
+    }
+
+    public @NotNull String validateRobotWorkspaceFilesMemoryBudgetMb(String robotWorkspaceFilesMemoryBudgetMb) {
+        if(robotWorkspaceFilesMemoryBudgetMb.isEmpty()) {
+            return "";
+        }
+        try {
+            
+            new JsonPrimitive(Integer.parseInt(robotWorkspaceFilesMemoryBudgetMb));
+            
+            return "";
+            
+        } catch(Exception e) {
+            return e.toString();
+        }
+    }
+
+    public void setRobotWorkspaceFilesMemoryBudgetMb(String s) {
+        if (s == null) {
+            s = "";
+        }
+        if (s.equals(robotWorkspaceFilesMemoryBudgetMb)) {
+            return;
+        }
+        String old = robotWorkspaceFilesMemoryBudgetMb;
+        robotWorkspaceFilesMemoryBudgetMb = s;
+        for (LanguageServerDefinition.IPreferencesListener listener : listeners) {
+            try {
+                listener.onChanged(ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB, old, s);
+            } catch (CancelledException e) {
+                // just ignore at this point
+            }
+        }
+    }
+    
     private String robotQuickFixKeywordTemplate = "";
 
     public @NotNull String getRobotQuickFixKeywordTemplate() {
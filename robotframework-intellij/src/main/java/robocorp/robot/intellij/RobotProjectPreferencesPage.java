@@ -55,6 +55,7 @@ class RobotProjectPreferencesComponent {
     private final JBTextField robotCompletionsKeywordsPrefixImportNameIgnore = new JBTextField();
     private final JBTextField robotCompletionsKeywordsArgumentsSeparator = new JBTextField();
     private final JBTextField robotWorkspaceSymbolsOnlyForOpenDocs = new JBTextField();
+    private final JBTextField robotWorkspaceFilesMemoryBudgetMb = new JBTextField();
     private final JBTextField robotQuickFixKeywordTemplate = new JBTextField();
     private final JBTextField robotLanguage = new JBTextField();
     private final JBTextField robotTimeoutUse = new JBTextField();
@@ -137,6 +138,8 @@ class RobotProjectPreferencesComponent {
                 .addComponent(createJTextArea("Defines the string used to separate arguments when applying a Keyword completion with arguments.\n"))
                 .addLabeledComponent(new JBLabel("Workspace Symbols Only For Open Docs"), robotWorkspaceSymbolsOnlyForOpenDocs, 1, false)
                 .addComponent(createJTextArea("Collecting workspace symbols can be resource intensive on big projects and may slow down code-\ncompletion, in this case, it's possible collect info only for open files on big projects.\nNote: expected 'true' or 'false'\n"))
+                .addLabeledComponent(new JBLabel("Workspace Files Memory Budget Mb"), robotWorkspaceFilesMemoryBudgetMb, 1, false)
+                .addComponent(createJTextArea("The memory\n(in MB) which may be used to cache the files loaded from the disk\n(when it's reached the ASTs of the least recently used files are released first and then the files).\nSet to 0 to use the default\n(1000 MB or the value in the RFLS_FILES_TARGET_MEMORY_IN_BYTES environment variable).\n"))
                 .addLabeledComponent(new JBLabel("Quick Fix Keyword Template"), robotQuickFixKeywordTemplate, 1, false)
                 .addComponent(createJTextArea("The template to be used for keyword creation in quick fixes.\n"))
                 .addLabeledComponent(new JBLabel("Language"), robotLanguage, 1, false)
@@ -494,6 +497,15 @@ class RobotProjectPreferencesComponent {
         robotWorkspaceSymbolsOnlyForOpenDocs.setText(newText);
     }
     
+    @NotNull
+    public String getRobotWorkspaceFilesMemoryBudgetMb() {
+        return robotWorkspaceFilesMemoryBudgetMb.getText();
+    }
+
+    public void setRobotWorkspaceFilesMemoryBudgetMb (@NotNull String newText) {
+        robotWorkspaceFilesMemoryBudgetMb.setText(newText);
+    }
+    
     @NotNull
     public String getRobotQuickFixKeywordTemplate() {
         return robotQuickFixKeywordTemplate.getText();
@@ -757,6 +769,10 @@ public class RobotProjectPreferencesPage implements Configurable {
             return true;
         }
         
+        if(!settings.getRobotWorkspaceFilesMemoryBudgetMb().equals(component.getRobotWorkspaceFilesMemoryBudgetMb())){
+            return true;
+        }
+        
         if(!settings.getRobotQuickFixKeywordTemplate().equals(component.getRobotQuickFixKeywordTemplate())){
             return true;
         }
@@ -840,6 +856,7 @@ public class RobotProjectPreferencesPage implements Configurable {
         component.setRobotCompletionsKeywordsPrefixImportNameIgnore(settings.getRobotCompletionsKeywordsPrefixImportNameIgnore());
         component.setRobotCompletionsKeywordsArgumentsSeparator(settings.getRobotCompletionsKeywordsArgumentsSeparator());
         component.setRobotWorkspaceSymbolsOnlyForOpenDocs(settings.getRobotWorkspaceSymbolsOnlyForOpenDocs());
+        component.setRobotWorkspaceFilesMemoryBudgetMb(settings.getRobotWorkspaceFilesMemoryBudgetMb());
         component.setRobotQuickFixKeywordTemplate(settings.getRobotQuickFixKeywordTemplate());
         component.setRobotLanguage(settings.getRobotLanguage());
         component.setRobotTimeoutUse(settings.getRobotTimeoutUse());
@@ -1001,6 +1018,10 @@ public class RobotProjectPreferencesPage implements Configurable {
         if(!s.isEmpty()) {
             throw new ConfigurationException("Error in Workspace Symbols Only For Open Docs:\n" + s);
         }
+        s = settings.validateRobotWorkspaceFilesMemoryBudgetMb(component.getRobotWorkspaceFilesMemoryBudgetMb());
+        if(!s.isEmpty()) {
+            throw new ConfigurationException("Error in Workspace Files Memory Budget Mb:\n" + s);
+        }
         s = settings.validateRobotQuickFixKeywordTemplate(component.getRobotQuickFixKeywordTemplate());
         if(!s.isEmpty()) {
             throw new ConfigurationException("Error in Quick Fix Keyword Template:\n" + s);
@@ -1073,6 +1094,7 @@ public class RobotProjectPreferencesPage implements Configurable {
         settings.setRobotCompletionsKeywordsPrefixImportNameIgnore(component.getRobotCompletionsKeywordsPrefixImportNameIgnore());
         settings.setRobotCompletionsKeywordsArgumentsSeparator(component.getRobotCompletionsKeywordsArgumentsSeparator());
         settings.setRobotWorkspaceSymbolsOnlyForOpenDocs(component.getRobotWorkspaceSymbolsOnlyForOpenDocs());
+        settings.setRobotWorkspaceFilesMemoryBudgetMb(component.getRobotWorkspaceFilesMemoryBudgetMb());
         settings.setRobotQuickFixKeywordTemplate(component.getRobotQuickFixKeywordTemplate());
         settings.setRobotLanguage(component.getRobotLanguage());
         settings.setRobotTimeoutUse(component.getRobotTimeoutUse());
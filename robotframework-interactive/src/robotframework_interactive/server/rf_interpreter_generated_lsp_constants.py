@@ -36,6 +36,7 @@ OPTION_ROBOT_COMPLETIONS_KEYWORDS_PREFIX_IMPORT_NAME = "robot.completions.keywor
 OPTION_ROBOT_COMPLETIONS_KEYWORDS_PREFIX_IMPORT_NAME_IGNORE = "robot.completions.keywords.prefixImportNameIgnore"
 OPTION_ROBOT_COMPLETIONS_KEYWORDS_ARGUMENTS_SEPARATOR = "robot.completions.keywords.argumentsSeparator"
 OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS = "robot.workspaceSymbolsOnlyForOpenDocs"
+OPTION_ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB = "robot.workspace.filesMemoryBudgetMB"
 OPTION_ROBOT_EDITOR_4SPACES_TAB = "robot.editor.4spacesTab"
 OPTION_ROBOT_QUICK_FIX_KEYWORD_TEMPLATE = "robot.quickFix.keywordTemplate"
 OPTION_ROBOT_CODE_LENS_ENABLE = "robot.codeLens.enable"
@@ -91,6 +92,7 @@ ALL_ROBOT_OPTIONS = frozenset(
         OPTION_ROBOT_COMPLETIONS_KEYWORDS_PREFIX_IMPORT_NAME_IGNORE,
         OPTION_ROBOT_COMPLETIONS_KEYWORDS_ARGUMENTS_SEPARATOR,
         OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS,
+        OPTION_ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB,
         OPTION_ROBOT_EDITOR_4SPACES_TAB,
         OPTION_ROBOT_QUICK_FIX_KEYWORD_TEMPLATE,
         OPTION_ROBOT_CODE_LENS_ENABLE,
@@ -140,6 +140,12 @@ COMMANDS: List[Command] = [
         server_handled=True,
         hide_from_command_palette=True,
     ),
+    Command(
+        "robot.memoryStats.internal",
+        "Collects the memory used by the caches in the language server processes.",
+        server_handled=True,
+        hide_from_command_palette=True,
+    ),
     Command(
         "robot.lint.workspace",
         "Lint all files in the workspace.",
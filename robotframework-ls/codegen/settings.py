@@ -183,6 +183,11 @@ SETTINGS = {
         "default": False,
         "description": "Collecting workspace symbols can be resource intensive on big projects and may slow down code-completion, in this case, it's possible collect info only for open files on big projects.",
     },
+    "robot.workspace.filesMemoryBudgetMB": {
+        "type": "number",
+        "default": 0,
+        "description": "The memory (in MB) which may be used to cache the files loaded from the disk (when it's reached the ASTs of the least recently used files are released first and then the files). Set to 0 to use the default (1000 MB or the value in the RFLS_FILES_TARGET_MEMORY_IN_BYTES environment variable).",
+    },
     "robot.editor.4spacesTab": {
         "type": "boolean",
         "default": True,
@@ -1,4 +1,16 @@
-from typing import Optional, Set, List, Dict, Iterator, Sequence
+from typing import (
+    Optional,
+    Set,
+    List,
+    Dict,
+    Iterator,
+    Sequence,
+    Tuple,
+    Iterable,
+    FrozenSet,
+    Any,
+    Hashable,
+)
 import weakref
 
 from robocorp_ls_core.protocols import ITestInfoFromSymbolsCacheTypedDict
@@ -120,28 +132,116 @@ class BaseSymbolsCache:
         raise NotImplementedError("iter_keyword_info abstract in: %s", self.__class__)
 
 
+def _add_to_reverse_map(
+    reverse_map: Dict[str, Set[str]], names: Iterable[str], uri: str
+) -> None:
+    for name in names:
+        s = reverse_map.get(name)
+        if s is None:
+            s = reverse_map[name] = set()
+        s.add(uri)
+
+
+def _remove_from_reverse_map(
+    reverse_map: Dict[str, Set[str]], names: Iterable[str], uri: str
+) -> None:
+    for name in names:
+        s = reverse_map.get(name)
+        if s is not None:
+            s.discard(uri)
+            if not s:
+                del reverse_map[name]
+
+
+class _UriContribution(object):
+    """
+    The names which a given uri added to the reverse maps (used so that it's
+    possible to remove those when the uri changes).
+    """
+
+    __slots__ = ["global_variables_defined", "keywords_used"]
+
+    def __init__(
+        self, global_variables_defined: FrozenSet[str], keywords_used: FrozenSet[str]
+    ):
+        self.global_variables_defined = global_variables_defined
+        self.keywords_used = keywords_used
+
+
+_EMPTY_CONTRIBUTION = _UriContribution(frozenset(), frozenset())
+
+
 class SymbolsCacheReverseIndex:
+    """
+    Keeps reverse maps from names to the uris which define/use those.
+
+    The index is computed for the whole workspace the first time (or when
+    a full reindex is requested, i.e.: when workspace folders change) and
+    afterwards only the uris changed are updated.
+
+    Note: only one thread may synchronize the index at a time, but the
+    contents may be read from any thread (contents are only mutated with the
+    GIL held and the public API only returns copies).
+    """
+
     def __init__(self):
         self._global_var_to_uris: Dict[str, Set[str]] = {}
 
+        # normalized keyword name used -> uris using it.
+        self._keyword_usage_to_uris: Dict[str, Set[str]] = {}
+
+        # Keyword names with embedded arguments (i.e.: `Log ${count} items`)
+        # can't be looked up directly in `_keyword_usage_to_uris` (each name
+        # used needs to be matched against it), so, the results of those
+        # matches are cached here until the keywords used change.
+        self._embedded_keyword_name_to_uris: Dict[str, Set[str]] = {}
+
+        # uri -> what the uri added to the maps above.
+        self._uri_to_contribution: Dict[str, _UriContribution] = {}
+
         self._lock = threading.Lock()
-        self._reindex_count = 0
 
-        self._uris_changed = set()
+        self._uris_changed: Set[str] = set()
         self._force_reindex = True
 
+        # The uris in the workspace when the index was last synchronized (used
+        # to detect files added/removed for which no change notification was
+        # received).
+        self._workspace_uris: Set[str] = set()
+
+        # The workspace files version related to `_workspace_uris` (the
+        # workspace uris are only listed again when it changes).
+        self._workspace_files_version: Optional[Hashable] = None
+
+        # Stats (see: get_stats()).
+        self._full_reindex_count = 0
+        self._full_reindex_time = 0.0
+        self._incremental_reindex_count = 0
+        self._incremental_reindex_time = 0.0
+        self._incremental_uris_updated = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return:
+            Information on how many times the index was computed (for the whole
+            workspace or incrementally) and the time (in seconds) spent on it.
+        """
+        return {
+            "full_reindex_count": self._full_reindex_count,
+            "full_reindex_time": self._full_reindex_time,
+            "incremental_reindex_count": self._incremental_reindex_count,
+            "incremental_reindex_time": self._incremental_reindex_time,
+            "incremental_uris_updated": self._incremental_uris_updated,
+            "indexed_uris": len(self._uri_to_contribution),
+        }
+
     def request_full_reindex(self):
         with self._lock:
             self._force_reindex = True
-            self._uris_changed.clear()
 
     def notify_uri_changed(self, uri: str) -> None:
         with self._lock:
-            if not self._force_reindex:
-                self._uris_changed.add(uri)
-                if len(self._uris_changed) > 1:
-                    self._force_reindex = True
-                    self._uris_changed.clear()
+            self._uris_changed.add(uri)
 
     def has_global_variable(self, normalized_var_name: str) -> bool:
         return normalized_var_name in self._global_var_to_uris
@@ -149,51 +249,235 @@ class SymbolsCacheReverseIndex:
     def get_global_variable_uri_definitions(
         self, normalized_var_name: str
     ) -> Optional[Set[str]]:
-        return self._global_var_to_uris.get(normalized_var_name)
+        found = self._global_var_to_uris.get(normalized_var_name)
+        if found is None:
+            return None
+        return set(found)
 
-    def synchronize(self, context: ICompletionContext):
-        with self._lock:
-            if not self._force_reindex:
-                if not self._uris_changed or self._uris_changed == {context.doc.uri}:
-                    # If the only thing changed is the current uri (or if there
-                    # were no changes), don't do a workspace-wide update.
-                    return
+    def has_keyword_usage(self, normalized_keyword_name: str) -> bool:
+        return bool(self.get_keyword_usage_uris(normalized_keyword_name))
+
+    def get_keyword_usage_uris(self, normalized_keyword_name: str) -> Set[str]:
+        """
+        :return:
+            The uris of the documents which use the given keyword.
+
+        :note: changes to the document of the context being synchronized aren't
+            applied to the index (so, callers should check it directly).
+        """
+        keyword_usage_to_uris = self._keyword_usage_to_uris
+        if "{" not in normalized_keyword_name:
+            return set(keyword_usage_to_uris.get(normalized_keyword_name, ()))
+
+        embedded_keyword_name_to_uris = self._embedded_keyword_name_to_uris
+        found = embedded_keyword_name_to_uris.get(normalized_keyword_name)
+        if found is None:
+            from robotframework_ls.impl.text_utilities import (
+                matches_name_with_variables,
+            )
+
+            found = set(keyword_usage_to_uris.get(normalized_keyword_name, ()))
+            for keyword_name_used, uris in list(keyword_usage_to_uris.items()):
+                if matches_name_with_variables(
+                    keyword_name_used, normalized_keyword_name
+                ):
+                    found.update(uris)
+            embedded_keyword_name_to_uris[normalized_keyword_name] = found
+
+        return set(found)
+
+    def _iter_workspace_uris(self, context: ICompletionContext) -> Iterator[str]:
+        from robotframework_ls.impl.robot_constants import ROBOT_FILE_EXTENSIONS
+
+        workspace = context.workspace
+        if workspace is not None:
+            yield from workspace.iter_all_doc_uris_in_workspace(ROBOT_FILE_EXTENSIONS)
+
+    def _update_workspace_uris(self, context: ICompletionContext) -> Set[str]:
+        """
+        :return:
+            The uris in the workspace (only listed again if files were
+            added/removed since the last time those were listed).
+        """
+        workspace = context.workspace
+        files_version = workspace.get_files_version() if workspace else None
+        if files_version is not None and files_version == self._workspace_files_version:
+            return self._workspace_uris
+
+        # Note: the version is gotten before listing the files (so, if files
+        # change while listing, they'll be listed again in the next call).
+        workspace_uris = set(self._iter_workspace_uris(context))
+        self._uris_changed.update(
+            workspace_uris.symmetric_difference(self._workspace_uris)
+        )
+        self._workspace_uris = workspace_uris
+        self._workspace_files_version = files_version
+        return workspace_uris
 
-            # Reset synchronize-related flags.
-            self._force_reindex = False
-            self._uris_changed.clear()
+    def synchronize(self, context: ICompletionContext):
+        import time
 
-            self._reindex_count += 1
-            self._compute_new_symbols_cache_reverse_index_state(context)
+        with self._lock:
+            workspace_uris = self._update_workspace_uris(context)
+
+            if self._force_reindex:
+                initial_time = time.time()
+                uris_changed = self._uris_changed
+                self._compute_new_symbols_cache_reverse_index_state(
+                    context, uris_changed
+                )
+
+                # Only reset the flags if it worked (it may be cancelled).
+                self._force_reindex = False
+                self._uris_changed = set()
+
+                elapsed = time.time() - initial_time
+                self._full_reindex_count += 1
+                self._full_reindex_time += elapsed
+                log.info(
+                    "Symbols cache reverse index: full reindex (%s uris) took: %.2fs",
+                    len(self._uri_to_contribution),
+                    elapsed,
+                )
+                return
+
+            # Changes in the current uri aren't applied (those are frequent
+            # while the user is typing and the users of the index check the
+            # current document directly). It's kept as changed so that it's
+            # updated when the index is synchronized for another document.
+            uris_changed = self._uris_changed.difference((context.doc.uri,))
+            if not uris_changed:
+                return
+
+            initial_time = time.time()
+            self._update_uris(context, uris_changed, workspace_uris)
+            self._uris_changed.difference_update(uris_changed)
+
+            elapsed = time.time() - initial_time
+            self._incremental_reindex_count += 1
+            self._incremental_reindex_time += elapsed
+            self._incremental_uris_updated += len(uris_changed)
+            log.debug(
+                "Symbols cache reverse index: updated %s uris in: %.2fs",
+                len(uris_changed),
+                elapsed,
+            )
 
     def dispose(self):
         self._global_var_to_uris = {}
+        self._keyword_usage_to_uris = {}
+        self._embedded_keyword_name_to_uris = {}
+        self._uri_to_contribution = {}
+
+    def _set_uri_contribution(
+        self, uri: str, symbols_cache: Optional[BaseSymbolsCache]
+    ) -> None:
+        old = self._uri_to_contribution.get(uri, _EMPTY_CONTRIBUTION)
+        if symbols_cache is None:
+            new = _EMPTY_CONTRIBUTION
+            self._uri_to_contribution.pop(uri, None)
+        else:
+            new = _UriContribution(
+                frozenset(symbols_cache._global_variables_defined),
+                frozenset(symbols_cache._keywords_used),
+            )
+            self._uri_to_contribution[uri] = new
+
+        _remove_from_reverse_map(
+            self._global_var_to_uris,
+            old.global_variables_defined.difference(new.global_variables_defined),
+            uri,
+        )
+        _add_to_reverse_map(
+            self._global_var_to_uris,
+            new.global_variables_defined.difference(old.global_variables_defined),
+            uri,
+        )
+
+        if old.keywords_used != new.keywords_used:
+            _remove_from_reverse_map(
+                self._keyword_usage_to_uris,
+                old.keywords_used.difference(new.keywords_used),
+                uri,
+            )
+            _add_to_reverse_map(
+                self._keyword_usage_to_uris,
+                new.keywords_used.difference(old.keywords_used),
+                uri,
+            )
+            self._embedded_keyword_name_to_uris = {}
+
+    def _update_uris(
+        self,
+        context: ICompletionContext,
+        uris_changed: Set[str],
+        workspace_uris: Set[str],
+    ) -> None:
+        from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+        workspace = typing.cast(Optional[RobotWorkspace], context.workspace)
+        if workspace is None or workspace.workspace_indexer is None:
+            return
+
+        open_docs_uris = set(workspace.get_open_docs_uris())
+        symbols_cache: Optional[BaseSymbolsCache]
+        for uri, symbols_cache in typing.cast(
+            Iterator[Tuple[str, Optional[BaseSymbolsCache]]],
+            workspace.workspace_indexer.iter_uri_and_symbols_cache(
+                context=context, uris_to_iter=uris_changed
+            ),
+        ):
+            if uri not in workspace_uris and uri not in open_docs_uris:
+                # i.e.: it was removed (or closed and it's not in the workspace).
+                symbols_cache = None
+            self._set_uri_contribution(uri, symbols_cache)
 
     def _compute_new_symbols_cache_reverse_index_state(
-        self, context: ICompletionContext
+        self, context: ICompletionContext, uris_changed: Set[str]
     ) -> None:
-        from robotframework_ls.impl.workspace_symbols import iter_symbols_caches
+        from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+        symbols_cache: Optional[BaseSymbolsCache]
 
-        new_global_var_to_uris: Dict[str, Set[str]] = {}
-        symbols_cache: BaseSymbolsCache
+        workspace = typing.cast(Optional[RobotWorkspace], context.workspace)
+        if workspace is None or workspace.workspace_indexer is None:
+            return
 
-        # Note: always update as a whole.
-        it = typing.cast(Iterator[BaseSymbolsCache], iter_symbols_caches("", context))
+        # Note: libraries don't have usages nor global variables, so, just the
+        # documents in the workspace are considered (and all of those must be
+        # considered so that references are complete, so, no timeout is used).
+        workspace_indexer = workspace.workspace_indexer
+        found: Set[str] = set()
 
+        def iter_uri_and_symbols_cache():
+            yield from workspace_indexer.iter_uri_and_symbols_cache(
+                context=context, found=found
+            )
+            if uris_changed:
+                # The workspace may still not be tracking files just created.
+                yield from workspace_indexer.iter_uri_and_symbols_cache(
+                    context=context, found=found, uris_to_iter=uris_changed
+                )
+
+        it = typing.cast(
+            Iterator[Tuple[str, Optional[BaseSymbolsCache]]],
+            iter_uri_and_symbols_cache(),
+        )
+
+        # Note: when a full reindex is done, the new state is computed in a
+        # new instance and the contents are set as a whole at the end.
+        new_state = SymbolsCacheReverseIndex()
         try:
-            for symbols_cache in it:
-                uri = symbols_cache.get_uri()
-                if not uri:
+            for uri, symbols_cache in it:
+                if not uri or symbols_cache is None:
                     continue
-
-                for global_var_name in symbols_cache._global_variables_defined:
-                    s = new_global_var_to_uris.get(global_var_name)
-                    if s is None:
-                        s = new_global_var_to_uris[global_var_name] = set()
-                    s.add(uri)
+                new_state._set_uri_contribution(uri, symbols_cache)
         except:
             log.exception("Exception computing symbols cache reverse index.")
             raise  # Maybe it was cancelled (or we had another error).
         else:
             # ok, it worked, let's actually update our internal state.
-            self._global_var_to_uris = new_global_var_to_uris
+            self._global_var_to_uris = new_state._global_var_to_uris
+            self._keyword_usage_to_uris = new_state._keyword_usage_to_uris
+            self._uri_to_contribution = new_state._uri_to_contribution
+            self._embedded_keyword_name_to_uris = {}
@@ -0,0 +1,378 @@
+"""
+Persists the information from the symbols cache of documents in the filesystem
+so that a new language server process doesn't need to parse all the files in
+the workspace again (only the ones whose mtime/size changed).
+
+The same store is also used to share the symbols cache of documents opened in
+the client among the sibling server processes (`.api`, `.lint.api` and
+`.others.api` all receive the same document changes): the first process
+computing the symbols cache for some contents stores it (keyed by the uri and
+validated by a hash of the contents) and the other processes load it in the
+`WorkspaceIndexer` instead of computing it again. As the contents of open
+documents change on each edit, those are only stored after the document isn't
+changed for a while (and the entry is removed when the document is closed).
+
+Note: just the symbols cache is shared (only used by the lookups done through
+the `WorkspaceIndexer`, such as workspace symbols, references, etc.). Each
+process still parses the ASTs and builds the dependency graphs it needs for
+its own requests (see: `test_symbols_cache_shared_for_open_docs_benchmark` for
+the CPU time per edit and the RSS of the 3 processes with and without sharing).
+"""
+from typing import Optional, List, Iterator, Tuple, Any, Set, Dict
+import os
+import threading
+
+from robocorp_ls_core.lsp import MarkupContentTypedDict, MarkupKind, SymbolKind
+from robocorp_ls_core.protocols import (
+    ITestInfoFromSymbolsCacheTypedDict,
+    check_implements,
+)
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl._symbols_cache import BaseSymbolsCache
+from robotframework_ls.impl.protocols import (
+    IRobotDocument,
+    ISymbolsCache,
+    ISymbolsJsonListEntry,
+    ISymbolKeywordInfo,
+)
+
+log = get_logger(__name__)
+
+# Bump whenever the information saved changes.
+_FORMAT_VERSION = 1
+
+# The entries which weren't stored in this time (in seconds) are removed when
+# the cache is pruned (and then the oldest entries are removed if the cache is
+# still over the max size in bytes).
+_MAX_CACHE_AGE = 30 * 24 * 60 * 60
+_MAX_CACHE_SIZE = 200 * 1024 * 1024
+
+# The symbols cache of an open document is only stored if the document isn't
+# changed for this time (in seconds).
+OPEN_DOC_STORE_DELAY = 1.0
+
+
+def get_symbols_cache_dir() -> str:
+    from robotframework_ls import robot_config
+
+    return os.path.join(
+        robot_config.get_robotframework_ls_home(),
+        "symbols_cache",
+        "v%s" % (_FORMAT_VERSION,),
+    )
+
+
+def _get_stamp(path: str) -> Optional[Tuple[float, int]]:
+    try:
+        stat = os.stat(path)
+    except Exception:
+        return None
+    return (stat.st_mtime, stat.st_size)
+
+
+def _range_to_list(r) -> List[int]:
+    start = r["start"]
+    end = r["end"]
+    return [start["line"], start["character"], end["line"], end["character"]]
+
+
+def _list_to_range(lst):
+    return {
+        "start": {"line": lst[0], "character": lst[1]},
+        "end": {"line": lst[2], "character": lst[3]},
+    }
+
+
+class _PersistedKeywordInfo:
+    _documentation: MarkupContentTypedDict
+
+    __slots__ = ["name", "_line", "_symbols_cache", "_documentation"]
+
+    def __init__(self, name: str, line: int, symbols_cache: BaseSymbolsCache):
+        self.name = name
+        self._line = line
+        self._symbols_cache = symbols_cache
+
+    def get_documentation(self) -> MarkupContentTypedDict:
+        try:
+            return self._documentation
+        except AttributeError:
+            pass
+
+        from robotframework_ls.impl import ast_utils
+        from robotframework_ls.impl.robot_workspace import _KeywordInfo
+
+        # The documentation is only available in the AST (so, if it's
+        # requested we need to actually parse the document).
+        documentation: MarkupContentTypedDict = {
+            "kind": MarkupKind.Markdown,
+            "value": "",
+        }
+        doc = self._symbols_cache.get_doc()
+        if doc is not None:
+            for keyword_node_info in ast_utils.iter_keywords(doc.get_ast()):
+                node = keyword_node_info.node
+                if node.lineno - 1 == self._line and node.name == self.name:
+                    documentation = _KeywordInfo.from_node(node).get_documentation()
+                    break
+
+        self._documentation = documentation
+        return self._documentation
+
+    def __typecheckself__(self) -> None:
+        _: ISymbolKeywordInfo = check_implements(self)
+
+
+class _SymbolsCacheFromPersisted(BaseSymbolsCache):
+    _cached_keyword_info: List[ISymbolKeywordInfo]
+
+    def iter_keyword_info(self) -> Iterator[ISymbolKeywordInfo]:
+        try:
+            yield from iter(self._cached_keyword_info)
+        except:
+            cache: List[ISymbolKeywordInfo] = []
+            for entry in self._json_list:
+                keyword_info = _PersistedKeywordInfo(
+                    entry["name"], entry["location"]["range"]["start"]["line"], self
+                )
+                yield keyword_info
+                cache.append(keyword_info)
+            self._cached_keyword_info = cache
+
+    def __typecheckself__(self) -> None:
+        _: ISymbolsCache = check_implements(self)
+
+
+class SymbolsCachePersistence(object):
+    """
+    Stores the symbols cache information for documents loaded from the
+    filesystem.
+
+    Each document is saved in its own entry (keyed by its path) along with the
+    stamp (mtime, size) of the file, the Robot Framework version and the
+    languages used to parse it. When loading, if any of those doesn't match
+    the entry is considered stale and the document must be parsed again.
+
+    Documents opened in the client are saved keyed by their uri along with
+    the hash of their contents (which is used instead of the stamp). Those
+    are only saved after `OPEN_DOC_STORE_DELAY` seconds without a new store
+    for the same uri.
+    """
+
+    def __init__(self, cache_dir: str):
+        from robocorp_ls_core.cache import CompactDirCache
+
+        self._dir_cache = CompactDirCache(cache_dir)
+        self._robot_version: Optional[str] = None
+
+        self._open_docs_lock = threading.Lock()
+        # uri -> (doc, symbols cache) waiting to be stored.
+        self._pending_open_docs: Dict[str, Tuple[IRobotDocument, BaseSymbolsCache]] = {}
+
+        # The number of entries written (for tests/stats).
+        self.stored_entries = 0
+
+    def prune(self) -> None:
+        """
+        Removes old entries so that the cache (which is shared by all the
+        workspaces) doesn't grow unbounded.
+        """
+        removed = self._dir_cache.prune(_MAX_CACHE_SIZE, _MAX_CACHE_AGE)
+        if removed:
+            log.info("Pruned %s entries from the symbols cache.", removed)
+
+    def _get_environment_key(self) -> List[Any]:
+        from robotframework_ls.impl.robot_localization import (
+            get_global_localization_info,
+        )
+
+        robot_version = self._robot_version
+        if robot_version is None:
+            from robotframework_ls.impl.robot_version import get_robot_version
+
+            robot_version = self._robot_version = get_robot_version()
+
+        language_codes = sorted(get_global_localization_info().language_codes)
+        return [robot_version, language_codes]
+
+    def _can_persist(self, doc: IRobotDocument) -> bool:
+        # Only documents which are loaded from the filesystem (i.e.: not opened
+        # in the client) can be persisted.
+        return bool(doc.immutable and doc.path)
+
+    def _get_contents_hash(self, doc: IRobotDocument) -> str:
+        import hashlib
+
+        return hashlib.sha256(doc.source.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def load(self, doc: IRobotDocument) -> Optional[ISymbolsCache]:
+        if not self._can_persist(doc):
+            if doc.immutable or not doc.uri:
+                return None
+            return self._load_open_doc(doc)
+
+        stamp = _get_stamp(doc.path)
+        if stamp is None:
+            return None
+
+        try:
+            value = self._dir_cache.load(("symbols_cache", doc.path), dict)
+        except KeyError:
+            return None
+
+        try:
+            if value["stamp"] != list(stamp):
+                return None
+
+            if value["env"] != self._get_environment_key():
+                return None
+
+            if not doc.is_source_in_sync():
+                return None
+
+            return self._create_symbols_cache(doc, value)
+        except Exception:
+            log.exception("Error loading persisted symbols cache for: %s", doc.path)
+            return None
+
+    def _load_open_doc(self, doc: IRobotDocument) -> Optional[ISymbolsCache]:
+        try:
+            value = self._dir_cache.load(("symbols_cache_open", doc.uri), dict)
+        except KeyError:
+            return None
+
+        try:
+            if value["contents_hash"] != self._get_contents_hash(doc):
+                return None
+
+            if value["env"] != self._get_environment_key():
+                return None
+
+            return self._create_symbols_cache(doc, value)
+        except Exception:
+            log.exception("Error loading shared symbols cache for: %s", doc.uri)
+            return None
+
+    def store(self, doc: IRobotDocument, symbols_cache: ISymbolsCache) -> None:
+        if not isinstance(symbols_cache, BaseSymbolsCache):
+            return
+
+        if not self._can_persist(doc):
+            if doc.immutable or not doc.uri:
+                return
+
+            self._schedule_store_open_doc(doc, symbols_cache)
+            return
+
+        stamp = _get_stamp(doc.path)
+        if stamp is None or not doc.is_source_in_sync():
+            return
+
+        value = self._create_value(symbols_cache)
+        value["stamp"] = list(stamp)
+        self._dir_cache.store(("symbols_cache", doc.path), value)
+        self.stored_entries += 1
+
+    def _schedule_store_open_doc(
+        self, doc: IRobotDocument, symbols_cache: BaseSymbolsCache
+    ) -> None:
+        from robocorp_ls_core.timeouts import TimeoutTracker
+
+        with self._open_docs_lock:
+            self._pending_open_docs[doc.uri] = (doc, symbols_cache)
+
+        # Note: the previous calls for the same uri aren't cancelled (they
+        # just do nothing as the doc pending is no longer the same).
+        TimeoutTracker.get_singleton().call_on_timeout(
+            OPEN_DOC_STORE_DELAY,
+            self._on_store_open_doc_timeout,
+            kwargs={"uri": doc.uri, "doc": doc},
+        )
+
+    def _on_store_open_doc_timeout(self, uri: str, doc: IRobotDocument) -> None:
+        with self._open_docs_lock:
+            pending = self._pending_open_docs.get(uri)
+            if pending is None or pending[0] is not doc:
+                return
+            del self._pending_open_docs[uri]
+
+        self._store_open_doc(*pending)
+
+    def _store_open_doc(
+        self, doc: IRobotDocument, symbols_cache: BaseSymbolsCache
+    ) -> None:
+        # A single entry is kept for each uri (so, the entry is overwritten
+        # as the document is changed).
+        value = self._create_value(symbols_cache)
+        value["contents_hash"] = self._get_contents_hash(doc)
+        self._dir_cache.store(("symbols_cache_open", doc.uri), value)
+        self.stored_entries += 1
+
+    def flush_open_docs(self) -> None:
+        """
+        Stores the open documents which are waiting for the store delay.
+        """
+        with self._open_docs_lock:
+            pending = list(self._pending_open_docs.values())
+            self._pending_open_docs.clear()
+
+        for doc, symbols_cache in pending:
+            self._store_open_doc(doc, symbols_cache)
+
+    def discard_open_doc(self, uri: str) -> None:
+        """
+        Removes the entry of a document which was closed in the client.
+        """
+        with self._open_docs_lock:
+            self._pending_open_docs.pop(uri, None)
+        self._dir_cache.discard(("symbols_cache_open", uri))
+
+    def _create_value(self, symbols_cache: BaseSymbolsCache) -> dict:
+        keywords = [
+            [entry["name"]] + _range_to_list(entry["location"]["range"])
+            for entry in symbols_cache.get_json_list()
+        ]
+
+        test_info = symbols_cache.get_test_info()
+        tests: Optional[List[List[Any]]] = None
+        if test_info is not None:
+            tests = [[t["name"]] + _range_to_list(t["range"]) for t in test_info]
+
+        return {
+            "env": self._get_environment_key(),
+            "keywords": keywords,
+            "keywords_used": sorted(symbols_cache._keywords_used),
+            "tests": tests,
+            "global_variables_defined": sorted(symbols_cache._global_variables_defined),
+            "variable_references": sorted(symbols_cache._variable_references),
+        }
+
+    def _create_symbols_cache(self, doc: IRobotDocument, value: dict) -> ISymbolsCache:
+        uri = doc.uri
+        symbols: List[ISymbolsJsonListEntry] = []
+        for keyword in value["keywords"]:
+            symbols.append(
+                {
+                    "name": keyword[0],
+                    "kind": SymbolKind.Class,
+                    "location": {"uri": uri, "range": _list_to_range(keyword[1:])},
+                    "containerName": doc.path,
+                }
+            )
+
+        test_info: Optional[List[ITestInfoFromSymbolsCacheTypedDict]] = None
+        tests = value["tests"]
+        if tests is not None:
+            test_info = [{"name": t[0], "range": _list_to_range(t[1:])} for t in tests]
+
+        keywords_used: Set[str] = set(value["keywords_used"])
+        return _SymbolsCacheFromPersisted(
+            symbols,
+            None,
+            doc,
+            keywords_used,
+            uri=uri,
+            test_info=test_info,
+            global_variables_defined=set(value["global_variables_defined"]),
+            variable_references=set(value["variable_references"]),
+        )
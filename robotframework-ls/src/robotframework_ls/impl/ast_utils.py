@@ -532,12 +532,18 @@ def _iter_nodes_reverse(node) -> Iterator[INode]:
             yield from _iter_nodes_reverse(value)
 
 
-def iter_all_nodes_recursive(node: INode) -> Iterator[Tuple[List[INode], INode]]:
+def iter_all_nodes_recursive(
+    node: INode, stack: Optional[List[INode]] = None
+) -> Iterator[Tuple[List[INode], INode]]:
     """
     This function will iterate over all the nodes. Use only if there's no
     other way to implement it as iterating over all the nodes is slow...
+
+    :param stack:
+        If given, the parents of the children of the node (i.e.: the parents
+        of the node and the node itself) -- it's changed while iterating.
     """
-    yield from _iter_nodes(node)
+    yield from _iter_nodes(node, stack)
 
 
 def _iter_nodes_filtered_not_recursive(
@@ -1048,7 +1054,10 @@ def get_documentation_raw(ast: INode) -> str:
 
 
 def get_documentation_as_markdown(ast) -> str:
-    documentation = get_documentation_raw(ast)
+    return convert_documentation_to_markdown(get_documentation_raw(ast))
+
+
+def convert_documentation_to_markdown(documentation: str) -> str:
     if not documentation:
         return documentation
     try:
@@ -2220,9 +2229,18 @@ def iter_arguments_from_template(
                         break
 
 
-def set_localization_info_in_model(ast, localization_info: LocalizationInfo):
+def set_localization_info_in_model(
+    ast,
+    localization_info: LocalizationInfo,
+    nodes: Optional[Iterable[INode]] = None,
+):
     """
     Sets information regarding localization of the AST in the model (File).
+
+    :param nodes:
+        If given only these nodes are updated (used when the model is created
+        by reusing nodes from another model which already had the same
+        localization info set).
     """
     assert (
         ast.__class__.__name__ == "File"
@@ -2231,7 +2249,10 @@ def set_localization_info_in_model(ast, localization_info: LocalizationInfo):
     ast.__localization_info__ = localization_info
 
     file_weak_ref = weakref.ref(ast)
-    for _stack, node in _iter_nodes(ast):
+    if nodes is None:
+        nodes = (node for _stack, node in _iter_nodes(ast))
+
+    for node in nodes:
         node.__file_weak_ref__ = file_weak_ref  # type:ignore
         node.__localization_info__ = localization_info  # type:ignore
 
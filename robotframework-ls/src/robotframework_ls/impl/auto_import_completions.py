@@ -11,12 +11,12 @@ from robocorp_ls_core.lsp import (
     CompletionItemTypedDict,
     InsertTextFormat,
 )
-from typing import Optional, List, Set, Dict, Any
+from typing import Optional, List, Set, Dict, Any, Iterator, Iterable, Tuple
 from robotframework_ls.impl.protocols import NodeInfo
 import os.path
 from robocorp_ls_core import uris
 from robocorp_ls_core.protocols import IWorkspace
-from robotframework_ls.impl.protocols import ISymbolsCache
+from robotframework_ls.impl.protocols import ISymbolsCache, ISymbolKeywordInfo
 from robotframework_ls.impl.robot_constants import ALL_KEYWORD_RELATED_FILE_EXTENSIONS
 
 
@@ -179,15 +179,55 @@ class _Collector(object):
         return completion_item
 
 
+def _iter_symbols_caches_and_keyword_infos(
+    completion_context: ICompletionContext, collector: _Collector
+) -> Iterator[Tuple[ISymbolsCache, Iterable[ISymbolKeywordInfo]]]:
+    """
+    Provides the symbols caches (and the keywords in it which may be accepted
+    by the collector).
+    """
+    from robotframework_ls.impl.workspace_symbols import (
+        iter_symbols_caches,
+        get_symbols_name_index,
+        get_workspace_symbols_timeout,
+    )
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+    from robotframework_ls.impl.robot_constants import BUILTIN_LIB
+
+    symbols_name_index = get_symbols_name_index(completion_context)
+    if symbols_name_index is None:
+        for symbols_cache in iter_symbols_caches(
+            None, completion_context, show_builtins=False
+        ):
+            yield symbols_cache, symbols_cache.iter_keyword_info()
+        return
+
+    # Only the keywords whose name matches the token are checked (the index is
+    # synchronized incrementally with the documents changed).
+    symbols_name_index.synchronize(
+        completion_context, timeout=get_workspace_symbols_timeout()
+    )
+    normalized_name = normalize_robot_name(collector.token.value)
+    if collector.exact_match:
+        names = [normalized_name]
+    else:
+        names = symbols_name_index.find_names(normalized_name, fuzzy=False)
+
+    for entry in symbols_name_index.iter_entries(names):
+        completion_context.check_cancelled()
+        library_info = entry.symbols_cache.get_library_info()
+        if library_info is not None and library_info.name == BUILTIN_LIB:
+            continue
+        yield entry.symbols_cache, entry.keyword_infos
+
+
 def _collect_auto_import_completions(
     completion_context: ICompletionContext,
     collector: _Collector,
     collect_deprecated: bool = False,
 ):
-    from robotframework_ls.impl.workspace_symbols import iter_symbols_caches
     from robotframework_ls.robot_config import create_convert_keyword_format_func
     from robotframework_ls import robot_config
-    from robotframework_ls.impl.text_utilities import has_deprecated_text
 
     symbols_cache: ISymbolsCache
     selection = completion_context.sel
@@ -213,30 +253,34 @@ def _collect_auto_import_completions(
         )
     )
 
-    for symbols_cache in iter_symbols_caches(
-        None, completion_context, show_builtins=False
-    ):
+    def compute_import_info(symbols_cache: ISymbolsCache) -> Optional[tuple]:
+        """
+        :return:
+            None if the keywords from the symbols cache must not be added or
+            a tuple(lib_import, resource_path, convert_keyword_format).
+        """
         library_info: Optional[ILibraryDoc] = symbols_cache.get_library_info()
         doc: Optional[IRobotDocument] = symbols_cache.get_doc()
 
         lib_import = None
         resource_path = None
+        convert_keyword_format = noop
 
         if library_info is not None:
             if not collect_deprecated and (
                 library_info.name in deprecated_name_to_replacement
-                or has_deprecated_text(library_info.doc)
+                or library_info.deprecated
             ):
-                continue
+                return None
 
             if library_info.source:
                 if (
                     library_info.source
                     in collector.import_location_info.imported_libraries
                 ):
-                    continue
+                    return None
             elif library_info.name in collector.import_location_info.imported_libraries:
-                continue
+                return None
 
             if library_info.source:
                 for folder_path in folder_paths:
@@ -267,9 +311,29 @@ def _collect_auto_import_completions(
                 )
             except:
                 pass
-            convert_keyword_format = noop
 
-        for keyword_info in symbols_cache.iter_keyword_info():
+        return lib_import, resource_path, convert_keyword_format
+
+    # The same symbols cache may be provided multiple times (once for each
+    # name found in it).
+    symbols_cache_id_to_import_info: Dict[int, Optional[tuple]] = {}
+
+    for symbols_cache, keyword_infos in _iter_symbols_caches_and_keyword_infos(
+        completion_context, collector
+    ):
+        cache_id = id(symbols_cache)
+        try:
+            import_info = symbols_cache_id_to_import_info[cache_id]
+        except KeyError:
+            import_info = symbols_cache_id_to_import_info[
+                cache_id
+            ] = compute_import_info(symbols_cache)
+
+        if import_info is None:
+            continue
+        lib_import, resource_path, convert_keyword_format = import_info
+
+        for keyword_info in keyword_infos:
             if collector.accepts(keyword_info.name):
                 item = collector._create_completion_item(
                     completion_context,
@@ -32,50 +32,13 @@ from robotframework_ls.impl.robot_lsp_constants import (
     OPTION_ROBOT_LINT_IGNORE_ENVIRONMENT_VARIABLES,
 )
 from robotframework_ls.impl.robot_constants import STDLIBS_LOWER
+from robotframework_ls.impl.keyword_index import KeywordIndexForContext
 import typing
 
 
 log = get_logger(__name__)
 
 
-class _KeywordContainer(object):
-    def __init__(self) -> None:
-        self._name_to_keywords: Dict[str, List[IKeywordFound]] = {}
-        self._names_with_variables: Dict[str, List[IKeywordFound]] = {}
-
-    def add_keyword(self, keyword_found: IKeywordFound) -> None:
-        from robotframework_ls.impl.text_utilities import normalize_robot_name
-
-        normalized_name = normalize_robot_name(keyword_found.keyword_name)
-        lst = self._name_to_keywords.get(normalized_name)
-        if lst is None:
-            lst = self._name_to_keywords[normalized_name] = []
-        lst.append(keyword_found)
-
-        if "{" in normalized_name:
-            lst = self._names_with_variables.get(normalized_name)
-            if lst is None:
-                lst = self._names_with_variables[normalized_name] = []
-            lst.append(keyword_found)
-
-    def get_keywords(self, normalized_keyword_name: str) -> List[IKeywordFound]:
-        from robotframework_ls.impl.text_utilities import matches_name_with_variables
-
-        keyword_found = self._name_to_keywords.get(normalized_keyword_name)
-
-        ret = []
-        if keyword_found is not None:
-            ret.extend(keyword_found)
-
-        # We do not have an exact match, still, we need to check if we may
-        # have a match in keywords that accept variables.
-        for name, keyword_found in self._names_with_variables.items():
-            if matches_name_with_variables(normalized_keyword_name, name):
-                ret.extend(keyword_found)
-
-        return ret
-
-
 class _VariablesCollector(AbstractVariablesCollector):
     def __init__(self, on_unresolved_variable_import) -> None:
         self._variables_collected: Dict[str, List[IVariableFound]] = {}
@@ -134,60 +97,32 @@ class _VariablesCollector(AbstractVariablesCollector):
         return False
 
 
-class _AnalysisKeywordsCollector(object):
+class _AnalysisKeywordsCollector(AbstractKeywordCollector):
     def __init__(
         self,
         on_unresolved_library,
         on_unresolved_resource,
         on_resolved_library,
     ):
-        self._keywords_container = _KeywordContainer()
-        self._resource_name_to_keywords_container = {}
-        self._library_name_to_keywords_container = {}
-
         self.on_unresolved_library = on_unresolved_library
         self.on_unresolved_resource = on_unresolved_resource
         self.on_resolved_library = on_resolved_library
 
+        # Set after the keywords are collected.
+        self.keyword_index: Optional[KeywordIndexForContext] = None
+
     def accepts(self, keyword_name):
-        return True
+        # Keywords are gotten from the keyword index (see: collect_keyword_index).
+        return False
 
     def on_keyword(self, keyword_found: IKeywordFound):
-        from robotframework_ls.impl.text_utilities import normalize_robot_name
-
-        # Note: Even if something is imported 'WITH NAME', it's still added
-        # to the global scope (there's just an additional reference with the
-        # new name).
-        self._keywords_container.add_keyword(keyword_found)
-        library_name = keyword_found.library_name
-        library_alias = keyword_found.library_alias
-        resource_name = keyword_found.resource_name
-
-        if library_name:
-            if library_alias:
-                name = normalize_robot_name(library_alias)
-            else:
-                name = normalize_robot_name(library_name)
-            dct = self._library_name_to_keywords_container
-        elif resource_name:
-            name = normalize_robot_name(resource_name)
-            dct = self._resource_name_to_keywords_container
-        else:
-            log.info(
-                "No library name nor resource name for keyword: %s",
-                keyword_found.keyword_name,
-            )
-            return
-
-        keyword_container = dct.get(name)
-        if keyword_container is None:
-            keyword_container = dct[name] = _KeywordContainer()
-
-        keyword_container.add_keyword(keyword_found)
+        pass
 
     def get_keywords(self, normalized_keyword_name: str) -> List[IKeywordFound]:
         from robotframework_ls.impl import text_utilities
 
+        keyword_index = self.keyword_index
+        assert keyword_index is not None
         ret = []
 
         # Note: the name could be something as `alias.keywordname` or
@@ -198,21 +133,12 @@ class _AnalysisKeywordsCollector(object):
         ):
             if not name or not remainder:
                 continue
-            containers = []
-            keywords_container = self._resource_name_to_keywords_container.get(name)
-            if keywords_container:
-                containers.append(keywords_container)
-            keywords_container = self._library_name_to_keywords_container.get(name)
-            if keywords_container:
-                containers.append(keywords_container)
-
-            for keywords_container in containers:
-                ret.extend(keywords_container.get_keywords(remainder))
+            ret.extend(keyword_index.get_keywords_in_scope(name, remainder))
 
         if not ret:
             # Finding with a dotted name has higher priority over finding it
             # without the qualifier.
-            ret.extend(self._keywords_container.get_keywords(normalized_keyword_name))
+            ret.extend(keyword_index.get_keywords(normalized_keyword_name))
 
         return ret
 
@@ -223,7 +149,7 @@ class _AnalysisKeywordsCollector(object):
 def collect_analysis_errors(initial_completion_context):
     from robotframework_ls.impl import ast_utils
     from robotframework_ls.impl.ast_utils import create_error_from_node
-    from robotframework_ls.impl.collect_keywords import collect_keywords
+    from robotframework_ls.impl.collect_keywords import collect_keyword_index
     from robotframework_ls.impl.text_utilities import normalize_robot_name
     from robotframework_ls.impl.text_utilities import contains_variable_text
     from robotframework_ls.impl.keyword_argument_analysis import (
@@ -239,8 +165,6 @@ def collect_analysis_errors(initial_completion_context):
         library_node: Optional[INode],
         library_doc: ILibraryDoc,
     ):
-        from robotframework_ls.impl.text_utilities import has_deprecated_text
-
         if library_node is None:
             return
 
@@ -276,7 +200,7 @@ def collect_analysis_errors(initial_completion_context):
             ):
                 errors.append(error)
 
-            if library_doc.doc and has_deprecated_text(library_doc.doc):
+            if library_doc.deprecated:
                 error = create_error_from_node(
                     library_node,
                     f"{library_doc.name} is deprecated.",
@@ -387,7 +311,9 @@ def collect_analysis_errors(initial_completion_context):
         on_unresolved_resource,
         on_resolved_library,
     )
-    collect_keywords(initial_completion_context, collector)
+    collector.keyword_index = collect_keyword_index(
+        initial_completion_context, collector
+    )
 
     ast = initial_completion_context.get_ast()
     for keyword_usage_info in ast_utils.iter_keyword_usage_tokens(
@@ -5,6 +5,11 @@ from robocorp_ls_core.protocols import check_implements
 from robocorp_ls_core.robotframework_log import get_logger
 from robotframework_ls.impl.protocols import (
     IKeywordFound,
+    IKeywordIndexEntry,
+    ILibraryDoc,
+    ILibraryDocOrError,
+    IResourceImportNode,
+    IRobotDocument,
     ICompletionContext,
     IKeywordCollector,
     IKeywordArg,
@@ -12,8 +17,9 @@ from robotframework_ls.impl.protocols import (
     AbstractKeywordCollector,
     INode,
 )
-from typing import Sequence, List, Dict, Optional, Iterator, Any
+from typing import Sequence, List, Dict, Optional, Iterator, Any, Tuple
 from robotframework_ls.impl.text_utilities import build_keyword_docs_with_signature
+from robotframework_ls.impl.keyword_index import KeywordIndexForContext
 from robocorp_ls_core.lsp import MarkupContentTypedDict, MarkupKind
 
 
@@ -215,9 +221,8 @@ class _KeywordFoundFromLibrary(object):
     def is_deprecated(self):
         if self._lib_deprecated:
             return self._lib_deprecated
-        from robotframework_ls.impl import text_utilities
 
-        return text_utilities.has_deprecated_text(self._keyword_doc.doc)
+        return self._keyword_doc.deprecated
 
     @property  # type: ignore
     @instance_cache
@@ -285,6 +290,156 @@ class _KeywordFoundFromLibrary(object):
         _: IKeywordFound = check_implements(self)
 
 
+class _KeywordIndexEntryFromAst(object):
+    __slots__ = [
+        "keyword_name",
+        "scope_name",
+        "doc",
+        "_module_ast",
+        "_keyword_node",
+        "_keyword_args",
+    ]
+
+    def __init__(
+        self,
+        doc: IRobotDocument,
+        scope_name: str,
+        module_ast,
+        keyword_node,
+        keyword_name: str,
+        keyword_args: Sequence[IKeywordArg],
+    ):
+        self.keyword_name = keyword_name
+        self.scope_name = scope_name
+        self.doc = doc
+        self._module_ast = module_ast
+        self._keyword_node = keyword_node
+        self._keyword_args = keyword_args
+
+    def create_keyword_found(
+        self, completion_context: ICompletionContext
+    ) -> IKeywordFound:
+        from robocorp_ls_core.lsp import CompletionItemKind
+
+        return _KeywordFoundFromAst(
+            self._module_ast,
+            self._keyword_node,
+            self.keyword_name,
+            self._keyword_args,
+            completion_context,
+            CompletionItemKind.Function,
+        )
+
+    def __typecheckself__(self) -> None:
+        _: IKeywordIndexEntry = check_implements(self)
+
+
+class _KeywordIndexEntryFromLibrary(object):
+    __slots__ = [
+        "keyword_name",
+        "scope_name",
+        "doc",
+        "_lib_deprecated",
+        "_library_doc",
+        "_keyword_doc",
+        "_keyword_args",
+        "_library_alias",
+    ]
+
+    def __init__(
+        self,
+        doc: IRobotDocument,
+        scope_name: str,
+        lib_deprecated,
+        library_doc,
+        keyword_doc,
+        keyword_name: str,
+        keyword_args: Sequence[IKeywordArg],
+        library_alias: Optional[str],
+    ):
+        self.keyword_name = keyword_name
+        self.scope_name = scope_name
+        self.doc = doc
+        self._lib_deprecated = lib_deprecated
+        self._library_doc = library_doc
+        self._keyword_doc = keyword_doc
+        self._keyword_args = keyword_args
+        self._library_alias = library_alias
+
+    def create_keyword_found(
+        self, completion_context: ICompletionContext
+    ) -> IKeywordFound:
+        from robocorp_ls_core.lsp import CompletionItemKind
+
+        return _KeywordFoundFromLibrary(
+            self._lib_deprecated,
+            self._library_doc,
+            self._keyword_doc,
+            self.keyword_name,
+            self._keyword_args,
+            completion_context,
+            CompletionItemKind.Method,
+            library_alias=self._library_alias,
+        )
+
+    def __typecheckself__(self) -> None:
+        _: IKeywordIndexEntry = check_implements(self)
+
+
+def _iter_keyword_index_entries_from_ast(
+    doc: IRobotDocument, ast
+) -> Iterator[IKeywordIndexEntry]:
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+    from robocorp_ls_core import uris
+
+    scope_name = normalize_robot_name(
+        os.path.splitext(os.path.basename(uris.to_fs_path(doc.uri)))[0]
+    )
+
+    # If multiple definitions of the same keyword are found, just the last
+    # one is used (as in collect_keywords_from_ast).
+    found: Dict[str, IKeywordIndexEntry] = {}
+    for keyword in ast_utils.iter_keywords(ast):
+        keyword_name = keyword.node.name
+        found[keyword_name] = _KeywordIndexEntryFromAst(
+            doc,
+            scope_name,
+            ast,
+            keyword.node,
+            keyword_name,
+            list(ast_utils.iter_keyword_arguments_as_kwarg(keyword.node)),
+        )
+    yield from found.values()
+
+
+def _iter_keyword_index_entries_from_library(
+    doc: IRobotDocument, library_info: LibraryDependencyInfo, library_doc: ILibraryDoc
+) -> Iterator[IKeywordIndexEntry]:
+    from robotframework_ls.impl import text_utilities
+
+    scope_name = text_utilities.normalize_robot_name(
+        library_info.alias or library_doc.name
+    )
+    lib_deprecated = library_doc.deprecated
+
+    for keyword in library_doc.keywords:
+        keyword_args: Sequence[IKeywordArg] = ()
+        if keyword.args:
+            keyword_args = keyword.args
+
+        yield _KeywordIndexEntryFromLibrary(
+            doc,
+            scope_name,
+            lib_deprecated,
+            library_doc,
+            keyword,
+            keyword.name,
+            keyword_args,
+            library_info.alias,
+        )
+
+
 def collect_keywords_from_ast(
     ast, completion_context: ICompletionContext, collector: IKeywordCollector
 ):
@@ -327,18 +482,18 @@ def _collect_current_doc_keywords(
     collect_keywords_from_ast(ast, completion_context, collector)
 
 
-def _collect_libraries_keywords(
+def _iter_resolved_libraries(
     completion_context: ICompletionContext,
     library_infos: Iterator[LibraryDependencyInfo],
-    collector: IKeywordCollector,
+    collector: Optional[IKeywordCollector],
     memo: Dict[Any, Any],
-):
+) -> Iterator[Tuple[LibraryDependencyInfo, ILibraryDoc]]:
+    """
+    Provides the library docs for the given library infos (notifying the
+    collector about resolved/unresolved libraries).
+    """
     from robotframework_ls.impl.libspec_manager import LibspecManager
     from robotframework_ls.impl.protocols import ILibraryDocOrError
-    from robotframework_ls.impl import text_utilities
-
-    # Get keywords from libraries
-    from robocorp_ls_core.lsp import CompletionItemKind
 
     libspec_manager: LibspecManager = completion_context.workspace.libspec_manager
     tracing = completion_context.tracing
@@ -376,93 +531,177 @@ def _collect_libraries_keywords(
             else:
                 memo[key] = True
 
-            doc = library_doc.doc
-            lib_deprecated = doc and text_utilities.has_deprecated_text(doc)
-
-            #: :type keyword: KeywordDoc
-            for keyword in library_doc.keywords:
-                keyword_name = keyword.name
-                if collector.accepts(keyword_name):
-                    if tracing:
-                        log.debug(
-                            "Accepted keyword name: %s (libname: %s, libalias: %s)",
-                            keyword_name,
-                            library_info.name,
-                            library_info.alias,
-                        )
-
-                    keyword_args: Sequence[IKeywordArg] = ()
-                    if keyword.args:
-                        keyword_args = keyword.args
-
-                    collector.on_keyword(
-                        _KeywordFoundFromLibrary(
-                            lib_deprecated,
-                            library_doc,
-                            keyword,
-                            keyword_name,
-                            keyword_args,
-                            completion_context,
-                            CompletionItemKind.Method,
-                            library_alias=library_info.alias,
-                        )
-                    )
+            yield library_info, library_doc
+
+            if collector is not None:
+                collector.on_resolved_library(
+                    completion_context, library_info.node, library_doc
+                )
+        elif collector is not None:
+            _notify_unresolved_library(
+                completion_context, library_info, library_doc_or_error, collector
+            )
+
 
-            collector.on_resolved_library(
-                completion_context, library_info.node, library_doc
+def _notify_unresolved_library(
+    completion_context: ICompletionContext,
+    library_info: LibraryDependencyInfo,
+    library_doc_or_error: ILibraryDocOrError,
+    collector: IKeywordCollector,
+):
+    from robot.api import Token
+
+    error_msg = library_doc_or_error.error
+    node = library_info.node
+    if node:
+        if error_msg:
+            error_msg = f"\nError generating libspec:\n{error_msg}"
+
+        node_name_tok = node.get_token(Token.NAME)
+
+        if node_name_tok is not None:
+            (
+                value,
+                token_errors,
+            ) = completion_context.token_value_and_unresolved_resolving_variables(
+                node_name_tok
             )
+            if token_errors:
+                for token_error, error_msg in token_errors:
+                    collector.on_unresolved_library(
+                        completion_context,
+                        node.name,
+                        token_error.lineno,
+                        token_error.lineno,
+                        token_error.col_offset,
+                        token_error.end_col_offset,
+                        error_msg,
+                        value,
+                    )
+            else:
+                collector.on_unresolved_library(
+                    completion_context,
+                    node.name,
+                    node_name_tok.lineno,
+                    node_name_tok.lineno,
+                    node_name_tok.col_offset,
+                    node_name_tok.end_col_offset,
+                    error_msg,
+                    value,
+                )
         else:
-            from robot.api import Token
+            collector.on_unresolved_library(
+                completion_context,
+                library_info.name,
+                node.lineno,
+                node.end_lineno,
+                node.col_offset,
+                node.end_col_offset,
+                error_msg,
+                "",
+            )
 
-            error_msg = library_doc_or_error.error
-            node = library_info.node
-            if node:
-                if error_msg:
-                    error_msg = f"\nError generating libspec:\n{error_msg}"
 
-                node_name_tok = node.get_token(Token.NAME)
+def _collect_libraries_keywords(
+    completion_context: ICompletionContext,
+    library_infos: Iterator[LibraryDependencyInfo],
+    collector: IKeywordCollector,
+    memo: Dict[Any, Any],
+):
+    # Get keywords from libraries
+    from robocorp_ls_core.lsp import CompletionItemKind
 
-                if node_name_tok is not None:
-                    (
-                        value,
-                        token_errors,
-                    ) = completion_context.token_value_and_unresolved_resolving_variables(
-                        node_name_tok
+    tracing = completion_context.tracing
+
+    for library_info, library_doc in _iter_resolved_libraries(
+        completion_context, library_infos, collector, memo
+    ):
+        lib_deprecated = library_doc.deprecated
+
+        #: :type keyword: KeywordDoc
+        for keyword in library_doc.keywords:
+            keyword_name = keyword.name
+            if collector.accepts(keyword_name):
+                if tracing:
+                    log.debug(
+                        "Accepted keyword name: %s (libname: %s, libalias: %s)",
+                        keyword_name,
+                        library_info.name,
+                        library_info.alias,
                     )
-                    if token_errors:
-                        for token_error, error_msg in token_errors:
-                            collector.on_unresolved_library(
-                                completion_context,
-                                node.name,
-                                token_error.lineno,
-                                token_error.lineno,
-                                token_error.col_offset,
-                                token_error.end_col_offset,
-                                error_msg,
-                                value,
-                            )
-                    else:
-                        collector.on_unresolved_library(
-                            completion_context,
-                            node.name,
-                            node_name_tok.lineno,
-                            node_name_tok.lineno,
-                            node_name_tok.col_offset,
-                            node_name_tok.end_col_offset,
-                            error_msg,
-                            value,
-                        )
-                else:
-                    collector.on_unresolved_library(
+
+                keyword_args: Sequence[IKeywordArg] = ()
+                if keyword.args:
+                    keyword_args = keyword.args
+
+                collector.on_keyword(
+                    _KeywordFoundFromLibrary(
+                        lib_deprecated,
+                        library_doc,
+                        keyword,
+                        keyword_name,
+                        keyword_args,
                         completion_context,
-                        library_info.name,
-                        node.lineno,
-                        node.end_lineno,
-                        node.col_offset,
-                        node.end_col_offset,
-                        error_msg,
-                        "",
+                        CompletionItemKind.Method,
+                        library_alias=library_info.alias,
                     )
+                )
+
+
+def _notify_unresolved_resource(
+    completion_context: ICompletionContext,
+    node: IResourceImportNode,
+    collector: IKeywordCollector,
+):
+    # Note that 'None' documents will only be given for the
+    # initial context (so, it's ok to use `completion_context`
+    # in this case).
+    from robot.api import Token
+
+    node_name_tok = node.get_token(Token.NAME)
+    if node_name_tok is not None:
+        (
+            value,
+            token_errors,
+        ) = completion_context.token_value_and_unresolved_resolving_variables(
+            node_name_tok
+        )
+
+        if token_errors:
+            for token_error, error_msg in token_errors:
+                collector.on_unresolved_resource(
+                    completion_context,
+                    node.name,
+                    token_error.lineno,
+                    token_error.lineno,
+                    token_error.col_offset,
+                    token_error.end_col_offset,
+                    error_msg,
+                    value,
+                )
+
+        else:
+            collector.on_unresolved_resource(
+                completion_context,
+                node.name,
+                node_name_tok.lineno,
+                node_name_tok.lineno,
+                node_name_tok.col_offset,
+                node_name_tok.end_col_offset,
+                None,
+                value,
+            )
+    else:
+        collector.on_unresolved_resource(
+            completion_context,
+            node.name,
+            node.lineno,
+            node.end_lineno,
+            node.col_offset,
+            node.end_col_offset,
+            None,
+            "",
+        )
 
 
 def _collect_from_context(
@@ -487,55 +726,7 @@ def _collect_from_context(
         completion_context.check_cancelled()
 
         if resource_doc is None:
-            # Note that 'None' documents will only be given for the
-            # initial context (so, it's ok to use `completion_context`
-            # in this case).
-            from robot.api import Token
-
-            node_name_tok = node.get_token(Token.NAME)
-            if node_name_tok is not None:
-                (
-                    value,
-                    token_errors,
-                ) = completion_context.token_value_and_unresolved_resolving_variables(
-                    node_name_tok
-                )
-
-                if token_errors:
-                    for token_error, error_msg in token_errors:
-                        collector.on_unresolved_resource(
-                            completion_context,
-                            node.name,
-                            token_error.lineno,
-                            token_error.lineno,
-                            token_error.col_offset,
-                            token_error.end_col_offset,
-                            error_msg,
-                            value,
-                        )
-
-                else:
-                    collector.on_unresolved_resource(
-                        completion_context,
-                        node.name,
-                        node_name_tok.lineno,
-                        node_name_tok.lineno,
-                        node_name_tok.col_offset,
-                        node_name_tok.end_col_offset,
-                        None,
-                        value,
-                    )
-            else:
-                collector.on_unresolved_resource(
-                    completion_context,
-                    node.name,
-                    node.lineno,
-                    node.end_lineno,
-                    node.col_offset,
-                    node.end_col_offset,
-                    None,
-                    "",
-                )
+            _notify_unresolved_resource(completion_context, node, collector)
             continue
         completion_context.check_cancelled()
         new_ctx = completion_context.create_copy(resource_doc)
@@ -581,3 +772,93 @@ def collect_keywords(
     Collects all the keywords that are available to the given completion_context.
     """
     _collect_from_context(completion_context, collector)
+
+
+def collect_keyword_index(
+    completion_context: ICompletionContext,
+    collector: Optional[IKeywordCollector] = None,
+) -> KeywordIndexForContext:
+    """
+    Provides an index with the keywords that are available to the given
+    completion_context.
+
+    The keywords from the libraries and resources are indexed only once for
+    a given dependency graph (and the index is discarded when the dependency
+    graph is invalidated).
+
+    :param collector:
+        If given, it's notified about resolved/unresolved libraries and
+        unresolved resources (`accepts` and `on_keyword` are not called, the
+        keywords should be gotten from the returned index).
+    """
+    from robotframework_ls.impl.keyword_index import KeywordIndex
+
+    dependency_graph = completion_context.collect_dependency_graph()
+
+    root_doc = dependency_graph.get_root_doc()
+    assert root_doc.uri == completion_context.doc.uri
+
+    # Note: libraries must always be resolved (the library doc may be changed
+    # in the libspec manager and the collector must be notified).
+    completion_context.check_cancelled()
+    memo: Dict[Any, Any] = {}
+    sources: List[Tuple[Any, ...]] = []
+    for library_info, library_doc in _iter_resolved_libraries(
+        completion_context,
+        dependency_graph.iter_libraries(completion_context.doc.uri),
+        collector,
+        memo,
+    ):
+        sources.append((completion_context.doc, library_info, library_doc))
+
+    for node, resource_doc in dependency_graph.iter_all_resource_imports_with_docs():
+        completion_context.check_cancelled()
+
+        if resource_doc is None:
+            if collector is not None:
+                _notify_unresolved_resource(completion_context, node, collector)
+            continue
+
+        sources.append((resource_doc,))
+        new_ctx = completion_context.create_copy(resource_doc)
+        for library_info, library_doc in _iter_resolved_libraries(
+            new_ctx,
+            dependency_graph.iter_libraries(resource_doc.uri),
+            collector,
+            memo,
+        ):
+            sources.append((resource_doc, library_info, library_doc))
+
+    cache_key = tuple(
+        (source[0].uri, source[1].alias, source[2])
+        if len(source) == 3
+        else (source[0].uri,)
+        for source in sources
+    )
+    dependencies_keyword_index = dependency_graph.get_cached_keyword_index(cache_key)
+    if dependencies_keyword_index is None:
+
+        def iter_entries():
+            for source in sources:
+                completion_context.check_cancelled()
+                if len(source) == 3:
+                    yield from _iter_keyword_index_entries_from_library(*source)
+                else:
+                    resource_doc = source[0]
+                    yield from _iter_keyword_index_entries_from_ast(
+                        resource_doc, resource_doc.get_ast()
+                    )
+
+        dependencies_keyword_index = KeywordIndex(iter_entries())
+        dependency_graph.cache_keyword_index(cache_key, dependencies_keyword_index)
+
+    # The keywords of the current document are always indexed again (changes
+    # in the current document don't invalidate the dependency graph).
+    doc_keyword_index = KeywordIndex(
+        _iter_keyword_index_entries_from_ast(
+            completion_context.doc, completion_context.get_ast()
+        )
+    )
+    return KeywordIndexForContext(
+        completion_context, doc_keyword_index, dependencies_keyword_index
+    )
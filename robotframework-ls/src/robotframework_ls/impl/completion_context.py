@@ -157,6 +157,7 @@ class CompletionContext(object):
         self._id_to_compute_documentation: Dict[
             int, Callable[[], MarkupContentTypedDict]
         ] = {}
+        self._variables_dependency_graphs: List[ICompletionContextDependencyGraph] = []
         self.variables_from_arguments_files_loader = (
             variables_from_arguments_files_loader
         )
@@ -508,7 +509,6 @@ class CompletionContext(object):
         from robot.api import Token
         from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_PYTHONPATH
 
-        ws = self.workspace
         token = resource_import.get_token(Token.NAME)
         if token is not None:
             name_with_resolved_vars = self.token_value_resolving_variables(token)
@@ -567,12 +567,9 @@ class CompletionContext(object):
                 else:
                     check_paths = [n]
 
-                for resource_path in check_paths:
-                    doc_uri = uris.from_fs_path(resource_path)
-                    resource_doc = ws.get_document(doc_uri, accept_from_file=True)
-                    if resource_doc is None:
-                        continue
-                    return typing.cast(IRobotDocument, resource_doc)
+                resource_doc = self._find_import_doc(tuple(check_paths))
+                if resource_doc is not None:
+                    return resource_doc
 
             log.info(
                 "Unable to find: %s (checked paths: %s)",
@@ -582,6 +579,47 @@ class CompletionContext(object):
 
         return None
 
+    def _find_import_doc(
+        self, check_paths: Tuple[str, ...]
+    ) -> Optional[IRobotDocument]:
+        """
+        :return:
+            The document for the first path in the `check_paths` which
+            exists (the result is cached in the workspace so that the same
+            paths aren't checked again for each import).
+        """
+        ws = self.workspace
+        caches = ws.completion_context_workspace_caches
+        (
+            found_in_cache,
+            resolved_path,
+            invalidation_count,
+        ) = caches.get_import_resolution(check_paths)
+        if found_in_cache:
+            if resolved_path is None:
+                return None
+
+            resource_doc = ws.get_document(
+                uris.from_fs_path(resolved_path), accept_from_file=True
+            )
+            if resource_doc is not None:
+                return typing.cast(IRobotDocument, resource_doc)
+
+            # It was removed in the meanwhile: resolve it again.
+
+        for resource_path in check_paths:
+            doc_uri = uris.from_fs_path(resource_path)
+            resource_doc = ws.get_document(doc_uri, accept_from_file=True)
+            if resource_doc is None:
+                continue
+            caches.cache_import_resolution_result(
+                check_paths, resource_path, invalidation_count
+            )
+            return typing.cast(IRobotDocument, resource_doc)
+
+        caches.cache_import_resolution_result(check_paths, None, invalidation_count)
+        return None
+
     def get_variable_import_as_doc(
         self, variables_import: INode
     ) -> Optional[IRobotDocument]:
@@ -757,6 +795,17 @@ class CompletionContext(object):
 
         return CompletionContextDependencyGraph.from_completion_context(self)
 
+    def add_variables_dependency_graph(
+        self, dependency_graph: ICompletionContextDependencyGraph
+    ) -> None:
+        if dependency_graph not in self._variables_dependency_graphs:
+            self._variables_dependency_graphs.append(dependency_graph)
+
+    def get_variables_dependency_graphs(
+        self,
+    ) -> Tuple[ICompletionContextDependencyGraph, ...]:
+        return tuple(self._variables_dependency_graphs)
+
     def obtain_symbols_cache_reverse_index(self) -> Optional[ISymbolsCacheReverseIndex]:
         original_ctx = self._original_ctx
         if original_ctx is not None:
@@ -1,24 +1,47 @@
-from typing import Iterator, Tuple, Optional, Deque, Dict, Sequence, List, Set
+from typing import (
+    Any,
+    Iterator,
+    Tuple,
+    Optional,
+    Deque,
+    Dict,
+    Sequence,
+    List,
+    Set,
+    Hashable,
+    Iterable,
+    FrozenSet,
+)
 
 from robocorp_ls_core.ordered_set import OrderedSet
 from robotframework_ls.impl.protocols import (
     ICompletionContextDependencyGraph,
+    ICompletionContextDependencyNode,
     LibraryDependencyInfo,
     ICompletionContext,
     IResourceImportNode,
     IRobotDocument,
     ICompletionContextWorkspaceCaches,
     IVariableImportNode,
+    IKeywordIndex,
 )
 from robotframework_ls.impl.robot_constants import BUILTIN_LIB
 from robocorp_ls_core.callbacks import Callback
 from robocorp_ls_core import uris
 import os
+import itertools
 from robocorp_ls_core.robotframework_log import get_logger
 
 log = get_logger(__name__)
 
 
+def normalize_for_basename_check(name: str) -> str:
+    if "}" in name:
+        # Get everything after a variable to account for patterns such as ${/}.
+        name = name.split("}")[-1]
+    return os.path.basename(os.path.splitext(name)[0]).lower()
+
+
 class _Memo(object):
     def __init__(self):
         self.clear()
@@ -51,6 +74,112 @@ class _Memo(object):
         return False
 
 
+class CompletionContextDependencyNode:
+    """
+    The (direct) imports of a document.
+
+    The imports of a document are resolved based only on the document itself,
+    on its own dependencies and on the configuration (and not on the document
+    which imports it), so, nodes are cached in the workspace and shared among
+    the dependency graphs of all the documents which depend on it.
+
+    If the import names use variables from the dependencies of the document,
+    the node is also invalidated by changes in those dependencies (given as
+    `variables_dependency_graphs`).
+    """
+
+    def __init__(
+        self,
+        doc: IRobotDocument,
+        library_infos: Tuple[LibraryDependencyInfo, ...],
+        resource_imports_as_docs: Tuple[
+            Tuple[IResourceImportNode, Optional[IRobotDocument]], ...
+        ],
+        variable_imports_as_docs: Tuple[
+            Tuple[IVariableImportNode, Optional[IRobotDocument]], ...
+        ],
+        variables_dependency_graphs: Sequence[ICompletionContextDependencyGraph] = (),
+    ):
+        self.doc = doc
+        self.library_infos = library_infos
+        self.resource_imports_as_docs = resource_imports_as_docs
+        self.variable_imports_as_docs = variable_imports_as_docs
+
+        invalidate_on_uri_changes: Set[str] = {uris.normalize_uri(doc.uri)}
+        invalidate_on_basename_no_ext_changes: Set[str] = set()
+        for import_node, import_doc in itertools.chain(
+            resource_imports_as_docs, variable_imports_as_docs
+        ):
+            if import_doc is not None:
+                invalidate_on_uri_changes.add(uris.normalize_uri(import_doc.uri))
+
+            # The import may be resolved to some other file if a file with
+            # the same name is created/removed.
+            for t in import_node.tokens:
+                if t.type == t.NAME:
+                    invalidate_on_basename_no_ext_changes.add(
+                        normalize_for_basename_check(t.value)
+                    )
+
+        for info in library_infos:
+            invalidate_on_basename_no_ext_changes.add(
+                normalize_for_basename_check(info.name)
+            )
+
+        for dependency_graph in variables_dependency_graphs:
+            (
+                uris_to_invalidate,
+                basenames_to_invalidate,
+            ) = dependency_graph.get_invalidate_on_changes()
+            invalidate_on_uri_changes.update(uris_to_invalidate)
+            invalidate_on_basename_no_ext_changes.update(basenames_to_invalidate)
+
+        self._invalidate_on_uri_changes: FrozenSet[str] = frozenset(
+            invalidate_on_uri_changes
+        )
+        self._invalidate_on_basename_no_ext_changes: FrozenSet[str] = frozenset(
+            invalidate_on_basename_no_ext_changes
+        )
+
+    @classmethod
+    def from_completion_context(
+        cls, ctx: ICompletionContext
+    ) -> "CompletionContextDependencyNode":
+        library_infos = tuple(
+            CompletionContextDependencyGraph._iter_library_infos_from_completion_context(
+                ctx
+            )
+        )
+        resource_imports_as_docs = tuple(ctx.get_resource_imports_as_docs())
+        variable_imports_as_docs = tuple(ctx.get_variable_imports_as_docs())
+        return cls(
+            ctx.doc,
+            library_infos,
+            resource_imports_as_docs,
+            variable_imports_as_docs,
+            # Note: only available after the imports are resolved.
+            ctx.get_variables_dependency_graphs(),
+        )
+
+    def get_invalidate_on_changes(self) -> Tuple[Iterable[str], Iterable[str]]:
+        return (
+            self._invalidate_on_uri_changes,
+            self._invalidate_on_basename_no_ext_changes,
+        )
+
+    def do_invalidate_on_uri_change(self, uri: str) -> bool:
+        if uris.normalize_uri(uri) in self._invalidate_on_uri_changes:
+            return True
+
+        basename = normalize_for_basename_check(uri)
+        return basename in self._invalidate_on_basename_no_ext_changes
+
+    def __typecheckself__(self) -> None:
+        from robocorp_ls_core.protocols import check_implements
+
+        _: ICompletionContextDependencyNode = check_implements(self)
+
+
 class CompletionContextDependencyGraph:
     """
     This class is used to map dependencies from a given document
@@ -76,10 +205,22 @@ class CompletionContextDependencyGraph:
         self._invalidate_on_uri_changes: Set[str] = set()
         self._invalidate_on_basename_no_ext_changes: Set[str] = set()
 
+        # The keywords from the dependencies (the index is discarded along
+        # with the dependency graph when it's invalidated).
+        # Note: set as a tuple (cache_key, keyword_index) so that it can be
+        # accessed from multiple threads.
+        self._keyword_index_and_key: Optional[Tuple[Hashable, IKeywordIndex]] = None
+
     def invalidate_on_basename_change(self, name):
-        basename = self._normalize_for_basename_check(name)
+        basename = normalize_for_basename_check(name)
         self._invalidate_on_basename_no_ext_changes.add(basename)
 
+    def get_invalidate_on_changes(self) -> Tuple[Iterable[str], Iterable[str]]:
+        return (
+            self._invalidate_on_uri_changes,
+            self._invalidate_on_basename_no_ext_changes,
+        )
+
     def to_dict(self):
         libraries = {}
         for doc_uri, library_infos in self._doc_uri_to_library_infos.items():
@@ -197,34 +338,35 @@ class CompletionContextDependencyGraph:
         if uris.normalize_uri(uri) in self._invalidate_on_uri_changes:
             return True
 
-        basename = self._normalize_for_basename_check(uri)
+        basename = normalize_for_basename_check(uri)
         if basename in self._invalidate_on_basename_no_ext_changes:
             return True
 
         return False
 
-    def _normalize_for_basename_check(self, name):
-        if "}" in name:
-            # Get everything after a variable to account for patterns such as ${/}.
-            name = name.split("}")[-1]
-        return os.path.basename(os.path.splitext(name)[0]).lower()
+    def get_cached_keyword_index(self, cache_key: Hashable) -> Optional[IKeywordIndex]:
+        keyword_index_and_key = self._keyword_index_and_key
+        if keyword_index_and_key is not None:
+            key, keyword_index = keyword_index_and_key
+            if key == cache_key:
+                return keyword_index
+        return None
+
+    def cache_keyword_index(
+        self, cache_key: Hashable, keyword_index: IKeywordIndex
+    ) -> None:
+        self._keyword_index_and_key = (cache_key, keyword_index)
 
     @classmethod
-    def _collect_library_info_from_completion_context(
-        cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
-    ) -> OrderedSet[LibraryDependencyInfo]:
+    def _iter_library_infos_from_completion_context(
+        cls, curr_ctx: ICompletionContext
+    ) -> Iterator[LibraryDependencyInfo]:
         from robotframework_ls.impl import ast_utils
         from robot.api import Token
 
         # Collect libraries information
         libraries = curr_ctx.get_imported_libraries()
 
-        new_library_infos: OrderedSet[LibraryDependencyInfo] = OrderedSet()
-        if is_root_context:
-            new_library_infos.add(
-                LibraryDependencyInfo(BUILTIN_LIB, None, True, None, None)
-            )
-
         for library in libraries:
             name_tok = library.get_token(Token.NAME)
 
@@ -240,55 +382,90 @@ class CompletionContextDependencyGraph:
                         resolved_name,
                         alias,
                     )
-                lib_info = LibraryDependencyInfo(
+                yield LibraryDependencyInfo(
                     resolved_name,
                     alias,
                     False,
                     args,
                     node,
                 )
-                if not memo.complete_for_library(lib_info.name, lib_info.alias):
-                    continue
 
-                new_library_infos.add(lib_info)
+    @classmethod
+    def _filter_library_infos(
+        cls,
+        library_infos: Iterable[LibraryDependencyInfo],
+        is_root_context: bool,
+        memo: _Memo,
+    ) -> OrderedSet[LibraryDependencyInfo]:
+        new_library_infos: OrderedSet[LibraryDependencyInfo] = OrderedSet()
+        if is_root_context:
+            new_library_infos.add(
+                LibraryDependencyInfo(BUILTIN_LIB, None, True, None, None)
+            )
+
+        for lib_info in library_infos:
+            if not memo.complete_for_library(lib_info.name, lib_info.alias):
+                continue
+
+            new_library_infos.add(lib_info)
         return new_library_infos
 
     @classmethod
-    def _collect_resource_info_from_completion_context(
-        cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
-    ):
-        # Collect related resource imports information.
-        resource_imports_as_docs = curr_ctx.get_resource_imports_as_docs()
-        new_resource_infos: List[
-            Tuple[IResourceImportNode, Optional[IRobotDocument]]
-        ] = []
-        if resource_imports_as_docs:
-            for resource_import_node, resource_doc in resource_imports_as_docs:
-                if resource_doc is None:
-                    if is_root_context:
-                        # We need to keep the empty nodes for the initial context.
-                        new_resource_infos.append((resource_import_node, resource_doc))
-                elif memo.follow_import(resource_doc.uri):
-                    new_resource_infos.append((resource_import_node, resource_doc))
-        return new_resource_infos
+    def _filter_imports_as_docs(
+        cls,
+        imports_as_docs: Sequence[Tuple[Any, Optional[IRobotDocument]]],
+        is_root_context: bool,
+        memo: _Memo,
+    ) -> List[Tuple[Any, Optional[IRobotDocument]]]:
+        new_infos: List[Tuple[Any, Optional[IRobotDocument]]] = []
+        for import_node, import_doc in imports_as_docs:
+            if import_doc is None:
+                if is_root_context:
+                    # We need to keep the empty nodes for the initial context.
+                    new_infos.append((import_node, import_doc))
+            elif memo.follow_import(import_doc.uri):
+                new_infos.append((import_node, import_doc))
+        return new_infos
 
-    @classmethod
-    def _collect_variable_info_from_completion_context(
-        cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
-    ) -> Sequence[Tuple[IVariableImportNode, Optional[IRobotDocument]]]:
-        variable_imports_as_docs = curr_ctx.get_variable_imports_as_docs()
-        new_variable_infos: List[
-            Tuple[IVariableImportNode, Optional[IRobotDocument]]
-        ] = []
-        if variable_imports_as_docs:
-            for variable_import_node, variable_doc in variable_imports_as_docs:
-                if variable_doc is None:
-                    if is_root_context:
-                        # We need to keep the empty nodes for the initial context.
-                        new_variable_infos.append((variable_import_node, variable_doc))
-                elif memo.follow_import(variable_doc.uri):
-                    new_variable_infos.append((variable_import_node, variable_doc))
-        return new_variable_infos
+    def _add_node(
+        self,
+        node: ICompletionContextDependencyNode,
+        new_library_infos: OrderedSet[LibraryDependencyInfo],
+        is_root_context: bool,
+        memo: _Memo,
+    ) -> List[IRobotDocument]:
+        """
+        Adds the imports from the given node which weren't already added
+        from some other node.
+
+        :return: The resource documents which must be followed.
+        """
+        doc_uri = node.doc.uri
+
+        if new_library_infos:
+            self.add_library_infos(doc_uri, new_library_infos)
+
+        new_resource_infos = self._filter_imports_as_docs(
+            node.resource_imports_as_docs, is_root_context, memo
+        )
+        if new_resource_infos:
+            self.add_resource_infos(doc_uri, new_resource_infos)
+
+        new_variable_infos = self._filter_imports_as_docs(
+            node.variable_imports_as_docs, is_root_context, memo
+        )
+        if new_variable_infos:
+            self.add_variable_infos(doc_uri, new_variable_infos)
+
+        uris_to_invalidate, basenames_to_invalidate = node.get_invalidate_on_changes()
+        self._invalidate_on_uri_changes.update(uris_to_invalidate)
+        self._invalidate_on_basename_no_ext_changes.update(basenames_to_invalidate)
+
+        return [
+            resource_doc
+            for _resource_import_node, resource_doc in new_resource_infos
+            if resource_doc is not None
+        ]
 
     @classmethod
     def from_completion_context(
@@ -305,8 +482,10 @@ class CompletionContextDependencyGraph:
         with caches.invalidation_tracker() as invalidation_tracker:
             dependency_graph = CompletionContextDependencyGraph(completion_context.doc)
 
-            initial_library_infos = cls._collect_library_info_from_completion_context(
-                completion_context, is_root_context=True, memo=memo
+            initial_library_infos = cls._filter_library_infos(
+                cls._iter_library_infos_from_completion_context(completion_context),
+                is_root_context=True,
+                memo=memo,
             )
 
             # i.e.: Note that the cache key involves the import names, not the
@@ -375,68 +554,42 @@ class CompletionContextDependencyGraph:
                 # Variables don't need any change as we don't store the nodes.
                 return found
 
-            completion_context_stack: Deque[ICompletionContext] = deque()
-            completion_context_stack.append(completion_context)
-
-            is_root_context = True
+            # The root node is always computed (but it's still cached to be
+            # used in the dependency graphs of the documents which import it).
+            root_node = CompletionContextDependencyNode.from_completion_context(
+                completion_context
+            )
+            caches.cache_dependency_node(root_node, invalidation_tracker)
 
             # Mark as being followed.
             memo.follow_import(completion_context.doc.uri)
 
-            while completion_context_stack:
-                curr_ctx = completion_context_stack.popleft()
-
-                if is_root_context:
-                    # use what's been already collected to compute the cache.
-                    new_library_infos = initial_library_infos
-                else:
-                    new_library_infos = (
-                        cls._collect_library_info_from_completion_context(
-                            curr_ctx, is_root_context, memo
-                        )
-                    )
-                new_resource_infos = cls._collect_resource_info_from_completion_context(
-                    curr_ctx, is_root_context, memo
-                )
-                new_variable_imports = (
-                    cls._collect_variable_info_from_completion_context(
-                        curr_ctx, is_root_context, memo
-                    )
+            docs_to_follow: Deque[IRobotDocument] = deque(
+                dependency_graph._add_node(
+                    root_node, initial_library_infos, is_root_context=True, memo=memo
                 )
+            )
 
-                if new_library_infos:
-                    dependency_graph.add_library_infos(
-                        curr_ctx.doc.uri, new_library_infos
-                    )
+            while docs_to_follow:
+                resource_doc = docs_to_follow.popleft()
 
-                if new_resource_infos:
-                    dependency_graph.add_resource_infos(
-                        curr_ctx.doc.uri, new_resource_infos
+                node = caches.get_cached_dependency_node(resource_doc)
+                if node is None:
+                    node = CompletionContextDependencyNode.from_completion_context(
+                        completion_context.create_copy(resource_doc)
                     )
-                    for _resource_import_node, resource_doc in new_resource_infos:
-                        if resource_doc is not None:
-                            new_ctx = curr_ctx.create_copy(resource_doc)
-                            completion_context_stack.append(new_ctx)
-
-                if new_variable_imports:
-                    dependency_graph.add_variable_infos(
-                        curr_ctx.doc.uri, new_variable_imports
+                    caches.cache_dependency_node(node, invalidation_tracker)
+
+                docs_to_follow.extend(
+                    dependency_graph._add_node(
+                        node,
+                        cls._filter_library_infos(
+                            node.library_infos, is_root_context=False, memo=memo
+                        ),
+                        is_root_context=False,
+                        memo=memo,
                     )
-
-                for node in resource_imports:
-                    for t in node.tokens:
-                        if t.type == t.NAME:
-                            dependency_graph.invalidate_on_basename_change(t.value)
-
-                for n in variable_imports:
-                    for t in n.tokens:
-                        if t.type == t.NAME:
-                            dependency_graph.invalidate_on_basename_change(t.value)
-
-                for info in initial_library_infos:
-                    dependency_graph.invalidate_on_basename_change(info.name)
-
-                is_root_context = False
+                )
 
             cls.on_before_cache_dependency_graph(dependency_graph)
             caches.cache_dependency_graph(
@@ -1,8 +1,19 @@
-from typing import Optional, Hashable, TypeVar, Generic, Iterator, Tuple, Set
+from typing import (
+    Optional,
+    Hashable,
+    TypeVar,
+    Generic,
+    Iterator,
+    Tuple,
+    Set,
+    Dict,
+    Iterable,
+)
 from robotframework_ls.impl.protocols import (
     IRobotDocument,
     ICompletionContextWorkspaceCaches,
     ICompletionContextDependencyGraph,
+    ICompletionContextDependencyNode,
     IOnDependencyChanged,
 )
 from robocorp_ls_core import uris
@@ -17,46 +28,115 @@ from contextlib import contextmanager
 from robocorp_ls_core.options import BaseOptions
 from robocorp_ls_core.robotframework_log import get_logger
 import json
+import os
+import time
 
 T = TypeVar("T")
 
 log = get_logger(__name__)
 
 
-class _LRU(Generic[T]):
+class _DependenciesLRU(Generic[T]):
     """
-    A really-simple LRU to help us keep track of only a few dependency graphs.
+    A LRU where each entry is invalidated by changes in some uris/basenames.
+
+    It keeps a reverse map from the uris/basenames to the entries affected
+    so that the entries invalidated by some change can be found without
+    checking each entry.
     """
 
     def __init__(self, max_size: int):
-        self._cache: "OrderedDict[Hashable, T]" = OrderedDict()
+        # key -> (value, uris, basenames)
+        self._cache: "OrderedDict[Hashable, Tuple[T, Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
         self._max_size = max_size
+        self._uri_to_keys: Dict[str, Set[Hashable]] = {}
+        self._basename_to_keys: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def get(self, key: Hashable) -> Optional[T]:
-        val = self._cache.get(key)
-        if val is None:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
         else:
             self._cache.move_to_end(key)
-            return val
+            return entry[0]
+
+    def put(
+        self,
+        key: Hashable,
+        value: T,
+        invalidate_on_uris: Iterable[str],
+        invalidate_on_basenames: Iterable[str],
+    ) -> None:
+        self.pop(key)
+
+        entry = (value, tuple(invalidate_on_uris), tuple(invalidate_on_basenames))
+        self._cache[key] = entry
+        self._add_to_reverse_map(self._uri_to_keys, entry[1], key)
+        self._add_to_reverse_map(self._basename_to_keys, entry[2], key)
 
-    def put(self, key: Hashable, value: T) -> None:
-        self._cache[key] = value
-        self._cache.move_to_end(key)
         if len(self._cache) > self._max_size:
-            self._cache.popitem(last=False)
+            oldest_key = next(iter(self._cache))
+            self.pop(oldest_key)
 
-    def pop(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
-        return self._cache.pop(key, default)
+    def pop(self, key: Hashable) -> Optional[T]:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return None
+        self._remove_from_reverse_map(self._uri_to_keys, entry[1], key)
+        self._remove_from_reverse_map(self._basename_to_keys, entry[2], key)
+        return entry[0]
+
+    def get_keys_affected(self, normalized_uri: str, basename: str) -> Set[Hashable]:
+        ret: Set[Hashable] = set()
+        keys = self._uri_to_keys.get(normalized_uri)
+        if keys:
+            ret.update(keys)
+        keys = self._basename_to_keys.get(basename)
+        if keys:
+            ret.update(keys)
+        return ret
+
+    def peek(self, key: Hashable) -> Optional[T]:
+        """
+        Provides the value without changing the LRU order.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        return entry[0]
 
     def clear(self) -> None:
         self._cache.clear()
-
-    def items(self) -> Iterator[Tuple[Hashable, T]]:
-        yield from self._cache.items()
+        self._uri_to_keys.clear()
+        self._basename_to_keys.clear()
 
     def values(self) -> Iterator[T]:
-        yield from self._cache.values()
+        for entry in self._cache.values():
+            yield entry[0]
+
+    @staticmethod
+    def _add_to_reverse_map(
+        reverse_map: Dict[str, Set[Hashable]], names: Tuple[str, ...], key: Hashable
+    ) -> None:
+        for name in names:
+            keys = reverse_map.get(name)
+            if keys is None:
+                keys = reverse_map[name] = set()
+            keys.add(key)
+
+    @staticmethod
+    def _remove_from_reverse_map(
+        reverse_map: Dict[str, Set[Hashable]], names: Tuple[str, ...], key: Hashable
+    ) -> None:
+        for name in names:
+            keys = reverse_map.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del reverse_map[name]
 
 
 class _InvalidationTracker:
@@ -80,50 +160,185 @@ class _InvalidationTracker:
         return True
 
 
+class _ImportResolutionCache:
+    """
+    Caches the path to which a resource/variable import resolves (or that
+    it couldn't be resolved) given the paths checked for it.
+
+    Entries are invalidated when a file with the same basename of the import
+    is changed/created/removed (or when a document with that basename is
+    changed in-memory).
+
+    As the paths checked may not be watched (i.e.: entries in the `sys.path`),
+    entries are still rechecked after some time (imports which couldn't be
+    resolved more often as those are the ones the user is usually fixing).
+    """
+
+    NOT_FOUND_REVALIDATION_TIMEOUT = 30.0
+    FOUND_REVALIDATION_TIMEOUT = 120.0
+
+    # When the cache gets bigger than this it's cleared.
+    MAX_ENTRIES = 5000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # check paths -> (resolved path or None, time when it was resolved)
+        self._resolved: Dict[Tuple[str, ...], Tuple[Optional[str], float]] = {}
+
+        # normalized basename -> check paths with that basename
+        self._basename_to_keys: Dict[str, Set[Tuple[str, ...]]] = {}
+
+        # Incremented whenever some entry is invalidated (used to know
+        # whether an invalidation happened while the resolution was being
+        # computed).
+        self._invalidation_count = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, check_paths: Tuple[str, ...]) -> Tuple[bool, Optional[str], int]:
+        """
+        :return:
+            A tuple(found in cache, resolved path or None, invalidation
+            count). The invalidation count must be passed to `put` if the
+            entry was not found in the cache.
+        """
+        with self._lock:
+            entry = self._resolved.get(check_paths)
+            if entry is not None:
+                resolved_path, resolved_time = entry
+                if resolved_path is None:
+                    timeout = self.NOT_FOUND_REVALIDATION_TIMEOUT
+                else:
+                    timeout = self.FOUND_REVALIDATION_TIMEOUT
+                if time.monotonic() - resolved_time < timeout:
+                    self.hits += 1
+                    return True, resolved_path, self._invalidation_count
+
+            self.misses += 1
+            return False, None, self._invalidation_count
+
+    def put(
+        self,
+        check_paths: Tuple[str, ...],
+        resolved_path: Optional[str],
+        invalidation_count: int,
+    ) -> None:
+        if not check_paths:
+            return
+
+        basename = os.path.normcase(os.path.basename(check_paths[0]))
+        with self._lock:
+            if invalidation_count != self._invalidation_count:
+                # Something changed while it was being resolved.
+                return
+
+            if len(self._resolved) >= self.MAX_ENTRIES:
+                self._resolved.clear()
+                self._basename_to_keys.clear()
+
+            self._resolved[check_paths] = (resolved_path, time.monotonic())
+            keys = self._basename_to_keys.get(basename)
+            if keys is None:
+                keys = self._basename_to_keys[basename] = set()
+            keys.add(check_paths)
+
+    def invalidate_path(self, path: str) -> None:
+        basename = os.path.normcase(os.path.basename(path))
+        with self._lock:
+            self._invalidation_count += 1
+            keys = self._basename_to_keys.pop(basename, None)
+            if keys:
+                for key in keys:
+                    self._resolved.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidation_count += 1
+            self._resolved.clear()
+            self._basename_to_keys.clear()
+
+
 class CompletionContextWorkspaceCaches:
+    MAX_CACHED_DEPENDENCY_GRAPHS = 200
+    MAX_CACHED_DEPENDENCY_NODES = 2000
+
     def __init__(
         self, on_dependency_changed: Optional[IOnDependencyChanged] = None
     ) -> None:
         self._lock = threading.Lock()
-        # Small cache because invalidation could become slow in a big cache
-        # (and it should be enough to hold what we're currently working with).
-        self._cached: _LRU[ICompletionContextDependencyGraph] = _LRU(5)
+        # The dependency graphs for the documents analyzed (the nodes with
+        # the imports of each document are shared among the dependency graphs
+        # and invalidation is done through a reverse map, so, this may hold
+        # many entries).
+        self._cached: _DependenciesLRU[
+            ICompletionContextDependencyGraph
+        ] = _DependenciesLRU(self.MAX_CACHED_DEPENDENCY_GRAPHS)
+        self._cached_nodes: _DependenciesLRU[
+            ICompletionContextDependencyNode
+        ] = _DependenciesLRU(self.MAX_CACHED_DEPENDENCY_NODES)
         self.cache_hits = 0
+        self.node_cache_hits = 0
         self.invalidations = 0
 
         self._invalidation_trackers: Set[_InvalidationTracker] = set()
         self._on_dependency_changed = on_dependency_changed
 
+        self._import_resolution_cache = _ImportResolutionCache()
+
+        # Should be set to False if changes in the filesystem aren't notified
+        # (in which case the resolution of imports isn't cached).
+        self.import_resolution_cache_enabled = True
+
     def _invalidate_uri(self, uri: str) -> None:
+        from robotframework_ls.impl.completion_context_dependency_graph import (
+            normalize_for_basename_check,
+        )
+
+        normalized_uri = uris.normalize_uri(uri)
+        basename = normalize_for_basename_check(uri)
+
         with self._lock:
             notified = set()
             for invalidation_tracker in self._invalidation_trackers:
                 invalidation_tracker.mark_uri_invalidated(uri)
 
+            for key in self._cached_nodes.get_keys_affected(normalized_uri, basename):
+                self._cached_nodes.pop(key)
+
             did_invalidate_entry = False
 
-            for key, entry in tuple(self._cached.items()):
-                if entry.do_invalidate_on_uri_change(uri):
-                    uri = entry.get_root_doc().uri
-                    if uri not in notified:
-                        notified.add(uri)
-                        if self._on_dependency_changed:
-                            self._on_dependency_changed(uri)
-
-                    did_invalidate_entry = True
-                    invalidated: Optional[
-                        ICompletionContextDependencyGraph
-                    ] = self._cached.pop(key, None)
-                    if BaseOptions.DEBUG_CACHE_DEPS and invalidated:
-                        log.info(
-                            "Invalidated: %s\n%s\n",
-                            key,
-                            json.dumps(invalidated.to_dict(), indent=4),
-                        )
+            for key in self._cached.get_keys_affected(normalized_uri, basename):
+                entry = self._cached.peek(key)
+                if entry is None:
+                    continue
+
+                root_uri = entry.get_root_doc().uri
+                if uris.normalize_uri(root_uri) == normalized_uri:
+                    # Changes in the root don't invalidate the dependency info
+                    # (rather it's used in the cache key).
+                    continue
+
+                if root_uri not in notified:
+                    notified.add(root_uri)
+                    if self._on_dependency_changed:
+                        self._on_dependency_changed(root_uri)
+
+                did_invalidate_entry = True
+                invalidated: Optional[
+                    ICompletionContextDependencyGraph
+                ] = self._cached.pop(key)
+                if BaseOptions.DEBUG_CACHE_DEPS and invalidated:
+                    log.info(
+                        "Invalidated: %s\n%s\n",
+                        key,
+                        json.dumps(invalidated.to_dict(), indent=4),
+                    )
 
             if BaseOptions.DEBUG_CACHE_DEPS and not did_invalidate_entry:
                 log.info("%s did not invalidate the caches:", uri)
-                for key, entry in tuple(self._cached.items()):
+                for entry in tuple(self._cached.values()):
                     log.info(
                         json.dumps(entry.to_dict(), indent=4),
                     )
@@ -146,6 +361,10 @@ class CompletionContextWorkspaceCaches:
         Called when a file is changed in the file-system (i.e.: it was saved).
         """
         if filename:
+            # The file may have been created/removed (so, imports with the same
+            # name may now resolve differently).
+            self._import_resolution_cache.invalidate_path(filename)
+
             lower = filename.lower()
             if lower.endswith(ROBOT_AND_TXT_FILE_EXTENSIONS):
                 uri = uris.from_fs_path(filename)
@@ -155,10 +374,10 @@ class CompletionContextWorkspaceCaches:
                 # If a library changes, we consider all caches invalid because
                 # we don't hold an association to know which library maps to
                 # which files at this level.
-                self.clear_caches()
+                self._clear_dependency_graphs()
 
             elif lower.endswith(VARIABLE_FILE_EXTENSIONS):
-                self.clear_caches()
+                self._clear_dependency_graphs()
 
     def on_updated_document(self, uri: str, document: Optional[IRobotDocument]):
         """
@@ -168,17 +387,25 @@ class CompletionContextWorkspaceCaches:
         :param document:
             The document just updated or None if it was removed.
         """
+        # Documents which are opened are found even if they aren't in the
+        # filesystem.
+        self._import_resolution_cache.invalidate_path(uris.to_fs_path(uri))
         self._invalidate_uri(uri)
 
     def clear_caches(self):
         """
         Called when all caches should be cleared.
         """
+        self._import_resolution_cache.clear()
+        self._clear_dependency_graphs()
+
+    def _clear_dependency_graphs(self):
         with self._lock:
             self.invalidations += 1
             for invalidation_tracker in self._invalidation_trackers:
                 invalidation_tracker.mark_all_invalidated()
             self._cached.clear()
+            self._cached_nodes.clear()
 
     def dispose(self):
         self.clear_caches()
@@ -218,7 +445,67 @@ class CompletionContextWorkspaceCaches:
     ) -> None:
         with self._lock:
             if invalidation_tracker.is_dependency_graph_still_valid(dependency_graph):
-                self._cached.put(cache_key, dependency_graph)
+                (
+                    invalidate_on_uris,
+                    invalidate_on_basenames,
+                ) = dependency_graph.get_invalidate_on_changes()
+                self._cached.put(
+                    cache_key,
+                    dependency_graph,
+                    invalidate_on_uris,
+                    invalidate_on_basenames,
+                )
+
+    def get_cached_dependency_node(
+        self, doc: IRobotDocument
+    ) -> Optional[ICompletionContextDependencyNode]:
+        key = uris.normalize_uri(doc.uri)
+        with self._lock:
+            ret = self._cached_nodes.get(key)
+            if ret is None or ret.doc is not doc:
+                # If it's not the same instance the document was reloaded
+                # (i.e.: it may have been changed outside of the workspace).
+                return None
+            self.node_cache_hits += 1
+            return ret
+
+    def cache_dependency_node(
+        self,
+        dependency_node: ICompletionContextDependencyNode,
+        invalidation_tracker: _InvalidationTracker,
+    ) -> None:
+        key = uris.normalize_uri(dependency_node.doc.uri)
+        with self._lock:
+            if invalidation_tracker.is_dependency_graph_still_valid(dependency_node):
+                (
+                    invalidate_on_uris,
+                    invalidate_on_basenames,
+                ) = dependency_node.get_invalidate_on_changes()
+                self._cached_nodes.put(
+                    key,
+                    dependency_node,
+                    invalidate_on_uris,
+                    invalidate_on_basenames,
+                )
+
+    def get_import_resolution(
+        self, check_paths: Tuple[str, ...]
+    ) -> Tuple[bool, Optional[str], int]:
+        if not self.import_resolution_cache_enabled:
+            return False, None, -1
+        return self._import_resolution_cache.get(check_paths)
+
+    def cache_import_resolution_result(
+        self,
+        check_paths: Tuple[str, ...],
+        resolved_path: Optional[str],
+        invalidation_count: int,
+    ) -> None:
+        if not self.import_resolution_cache_enabled:
+            return
+        self._import_resolution_cache.put(
+            check_paths, resolved_path, invalidation_count
+        )
 
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
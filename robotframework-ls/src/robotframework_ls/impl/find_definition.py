@@ -3,10 +3,8 @@ from robotframework_ls.impl.protocols import (
     IDefinition,
     TokenInfo,
     IKeywordDefinition,
-    IKeywordCollector,
     IVariablesCollector,
     IKeywordFound,
-    AbstractKeywordCollector,
     IRobotToken,
     IVariableFound,
     AbstractVariablesCollector,
@@ -242,38 +240,6 @@ class _DefinitionFromVariable(object):
         _: IDefinition = check_implements(self)
 
 
-class _FindDefinitionKeywordCollector(AbstractKeywordCollector):
-    def __init__(self, match_name):
-        from robotframework_ls.impl.string_matcher import RobotStringMatcher
-        from robotframework_ls.impl.string_matcher import (
-            build_matchers_with_resource_or_library_scope,
-        )
-
-        self.match_name = match_name
-        self.matches = []
-
-        self._matcher = RobotStringMatcher(match_name)
-        self._scope_matchers = build_matchers_with_resource_or_library_scope(match_name)
-
-    def accepts(self, keyword_name):
-        return True
-
-    def on_keyword(self, keyword_found):
-        if self._matcher.is_keyword_name_match(keyword_found.keyword_name):
-            definition = _DefinitionFromKeyword(keyword_found)
-            self.matches.append(definition)
-            return
-
-        for matcher in self._scope_matchers:
-            if matcher.is_keyword_match(keyword_found):
-                definition = _DefinitionFromKeyword(keyword_found)
-                self.matches.append(definition)
-                return
-
-    def __typecheckself__(self) -> None:
-        _: IKeywordCollector = check_implements(self)
-
-
 class _FindDefinitionVariablesCollector(AbstractVariablesCollector):
     def __init__(
         self, completion_context: ICompletionContext, var_token_info: VarTokenInfo
@@ -382,7 +348,8 @@ def find_keyword_definition(
     The token info must be already computed and must match the completion
     context location.
     """
-    from robotframework_ls.impl.collect_keywords import collect_keywords
+    from robotframework_ls.impl.collect_keywords import collect_keyword_index
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
     from robotframework_ls.impl import ast_utils
 
     token = ast_utils.get_keyword_name_token(
@@ -396,9 +363,13 @@ def find_keyword_definition(
                 token = token_info.token
 
     if token is not None:
-        collector = _FindDefinitionKeywordCollector(token.value)
-        collect_keywords(completion_context, collector)
-        return collector.matches
+        keyword_index = collect_keyword_index(completion_context)
+        return [
+            _DefinitionFromKeyword(keyword_found)
+            for keyword_found in keyword_index.get_keywords_matching(
+                normalize_robot_name(token.value)
+            )
+        ]
     return None
 
 
@@ -0,0 +1,240 @@
+"""
+Index to find keywords by their (normalized) name.
+
+The `KeywordIndex` holds entries which don't depend on a given completion
+context (so, it may be cached in a `ICompletionContextDependencyGraph` and
+reused in different requests) and the `KeywordIndexForContext` binds those
+entries to the completion context of the request (creating the related
+`IKeywordFound` on demand).
+"""
+from typing import Dict, List, Optional, Pattern, Tuple, Iterable, Iterator
+
+from robotframework_ls.impl.protocols import (
+    ICompletionContext,
+    IKeywordFound,
+    IKeywordIndexEntry,
+    IRobotDocument,
+    IKeywordIndex,
+)
+from robocorp_ls_core.protocols import check_implements
+
+
+class KeywordIndex(object):
+    """
+    Maps the normalized keyword name to the entries with that name.
+
+    Keywords with embedded arguments (i.e.: `Log ${count} items`) are kept
+    in a separate structure with the regexp used to match those already
+    compiled.
+
+    Note: the index is not changed after it's created (so, it's safe to
+    access it from multiple threads).
+    """
+
+    def __init__(self, entries: Iterable[IKeywordIndexEntry], index_scopes=True):
+        from robotframework_ls.impl.text_utilities import normalize_robot_name
+        from robotframework_ls.impl.text_utilities import compile_name_with_variables
+
+        self._entries: List[IKeywordIndexEntry] = list(entries)
+
+        # Used to provide entries in the same order in which they were added
+        # (which is the order in which they'd be found when collecting keywords).
+        self._entry_to_order: Dict[IKeywordIndexEntry, int] = dict(
+            (entry, i) for i, entry in enumerate(self._entries)
+        )
+        self._name_to_entries: Dict[str, List[IKeywordIndexEntry]] = {}
+        self._names_with_variables: List[
+            Tuple[Optional[Pattern], List[IKeywordIndexEntry]]
+        ] = []
+
+        # scope (normalized library alias/library name/resource name) -> index
+        self._scope_to_index: Dict[str, KeywordIndex] = {}
+
+        names_with_variables: Dict[str, List[IKeywordIndexEntry]] = {}
+        scope_to_entries: Dict[str, List[IKeywordIndexEntry]] = {}
+        for entry in self._entries:
+            normalized_name = normalize_robot_name(entry.keyword_name)
+            self._name_to_entries.setdefault(normalized_name, []).append(entry)
+            if "{" in normalized_name:
+                names_with_variables.setdefault(normalized_name, []).append(entry)
+
+            if index_scopes and entry.scope_name:
+                scope_to_entries.setdefault(entry.scope_name, []).append(entry)
+
+        for name_with_variables, lst in names_with_variables.items():
+            self._names_with_variables.append(
+                (compile_name_with_variables(name_with_variables), lst)
+            )
+
+        for scope_name, lst in scope_to_entries.items():
+            self._scope_to_index[scope_name] = KeywordIndex(lst, index_scopes=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def iter_entries(self) -> Iterator[IKeywordIndexEntry]:
+        return iter(self._entries)
+
+    def get_entries(self, normalized_name: str) -> List[IKeywordIndexEntry]:
+        """
+        :param normalized_name:
+            The normalized name of the keyword being used.
+
+        :return:
+            The entries which match the name given (either by having the same
+            normalized name or by matching the keyword with embedded arguments).
+        """
+        ret: List[IKeywordIndexEntry] = []
+
+        found = self._name_to_entries.get(normalized_name)
+        if found:
+            ret.extend(found)
+
+        matched_with_variables = False
+        for compiled, entries in self._names_with_variables:
+            if compiled is not None and compiled.match(normalized_name):
+                for entry in entries:
+                    if entry not in ret:
+                        ret.append(entry)
+                        matched_with_variables = True
+
+        if matched_with_variables:
+            self._sort(ret)
+        return ret
+
+    def _sort(self, entries: List[IKeywordIndexEntry]) -> None:
+        entry_to_order = self._entry_to_order
+        entries.sort(key=lambda entry: entry_to_order[entry])
+
+    def get_entries_in_scope(
+        self, normalized_scope_name: str, normalized_name: str
+    ) -> List[IKeywordIndexEntry]:
+        """
+        :param normalized_scope_name:
+            The normalized library alias, library name or resource name.
+
+        :param normalized_name:
+            The normalized name of the keyword being used.
+        """
+        index = self._scope_to_index.get(normalized_scope_name)
+        if index is None:
+            return []
+        return index.get_entries(normalized_name)
+
+    def get_entries_matching(self, normalized_name: str) -> List[IKeywordIndexEntry]:
+        """
+        :param normalized_name:
+            The normalized name of the keyword being used.
+
+        :return:
+            The entries which match the given name either directly or when the
+            name is considered as being qualified with the library/resource name
+            (i.e.: `builtin.log`).
+        """
+        from robotframework_ls.impl.text_utilities import iter_dotted_names
+
+        ret = self.get_entries(normalized_name)
+        found_in_scope = False
+        for scope_name, remainder in iter_dotted_names(normalized_name):
+            for entry in self.get_entries_in_scope(scope_name, remainder):
+                if entry not in ret:
+                    ret.append(entry)
+                    found_in_scope = True
+
+        if found_in_scope:
+            self._sort(ret)
+        return ret
+
+    def __typecheckself__(self) -> None:
+        _: IKeywordIndex = check_implements(self)
+
+
+class KeywordIndexForContext(object):
+    """
+    Provides the keywords available for a given completion context.
+
+    The keywords from the document of the completion context are kept in its
+    own index (as those change as the user types) and the others (from the
+    libraries and resources imported) are gotten from the index cached in the
+    dependency graph.
+    """
+
+    def __init__(
+        self,
+        completion_context: ICompletionContext,
+        doc_keyword_index: IKeywordIndex,
+        dependencies_keyword_index: IKeywordIndex,
+    ):
+        self._completion_context = completion_context
+        self._doc_keyword_index = doc_keyword_index
+        self._dependencies_keyword_index = dependencies_keyword_index
+
+        self._uri_to_completion_context: Dict[str, ICompletionContext] = {
+            completion_context.doc.uri: completion_context
+        }
+        self._entry_to_keyword_found: Dict[IKeywordIndexEntry, IKeywordFound] = {}
+
+    def _get_completion_context(self, doc: IRobotDocument) -> ICompletionContext:
+        ctx = self._uri_to_completion_context.get(doc.uri)
+        if ctx is None:
+            ctx = self._completion_context.create_copy(doc)
+            self._uri_to_completion_context[doc.uri] = ctx
+        return ctx
+
+    def _to_keywords_found(
+        self, entries: Iterable[IKeywordIndexEntry]
+    ) -> List[IKeywordFound]:
+        ret = []
+        for entry in entries:
+            keyword_found = self._entry_to_keyword_found.get(entry)
+            if keyword_found is None:
+                keyword_found = entry.create_keyword_found(
+                    self._get_completion_context(entry.doc)
+                )
+                self._entry_to_keyword_found[entry] = keyword_found
+            ret.append(keyword_found)
+        return ret
+
+    def get_keywords(self, normalized_name: str) -> List[IKeywordFound]:
+        """
+        :return:
+            The keywords which match the given name (without considering the
+            name as being qualified with the library/resource name).
+        """
+        return self._to_keywords_found(
+            self._doc_keyword_index.get_entries(normalized_name)
+        ) + self._to_keywords_found(
+            self._dependencies_keyword_index.get_entries(normalized_name)
+        )
+
+    def get_keywords_in_scope(
+        self, normalized_scope_name: str, normalized_name: str
+    ) -> List[IKeywordFound]:
+        """
+        :return:
+            The keywords which match the given name in the given library or
+            resource (i.e.: for `BuiltIn.Log` the scope is `builtin` and the
+            name is `log`).
+        """
+        return self._to_keywords_found(
+            self._doc_keyword_index.get_entries_in_scope(
+                normalized_scope_name, normalized_name
+            )
+        ) + self._to_keywords_found(
+            self._dependencies_keyword_index.get_entries_in_scope(
+                normalized_scope_name, normalized_name
+            )
+        )
+
+    def get_keywords_matching(self, normalized_name: str) -> List[IKeywordFound]:
+        """
+        :return:
+            The keywords which match the given name either directly or when
+            the name is considered as being qualified with the library/resource
+            name.
+        """
+        return self._to_keywords_found(
+            self._doc_keyword_index.get_entries_matching(normalized_name)
+        ) + self._to_keywords_found(
+            self._dependencies_keyword_index.get_entries_matching(normalized_name)
+        )
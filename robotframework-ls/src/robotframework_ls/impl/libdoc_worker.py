@@ -0,0 +1,264 @@
+"""
+A long-lived process which generates libspecs (keeping `robot` imported so
+that each libspec doesn't pay for the interpreter startup and imports).
+
+It's started by the `LibdocWorkerPool` as:
+
+    python libdoc_worker.py
+
+and receives JSON-RPC messages (with the same `Content-Length` framing used
+in the language server protocol) in its stdin, answering in its stdout.
+
+Note: this module must not import anything besides the standard library and
+`robot` (it's executed as a script, so, `robotframework_ls` may not be in the
+PYTHONPATH).
+
+Requests:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "libdoc",
+     "params": {"argv": [...libdoc arguments...], "cwd": "/some/dir"}}
+
+    Response result: {"returncode": 0, "output": "...", "memory": 123}
+    (memory is the resident set size of the worker in bytes or 0 if it's
+    not available).
+
+    If a module imported by a previous request (and kept loaded in the
+    worker) changed on disk the worker can't generate an up to date libspec,
+    so, it answers with an error (code: STALE_MODULES_ERROR_CODE) and exits
+    (the request should be retried in a new worker).
+
+Notifications:
+
+    {"jsonrpc": "2.0", "method": "exit"}
+"""
+import json
+import os
+import sys
+
+STALE_MODULES_ERROR_CODE = -32001
+
+
+def read_message(stream):
+    """
+    :return dict|NoneType:
+        The message read or None if the stream was closed.
+    """
+    headers = {}
+    while True:
+        line = stream.readline()
+        if not line:  # EOF
+            return None
+        line = line.strip().decode("ascii")
+        if not line:
+            break
+        name, value = line.split(":", 1)
+        headers[name.strip()] = value.strip()
+
+    content_length = int(headers["Content-Length"])
+    body = b""
+    while len(body) < content_length:
+        data = stream.read(content_length - len(body))
+        if not data:
+            return None
+        body += data
+    return json.loads(body.decode("utf-8"))
+
+
+def write_message(stream, message):
+    body = json.dumps(message).encode("utf-8")
+    stream.write(("Content-Length: %s\r\n\r\n" % (len(body),)).encode("ascii"))
+    stream.write(body)
+    stream.flush()
+
+
+def _get_memory():
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+
+    try:
+        # Note: in Linux ru_maxrss is in kilobytes (in Mac it's in bytes).
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            return maxrss
+        return maxrss * 1024
+    except Exception:
+        return 0
+
+
+def _get_mtime(filename):
+    try:
+        return os.stat(filename).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _remove_modules_from_paths(module_names, paths, kept_modules_mtimes):
+    """
+    Modules loaded from the paths added for a library (i.e.: the library
+    itself) are removed so that they're imported again in the next run (they
+    may have changed on disk).
+
+    Note: other modules (i.e.: from the standard library or site-packages) are
+    kept as re-importing those may not be safe. The mtime of the file of each
+    of those is saved in `kept_modules_mtimes` so that the worker can check
+    whether it became stale (see: `_get_stale_module_filenames`).
+    """
+    paths = tuple(os.path.normcase(os.path.join(os.path.abspath(p), "")) for p in paths)
+
+    for name in module_names:
+        module = sys.modules.get(name)
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            continue
+        filename = os.path.abspath(filename)
+        if paths and os.path.normcase(filename).startswith(paths):
+            sys.modules.pop(name, None)
+        else:
+            kept_modules_mtimes[filename] = _get_mtime(filename)
+
+
+def _get_stale_module_filenames(kept_modules_mtimes):
+    """
+    :return list(str):
+        The files of the modules kept loaded which changed on disk after
+        being imported.
+    """
+    return [
+        filename
+        for filename, mtime in kept_modules_mtimes.items()
+        if _get_mtime(filename) != mtime
+    ]
+
+
+def _run_libdoc(argv, cwd, kept_modules_mtimes):
+    """
+    Runs libdoc with the given arguments, restoring the process state
+    (cwd, sys.path) afterwards.
+    """
+    import io
+    from robot.libdoc import LibDoc  # type: ignore
+
+    initial_cwd = os.getcwd()
+    initial_sys_path = sys.path[:]
+    initial_modules = set(sys.modules)
+    initial_stdout = sys.stdout
+    initial_stderr = sys.stderr
+
+    output = io.StringIO()
+    sys.stdout = sys.stderr = output
+    try:
+        if cwd:
+            os.chdir(cwd)
+            # As `python -m robot.libdoc` would do.
+            sys.path.insert(0, cwd)
+        try:
+            returncode = LibDoc().execute_cli(argv, exit=False)
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            import traceback
+
+            traceback.print_exc(file=output)
+            returncode = 1
+    finally:
+        sys.stdout = initial_stdout
+        sys.stderr = initial_stderr
+        try:
+            os.chdir(initial_cwd)
+        except Exception:
+            pass
+        added_paths = [p for p in sys.path if p and p not in initial_sys_path]
+        sys.path[:] = initial_sys_path
+        _remove_modules_from_paths(
+            set(sys.modules).difference(initial_modules),
+            added_paths,
+            kept_modules_mtimes,
+        )
+
+    return returncode, output.getvalue()
+
+
+def main():
+    # Libraries may print directly to the stdout file descriptor, so, the
+    # original stdout is used only for the protocol and the file descriptor 1
+    # is redirected to stderr.
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    protocol_in = sys.stdin.buffer
+
+    # The folder of this script must not be in the PYTHONPATH (its modules
+    # could shadow the libraries being documented).
+    this_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != this_dir]
+
+    # Import robot only once.
+    import robot.libdoc  # type: ignore # noqa
+
+    # filename -> mtime of the modules imported by libraries which are kept
+    # loaded in the worker.
+    kept_modules_mtimes = {}
+
+    while True:
+        message = read_message(protocol_in)
+        if message is None:
+            return
+
+        method = message.get("method")
+        if method == "exit":
+            return
+
+        message_id = message.get("id")
+        if method != "libdoc":
+            if message_id is not None:
+                write_message(
+                    protocol_out,
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message_id,
+                        "error": {"code": -32601, "message": "Method not found"},
+                    },
+                )
+            continue
+
+        stale_module_filenames = _get_stale_module_filenames(kept_modules_mtimes)
+        if stale_module_filenames:
+            write_message(
+                protocol_out,
+                {
+                    "jsonrpc": "2.0",
+                    "id": message_id,
+                    "error": {
+                        "code": STALE_MODULES_ERROR_CODE,
+                        "message": "Modules changed after being imported: %s"
+                        % (", ".join(sorted(stale_module_filenames)),),
+                    },
+                },
+            )
+            return
+
+        params = message.get("params") or {}
+        returncode, output = _run_libdoc(
+            params.get("argv", []), params.get("cwd"), kept_modules_mtimes
+        )
+        write_message(
+            protocol_out,
+            {
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "result": {
+                    "returncode": returncode,
+                    "output": output,
+                    "memory": _get_memory(),
+                },
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
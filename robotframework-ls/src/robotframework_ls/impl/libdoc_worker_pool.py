@@ -0,0 +1,251 @@
+"""
+A pool of long-lived processes to generate libspecs (see: libdoc_worker.py).
+
+Each worker keeps `robot` imported (so, generating a libspec doesn't need to
+pay for the interpreter startup and imports). As importing libraries may have
+side effects in the process, workers are recycled after handling a number
+of requests or when their memory grows too much (and a worker is also
+replaced if a module it keeps loaded changes on disk).
+"""
+import os
+import sys
+import threading
+from typing import List, Optional, Tuple
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Environment variable with the number of workers (0 disables the pool
+# and each libspec is generated in a new `python -m robot.libdoc` process).
+ENV_LIBDOC_WORKERS = "ROBOTFRAMEWORK_LS_LIBDOC_WORKERS"
+
+
+def get_default_max_workers() -> int:
+    try:
+        return int(os.environ[ENV_LIBDOC_WORKERS])
+    except (KeyError, ValueError):
+        return max(1, min(4, os.cpu_count() or 1))
+
+
+class LibdocWorkerError(Exception):
+    """
+    Raised if there was some error communicating with a worker (in which case
+    the libspec should be generated in a new process).
+    """
+
+
+class _StaleLibdocWorkerError(LibdocWorkerError):
+    """
+    Raised if a module kept loaded in the worker changed on disk (in which
+    case the libspec should be generated in a new worker).
+    """
+
+
+class _LibdocWorker(object):
+    def __init__(self):
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+        from robotframework_ls.impl import libdoc_worker
+
+        self._process = subprocess.Popen(
+            [sys.executable, "-u", libdoc_worker.__file__],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._next_id = 0
+        self.requests_handled = 0
+        self.memory = 0
+        log.debug("Started libdoc worker (pid: %s).", self._process.pid)
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    def run_libdoc(self, argv: List[str], cwd: Optional[str]) -> Tuple[int, str]:
+        from robotframework_ls.impl.libdoc_worker import (
+            read_message,
+            write_message,
+            STALE_MODULES_ERROR_CODE,
+        )
+
+        self._next_id += 1
+        message_id = self._next_id
+        try:
+            write_message(
+                self._process.stdin,
+                {
+                    "jsonrpc": "2.0",
+                    "id": message_id,
+                    "method": "libdoc",
+                    "params": {"argv": argv, "cwd": cwd},
+                },
+            )
+            response = read_message(self._process.stdout)
+        except Exception as e:
+            raise LibdocWorkerError(f"Error communicating with libdoc worker: {e}")
+
+        if response is None:
+            raise LibdocWorkerError(
+                f"Libdoc worker exited (exit code: {self._process.poll()})."
+            )
+
+        error = response.get("error")
+        if error and error.get("code") == STALE_MODULES_ERROR_CODE:
+            raise _StaleLibdocWorkerError(error.get("message"))
+
+        if response.get("id") != message_id or "result" not in response:
+            raise LibdocWorkerError(f"Unexpected libdoc worker response: {response}")
+
+        result = response["result"]
+        self.requests_handled += 1
+        self.memory = result.get("memory", 0)
+        return result["returncode"], result["output"]
+
+    def dispose(self) -> None:
+        from robotframework_ls.impl.libdoc_worker import write_message
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+
+        process = self._process
+        if process.poll() is None:
+            try:
+                write_message(process.stdin, {"jsonrpc": "2.0", "method": "exit"})
+                process.stdin.close()
+            except Exception:
+                pass
+            try:
+                process.wait(2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class LibdocWorkerPool(object):
+    """
+    Provides workers to generate libspecs (at most `max_workers` workers run
+    at the same time; callers wait for a worker to be available).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_requests_per_worker: int = 50,
+        max_worker_memory: int = 512 * 1024 * 1024,
+    ):
+        if max_workers is None:
+            max_workers = get_default_max_workers()
+        assert max_workers >= 1
+
+        self._max_workers = max_workers
+        self._max_requests_per_worker = max_requests_per_worker
+        self._max_worker_memory = max_worker_memory
+
+        self._condition = threading.Condition()
+        self._idle_workers: List[_LibdocWorker] = []
+        self._workers_count = 0
+        self._disposed = False
+
+        # Stats
+        self.workers_created = 0
+        self.workers_recycled = 0
+        self.workers_stale = 0
+
+    def _acquire(self) -> _LibdocWorker:
+        with self._condition:
+            while True:
+                if self._disposed:
+                    raise LibdocWorkerError("Libdoc worker pool already disposed.")
+
+                if self._idle_workers:
+                    return self._idle_workers.pop()
+
+                if self._workers_count < self._max_workers:
+                    self._workers_count += 1
+                    self.workers_created += 1
+                    break
+
+                self._condition.wait()
+
+        try:
+            return _LibdocWorker()
+        except Exception as e:
+            self._release(None)
+            raise LibdocWorkerError(f"Unable to start libdoc worker: {e}")
+
+    def _release(self, worker: Optional[_LibdocWorker]) -> None:
+        with self._condition:
+            if worker is None or self._disposed:
+                self._workers_count -= 1
+            else:
+                self._idle_workers.append(worker)
+            self._condition.notify()
+
+        if worker is not None and self._disposed:
+            worker.dispose()
+
+    def _should_recycle(self, worker: _LibdocWorker) -> bool:
+        if worker.requests_handled >= self._max_requests_per_worker:
+            return True
+        if worker.memory > self._max_worker_memory:
+            return True
+        return False
+
+    def run_libdoc(self, argv: List[str], cwd: Optional[str]) -> Tuple[int, str]:
+        """
+        :param argv:
+            The arguments to libdoc (i.e.: what would be passed after
+            `python -m robot.libdoc`).
+
+        :return:
+            The return code and the output of libdoc.
+
+        :raises LibdocWorkerError:
+            If it wasn't possible to generate the libspec with a worker.
+        """
+        while True:
+            worker = self._acquire()
+            try:
+                ret = worker.run_libdoc(argv, cwd)
+            except _StaleLibdocWorkerError as e:
+                # Some module the worker has loaded changed: retry in another
+                # worker (the stale one already exited).
+                log.debug("Libdoc worker (pid: %s) is stale: %s", worker.pid, e)
+                self.workers_stale += 1
+                worker.dispose()
+                self._release(None)
+                continue
+            except BaseException:
+                worker.dispose()
+                self._release(None)
+                raise
+            break
+
+        if self._should_recycle(worker):
+            log.debug(
+                "Recycling libdoc worker (pid: %s, requests: %s, memory: %s).",
+                worker.pid,
+                worker.requests_handled,
+                worker.memory,
+            )
+            self.workers_recycled += 1
+            worker.dispose()
+            self._release(None)
+        else:
+            self._release(worker)
+        return ret
+
+    def dispose(self) -> None:
+        with self._condition:
+            self._disposed = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+            self._workers_count -= len(idle_workers)
+            self._condition.notify_all()
+
+        for worker in idle_workers:
+            worker.dispose()
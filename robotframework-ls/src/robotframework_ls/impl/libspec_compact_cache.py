@@ -0,0 +1,347 @@
+"""
+A compact cache for the contents of a `.libspec` (or of its markdown json
+version).
+
+Loading a libspec from the xml (or json) materializes the documentation of
+every keyword, which is rarely needed (it's only needed on hover, on the
+completion resolve, etc.), so, the compact version is saved as:
+
+    MAGIC (8 bytes)
+    token (16 bytes, random, changed whenever the file is written)
+    index length (8 bytes)
+    index (pickled with only builtin types)
+    documentation (utf-8 encoded, concatenated)
+
+The index has the names, arguments, tags, source, line info, the library
+documentation, etc. and is loaded eagerly whereas the keywords documentation
+is kept just as (offset, length) and is read from the file only when actually
+requested.
+
+The cache is keyed by the mtime of the `.libspec` (if it doesn't match the
+libspec must be loaded from the xml/json again).
+"""
+import io
+import os
+import pickle
+import struct
+import threading
+import typing
+import weakref
+from typing import Optional, List, Tuple, Any
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.protocols import ILibraryDoc
+from robotframework_ls.impl.robot_specbuilder import (
+    LibraryDoc,
+    KeywordDoc,
+    KeywordArg,
+    CustomDoc,
+    EnumDoc,
+    TypedDictDoc,
+)
+
+log = get_logger(__name__)
+
+_MAGIC = b"RFLSLIB1"
+_TOKEN_LEN = 16
+_INDEX_LEN_STRUCT = struct.Struct(">Q")
+_HEADER_LEN = len(_MAGIC) + _TOKEN_LEN + _INDEX_LEN_STRUCT.size
+
+# Increment if the contents of the index change.
+_INDEX_VERSION = 2
+
+# Kinds of compact versions (a libspec may have both).
+KIND_RAW = "raw"  # Loaded from the .libspec.
+KIND_MARKDOWN = "md"  # Loaded from the markdown json version.
+
+
+class _SafeUnpickler(pickle.Unpickler):
+    """
+    The index only has builtin types (so, don't allow any class to be loaded).
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Unexpected class in index: {module}.{name}")
+
+
+class _LazyDocsReader(object):
+    def __init__(self, filename: str, token: bytes, docs_start: int):
+        self._filename = filename
+        self._token = token
+        self._docs_start = docs_start
+
+    def read(self, offset: int, length: int) -> str:
+        if length <= 0:
+            return ""
+        try:
+            with open(self._filename, "rb") as stream:
+                header = stream.read(len(_MAGIC) + _TOKEN_LEN)
+                if header != _MAGIC + self._token:
+                    log.info(
+                        "Unable to load docs from: %s (file changed after being loaded).",
+                        self._filename,
+                    )
+                    return ""
+                stream.seek(self._docs_start + offset)
+                return stream.read(length).decode("utf-8")
+        except Exception:
+            log.exception("Error loading docs from: %s", self._filename)
+            return ""
+
+
+class _CompactLibraryDoc(LibraryDoc):
+    """
+    Note: the library documentation is kept in memory (it's requested in
+    many places, such as when filtering deprecated libraries, and there's
+    only one per library), only the keywords documentation is lazily loaded.
+    """
+
+
+class _CompactKeywordDoc(KeywordDoc):
+    def __init__(
+        self,
+        docs_reader: _LazyDocsReader,
+        doc_location: Tuple[int, int],
+        shortdoc: str,
+        deprecated: bool,
+        **kwargs,
+    ):
+        KeywordDoc.__init__(self, **kwargs)
+        self._docs_reader = docs_reader
+        self._doc_location = doc_location
+        self._doc: Optional[str] = None
+        self._compact_shortdoc = shortdoc
+        self._deprecated = deprecated
+
+    @property
+    def doc(self):
+        doc = self._doc
+        if doc is None:
+            # Note: not kept in memory (it's read again if needed).
+            return self._docs_reader.read(*self._doc_location)
+        return doc
+
+    @doc.setter
+    def doc(self, doc):
+        self._doc = doc
+
+    @property
+    def shortdoc(self):
+        if self._shortdoc or self._doc is not None:
+            return KeywordDoc.shortdoc.fget(self)  # type: ignore
+        return self._compact_shortdoc
+
+    @shortdoc.setter
+    def shortdoc(self, shortdoc):
+        self._shortdoc = shortdoc
+
+    @property
+    def deprecated(self) -> bool:
+        if self._doc is None:
+            return self._deprecated
+        return KeywordDoc.deprecated.fget(self)  # type: ignore
+
+
+class _DocsWriter(object):
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def add(self, doc: str) -> Tuple[int, int]:
+        if not doc:
+            return (0, 0)
+        contents = doc.encode("utf-8")
+        location = (self._offset, len(contents))
+        self._chunks.append(contents)
+        self._offset += len(contents)
+        return location
+
+    def get_contents(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+def _keyword_to_compact(keyword: KeywordDoc, docs_writer: _DocsWriter) -> tuple:
+    return (
+        keyword.name,
+        tuple(arg.to_compact() for arg in keyword.args),  # type: ignore
+        docs_writer.add(keyword.doc),
+        tuple(keyword.tags),
+        keyword._source,
+        keyword.lineno,
+        keyword.shortdoc,
+        keyword.deprecated,
+    )
+
+
+def _keyword_from_compact(
+    compact: tuple, weak_libdoc, docs_reader: _LazyDocsReader
+) -> KeywordDoc:
+    (name, args, doc_location, tags, source, lineno, shortdoc, deprecated) = compact
+    return _CompactKeywordDoc(
+        docs_reader,
+        doc_location,
+        shortdoc,
+        deprecated,
+        weak_libdoc=weak_libdoc,
+        name=name,
+        args=tuple(KeywordArg.from_compact(arg) for arg in args),
+        tags=tags,
+        source=source,
+        lineno=lineno,
+    )
+
+
+def _create_index(libdoc: LibraryDoc, mtime: float, docs_writer: _DocsWriter) -> dict:
+    return {
+        "version": _INDEX_VERSION,
+        "mtime": str(mtime),
+        "name": libdoc.name,
+        "doc": libdoc.doc,
+        "lib_version": libdoc.version,
+        "specversion": libdoc.specversion,
+        "type": libdoc.type,
+        "scope": libdoc.scope,
+        "named_args": libdoc.named_args,
+        "doc_format": libdoc.doc_format,
+        "source": libdoc._source,
+        "lineno": libdoc.lineno,
+        # Data types are usually small, so, they're kept as is.
+        "data_types": [data_type.to_dictionary() for data_type in libdoc.data_types],
+        "inits": [_keyword_to_compact(kw, docs_writer) for kw in libdoc.inits],
+        "keywords": [_keyword_to_compact(kw, docs_writer) for kw in libdoc.keywords],
+    }
+
+
+def _create_data_type(data_type: dict) -> Any:
+    type_name = data_type["type"]
+    if type_name == EnumDoc.type:
+        return EnumDoc(data_type["name"], data_type["doc"], data_type["members"])
+    if type_name == TypedDictDoc.type:
+        return TypedDictDoc(data_type["name"], data_type["doc"], data_type["items"])
+    return CustomDoc(data_type["name"], data_type["doc"])
+
+
+def _create_library_doc(
+    spec_filename: str, index: dict, docs_reader: _LazyDocsReader
+) -> LibraryDoc:
+    libdoc = _CompactLibraryDoc(
+        filename=spec_filename,
+        name=index["name"],
+        doc=index["doc"],
+        version=index["lib_version"],
+        specversion=index["specversion"],
+        type=index["type"],
+        scope=index["scope"],
+        named_args=index["named_args"],
+        doc_format=index["doc_format"],
+        source=index["source"],
+        lineno=index["lineno"],
+    )
+    libdoc.data_types = [_create_data_type(dt) for dt in index["data_types"]]
+
+    weak_libdoc = weakref.ref(libdoc)
+    libdoc.inits = [
+        _keyword_from_compact(kw, weak_libdoc, docs_reader) for kw in index["inits"]
+    ]
+    libdoc.keywords = [
+        _keyword_from_compact(kw, weak_libdoc, docs_reader) for kw in index["keywords"]
+    ]
+    return libdoc
+
+
+def get_compact_version_filename(libspec_manager, spec_filename: str, kind: str):
+    from robotframework_ls.impl.libspec_markdown_conversion import (
+        _get_markdown_json_version_filename,
+    )
+
+    # Kept alongside the markdown json version.
+    target_json = _get_markdown_json_version_filename(libspec_manager, spec_filename)
+    return f"{target_json[:-len('.json')]}.{kind}.compact"
+
+
+def write_compact_version(target: str, libdoc: LibraryDoc, mtime: float) -> None:
+    """
+    Writes the compact version of the given library doc to the given target
+    (the file is written to a temporary file and then renamed so that other
+    processes never see a partially written file).
+    """
+    docs_writer = _DocsWriter()
+    index = pickle.dumps(_create_index(libdoc, mtime, docs_writer), protocol=4)
+
+    temp_target = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_target, "wb") as stream:
+            stream.write(_MAGIC)
+            stream.write(os.urandom(_TOKEN_LEN))
+            stream.write(_INDEX_LEN_STRUCT.pack(len(index)))
+            stream.write(index)
+            stream.write(docs_writer.get_contents())
+        os.replace(temp_target, target)
+    finally:
+        if os.path.exists(temp_target):
+            os.remove(temp_target)
+
+
+def read_compact_version(
+    target: str, spec_filename: str, mtime: float
+) -> Optional[LibraryDoc]:
+    """
+    :return:
+        The library doc loaded (with the documentation loaded lazily) or None
+        if it wasn't possible to load it (i.e.: it doesn't exist or its mtime
+        doesn't match the one given).
+    """
+    try:
+        stream = open(target, "rb")
+    except Exception:
+        log.debug("Unable to load compact libspec: %s (file does not exist)", target)
+        return None
+
+    with stream:
+        header = stream.read(_HEADER_LEN)
+        if len(header) != _HEADER_LEN or not header.startswith(_MAGIC):
+            log.info("Unable to load compact libspec: %s (invalid header)", target)
+            return None
+
+        token = header[len(_MAGIC) : len(_MAGIC) + _TOKEN_LEN]
+        (index_len,) = _INDEX_LEN_STRUCT.unpack(header[len(_MAGIC) + _TOKEN_LEN :])
+        index_contents = stream.read(index_len)
+        if len(index_contents) != index_len:
+            log.info("Unable to load compact libspec: %s (invalid index)", target)
+            return None
+
+    index = _SafeUnpickler(io.BytesIO(index_contents)).load()
+    if index.get("version") != _INDEX_VERSION:
+        log.debug("Unable to load compact libspec: %s (version changed)", target)
+        return None
+
+    if index.get("mtime") != str(mtime):
+        log.debug("Unable to load compact libspec: %s (mtime changed)", target)
+        return None
+
+    docs_reader = _LazyDocsReader(target, token, _HEADER_LEN + index_len)
+    return _create_library_doc(spec_filename, index, docs_reader)
+
+
+def load_compact_version(
+    libspec_manager, spec_filename: str, mtime: float, kind: str
+) -> Optional[ILibraryDoc]:
+    target = get_compact_version_filename(libspec_manager, spec_filename, kind)
+    try:
+        return typing.cast(
+            Optional[ILibraryDoc], read_compact_version(target, spec_filename, mtime)
+        )
+    except Exception:
+        log.exception("Error loading compact libspec: %s", target)
+        return None
+
+
+def save_compact_version(
+    libspec_manager, spec_filename: str, mtime: float, kind: str, libdoc: ILibraryDoc
+) -> None:
+    target = get_compact_version_filename(libspec_manager, spec_filename, kind)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        write_compact_version(target, libdoc, mtime)  # type: ignore
+    except Exception:
+        log.exception("Error saving compact libspec: %s", target)
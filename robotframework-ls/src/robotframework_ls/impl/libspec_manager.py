@@ -3,7 +3,7 @@ import sys
 from robotframework_ls.constants import NULL
 from robocorp_ls_core.robotframework_log import get_logger
 import threading
-from typing import Optional, Dict, Set, Iterator, Union, Any
+from typing import Optional, Dict, Set, Iterator, Union, Any, List, Tuple
 from robocorp_ls_core.protocols import Sentinel, IEndPoint
 from robotframework_ls.impl.protocols import (
     ILibraryDoc,
@@ -11,7 +11,7 @@ from robotframework_ls.impl.protocols import (
     ICompletionContext,
 )
 import itertools
-from robocorp_ls_core.watchdog_wrapper import IFSObserver
+from robocorp_ls_core.watchdog_wrapper import IFSObserver, IFSWatch
 from robotframework_ls.impl.robot_lsp_constants import (
     OPTION_ROBOT_LIBRARIES_LIBDOC_NEEDS_ARGS,
 )
@@ -24,6 +24,7 @@ from pathlib import Path
 from contextlib import contextmanager
 import typing
 from robotframework_ls.impl.text_utilities import get_digest_from_string
+from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
 from robocorp_ls_core.basic import normalize_filename
 
 log = get_logger(__name__)
@@ -66,10 +67,10 @@ def _load_library_doc_and_mtime(libspec_manager, spec_filename: str, obtain_mute
         Should be False if this is part of a bigger operation that already
         has the spec_filename mutex.
     """
-    from robotframework_ls.impl import robot_specbuilder
     from robotframework_ls.impl.libspec_markdown_conversion import (
         load_markdown_json_version,
     )
+    from robotframework_ls.impl import libspec_compact_cache
 
     ctx: Any
     if obtain_mutex:
@@ -81,28 +82,67 @@ def _load_library_doc_and_mtime(libspec_manager, spec_filename: str, obtain_mute
         try:
             mtime = os.path.getmtime(spec_filename)
             if not libspec_manager.is_copy:
+                libdoc = libspec_compact_cache.load_compact_version(
+                    libspec_manager,
+                    spec_filename,
+                    mtime,
+                    libspec_compact_cache.KIND_MARKDOWN,
+                )
+                if libdoc is not None:
+                    return libdoc, mtime
+
                 libdoc = load_markdown_json_version(
                     libspec_manager, spec_filename, mtime
                 )
+                if libdoc is not None:
+                    libspec_compact_cache.save_compact_version(
+                        libspec_manager,
+                        spec_filename,
+                        mtime,
+                        libspec_compact_cache.KIND_MARKDOWN,
+                        libdoc,
+                    )
+                    return libdoc, mtime
 
-                if libdoc is None:
-                    builder = robot_specbuilder.SpecDocBuilder()
-                    libdoc = builder.build(spec_filename)
-                    if libdoc.doc_format != "markdown":
-                        libspec_manager.schedule_conversion_to_markdown(spec_filename)
+                libdoc = _load_raw_library_doc(libspec_manager, spec_filename, mtime)
+                if libdoc.doc_format != "markdown":
+                    libspec_manager.schedule_conversion_to_markdown(spec_filename)
                 return libdoc, mtime
 
             else:
                 # For a copy we don't use markdown by default, rather
                 # we always use the raw format and convert as needed.
-                builder = robot_specbuilder.SpecDocBuilder()
-                libdoc = builder.build(spec_filename)
+                libdoc = _load_raw_library_doc(libspec_manager, spec_filename, mtime)
                 return libdoc, mtime
         except Exception:
             log.exception("Error when loading spec info from: %s", spec_filename)
             return None
 
 
+def _load_raw_library_doc(libspec_manager, spec_filename: str, mtime: float):
+    """
+    Loads the library doc from the compact version of the .libspec (or from
+    the .libspec itself if the compact version is not available).
+    """
+    from robotframework_ls.impl import robot_specbuilder
+    from robotframework_ls.impl import libspec_compact_cache
+
+    libdoc = libspec_compact_cache.load_compact_version(
+        libspec_manager, spec_filename, mtime, libspec_compact_cache.KIND_RAW
+    )
+    if libdoc is None:
+        builder = robot_specbuilder.SpecDocBuilder()
+        libdoc = builder.build(spec_filename)
+        libspec_compact_cache.save_compact_version(
+            libspec_manager,
+            spec_filename,
+            mtime,
+            libspec_compact_cache.KIND_RAW,
+            libdoc,
+        )
+    return libdoc
+
+
 def _load_lib_info(libspec_manager, canonical_spec_filename: str, can_regenerate: bool):
     libdoc_and_mtime = _load_library_doc_and_mtime(
         libspec_manager, canonical_spec_filename
@@ -118,7 +158,7 @@ _SOURCE_TO_MTIME = "source_to_mtime"
 _UNABLE_TO_LOAD = "unable_to_load"
 
 
-def _create_updated_source_to_mtime(library_doc):
+def _get_library_doc_sources(library_doc) -> Set[str]:
     sources = set()
 
     source = library_doc.source
@@ -129,9 +169,12 @@ def _create_updated_source_to_mtime(library_doc):
         source = keyword.source
         if source is not None:
             sources.add(source)
+    return sources
 
+
+def _create_updated_source_to_mtime(library_doc):
     source_to_mtime = {}
-    for source in sources:
+    for source in _get_library_doc_sources(library_doc):
         try:
             # i.e.: get it before normalizing (but leave the cache key normalized).
             # This is because even on windows the file-system may end up being
@@ -220,6 +263,7 @@ class _LibInfo(object):
         "_additional_info",
         "_invalid",
         "_can_regenerate",
+        "__weakref__",
     ]
 
     def __init__(self, library_doc: ILibraryDoc, mtime, spec_filename, can_regenerate):
@@ -390,6 +434,257 @@ class _FolderInfo(object):
         return new_libspec_filename_to_info
 
 
+def _get_file_id(filename: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(filename)
+    except Exception:
+        return None
+    if not stat.st_ino:
+        # Not available in this filesystem.
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+# Used to give a new version to each _LibInfoIndex created.
+_next_lib_info_index_version = itertools.count(1)
+
+
+class _LibInfoIndex(object):
+    """
+    Provides the _LibInfo which may match some library without traversing all
+    the tracked libspecs.
+
+    The _LibInfo are kept in the same order from `LibspecManager.iter_lib_info`
+    (which is the priority order) and the lookups provide the entries in that
+    same order.
+
+    Note: the index is created for a given set of `libspec_canonical_filename_to_info`
+    (which are replaced when the tracked .libspec files change) along with the
+    blacklist/deprecated libraries and must be recreated when any of those
+    change.
+    """
+
+    def __init__(
+        self,
+        canonical_filename_to_infos: Tuple[dict, ...],
+        blacklist,
+        deprecated_library_name_to_replacement: Dict[str, str],
+        lib_infos: List[_LibInfo],
+    ):
+        self._canonical_filename_to_infos = canonical_filename_to_infos
+        self._blacklist = blacklist
+        self._deprecated_library_name_to_replacement = (
+            deprecated_library_name_to_replacement
+        )
+        self._lib_infos = lib_infos
+        self.version = next(_next_lib_info_index_version)
+
+        self._name_lower_to_positions: Dict[str, List[int]] = {}
+        self._spec_basename_to_positions: Dict[str, List[int]] = {}
+        self._source_to_positions: Dict[str, List[int]] = {}
+
+        # Only computed if some target file doesn't match any source by its
+        # name (so that os.stat() isn't called for all the sources beforehand).
+        self._file_id_to_positions: Optional[Dict[Tuple[int, int], List[int]]] = None
+
+        for i, lib_info in enumerate(lib_infos):
+            library_doc = lib_info.library_doc
+            if library_doc.name:
+                self._name_lower_to_positions.setdefault(
+                    library_doc.name.lower(), []
+                ).append(i)
+
+            if library_doc.filename:
+                self._spec_basename_to_positions.setdefault(
+                    os.path.normcase(os.path.basename(library_doc.filename)), []
+                ).append(i)
+
+            if library_doc.source and lib_info._can_regenerate:
+                self._source_to_positions.setdefault(
+                    normalize_filename(library_doc.source), []
+                ).append(i)
+
+    def is_valid_for(
+        self,
+        canonical_filename_to_infos: Tuple[dict, ...],
+        blacklist,
+        deprecated_library_name_to_replacement: Dict[str, str],
+    ) -> bool:
+        if len(canonical_filename_to_infos) != len(self._canonical_filename_to_infos):
+            return False
+
+        for d1, d2 in zip(
+            canonical_filename_to_infos, self._canonical_filename_to_infos
+        ):
+            if d1 is not d2:
+                return False
+
+        return (
+            self._deprecated_library_name_to_replacement
+            is deprecated_library_name_to_replacement
+            and self._blacklist == blacklist
+        )
+
+    def get_positions_by_name(self, name_lower: str) -> List[int]:
+        return self._name_lower_to_positions.get(name_lower, [])
+
+    def get_positions_by_spec_basename(self, spec_basename: str) -> List[int]:
+        return self._spec_basename_to_positions.get(os.path.normcase(spec_basename), [])
+
+    def get_positions_by_source(self, normalized_source: str, source: str) -> List[int]:
+        found = self._source_to_positions.get(normalized_source)
+        if found:
+            return found
+
+        # Fallback to match the same file with a different name (i.e.: links).
+        file_id = _get_file_id(source)
+        if file_id is None:
+            return []
+
+        file_id_to_positions = self._file_id_to_positions
+        if file_id_to_positions is None:
+            file_id_to_positions = {}
+            for positions in self._source_to_positions.values():
+                # All the entries in positions have the same source.
+                source_file_id = _get_file_id(
+                    self._lib_infos[positions[0]].library_doc.source
+                )
+                if source_file_id is not None:
+                    file_id_to_positions.setdefault(source_file_id, []).extend(
+                        positions
+                    )
+            self._file_id_to_positions = file_id_to_positions
+
+        return file_id_to_positions.get(file_id, [])
+
+    def iter_lib_infos(self, *positions: List[int]) -> Iterator[_LibInfo]:
+        """
+        Provides the _LibInfo in the given positions in the priority order.
+        """
+        lib_infos = self._lib_infos
+        for i in sorted(set(itertools.chain(*positions))):
+            yield lib_infos[i]
+
+
+# The extensions of the library sources whose changes are tracked by the
+# filesystem observer.
+_TRACKED_LIBRARY_SOURCE_EXTENSIONS = (".py", ".pyd", ".so", ".java", ".class")
+
+
+class _LibrarySourcesSyncCache(object):
+    """
+    Caches the result of `_LibInfo.verify_sources_sync()`.
+
+    The folders with the sources of the libraries are tracked by the filesystem
+    observer and the cached result for a library is discarded when one of its
+    sources changes (so, the sources are not checked on each lookup).
+
+    Libraries with some source whose extension isn't tracked (see:
+    `_TRACKED_LIBRARY_SOURCE_EXTENSIONS`) have the mtime of the sources
+    verified on each access.
+    """
+
+    def __init__(self, observer: IFSObserver, notifier, enabled: bool):
+        import weakref
+
+        self._observer = observer
+        self._notifier = notifier
+
+        # When the observer doesn't notify changes the sources must be
+        # verified on each access.
+        self._enabled = enabled
+
+        self._lock = threading.Lock()
+        self._folder_to_watch: Dict[str, IFSWatch] = {}
+        self._source_to_lib_infos: Dict[str, "weakref.WeakSet[_LibInfo]"] = {}
+        self._in_sync: "weakref.WeakSet[_LibInfo]" = weakref.WeakSet()
+        self._changes_count = 0
+        self._disposed = False
+
+    def verify_sources_sync(self, lib_info: _LibInfo) -> bool:
+        import weakref
+
+        if not self._enabled:
+            return lib_info.verify_sources_sync()
+
+        if lib_info in self._in_sync:
+            return True
+
+        sources = set(
+            _normfile(source)
+            for source in _get_library_doc_sources(lib_info.library_doc)
+        )
+        for source in sources:
+            if not source.lower().endswith(_TRACKED_LIBRARY_SOURCE_EXTENSIONS):
+                return lib_info.verify_sources_sync()
+
+        new_folders = []
+        with self._lock:
+            for source in sources:
+                lib_infos = self._source_to_lib_infos.get(source)
+                if lib_infos is None:
+                    lib_infos = self._source_to_lib_infos[source] = weakref.WeakSet()
+                lib_infos.add(lib_info)
+
+                folder = os.path.dirname(source)
+                if folder not in self._folder_to_watch:
+                    self._folder_to_watch[folder] = NULL
+                    new_folders.append(folder)
+
+        # Start tracking before verifying so that a change done while the
+        # verification happens isn't lost.
+        for folder in new_folders:
+            self._start_watch(folder)
+
+        with self._lock:
+            changes_count = self._changes_count
+
+        if not lib_info.verify_sources_sync():
+            return False
+
+        with self._lock:
+            if changes_count == self._changes_count:
+                self._in_sync.add(lib_info)
+        return True
+
+    def _start_watch(self, folder: str) -> None:
+        from robocorp_ls_core.watchdog_wrapper import PathInfo
+
+        if not os.path.isdir(folder):
+            return
+
+        log.debug("Tracking library sources folder for changes: %s", folder)
+        watch = self._observer.notify_on_any_change(
+            [PathInfo(folder, recursive=False)],
+            self._notifier.on_change,
+            (None,),
+            extensions=_TRACKED_LIBRARY_SOURCE_EXTENSIONS,
+        )
+        with self._lock:
+            if self._disposed:
+                watch.stop_tracking()
+            else:
+                self._folder_to_watch[folder] = watch
+
+    def on_source_changed(self, source: str) -> None:
+        source = _normfile(source)
+        with self._lock:
+            self._changes_count += 1
+            for lib_info in list(self._source_to_lib_infos.get(source, ())):
+                self._in_sync.discard(lib_info)
+
+    def dispose(self) -> None:
+        with self._lock:
+            self._disposed = True
+            folder_to_watch = self._folder_to_watch
+            self._folder_to_watch = {}
+            self._source_to_lib_infos.clear()
+            self._in_sync.clear()
+
+        for watch in folder_to_watch.values():
+            watch.stop_tracking()
+
+
 class LibspecManager(object):
     """
     Used to manage the libspec files.
@@ -524,12 +819,17 @@ class LibspecManager(object):
 
             self.libspec_markdown_conversion: Optional[
                 LibspecMarkdownConversion
-            ] = LibspecMarkdownConversion(self)
+            ] = LibspecMarkdownConversion(self, endpoint)
         else:
             self.libspec_markdown_conversion = None
 
         self._libspec_warmup = LibspecWarmup(endpoint, dir_cache)
 
+        # Created on demand (see: _subprocess_check_output).
+        self._libdoc_worker_pool: Optional[LibdocWorkerPool] = None
+        self._libdoc_worker_pool_lock = threading.Lock()
+        self._disposed = False
+
         self._libspec_failures_cache: Dict[
             tuple, str
         ] = {}  # key -> error creating libspec
@@ -545,9 +845,20 @@ class LibspecManager(object):
         self._fs_observer = observer
 
         self._file_changes_notifier = watchdog_wrapper.create_notifier(
-            self._on_file_changed, timeout=0.5, extensions=(".libspec", ".py")
+            self._on_file_changed,
+            timeout=0.5,
+            extensions=(".libspec",) + _TRACKED_LIBRARY_SOURCE_EXTENSIONS,
+        )
+
+        self._library_sources_sync_cache = _LibrarySourcesSyncCache(
+            observer,
+            self._file_changes_notifier,
+            enabled=observer.notifies_changes(),
         )
 
+        # builtin -> index (recreated when the tracked .libspec files change).
+        self._lib_info_indexes: Dict[bool, _LibInfoIndex] = {}
+
         # Spec info found in the workspace
         self._workspace_folder_uri_to_folder_info: Dict[str, _FolderInfo] = {}
         self._additional_pythonpath_folder_to_folder_info: Dict[str, _FolderInfo] = {}
@@ -696,14 +1007,13 @@ class LibspecManager(object):
         # Notify _FolderInfo._on_change_spec
         lowername = spec_file.lower()
         if lowername.endswith(".libspec"):
-            folder_info_on_change_spec(spec_file)
-        elif lowername.endswith(".py"):
-            # Note: right now we don't act on .py info.
-            # This means that the caches for libraries will actually be invalid
-            # until someone calls 'libspec_manager.get_library_doc_or_error'
-            # for that library again (at which point it verifies the timestamp
-            # of the library).
-            pass
+            if folder_info_on_change_spec is not None:
+                folder_info_on_change_spec(spec_file)
+        elif lowername.endswith(_TRACKED_LIBRARY_SOURCE_EXTENSIONS):
+            # Note: the library is regenerated when someone calls
+            # 'libspec_manager.get_library_doc_or_error' for that library
+            # again (at which point it verifies the timestamp of the library).
+            self._library_sources_sync_cache.on_source_changed(spec_file)
 
     def add_workspace_folder(self, folder_uri: str):
         self._check_in_main_thread()
@@ -798,9 +1108,7 @@ class LibspecManager(object):
 
         yield from self._additional_pythonpath_folder_to_folder_info.keys()
 
-    def iter_lib_info(self, builtin=False):
-        from robotframework_ls.impl.text_utilities import has_deprecated_text
-
+    def _get_libraries_blacklist(self):
         blacklist = ()
         if self.config is not None:
             from robotframework_ls.impl.robot_generated_lsp_constants import (
@@ -814,10 +1122,28 @@ class LibspecManager(object):
                 blacklist = ()
             else:
                 blacklist = set(blacklist)
+        return blacklist
 
-        deprecated_library_name_to_replacement = (
-            self._deprecated_library_name_to_replacement
+    def get_lib_infos_version(self, builtin=False) -> int:
+        """
+        :return:
+            A number which changes whenever the libraries provided by
+            `iter_lib_info` (for the given `builtin`) may have changed.
+        """
+        return self._get_lib_info_index(builtin).version
+
+    def iter_lib_info(self, builtin=False):
+        yield from self._iter_lib_info_filtered(
+            builtin,
+            self._get_libraries_blacklist(),
+            self._deprecated_library_name_to_replacement,
         )
+
+    def _iter_lib_info_filtered(
+        self, builtin, blacklist, deprecated_library_name_to_replacement
+    ):
+        from robotframework_ls.impl.text_utilities import has_deprecated_text
+
         for libinfo in self._iter_lib_info(builtin):
             if libinfo.library_doc.name not in blacklist:
                 deprecated = deprecated_library_name_to_replacement.get(
@@ -830,21 +1156,56 @@ class LibspecManager(object):
                         libinfo.library_doc.__original_doc__ = libinfo.library_doc.doc
                         libinfo.library_doc.doc = deprecated + libinfo.library_doc.doc
                 else:
-                    if libinfo.library_doc.doc and hasattr(
-                        libinfo.library_doc, "__original_doc__"
+                    if (
+                        hasattr(libinfo.library_doc, "__original_doc__")
+                        and libinfo.library_doc.doc
                     ):
                         libinfo.library_doc.doc = libinfo.library_doc.__original_doc__
                         delattr(libinfo.library_doc, "__original_doc__")
 
                 yield libinfo
 
-    def _iter_lib_info(self, builtin=False):
+    def _get_lib_info_index(self, builtin: bool) -> _LibInfoIndex:
+        blacklist = self._get_libraries_blacklist()
+        deprecated_library_name_to_replacement = (
+            self._deprecated_library_name_to_replacement
+        )
+        canonical_filename_to_infos = tuple(
+            canonical_filename_to_info
+            for canonical_filename_to_info, _can_regenerate in self._get_canonical_filename_to_infos(
+                builtin
+            )
+        )
+
+        index = self._lib_info_indexes.get(builtin)
+        if index is None or not index.is_valid_for(
+            canonical_filename_to_infos,
+            blacklist,
+            deprecated_library_name_to_replacement,
+        ):
+            index = _LibInfoIndex(
+                canonical_filename_to_infos,
+                blacklist,
+                deprecated_library_name_to_replacement,
+                list(
+                    self._iter_lib_info_filtered(
+                        builtin, blacklist, deprecated_library_name_to_replacement
+                    )
+                ),
+            )
+            self._lib_info_indexes[builtin] = index
+        return index
+
+    def _get_canonical_filename_to_infos(
+        self, builtin: bool
+    ) -> List[Tuple[Dict[str, Optional[_LibInfo]], bool]]:
         """
-        :rtype: generator(_LibInfo)
+        :return: a list with the (libspec_canonical_filename_to_info, can_regenerate)
+        to be searched.
         """
         # Note: the iteration order is important (first ones are visited earlier
         # and have higher priority).
-        iter_in = []
+        iter_in: List[Tuple[Dict[str, Optional[_LibInfo]], bool]] = []
         for _uri, info in self._workspace_folder_uri_to_folder_info.items():
             if info.libspec_canonical_filename_to_info:
                 iter_in.append((info.libspec_canonical_filename_to_info, False))
@@ -865,8 +1226,16 @@ class LibspecManager(object):
             for _uri, info in self._internal_folder_to_folder_info.items():
                 if info.libspec_canonical_filename_to_info:
                     iter_in.append((info.libspec_canonical_filename_to_info, True))
+        return iter_in
 
-        for canonical_filename_to_info, can_regenerate in iter_in:
+    def _iter_lib_info(self, builtin=False):
+        """
+        :rtype: generator(_LibInfo)
+        """
+        for (
+            canonical_filename_to_info,
+            can_regenerate,
+        ) in self._get_canonical_filename_to_infos(builtin):
             for canonical_spec_filename, info in list(
                 canonical_filename_to_info.items()
             ):
@@ -926,11 +1295,44 @@ class LibspecManager(object):
 
         return error_creating
 
-    def _subprocess_check_output(self, *args, **kwargs):
+    def _get_libdoc_worker_pool(self) -> Optional[LibdocWorkerPool]:
+        from robotframework_ls.impl.libdoc_worker_pool import (
+            get_default_max_workers,
+        )
+
+        with self._libdoc_worker_pool_lock:
+            if self._libdoc_worker_pool is None and not self._disposed:
+                max_workers = get_default_max_workers()
+                if max_workers > 0:
+                    self._libdoc_worker_pool = LibdocWorkerPool(max_workers)
+            return self._libdoc_worker_pool
+
+    def _subprocess_check_output(self, call, **kwargs):
         # Only done for mocking.
         from robocorp_ls_core.subprocess_wrapper import subprocess
+        from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerError
 
-        return subprocess.check_output(*args, **kwargs)
+        if call[:3] == [sys.executable, "-m", "robot.libdoc"]:
+            # Use a worker which already has robot imported if possible.
+            libdoc_worker_pool = self._get_libdoc_worker_pool()
+            if libdoc_worker_pool is not None:
+                try:
+                    returncode, output = libdoc_worker_pool.run_libdoc(
+                        call[3:], kwargs.get("cwd")
+                    )
+                except LibdocWorkerError:
+                    log.exception(
+                        "Error generating libspec in libdoc worker (a new process will be used)."
+                    )
+                else:
+                    bytes_output = output.encode("utf-8", "replace")
+                    if returncode != 0:
+                        raise subprocess.CalledProcessError(
+                            returncode, call, bytes_output
+                        )
+                    return bytes_output
+
+        return subprocess.check_output(call, **kwargs)
 
     def _cached_create_libspec(
         self,
@@ -1122,7 +1524,15 @@ class LibspecManager(object):
                 log.debug("Took: %.2fs to generate info for: %s" % (delta, libname))
 
     def dispose(self):
+        with self._libdoc_worker_pool_lock:
+            self._disposed = True
+            libdoc_worker_pool = self._libdoc_worker_pool
+            self._libdoc_worker_pool = None
+        if libdoc_worker_pool is not None:
+            libdoc_worker_pool.dispose()
+
         self._file_changes_notifier.dispose()
+        self._library_sources_sync_cache.dispose()
         if self.libspec_markdown_conversion is not None:
             self.libspec_markdown_conversion.dispose()
 
@@ -1213,6 +1623,47 @@ class LibspecManager(object):
 
         return target_file
 
+    def _iter_lib_info_candidates(
+        self,
+        builtin: bool,
+        libname: str,
+        libname_lower: str,
+        target_file: str,
+        normalized_target_file: str,
+        args: Optional[str],
+    ) -> Iterator[_LibInfo]:
+        """
+        Provides the _LibInfo which may match the given library (in the same
+        order from `iter_lib_info`). Callers must still check whether each
+        entry actually matches.
+        """
+        index = self._get_lib_info_index(builtin)
+
+        target_file_positions: List[int] = []
+        if target_file:
+            if args:
+                digest = (
+                    get_digest_from_string(target_file)
+                    + "_"
+                    + get_digest_from_string(args)
+                )
+                target_file_positions = index.get_positions_by_spec_basename(
+                    digest + ".libspec"
+                )
+            else:
+                target_file_positions = index.get_positions_by_source(
+                    normalized_target_file, target_file
+                )
+
+        if not args:
+            name_positions = index.get_positions_by_name(libname_lower)
+        else:
+            name_positions = index.get_positions_by_spec_basename(
+                os.path.basename(libname + get_digest_from_string(args) + ".libspec")
+            )
+
+        return index.iter_lib_infos(target_file_positions, name_positions)
+
     def get_library_doc_or_error(
         self,
         libname: str,
@@ -1294,7 +1745,9 @@ class LibspecManager(object):
             libname_lower = os.path.basename(libname_lower)
 
         lib_info: _LibInfo
-        for lib_info in self.iter_lib_info(builtin=builtin):
+        for lib_info in self._iter_lib_info_candidates(
+            builtin, libname, libname_lower, target_file, normalized_target_file, args
+        ):
             library_doc = lib_info.library_doc
 
             # If it maps to a file in the filesystem, that's what we need to match,
@@ -1338,7 +1791,7 @@ class LibspecManager(object):
                     )
 
             if found:
-                if not lib_info.verify_sources_sync():
+                if not self._library_sources_sync_cache.verify_sources_sync(lib_info):
                     if create:
                         # Found but it's not in sync. Try to regenerate (don't proceed
                         # because we don't want to match a lower priority item, so,
@@ -1360,6 +1813,10 @@ class LibspecManager(object):
                         # Not in sync and it should not be created, just skip it.
                         continue
                 else:
+                    libspec_markdown_conversion = self.libspec_markdown_conversion
+                    if libspec_markdown_conversion is not None:
+                        # Libraries being used are converted to markdown first.
+                        libspec_markdown_conversion.prioritize(library_doc.filename)
                     return _LibraryDocOrError(library_doc, None)
 
         if create:
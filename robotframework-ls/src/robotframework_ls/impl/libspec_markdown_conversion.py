@@ -1,7 +1,9 @@
 from robotframework_ls.impl.text_utilities import get_digest_from_string
 import os
-from typing import Optional
+from typing import Optional, Callable, Any, Dict, List, Set, Tuple
 from robotframework_ls.impl.protocols import ILibraryDoc
+from robocorp_ls_core.protocols import IEndPoint
+from robocorp_ls_core.constants import NULL
 from robocorp_ls_core.robotframework_log import get_logger
 import threading
 import robotframework_ls
@@ -126,49 +128,278 @@ def _convert_to_markdown_if_needed(spec_filename, target_json) -> None:
     os.remove(tempf.name)
 
 
+def _is_conversion_needed(spec_filename: str, target_json: str) -> bool:
+    """
+    Checks whether the target json is outdated (without doing the conversion).
+    """
+    try:
+        mtime = os.path.getmtime(spec_filename)
+    except Exception:
+        # i.e.: the spec was removed in the meanwhile.
+        return False
+
+    try:
+        with open(target_json, "r", encoding="utf-8") as existing_stream:
+            current_mtime = _get_mtime_from_stream(existing_stream)
+    except Exception:
+        return True
+
+    return str(mtime) != str(current_mtime)
+
+
+def _create_env() -> dict:
+    env = os.environ.copy()
+
+    # Make sure we're in the pythonpath.
+    env["PYTHONPATH"] = os.pathsep.join(
+        [
+            os.path.dirname(os.path.dirname(robotframework_ls.__file__)),
+            os.path.dirname(os.path.dirname(robocorp_ls_core.__file__)),
+        ]
+    )
+    return env
+
+
+class _ConversionWorkerError(Exception):
+    pass
+
+
+class _ConversionWorker(object):
+    """
+    A process which converts many libspecs to markdown (started as
+    `python libspec_markdown_conversion.py --worker` and communicating through
+    the same messages used by the libdoc worker).
+    """
+
+    def __init__(self):
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+
+        self._process = subprocess.Popen(
+            [sys.executable, "-u", __file__, "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_create_env(),
+        )
+        self._next_id = 0
+        log.debug("Started libspec to markdown worker (pid: %s).", self._process.pid)
+
+    def convert(self, spec_filename: str, target_json: str) -> Optional[str]:
+        """
+        :return: an error message if the conversion failed or None if it worked.
+        """
+        from robotframework_ls.impl.libdoc_worker import read_message, write_message
+
+        self._next_id += 1
+        message_id = self._next_id
+        try:
+            write_message(
+                self._process.stdin,
+                {
+                    "jsonrpc": "2.0",
+                    "id": message_id,
+                    "method": "convert",
+                    "params": {
+                        "spec_filename": spec_filename,
+                        "target_json": target_json,
+                    },
+                },
+            )
+            response = read_message(self._process.stdout)
+        except Exception as e:
+            raise _ConversionWorkerError(
+                f"Error communicating with libspec to markdown worker: {e}"
+            )
+
+        if response is None:
+            raise _ConversionWorkerError(
+                f"Libspec to markdown worker exited (exit code: {self._process.poll()})."
+            )
+
+        if response.get("id") != message_id or "result" not in response:
+            raise _ConversionWorkerError(
+                f"Unexpected libspec to markdown worker response: {response}"
+            )
+        return response["result"].get("error")
+
+    def dispose(self) -> None:
+        from robotframework_ls.impl.libdoc_worker import write_message
+        from robocorp_ls_core.subprocess_wrapper import subprocess
+
+        process = self._process
+        if process.poll() is None:
+            try:
+                write_message(process.stdin, {"jsonrpc": "2.0", "method": "exit"})
+                process.stdin.close()
+            except Exception:
+                pass
+            try:
+                process.wait(2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
 class _ConversionThread(threading.Thread):
+    """
+    Converts the scheduled libspecs in batches: the specs scheduled together
+    are converted by (at most) `MAX_WORKERS` processes, each converting many
+    specs (the prioritized ones are converted first).
+    """
+
     DISPOSE = "DISPOSE"
 
-    def __init__(self):
+    # Time to wait for more specs to be scheduled before starting a batch.
+    BATCH_DELAY = 0.5
+
+    MAX_WORKERS = max(1, min(2, os.cpu_count() or 1))
+
+    def __init__(
+        self,
+        is_prioritized: Callable[[str], bool],
+        endpoint: Optional[IEndPoint] = None,
+    ):
         import queue
 
         threading.Thread.__init__(self)
+        self.name = "Libspec to markdown conversion thread"
         self.daemon = True
-        self.queue = queue.Queue()
+        self.queue: "queue.Queue[Any]" = queue.Queue()
+        self._is_prioritized = is_prioritized
+        self._endpoint = endpoint
+        self._disposed = False
+
+        # Stats
+        self.workers_created = 0
 
     def run(self):
-        from robocorp_ls_core.subprocess_wrapper import subprocess
+        import queue
+        import time
 
         while True:
             entry = self.queue.get()
             if entry == self.DISPOSE:
                 return
 
-            spec_filename, target_json = entry
-            env = os.environ.copy()
+            entries = [entry]
+            time.sleep(self.BATCH_DELAY)
+            while True:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry == self.DISPOSE:
+                    return
+                entries.append(entry)
+
+            try:
+                self._convert_batch(entries)
+            except Exception:
+                log.exception("Error converting libspecs to markdown.")
+
+    def _convert_batch(self, entries: List[Tuple[str, str]]) -> None:
+        from robocorp_ls_core.progress_report import progress_context
+        from robocorp_ls_core.progress_report import ProgressWrapperForTotalWork
+
+        # target_json -> spec_filename (keeps the order in which those were
+        # scheduled).
+        target_json_to_spec_filename: Dict[str, str] = {}
+        for spec_filename, target_json in entries:
+            if target_json not in target_json_to_spec_filename:
+                if _is_conversion_needed(spec_filename, target_json):
+                    target_json_to_spec_filename[target_json] = spec_filename
+
+        pending = [
+            (spec_filename, target_json)
+            for target_json, spec_filename in target_json_to_spec_filename.items()
+        ]
+        if not pending:
+            return
+
+        spec_filename_to_key = dict(
+            (spec_filename, normalize_filename(os.path.realpath(spec_filename)))
+            for spec_filename, _target_json in pending
+        )
 
-            # Make sure we're in the pythonpath.
-            env["PYTHONPATH"] = os.pathsep.join(
-                [
-                    os.path.dirname(os.path.dirname(robotframework_ls.__file__)),
-                    os.path.dirname(os.path.dirname(robocorp_ls_core.__file__)),
-                ]
+        ctx: Any
+        if self._endpoint is not None:
+            ctx = progress_context(
+                self._endpoint, "Convert libspec docs to markdown", None
             )
+        else:
+            ctx = NULL
+
+        lock = threading.Lock()
+
+        def pop_next() -> Optional[Tuple[str, str]]:
+            with lock:
+                if self._disposed or not pending:
+                    return None
 
+                # Libraries used in the documents being analyzed first
+                # (otherwise keep the scheduled order).
+                for i, entry in enumerate(pending):
+                    if self._is_prioritized(spec_filename_to_key[entry[0]]):
+                        return pending.pop(i)
+                return pending.pop(0)
+
+        def convert_pending(progress_wrapper: ProgressWrapperForTotalWork) -> None:
+            worker: Optional[_ConversionWorker] = None
             try:
-                subprocess.check_output(
-                    [sys.executable, __file__, spec_filename, target_json],
-                    stderr=subprocess.STDOUT,
-                    stdin=subprocess.PIPE,
-                    env=env,
-                )
-            except subprocess.CalledProcessError as e:
-                log.exception(
-                    "Error converting libspec to markdown: %s.\nReturn code: %s\nOutput:\n%s",
-                    spec_filename,
-                    e.returncode,
-                    e.output,
-                )
+                while True:
+                    entry = pop_next()
+                    if entry is None:
+                        return
+
+                    spec_filename, target_json = entry
+                    if worker is None:
+                        worker = _ConversionWorker()
+                        with lock:
+                            self.workers_created += 1
+                    try:
+                        error = worker.convert(spec_filename, target_json)
+                    except _ConversionWorkerError:
+                        log.exception(
+                            "Error converting libspec to markdown: %s.", spec_filename
+                        )
+                        # Start a new worker for the next one.
+                        worker.dispose()
+                        worker = None
+                    else:
+                        if error:
+                            log.info(
+                                "Error converting libspec to markdown: %s.\n%s",
+                                spec_filename,
+                                error,
+                            )
+                    progress_wrapper.increment_step_done()
+            finally:
+                if worker is not None:
+                    worker.dispose()
+
+        with ctx as progress_reporter:
+            progress_wrapper = ProgressWrapperForTotalWork(progress_reporter)
+            for _entry in pending:
+                progress_wrapper.increment_total_steps()
+
+            threads = []
+            for _i in range(min(self.MAX_WORKERS, len(pending))):
+                t = threading.Thread(target=convert_pending, args=(progress_wrapper,))
+                t.daemon = True
+                t.start()
+                threads.append(t)
+
+            for t in threads:
+                t.join()
+
+    def dispose(self):
+        self._disposed = True
+        self.queue.put(self.DISPOSE)
 
 
 def _get_markdown_json_version_filename(libspec_manager, spec_filename: str) -> str:
@@ -183,16 +414,32 @@ def _get_markdown_json_version_filename(libspec_manager, spec_filename: str) ->
 
 
 class LibspecMarkdownConversion:
-    def __init__(self, libspec_manager):
-        self._conversion_thread = _ConversionThread()
+    def __init__(self, libspec_manager, endpoint: Optional[IEndPoint] = None):
+        self._conversion_thread = _ConversionThread(self._is_prioritized, endpoint)
         self._started = False
         self._weak_libspec_manager = weakref.ref(libspec_manager)
 
+        # The (normalized) spec filenames of the libraries which were requested
+        # (i.e.: imported by the documents being analyzed).
+        self._prioritized_spec_filenames: Set[str] = set()
+
     def get_markdown_json_version_filename(self, spec_filename: str) -> str:
         libspec_manager = self._weak_libspec_manager()
         assert libspec_manager is not None
         return _get_markdown_json_version_filename(libspec_manager, spec_filename)
 
+    def prioritize(self, spec_filename: str) -> None:
+        """
+        Marks that the given spec should be converted before the others.
+
+        :param spec_filename:
+            The spec filename (already normalized).
+        """
+        self._prioritized_spec_filenames.add(spec_filename)
+
+    def _is_prioritized(self, normalized_spec_filename: str) -> bool:
+        return normalized_spec_filename in self._prioritized_spec_filenames
+
     def schedule_conversion_to_markdown(self, spec_filename: str) -> Optional[str]:
         if not self._started:
             self._conversion_thread.start()
@@ -209,18 +456,70 @@ class LibspecMarkdownConversion:
         return target_json
 
     def dispose(self):
-        self._conversion_thread.queue.put(_ConversionThread.DISPOSE)
+        self._conversion_thread.dispose()
+
+
+def _worker_main():
+    from robotframework_ls.impl.libdoc_worker import read_message, write_message
+
+    # Only the original stdout is used for the protocol (anything printed
+    # during the conversion goes to stderr).
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    protocol_in = sys.stdin.buffer
+
+    while True:
+        message = read_message(protocol_in)
+        if message is None:
+            return
+
+        method = message.get("method")
+        if method == "exit":
+            return
+
+        message_id = message.get("id")
+        if method != "convert":
+            if message_id is not None:
+                write_message(
+                    protocol_out,
+                    {
+                        "jsonrpc": "2.0",
+                        "id": message_id,
+                        "error": {"code": -32601, "message": "Method not found"},
+                    },
+                )
+            continue
+
+        params = message.get("params") or {}
+        error = None
+        try:
+            _convert_to_markdown_if_needed(
+                params["spec_filename"], params["target_json"]
+            )
+        except Exception:
+            import traceback
+
+            error = traceback.format_exc()
+
+        write_message(
+            protocol_out,
+            {"jsonrpc": "2.0", "id": message_id, "result": {"error": error}},
+        )
 
 
 if __name__ == "__main__":
     args = sys.argv[1:]
 
+    if args == ["--worker"]:
+        _worker_main()
+        sys.exit(0)
+
     try:
         spec_filename = args[0]
         target_json = args[1]
     except:
         sys.stderr.write(
-            f"Expected 2 arguments (spec_filename, target_json). Received: {args}"
+            f"Expected 2 arguments (spec_filename, target_json) or --worker. Received: {args}"
         )
         sys.stderr.flush()
         sys.exit(1)
@@ -0,0 +1,295 @@
+"""
+Lints documents in a pool of worker processes (used to lint many files at
+once, i.e.: "Lint workspace" or a headless lint in CI).
+
+Each worker is a process with its own `RobotFrameworkServerApi` (and thus its
+own `LibspecManager` and workspace) which is kept alive while the documents
+are linted, so, libraries, resources and libspecs loaded when linting a
+document are reused when linting the next documents handled by the same
+worker.
+
+The diagnostics are the same ones provided by the `lint` request (they're
+computed with `RobotFrameworkServerApi._threaded_lint`) and are provided as
+each document is linted.
+"""
+import os
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from robocorp_ls_core.lsp import DiagnosticsTypedDict
+from robocorp_ls_core.protocols import IMonitor
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Environment variable with the number of workers (0 or 1 means that the
+# documents are linted in the current process).
+ENV_LINT_WORKERS = "ROBOTFRAMEWORK_LS_LINT_WORKERS"
+
+# (doc uri, diagnostics, dependencies (see: collect_lint_dependencies))
+LintResult = Tuple[str, List[DiagnosticsTypedDict], Optional[List[str]]]
+
+# Starting a worker is expensive (it needs to import robot, load libspecs,
+# etc.), so, a worker is only started if it'll lint at least this number of
+# documents.
+MIN_DOCS_PER_WORKER = 10
+
+
+def get_default_max_workers() -> int:
+    from robocorp_ls_core import process_pool
+
+    return process_pool.get_default_max_workers(ENV_LINT_WORKERS)
+
+
+def compute_workers_count(docs_count: int, max_workers: Optional[int] = None) -> int:
+    """
+    :return:
+        The number of workers which should be used to lint the given number of
+        documents (if <= 1 the documents should be linted in the current
+        process).
+    """
+    from robocorp_ls_core import process_pool
+
+    if max_workers is None:
+        max_workers = get_default_max_workers()
+    return process_pool.compute_workers_count(
+        docs_count, MIN_DOCS_PER_WORKER, max_workers
+    )
+
+
+def create_lint_server_api(
+    root_uri: str,
+    workspace_folders: Sequence[dict] = (),
+    settings: Optional[dict] = None,
+    parent_pid: Optional[int] = None,
+):
+    """
+    Creates a `RobotFrameworkServerApi` which isn't connected to a client
+    (used to lint documents without a language server).
+    """
+    from robocorp_ls_core.watchdog_wrapper import create_observer
+    from robotframework_ls.server_api.server import RobotFrameworkServerApi
+    import io
+
+    server_api = RobotFrameworkServerApi(
+        io.BytesIO(), open(os.devnull, "wb"), observer=create_observer("dummy", ())
+    )
+    server_api.m_initialize(
+        processId=parent_pid,
+        rootUri=root_uri,
+        workspaceFolders=list(workspace_folders),
+    )
+    if settings is not None:
+        server_api.m_workspace__did_change_configuration(settings=settings)
+    return server_api
+
+
+def collect_lint_dependencies(server_api, doc_uri: str) -> Optional[List[str]]:
+    """
+    :return:
+        The paths of the files (resources, variables and libraries) which
+        may affect the diagnostics of the given document or None if it's not
+        possible to know it (i.e.: some import is not resolved or the whole
+        workspace is used in the analysis).
+    """
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_LINT_UNUSED_KEYWORD,
+    )
+
+    config = server_api.config
+    if config is not None and config.get_setting(
+        OPTION_ROBOT_LINT_UNUSED_KEYWORD, bool, False
+    ):
+        return None
+
+    completion_context = server_api._create_completion_context(doc_uri, 0, 0, Monitor())
+    if completion_context is None:
+        return None
+
+    dependencies = set()
+    dependency_graph = completion_context.collect_dependency_graph()
+    for _node, doc in dependency_graph.iter_all_resource_imports_with_docs():
+        if doc is None or not doc.path:
+            return None
+        dependencies.add(doc.path)
+
+    for _node, doc in dependency_graph.iter_all_variable_imports_as_docs():
+        if doc is None or not doc.path:
+            return None
+        dependencies.add(doc.path)
+
+    libspec_manager = server_api.libspec_manager
+    for library in dependency_graph.iter_all_libraries():
+        library_doc = libspec_manager.get_library_doc_or_error(
+            library.name,
+            create=False,
+            completion_context=completion_context,
+            builtin=library.builtin,
+            args=library.args,
+        ).library_doc
+        if library_doc is None:
+            return None
+        if library_doc.source:
+            dependencies.add(library_doc.source)
+
+    dependencies.discard(completion_context.doc.path)
+    return sorted(dependencies)
+
+
+# The server api used in a worker process.
+_worker_server_api = None
+
+
+def _initialize_worker(
+    root_uri: str,
+    workspace_folders: List[dict],
+    settings: Optional[dict],
+    parent_pid: int,
+) -> None:
+    global _worker_server_api
+
+    _worker_server_api = create_lint_server_api(
+        root_uri, workspace_folders, settings, parent_pid
+    )
+
+
+def lint_document(
+    server_api, doc_uri: str, monitor: IMonitor, collect_dependencies: bool = False
+) -> LintResult:
+    diagnostics = server_api._threaded_lint(doc_uri, monitor)
+    dependencies = None
+    if collect_dependencies:
+        try:
+            dependencies = collect_lint_dependencies(server_api, doc_uri)
+        except Exception:
+            log.exception("Error collecting lint dependencies of: %s", doc_uri)
+    return doc_uri, diagnostics, dependencies
+
+
+def _lint_in_worker(doc_uri: str, collect_dependencies: bool) -> LintResult:
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+
+    server_api = _worker_server_api
+    assert server_api is not None, "Lint worker not initialized."
+    return lint_document(server_api, doc_uri, Monitor(), collect_dependencies)
+
+
+class LintPool(object):
+    """
+    Usage:
+
+        lint_pool = LintPool(root_uri, workspace_folders, settings, max_workers=4)
+        try:
+            for doc_uri, diagnostics in lint_pool.iter_lint(doc_uris, monitor):
+                ...
+        finally:
+            lint_pool.dispose()
+    """
+
+    def __init__(
+        self,
+        root_uri: str,
+        workspace_folders: Sequence[dict] = (),
+        settings: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+    ):
+        from robocorp_ls_core.process_pool import create_process_pool_executor
+
+        if max_workers is None:
+            max_workers = get_default_max_workers()
+        self.max_workers = max_workers
+
+        self._executor = create_process_pool_executor(
+            max_workers,
+            "lint-worker",
+            initializer=_initialize_worker,
+            initargs=(root_uri, list(workspace_folders), settings, os.getpid()),
+        )
+
+    def iter_lint(
+        self, doc_uris: Iterable[str], monitor: Optional[IMonitor] = None
+    ) -> Iterator[Tuple[str, List[DiagnosticsTypedDict]]]:
+        """
+        Provides the diagnostics for each document as it's linted (in the
+        order in which they're finished).
+
+        :raises JsonRpcRequestCancelled:
+            If the monitor is cancelled (in which case the documents still not
+            linted are skipped).
+        """
+        for doc_uri, diagnostics, _dependencies in self.iter_lint_results(
+            doc_uris, monitor
+        ):
+            yield doc_uri, diagnostics
+
+    def iter_lint_results(
+        self,
+        doc_uris: Iterable[str],
+        monitor: Optional[IMonitor] = None,
+        collect_dependencies: bool = False,
+        on_error: Optional[Callable[[str, str], None]] = None,
+    ) -> Iterator[LintResult]:
+        """
+        Same as `iter_lint` but also provides the dependencies of each
+        document (if `collect_dependencies` is True).
+
+        :param on_error:
+            Called with the doc uri and the error message for each document
+            which couldn't be linted (i.e.: the worker raised an exception or
+            crashed). Such documents are not provided in the results.
+        """
+        from robocorp_ls_core.process_pool import iter_completed
+
+        future_to_doc_uri = dict(
+            (
+                self._executor.submit(_lint_in_worker, doc_uri, collect_dependencies),
+                doc_uri,
+            )
+            for doc_uri in doc_uris
+        )
+        for future in iter_completed(future_to_doc_uri, monitor):
+            doc_uri = future_to_doc_uri.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                log.exception("Error linting %s in lint worker.", doc_uri)
+                if on_error is not None:
+                    on_error(doc_uri, str(e) or e.__class__.__name__)
+                continue
+            yield result
+
+    def dispose(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def lint_in_pool(
+    root_uri: str,
+    doc_uris: Sequence[str],
+    workspace_folders: Sequence[dict] = (),
+    settings: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+    monitor: Optional[IMonitor] = None,
+) -> Dict[str, List[DiagnosticsTypedDict]]:
+    """
+    Helper to lint the given documents in a new pool (without a language
+    server).
+
+    :return: A dict with the doc uri -> diagnostics.
+    """
+    if max_workers is None:
+        max_workers = max(1, compute_workers_count(len(doc_uris)))
+
+    lint_pool = LintPool(root_uri, workspace_folders, settings, max_workers)
+    try:
+        return dict(lint_pool.iter_lint(doc_uris, monitor))
+    finally:
+        lint_pool.dispose()
@@ -0,0 +1,179 @@
+"""
+A persisted cache with the lint results of documents (used by the headless
+lint so that documents which didn't change -- nor any of their dependencies
+-- aren't linted again in a new run).
+
+The results of a root folder are saved in a single json file as:
+
+    {
+        "version": 1,
+        "env": [... robot version, settings, etc ...],
+        "files": {
+            "<path>": {
+                "hash": "<sha256 of the document contents>",
+                "dependencies": ["<path>", ...],
+                "dependencies_hash": "<sha256 of the dependencies contents>",
+                "diagnostics": [...]
+            }
+        }
+    }
+
+If the environment changes, all the results are discarded.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from robocorp_ls_core.lsp import DiagnosticsTypedDict
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+_FORMAT_VERSION = 1
+
+
+def get_lint_result_cache_dir() -> str:
+    from robotframework_ls import robot_config
+
+    return os.path.join(robot_config.get_robotframework_ls_home(), "lint_cache")
+
+
+class LintResultCache(object):
+    def __init__(self, cache_dir: str, root_path: str, env: List[Any]):
+        root_hash = hashlib.sha256(os.path.normcase(root_path).encode("utf-8"))
+        self._filename = os.path.join(
+            cache_dir, f"lint_results_{root_hash.hexdigest()[:16]}.json"
+        )
+        # json.dumps/loads so that it matches what's loaded from the disk
+        # (i.e.: tuples become lists).
+        self._env = json.loads(json.dumps(env))
+        self._files: Dict[str, dict] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def load(self) -> None:
+        try:
+            with open(self._filename, "r", encoding="utf-8") as stream:
+                contents = json.load(stream)
+        except FileNotFoundError:
+            return
+        except Exception:
+            log.exception("Error loading lint results from: %s", self._filename)
+            return
+
+        if (
+            not isinstance(contents, dict)
+            or contents.get("version") != _FORMAT_VERSION
+            or contents.get("env") != self._env
+        ):
+            log.info("Lint results cache discarded (environment changed).")
+            return
+
+        files = contents.get("files")
+        if isinstance(files, dict):
+            self._files = files
+
+    def save(self) -> None:
+        with self._lock:
+            # Files removed aren't kept.
+            for path in [p for p in self._files if not os.path.exists(p)]:
+                del self._files[path]
+
+        contents = {"version": _FORMAT_VERSION, "env": self._env, "files": self._files}
+        tmp_filename = f"{self._filename}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._filename), exist_ok=True)
+            with open(tmp_filename, "w", encoding="utf-8") as stream:
+                json.dump(contents, stream, separators=(",", ":"))
+            os.replace(tmp_filename, self._filename)
+        except Exception:
+            log.exception("Error saving lint results to: %s", self._filename)
+            try:
+                os.remove(tmp_filename)
+            except Exception:
+                pass
+
+    def get_file_hash(self, path: str) -> str:
+        """
+        :return:
+            The hash of the contents of the given file (or an empty string if
+            it can't be read). Note: the hash of a file is computed only once.
+        """
+        file_hash = self._file_hashes.get(path)
+        if file_hash is None:
+            try:
+                with open(path, "rb") as stream:
+                    file_hash = hashlib.sha256(stream.read()).hexdigest()
+            except Exception:
+                file_hash = ""
+            self._file_hashes[path] = file_hash
+        return file_hash
+
+    def _compute_dependencies_hash(self, dependencies: List[str]) -> str:
+        h = hashlib.sha256()
+        for path in dependencies:
+            h.update(path.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+            h.update(self.get_file_hash(path).encode("ascii"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, path: str) -> Optional[List[DiagnosticsTypedDict]]:
+        """
+        :return:
+            The diagnostics of the given path if neither the file nor its
+            dependencies changed since the result was stored (or None).
+        """
+        with self._lock:
+            entry = self._files.get(path)
+        if entry is None:
+            return None
+
+        try:
+            file_hash = self.get_file_hash(path)
+            if not file_hash or entry["hash"] != file_hash:
+                return None
+
+            if entry["dependencies_hash"] != self._compute_dependencies_hash(
+                entry["dependencies"]
+            ):
+                return None
+            return entry["diagnostics"]
+        except Exception:
+            log.exception("Error checking lint results cache for: %s", path)
+            return None
+
+    def put(
+        self,
+        path: str,
+        diagnostics: List[DiagnosticsTypedDict],
+        dependencies: Optional[List[str]],
+    ) -> None:
+        """
+        :param dependencies:
+            The paths which may affect the diagnostics (if None the result
+            isn't cached as it's not possible to know whether it's up to date).
+        """
+        if dependencies is None:
+            with self._lock:
+                self._files.pop(path, None)
+            return
+
+        file_hash = self.get_file_hash(path)
+        if not file_hash:
+            return
+
+        entry = {
+            "hash": file_hash,
+            "dependencies": dependencies,
+            "dependencies_hash": self._compute_dependencies_hash(dependencies),
+            "diagnostics": diagnostics,
+        }
+        with self._lock:
+            self._files[path] = entry
@@ -0,0 +1,170 @@
+"""
+Lists the tests of many files at once (used when the tests of a directory
+are requested).
+
+The files are parsed in a pool of worker processes (if there are enough files
+to make it worth it) and the tests of each file are provided as each chunk of
+files is parsed.
+
+Note: the ranges of the tests provided are already converted to the client
+(utf-16 code units).
+"""
+import os
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from robocorp_ls_core.protocols import IMonitor, ITestInfoTypedDict
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Environment variable with the number of workers (0 or 1 means that the
+# files are parsed in the current process).
+ENV_LIST_TESTS_WORKERS = "ROBOTFRAMEWORK_LS_LIST_TESTS_WORKERS"
+
+# (doc uri, tests)
+ListTestsResult = Tuple[str, List[ITestInfoTypedDict]]
+
+# Starting a worker is expensive (it needs to import robot), so, a worker is
+# only started if it'll parse at least this number of files.
+MIN_DOCS_PER_WORKER = 50
+
+# The number of files parsed in each task submitted to a worker.
+CHUNK_SIZE = 20
+
+
+def get_default_max_workers() -> int:
+    from robocorp_ls_core import process_pool
+
+    return process_pool.get_default_max_workers(ENV_LIST_TESTS_WORKERS)
+
+
+def compute_workers_count(docs_count: int, max_workers: Optional[int] = None) -> int:
+    """
+    :return:
+        The number of workers which should be used to parse the given number
+        of files (if <= 1 the files should be parsed in the current process).
+    """
+    from robocorp_ls_core import process_pool
+
+    if max_workers is None:
+        max_workers = get_default_max_workers()
+    return process_pool.compute_workers_count(
+        docs_count, MIN_DOCS_PER_WORKER, max_workers
+    )
+
+
+def iter_robot_files_in_dir(
+    dir_path: str, accept_directory: Optional[Callable[[str], bool]] = None
+) -> Iterator[str]:
+    """
+    Provides the `.robot` files in the given directory (recursively and in a
+    deterministic order), skipping the directories not accepted.
+
+    :param accept_directory:
+        If not given the ignored directories are the ones from
+        `load_ignored_dirs` (which also considers the
+        `ROBOTFRAMEWORK_LS_IGNORE_DIRS` environment variable).
+    """
+    if accept_directory is None:
+        from robocorp_ls_core import load_ignored_dirs
+
+        accept_directory = load_ignored_dirs.create_accept_directory_callable()
+
+    for root, dirs, files in os.walk(dir_path):
+        dirs[:] = sorted(d for d in dirs if accept_directory(os.path.join(root, d)))
+        for filename in sorted(files):
+            if filename.endswith(".robot"):
+                yield os.path.join(root, filename)
+
+
+def list_tests_in_files(doc_uris: Iterable[str]) -> List[ListTestsResult]:
+    """
+    Parses the given files (from the filesystem) and lists the tests in each.
+    """
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.code_lens import list_tests
+    from robocorp_ls_core.code_units import convert_tests_pos_to_client_inplace
+
+    ret: List[ListTestsResult] = []
+    for doc_uri in doc_uris:
+        try:
+            doc = RobotDocument(doc_uri, force_load_source=True)
+        except Exception:
+            log.debug("Unable to load contents from: %s", doc_uri)
+            continue
+
+        try:
+            tests = list_tests(CompletionContext(doc))
+            ret.append((doc_uri, convert_tests_pos_to_client_inplace(doc, tests)))
+        except Exception:
+            log.exception("Error listing tests in: %s", doc_uri)
+    return ret
+
+
+def _initialize_worker(language_codes: Tuple[str, ...]) -> None:
+    from robotframework_ls.impl.robot_localization import (
+        LocalizationInfo,
+        set_global_localization_info,
+    )
+
+    set_global_localization_info(LocalizationInfo(language_codes))
+
+
+class ListTestsPool(object):
+    """
+    Usage:
+
+        pool = ListTestsPool(max_workers=4)
+        try:
+            for chunk in pool.iter_list_tests(doc_uris, monitor):
+                for doc_uri, tests in chunk:
+                    ...
+        finally:
+            pool.dispose()
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        from robocorp_ls_core.process_pool import create_process_pool_executor
+        from robotframework_ls.impl.robot_localization import (
+            get_global_localization_info,
+        )
+
+        if max_workers is None:
+            max_workers = get_default_max_workers()
+        self.max_workers = max_workers
+
+        self._executor = create_process_pool_executor(
+            max_workers,
+            "list-tests-worker",
+            initializer=_initialize_worker,
+            initargs=(tuple(get_global_localization_info().language_codes),),
+        )
+
+    def iter_list_tests(
+        self, doc_uris: Sequence[str], monitor: Optional[IMonitor] = None
+    ) -> Iterator[List[ListTestsResult]]:
+        """
+        Provides the tests of each chunk of files as it's parsed (in the order
+        in which the chunks are finished).
+
+        :raises JsonRpcRequestCancelled:
+            If the monitor is cancelled (in which case the files still not
+            parsed are skipped).
+        """
+        from robocorp_ls_core.process_pool import iter_completed
+
+        futures = [
+            self._executor.submit(list_tests_in_files, doc_uris[i : i + CHUNK_SIZE])
+            for i in range(0, len(doc_uris), CHUNK_SIZE)
+        ]
+        for future in iter_completed(futures, monitor):
+            try:
+                result = future.result()
+            except Exception:
+                log.exception("Error listing tests in worker.")
+                continue
+            yield result
+
+    def dispose(self) -> None:
+        self._executor.shutdown(wait=False)
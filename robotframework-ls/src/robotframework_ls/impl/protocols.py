@@ -350,6 +350,10 @@ class ILibraryDoc(Protocol):
     keywords: List["IKeywordDoc"]
     doc: str
 
+    @property
+    def deprecated(self) -> bool:
+        pass
+
 
 class ILibraryDocConversions(ILibraryDoc):
     """
@@ -505,6 +509,45 @@ class ICompletionContextWorkspaceCaches(Protocol):
     ) -> None:
         pass
 
+    def get_cached_dependency_node(
+        self, doc: IRobotDocument
+    ) -> Optional["ICompletionContextDependencyNode"]:
+        """
+        :return:
+            The node with the imports of the given document (if cached for
+            that same document instance).
+        """
+
+    def cache_dependency_node(
+        self,
+        dependency_node: "ICompletionContextDependencyNode",
+        invalidation_tracker,
+    ) -> None:
+        pass
+
+    def get_import_resolution(
+        self, check_paths: Tuple[str, ...]
+    ) -> Tuple[bool, Optional[str], int]:
+        """
+        :param check_paths:
+            The paths checked (in order) to resolve some resource/variable
+            import.
+
+        :return:
+            A tuple(found in cache, resolved path or None if it couldn't be
+            resolved, invalidation count). If it was not found in the cache
+            the invalidation count must be passed to
+            `cache_import_resolution_result` after resolving it.
+        """
+
+    def cache_import_resolution_result(
+        self,
+        check_paths: Tuple[str, ...],
+        resolved_path: Optional[str],
+        invalidation_count: int,
+    ) -> None:
+        pass
+
 
 class IRobotWorkspace(IWorkspace, Protocol):
     completion_context_workspace_caches: ICompletionContextWorkspaceCaches
@@ -613,6 +656,48 @@ class IKeywordFound(Protocol):
         pass
 
 
+class IKeywordIndexEntry(Protocol):
+    """
+    An entry in a keyword index (it's independent of a completion context and
+    is bound to one to provide the related `IKeywordFound`).
+    """
+
+    # The name of the keyword.
+    keyword_name: str
+
+    # The normalized library alias/library name/resource name which may be
+    # used to qualify the keyword (i.e.: `builtin` in `BuiltIn.Log`).
+    scope_name: str
+
+    # The document whose completion context should be used to create the
+    # IKeywordFound.
+    doc: "IRobotDocument"
+
+    def create_keyword_found(
+        self, completion_context: "ICompletionContext"
+    ) -> IKeywordFound:
+        pass
+
+
+class IKeywordIndex(Protocol):
+    def __len__(self) -> int:
+        pass
+
+    def iter_entries(self) -> Iterator[IKeywordIndexEntry]:
+        pass
+
+    def get_entries(self, normalized_name: str) -> List[IKeywordIndexEntry]:
+        pass
+
+    def get_entries_in_scope(
+        self, normalized_scope_name: str, normalized_name: str
+    ) -> List[IKeywordIndexEntry]:
+        pass
+
+    def get_entries_matching(self, normalized_name: str) -> List[IKeywordIndexEntry]:
+        pass
+
+
 class IKeywordCollector(Protocol):
     def accepts(self, keyword_name: str) -> bool:
         """
@@ -814,6 +899,93 @@ class ISymbolsCacheReverseIndex(Protocol):
     def has_global_variable(self, normalized_var_name: str) -> bool:
         pass
 
+    def has_keyword_usage(self, normalized_keyword_name: str) -> bool:
+        pass
+
+    def get_keyword_usage_uris(self, normalized_keyword_name: str) -> Set[str]:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        pass
+
+
+class SymbolsNameIndexEntry:
+    __slots__ = ["key", "symbols_cache", "keyword_infos", "json_entries"]
+
+    def __init__(
+        self,
+        key: Hashable,
+        symbols_cache: ISymbolsCache,
+        keyword_infos: List[ISymbolKeywordInfo],
+        json_entries: List[ISymbolsJsonListEntry],
+    ):
+        """
+        :param key:
+            The document uri or `("library", <source or name>)` for libraries.
+
+        :param keyword_infos:
+            The keywords of the symbols cache with the name searched.
+
+        :param json_entries:
+            The workspace symbols of the symbols cache with the name searched.
+        """
+        self.key = key
+        self.symbols_cache = symbols_cache
+        self.keyword_infos = keyword_infos
+        self.json_entries = json_entries
+
+
+class ISymbolsNameIndex(Protocol):
+    def find_names(self, normalized_query: str, fuzzy: bool = False) -> List[str]:
+        """
+        :return:
+            The (normalized) names matching the query (best matches first).
+        """
+
+    def iter_entries(
+        self, normalized_names: Iterable[str]
+    ) -> Iterator[SymbolsNameIndexEntry]:
+        pass
+
+    def iter_symbols_caches(self) -> Iterator[Tuple[Hashable, ISymbolsCache]]:
+        pass
+
+    def synchronize(
+        self,
+        context: IBaseCompletionContext,
+        initial_time: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        pass
+
+
+class ICompletionContextDependencyNode(Protocol):
+    """
+    The direct imports of a document (shared among dependency graphs).
+    """
+
+    doc: IRobotDocument
+    library_infos: Tuple[LibraryDependencyInfo, ...]
+    resource_imports_as_docs: Tuple[
+        Tuple[IResourceImportNode, Optional[IRobotDocument]], ...
+    ]
+    variable_imports_as_docs: Tuple[
+        Tuple[IVariableImportNode, Optional[IRobotDocument]], ...
+    ]
+
+    def get_invalidate_on_changes(self) -> Tuple[Iterable[str], Iterable[str]]:
+        """
+        :return:
+            A tuple(normalized uris, normalized basenames) which invalidate
+            this node when changed.
+        """
+
+    def do_invalidate_on_uri_change(self, uri: str) -> bool:
+        pass
+
 
 class ICompletionContextDependencyGraph(Protocol):
     def add_library_infos(
@@ -878,6 +1050,27 @@ class ICompletionContextDependencyGraph(Protocol):
     def do_invalidate_on_uri_change(self, uri: str) -> bool:
         pass
 
+    def get_invalidate_on_changes(self) -> Tuple[Iterable[str], Iterable[str]]:
+        """
+        :return:
+            A tuple(normalized uris, normalized basenames) which invalidate
+            this dependency graph when changed (note: changes to the root
+            document don't invalidate it even if its uri is returned).
+        """
+
+    def get_cached_keyword_index(self, cache_key: Hashable) -> Optional[IKeywordIndex]:
+        """
+        :param cache_key:
+            The key with the information which may invalidate the keyword index
+            and isn't tracked by the dependency graph (i.e.: the libraries
+            loaded from the libspec manager).
+        """
+
+    def cache_keyword_index(
+        self, cache_key: Hashable, keyword_index: IKeywordIndex
+    ) -> None:
+        pass
+
 
 class IVariablesFromArgumentsFileLoader(Protocol):
     def get_variables(self) -> Tuple["IVariableFound", ...]:
@@ -1121,6 +1314,24 @@ class ICompletionContext(Protocol):
     def collect_dependency_graph(self) -> ICompletionContextDependencyGraph:
         pass
 
+    def add_variables_dependency_graph(
+        self, dependency_graph: ICompletionContextDependencyGraph
+    ) -> None:
+        """
+        Called when the variables from the given dependency graph were used to
+        resolve some variable in this context.
+        """
+
+    def get_variables_dependency_graphs(
+        self,
+    ) -> Tuple[ICompletionContextDependencyGraph, ...]:
+        """
+        :return:
+            The dependency graphs whose variables were used to resolve
+            variables in this context (so, what's computed from those values
+            must be invalidated when the documents in those graphs change).
+        """
+
     def iter_dependency_and_init_resource_docs(
         self, dependency_graph
     ) -> Iterator[IRobotDocument]:
@@ -14,6 +14,7 @@ from robotframework_ls.impl.protocols import (
     VarTokenInfo,
     VariableKind,
     KeywordUsageInfo,
+    ISymbolsCache,
 )
 import typing
 from robocorp_ls_core.protocols import check_implements
@@ -556,6 +557,42 @@ def _references_for_variable_found(
     return ret.lst
 
 
+def _iter_keyword_usage_candidates_symbols_caches(
+    completion_context: ICompletionContext, normalized_keyword_name: str
+) -> Iterator[ISymbolsCache]:
+    """
+    Provides the symbols caches for the documents which may use the given
+    keyword (uses the reverse index when available so that only the documents
+    which actually use it need to be checked).
+    """
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+    from robotframework_ls.impl.workspace_symbols import iter_symbols_caches
+
+    symbols_cache_reverse_index = (
+        completion_context.obtain_symbols_cache_reverse_index()
+    )
+    workspace = typing.cast(Optional[RobotWorkspace], completion_context.workspace)
+    if (
+        symbols_cache_reverse_index is None
+        or workspace is None
+        or workspace.workspace_indexer is None
+    ):
+        yield from iter_symbols_caches(
+            None, completion_context, force_all_docs_in_workspace=True, timeout=999999
+        )
+        return
+
+    uris = symbols_cache_reverse_index.get_keyword_usage_uris(normalized_keyword_name)
+    # Changes in the current document may not be in the reverse index.
+    uris.add(completion_context.doc.uri)
+
+    for _uri, symbols_cache in workspace.workspace_indexer.iter_uri_and_symbols_cache(
+        context=completion_context, uris_to_iter=uris
+    ):
+        if symbols_cache is not None:
+            yield symbols_cache
+
+
 def references_for_keyword_found(
     completion_context: ICompletionContext,
     keyword_found: IKeywordFound,
@@ -586,10 +623,8 @@ def references_for_keyword_found(
             }
         )
 
-    from robotframework_ls.impl.workspace_symbols import iter_symbols_caches
-
-    for symbols_cache in iter_symbols_caches(
-        None, completion_context, force_all_docs_in_workspace=True, timeout=999999
+    for symbols_cache in _iter_keyword_usage_candidates_symbols_caches(
+        completion_context, normalized_name
     ):
         completion_context.check_cancelled()
         if symbols_cache.has_keyword_usage(normalized_name):
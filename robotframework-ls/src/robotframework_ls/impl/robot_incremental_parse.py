@@ -0,0 +1,325 @@
+"""
+Helpers to create the model (AST) of a document based on the model of a
+previous version of the same document, reparsing only what changed.
+
+The lines changed are found by comparing the previous lines with the new
+lines (so, it works regardless of how many changes were applied) and then:
+
+- If the change is inside a section with keywords or test cases, only the
+  affected keywords/test cases are reparsed.
+- If the change is inside some other section (settings, variables, comments),
+  that section is reparsed.
+- If the change touches a section header (or anything before the first
+  header, where the language may be specified), `None` is returned (in which
+  case a full parse is needed).
+
+The new model is created without changing the previous model: nodes before
+the change are shared (so, caches such as the `_ASTIndexer` of the sections
+which didn't change are kept) and nodes after the change are copied with
+their line numbers updated if the number of lines changed.
+"""
+import ast as ast_module
+from typing import Callable, List, Optional, Sequence, Tuple, Any
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.protocols import INode
+
+log = get_logger(__name__)
+
+# Sections where the body is composed by blocks which may be reparsed
+# separately.
+_SECTIONS_WITH_BLOCKS = frozenset(("KeywordSection", "TestCaseSection", "TaskSection"))
+_BLOCKS = frozenset(("Keyword", "TestCase", "Task"))
+
+# Attributes with caches which are related to a given node instance and must
+# not be copied to new nodes.
+_NODE_CACHE_ATTRIBUTES = (
+    "__ast_indexer__",
+    "__instance_cache__",
+    "__semantic_tokens__",
+)
+
+# Avoid a loop if the start of the reparsed region keeps on changing.
+_MAX_REGION_EXPANSIONS = 5
+
+
+class IncrementalParseResult(object):
+    def __init__(self, ast, new_nodes: List[INode]):
+        self.ast = ast
+
+        # The nodes which were created (the other ones are shared with the
+        # previous model).
+        self.new_nodes = new_nodes
+
+
+def _compute_changed_lines(
+    old_lines: Sequence[str], new_lines: Sequence[str]
+) -> Tuple[int, int]:
+    """
+    :return:
+        A tuple with the number of lines in the common prefix and the number
+        of lines in the common suffix.
+    """
+    max_common = min(len(old_lines), len(new_lines))
+
+    prefix = 0
+    while prefix < max_common and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = max_common - prefix
+    while (
+        suffix < max_suffix
+        and old_lines[len(old_lines) - suffix - 1]
+        == new_lines[len(new_lines) - suffix - 1]
+    ):
+        suffix += 1
+
+    return prefix, suffix
+
+
+def _is_header_line(line: str) -> bool:
+    return line.startswith("*")
+
+
+def _shallow_copy_node(node):
+    """
+    Creates a shallow copy of the node without the caches related to the
+    node instance.
+
+    Note: `copy.copy` can't be used as the robot nodes require arguments in
+    the constructor.
+    """
+    cls = node.__class__
+    new = cls.__new__(cls)
+    d = new.__dict__
+    d.update(node.__dict__)
+    for attr in _NODE_CACHE_ATTRIBUTES:
+        d.pop(attr, None)
+    return new
+
+
+def _copy_shifting_lines(node, delta: int, new_nodes: List[INode]):
+    """
+    Creates a copy of the given node (and its children) with the line of the
+    tokens shifted by the given delta.
+    """
+    from robot.api import Token
+
+    new = _shallow_copy_node(node)
+    new_nodes.append(new)
+
+    tokens = getattr(node, "tokens", None)
+    if tokens is not None:
+        new.tokens = tuple(
+            Token(t.type, t.value, t.lineno + delta, t.col_offset, t.error)
+            for t in tokens
+        )
+
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            setattr(
+                new,
+                field,
+                [
+                    _copy_shifting_lines(item, delta, new_nodes)
+                    if isinstance(item, ast_module.AST)
+                    else item
+                    for item in value
+                ],
+            )
+        elif isinstance(value, ast_module.AST):
+            setattr(new, field, _copy_shifting_lines(value, delta, new_nodes))
+    return new
+
+
+def _shift_lines_in_place(node, delta: int, new_nodes: List[INode]) -> None:
+    """
+    Shifts the lines of a node which was just created (and is not shared
+    with any other model).
+    """
+    from robotframework_ls.impl import ast_utils
+
+    nodes = [node]
+    nodes.extend(n for _stack, n in ast_utils.iter_all_nodes_recursive(node))
+    for n in nodes:
+        new_nodes.append(n)
+        if delta:
+            for token in getattr(n, "tokens", ()):
+                token.lineno += delta
+
+
+def _get_section_start_lines(sections, line_count: int) -> Optional[List[int]]:
+    """
+    :return:
+        The 0-based start line of each section (and at the end the line count)
+        or None if the sections don't seem to be contiguous.
+    """
+    starts: List[int] = []
+    for section in sections:
+        if section.header is None:
+            start = 0
+        else:
+            start = section.header.lineno - 1
+        if start < 0 or (starts and start <= starts[-1]):
+            return None
+        starts.append(start)
+
+    if not starts or starts[0] != 0:
+        return None
+    starts.append(line_count)
+    return starts
+
+
+def _get_item_index(item_starts: Sequence[int], line: int) -> int:
+    import bisect
+
+    return max(0, bisect.bisect_right(item_starts, line) - 1)
+
+
+def parse_incrementally(
+    old_ast,
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    create_model: Callable[[str], Any],
+) -> Optional[IncrementalParseResult]:
+    """
+    :param old_ast:
+        The model (File) of the previous version of the document.
+
+    :param old_lines:
+        The lines (with line endings) of the previous version of the document.
+
+    :param new_lines:
+        The lines (with line endings) of the new version of the document.
+
+    :param create_model:
+        Callable which parses a given source and returns its model (it must
+        be the same function used to create the old model).
+
+    :return:
+        The new model or None if a full parse is needed.
+    """
+    prefix, suffix = _compute_changed_lines(old_lines, new_lines)
+    if prefix == len(old_lines) == len(new_lines):
+        # Nothing changed.
+        return IncrementalParseResult(old_ast, [])
+
+    if prefix == 0:
+        # Changes in the first line require a full parse.
+        return None
+
+    old_end = len(old_lines) - suffix
+    new_end = len(new_lines) - suffix
+    for line in old_lines[prefix:old_end]:
+        if _is_header_line(line):
+            return None
+    for line in new_lines[prefix:new_end]:
+        if _is_header_line(line):
+            return None
+
+    delta = len(new_lines) - len(old_lines)
+
+    # The line before the change is always considered as touched (as lines
+    # added are usually part of the block of the previous line).
+    first_touched = prefix - 1
+    last_touched = max(old_end - 1, first_touched)
+
+    sections = old_ast.sections
+    section_starts = _get_section_start_lines(sections, len(old_lines))
+    if section_starts is None:
+        return None
+
+    section_index = _get_item_index(section_starts[:-1], first_touched)
+    section = sections[section_index]
+    section_start = section_starts[section_index]
+    section_end = section_starts[section_index + 1]
+    if section.header is None or last_touched >= section_end:
+        # Changes in the implicit comment section (where the language may be
+        # defined) or in more than one section require a full parse.
+        return None
+
+    new_nodes: List[INode] = []
+    section_class_name = section.__class__.__name__
+    body = section.body
+
+    if section_class_name not in _SECTIONS_WITH_BLOCKS or not body:
+        # Reparse the whole section.
+        source = "".join(new_lines[section_start : section_end + delta])
+        new_sections = create_model(source).sections
+        if (
+            len(new_sections) != 1
+            or new_sections[0].__class__.__name__ != section_class_name
+        ):
+            return None
+        new_section = new_sections[0]
+        _shift_lines_in_place(new_section, section_start, new_nodes)
+
+    else:
+        item_starts = [item.lineno - 1 for item in body]
+        if item_starts[0] <= section_start or item_starts != sorted(item_starts):
+            return None
+
+        if first_touched <= section_start:
+            i0 = 0
+        else:
+            i0 = _get_item_index(item_starts, first_touched)
+        i1 = max(i0, _get_item_index(item_starts, last_touched))
+
+        header_line = old_lines[section_start]
+        for _i in range(_MAX_REGION_EXPANSIONS):
+            region_start = item_starts[i0]
+            if i1 + 1 < len(item_starts):
+                region_end = item_starts[i1 + 1]
+            else:
+                region_end = section_end
+
+            source = header_line + "".join(new_lines[region_start : region_end + delta])
+            new_sections = create_model(source).sections
+            if (
+                len(new_sections) != 1
+                or new_sections[0].__class__.__name__ != section_class_name
+            ):
+                return None
+
+            new_items = new_sections[0].body
+            if (
+                i0 > 0
+                and new_items
+                and new_items[0].__class__.__name__ not in _BLOCKS
+                and body[i0 - 1].__class__.__name__ in _BLOCKS
+            ):
+                # The first lines would be part of the previous block
+                # (i.e.: the keyword name was removed): reparse it too.
+                i0 -= 1
+                continue
+            break
+        else:
+            return None
+
+        for item in new_items:
+            # The header is the first line (so, the lines start at 2).
+            _shift_lines_in_place(item, region_start - 1, new_nodes)
+
+        if delta:
+            after = [
+                _copy_shifting_lines(item, delta, new_nodes) for item in body[i1 + 1 :]
+            ]
+        else:
+            after = list(body[i1 + 1 :])
+
+        new_section = _shallow_copy_node(section)
+        new_nodes.append(new_section)
+        new_section.body = list(body[:i0]) + list(new_items) + after
+
+    new_ast = _shallow_copy_node(old_ast)
+    later_sections = sections[section_index + 1 :]
+    if delta:
+        later_sections = [
+            _copy_shifting_lines(s, delta, new_nodes) for s in later_sections
+        ]
+    new_ast.sections = (
+        list(sections[:section_index]) + [new_section] + list(later_sections)
+    )
+    return IncrementalParseResult(new_ast, new_nodes)
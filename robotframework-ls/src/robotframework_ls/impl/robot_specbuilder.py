@@ -266,6 +266,12 @@ class LibraryDoc(object):
     def keywords(self, kws):
         self._keywords = sorted(kws, key=lambda kw: kw.name)
 
+    @property
+    def deprecated(self) -> bool:
+        from robotframework_ls.impl.text_utilities import has_deprecated_text
+
+        return has_deprecated_text(self.doc)
+
     @property
     def all_tags(self):
         from itertools import chain
@@ -438,6 +444,52 @@ class KeywordArg(object):
 
         return ret
 
+    def to_compact(self) -> tuple:
+        """
+        :return:
+            A tuple with the internal state of the argument (with only
+            builtin types) which may be restored with `from_compact`.
+        """
+        return (
+            self.original_arg,
+            self.kind,
+            self._arg_name,
+            self._is_keyword_arg,
+            self._is_star_arg,
+            self._default_value is not Sentinel,
+            self._default_value if self._default_value is not Sentinel else None,
+            self._arg_type is not Sentinel,
+            self._arg_type if self._arg_type is not Sentinel else None,
+        )
+
+    @classmethod
+    def from_compact(cls, compact: tuple) -> "KeywordArg":
+        (
+            original_arg,
+            kind,
+            arg_name,
+            is_keyword_arg,
+            is_star_arg,
+            default_value_set,
+            default_value,
+            arg_type_set,
+            arg_type,
+        ) = compact
+
+        ret = cls.__new__(cls)
+        ret.original_arg = original_arg
+        ret.kind = kind
+        ret._arg_name = arg_name
+        if is_keyword_arg:
+            ret._is_keyword_arg = True
+        if is_star_arg:
+            ret._is_star_arg = True
+        if default_value_set:
+            ret._default_value = default_value
+        if arg_type_set:
+            ret._arg_type = arg_type
+        return ret
+
     def is_default_value_set(self) -> bool:
         return self._default_value is not Sentinel
 
@@ -5,7 +5,7 @@ import weakref
 
 from robocorp_ls_core import uris
 from robocorp_ls_core.basic import overrides
-from robocorp_ls_core.cache import instance_cache
+from robocorp_ls_core.cache import instance_cache, SizeEstimator
 from robocorp_ls_core.lsp import (
     TextDocumentContentChangeEvent,
     TextDocumentItem,
@@ -45,15 +45,39 @@ from robotframework_ls.impl.robot_constants import ROBOT_FILE_EXTENSIONS
 
 log = get_logger(__name__)
 
+# Estimate the memory used by the caches kept in a RobotDocument based on the
+# number of chars in the document (calibrated by measuring some samples).
+_AST_SIZE_ESTIMATOR = SizeEstimator(initial_bytes_per_unit=60)
+_PYTHON_AST_SIZE_ESTIMATOR = SizeEstimator(initial_bytes_per_unit=60)
+_YAML_SIZE_ESTIMATOR = SizeEstimator(initial_bytes_per_unit=20)
+_SYMBOLS_CACHE_SIZE_ESTIMATOR = SizeEstimator(initial_bytes_per_unit=20)
+
 
 class _KeywordInfo:
+    """
+    Note: only the information needed for the documentation is kept (and not
+    the keyword node) so that the AST can be released while the symbols
+    cache is still alive.
+    """
+
     _documentation: MarkupContentTypedDict
 
-    __slots__ = ["_node", "name", "_documentation"]
+    __slots__ = ["name", "_args", "_raw_docs", "_documentation"]
+
+    def __init__(self, name: str, args: Tuple[str, ...], raw_docs: str):
+        self.name = name
+        self._args = args
+        self._raw_docs = raw_docs
 
-    def __init__(self, node: IKeywordNode):
-        self._node = node
-        self.name = node.name
+    @classmethod
+    def from_node(cls, node: IKeywordNode) -> "_KeywordInfo":
+        from robotframework_ls.impl import ast_utils
+
+        return cls(
+            node.name,
+            tuple(ast_utils.iter_keyword_arguments_as_str(node)),
+            ast_utils.get_documentation_raw(node),
+        )
 
     def get_documentation(self) -> MarkupContentTypedDict:
         from robotframework_ls.impl import ast_utils
@@ -64,10 +88,10 @@ class _KeywordInfo:
         try:
             return self._documentation
         except AttributeError:
-            docs = ast_utils.get_documentation_as_markdown(self._node)
-            args = tuple(ast_utils.iter_keyword_arguments_as_str(self._node))
-
-            docs = build_keyword_docs_with_signature(self.name, args, docs, "markdown")
+            docs = ast_utils.convert_documentation_to_markdown(self._raw_docs)
+            docs = build_keyword_docs_with_signature(
+                self.name, self._args, docs, "markdown"
+            )
 
             self._documentation = {
                 "kind": MarkupKind.Markdown,
@@ -85,19 +109,11 @@ class _SymbolsCacheForAST(BaseSymbolsCache):
 
     def __init__(self, *args, **kwargs):
         keywords = kwargs.pop("keywords")
-        self._keywords: List[IKeywordNode] = keywords
+        self._cached_keyword_info = keywords
         super(_SymbolsCacheForAST, self).__init__(*args, **kwargs)
 
     def iter_keyword_info(self) -> Iterator[ISymbolKeywordInfo]:
-        try:
-            yield from iter(self._cached_keyword_info)
-        except:
-            cache: List[ISymbolKeywordInfo] = []
-            for k in self._keywords:
-                keyword_info = _KeywordInfo(k)
-                yield keyword_info
-                cache.append(keyword_info)
-            self._cached_keyword_info = cache
+        yield from iter(self._cached_keyword_info)
 
     def __typecheckself__(self) -> None:
         _: ISymbolsCache = check_implements(self)
@@ -119,9 +135,9 @@ def _compute_symbols_from_ast(completion_context: ICompletionContext) -> ISymbol
     symbols: List[ISymbolsJsonListEntry] = []
     uri = doc.uri
 
-    keywords: List[IKeywordNode] = []
+    keywords: List[ISymbolKeywordInfo] = []
     for keyword_node_info in ast_utils.iter_keywords(ast):
-        keywords.append(keyword_node_info.node)
+        keywords.append(_KeywordInfo.from_node(keyword_node_info.node))
         symbols.append(
             {
                 "name": keyword_node_info.node.name,
@@ -278,8 +294,30 @@ class WorkspaceIndexer(object):
         robot_workspace,
         endpoint: Optional[IEndPoint],
         collect_tests: bool = False,
+        symbols_cache_dir: Optional[str] = None,
     ) -> None:
+        """
+        :param symbols_cache_dir:
+            If given, the symbols cache of documents loaded from the filesystem
+            is persisted in this directory (and reused in new sessions when the
+            file didn't change).
+        """
         from robotframework_ls.impl._symbols_cache import SymbolsCacheReverseIndex
+        from robotframework_ls.impl.symbols_name_index import SymbolsNameIndex
+        from robotframework_ls.impl._symbols_cache_persistence import (
+            SymbolsCachePersistence,
+        )
+
+        self._symbols_cache_persistence: Optional[SymbolsCachePersistence] = None
+        if symbols_cache_dir:
+            try:
+                self._symbols_cache_persistence = SymbolsCachePersistence(
+                    symbols_cache_dir
+                )
+            except Exception:
+                log.exception(
+                    "Unable to persist symbols cache in: %s", symbols_cache_dir
+                )
 
         self._robot_workspace = weakref.ref(robot_workspace)
         robot_workspace.on_file_changed.register(self._on_file_changed)
@@ -289,6 +327,7 @@ class WorkspaceIndexer(object):
         self._reindex_manager = _ReindexManager()
         self._disposed = threading.Event()
         self.symbols_cache_reverse_index = SymbolsCacheReverseIndex()
+        self.symbols_name_index = SymbolsNameIndex()
 
         if collect_tests:
             assert endpoint is not None
@@ -305,6 +344,7 @@ class WorkspaceIndexer(object):
             uri = uris.from_fs_path(filename)
             self._reindex_manager.request_uri_collection(uri)
             self.symbols_cache_reverse_index.notify_uri_changed(uri)
+            self.symbols_name_index.notify_uri_changed(uri)
 
     def wait_for_full_test_collection(self):
         assert (
@@ -318,6 +358,12 @@ class WorkspaceIndexer(object):
         return True
 
     def _on_thread(self) -> None:
+        if self._symbols_cache_persistence is not None:
+            try:
+                self._symbols_cache_persistence.prune()
+            except:
+                log.exception("Error pruning the symbols cache.")
+
         try:
             self._on_thread_internal()
         except:
@@ -417,14 +463,22 @@ class WorkspaceIndexer(object):
         self._disposed.set()
         self._reindex_manager.dispose()
         self.symbols_cache_reverse_index.dispose()
+        self.symbols_name_index.dispose()
 
     def on_updated_document(self, doc_uri: str):
         self._reindex_manager.request_uri_collection(doc_uri)
         self.symbols_cache_reverse_index.notify_uri_changed(doc_uri)
+        self.symbols_name_index.notify_uri_changed(doc_uri)
+
+    def on_closed_document(self, doc_uri: str):
+        self.on_updated_document(doc_uri)
+        if self._symbols_cache_persistence is not None:
+            self._symbols_cache_persistence.discard_open_doc(doc_uri)
 
     def on_updated_folders(self):
         self._reindex_manager.request_full_collection()
         self.symbols_cache_reverse_index.request_full_reindex()
+        self.symbols_name_index.request_full_reindex()
 
     def iter_uri_and_symbols_cache(
         self,
@@ -433,12 +487,12 @@ class WorkspaceIndexer(object):
         timeout: Optional[float] = None,
         context: Optional[IBaseCompletionContext] = None,
         found: Optional[Set[str]] = None,
-        uris_to_iter: Optional[Set[str]] = None,
+        uris_to_iter: Optional[Iterable[str]] = None,
     ) -> Iterable[Tuple[str, Optional[ISymbolsCache]]]:
         from typing import cast
         import time
 
-        if not found:
+        if found is None:
             found = set()
 
         if initial_time is None:
@@ -508,6 +562,9 @@ class WorkspaceIndexer(object):
             # (which means we'll spend some more cpu cycles but we shouldn't
             # have any bad behavior due to it).
             symbols_cache = doc.symbols_cache
+            if symbols_cache is None and self._symbols_cache_persistence is not None:
+                symbols_cache = self._symbols_cache_persistence.load(doc)
+
             if symbols_cache is None:
                 from robotframework_ls.impl.completion_context import (
                     CompletionContext,
@@ -526,6 +583,8 @@ class WorkspaceIndexer(object):
                         workspace=workspace,
                     )
                 symbols_cache = _compute_symbols_from_ast(ctx)
+                if self._symbols_cache_persistence is not None:
+                    self._symbols_cache_persistence.store(doc, symbols_cache)
             doc.symbols_cache = symbols_cache
             yield uri, symbols_cache
 
@@ -542,22 +601,28 @@ class RobotWorkspace(Workspace):
         collect_tests=False,
         endpoint: Optional[IEndPoint] = None,
         on_dependency_changed: Optional[IOnDependencyChanged] = None,
+        symbols_cache_dir: Optional[str] = None,
     ):
         from robotframework_ls.impl.completion_context_workspace_caches import (
             CompletionContextWorkspaceCaches,
         )
 
         self.libspec_manager = libspec_manager
+        self._symbols_cache_dir = symbols_cache_dir
 
         # It needs to be set to None in the initialization (while we setup folders).
         self.workspace_indexer: Optional[WorkspaceIndexer] = None
+        caches = CompletionContextWorkspaceCaches(on_dependency_changed)
         self.completion_context_workspace_caches: ICompletionContextWorkspaceCaches = (
-            CompletionContextWorkspaceCaches(on_dependency_changed)
+            caches
         )
 
         Workspace.__init__(
             self, root_uri, fs_observer, workspace_folders=workspace_folders
         )
+        # The resolution of imports is only cached if changes to the files
+        # are notified.
+        caches.import_resolution_cache_enabled = self._fs_observer_notifies_changes
         self._generate_ast = generate_ast
         self._lock_setup_workspace_indexer = threading.Lock()
         if collect_tests:
@@ -568,7 +633,10 @@ class RobotWorkspace(Workspace):
 
         if index_workspace:
             self.workspace_indexer = WorkspaceIndexer(
-                self, endpoint, collect_tests=collect_tests
+                self,
+                endpoint,
+                collect_tests=collect_tests,
+                symbols_cache_dir=symbols_cache_dir,
             )
         else:
             self.workspace_indexer = None
@@ -580,7 +648,12 @@ class RobotWorkspace(Workspace):
     def setup_workspace_indexer(self):
         with self._lock_setup_workspace_indexer:
             assert self.workspace_indexer is None
-            self.workspace_indexer = WorkspaceIndexer(self, None, collect_tests=False)
+            self.workspace_indexer = WorkspaceIndexer(
+                self,
+                None,
+                collect_tests=False,
+                symbols_cache_dir=self._symbols_cache_dir,
+            )
 
     @overrides(Workspace.put_document)
     def put_document(self, text_document: TextDocumentItem) -> IDocument:
@@ -594,9 +667,12 @@ class RobotWorkspace(Workspace):
     def update_document(
         self, text_doc: TextDocumentItem, change: TextDocumentContentChangeEvent
     ) -> IDocument:
+        previous_doc = self.get_document(text_doc["uri"], accept_from_file=False)
         doc = typing.cast(
             IRobotDocument, Workspace.update_document(self, text_doc, change)
         )
+        if isinstance(previous_doc, RobotDocument) and isinstance(doc, RobotDocument):
+            doc.set_incremental_parse_base(previous_doc)
         self.completion_context_workspace_caches.on_updated_document(doc.uri, doc)
         if self.workspace_indexer is not None:
             self.workspace_indexer.on_updated_document(doc.uri)
@@ -607,7 +683,7 @@ class RobotWorkspace(Workspace):
         doc = Workspace.remove_document(self, uri)
         self.completion_context_workspace_caches.on_updated_document(uri, None)
         if self.workspace_indexer is not None:
-            self.workspace_indexer.on_updated_document(uri)
+            self.workspace_indexer.on_closed_document(uri)
         return doc
 
     @overrides(Workspace.add_folder)
@@ -628,9 +704,20 @@ class RobotWorkspace(Workspace):
 
     @overrides(Workspace.on_changed_config)
     def on_changed_config(self, config: IConfig):
+        from robotframework_ls.impl.robot_generated_lsp_constants import (
+            OPTION_ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB,
+        )
+
         Workspace.on_changed_config(self, config)
         self.completion_context_workspace_caches.clear_caches()
 
+        files_memory_budget_mb = config.get_setting(
+            OPTION_ROBOT_WORKSPACE_FILES_MEMORY_BUDGET_MB, float, 0
+        )
+        self.set_filesystem_docs_target_memory(
+            int(files_memory_budget_mb * 1e6) if files_memory_budget_mb > 0 else None
+        )
+
     @overrides(Workspace.dispose)
     def dispose(self):
         Workspace.dispose(self)
@@ -661,6 +748,15 @@ class RobotDocument(Document):
     TYPE_INIT = "init"
     TYPE_RESOURCE = "resource"
 
+    # The AST from get_ast() and the language codes used to generate it.
+    _ast_and_language_codes: Optional[Tuple[Any, Tuple[str, ...]]]
+
+    # The memory estimated for each cache (i.e.: 'ast' -> size in bytes).
+    # Note: always replaced as a whole (never mutated).
+    _caches_memory_usage: Dict[str, int]
+
+    _symbols_cache: Optional[ISymbolsCache]
+
     def __init__(
         self,
         uri,
@@ -681,17 +777,72 @@ class RobotDocument(Document):
         )
 
         self._generate_ast = generate_ast
-        self._ast = None
+        self._caches_memory_usage = {}
         self.symbols_cache = None
 
+        # The base used to generate the AST incrementally:
+        # (ast, lines, language codes).
+        self._incremental_parse_base: Optional[
+            Tuple[Any, Tuple[str, ...], Tuple[str, ...]]
+        ] = None
+
     @overrides(Document._clear_caches)
     def _clear_caches(self):
         Document._clear_caches(self)
         self._symbols_cache = None
+        self._ast_and_language_codes = None
+        self._caches_memory_usage = {}
         self.get_ast.cache_clear(self)  # noqa (clear the instance_cache).
         self.get_python_ast.cache_clear(self)  # noqa (clear the instance_cache).
         self.get_yaml_contents.cache_clear(self)  # noqa (clear the instance_cache).
 
+    @overrides(Document.release_derived_caches)
+    def release_derived_caches(self) -> None:
+        # Note: the source and the symbols cache are kept (the symbols cache
+        # is what's used to search the workspace and it's much smaller than
+        # the AST).
+        Document.release_derived_caches(self)
+        self._ast_and_language_codes = None
+        self._incremental_parse_base = None
+        caches_memory_usage = {}
+        symbols_size = self._caches_memory_usage.get("symbols")
+        if symbols_size is not None:
+            caches_memory_usage["symbols"] = symbols_size
+        self._caches_memory_usage = caches_memory_usage
+        self.get_ast.cache_clear(self)  # noqa (clear the instance_cache).
+        self.get_python_ast.cache_clear(self)  # noqa (clear the instance_cache).
+        self.get_yaml_contents.cache_clear(self)  # noqa (clear the instance_cache).
+
+    @overrides(Document.get_memory_usage)
+    def get_memory_usage(self) -> Dict[str, int]:
+        ret = Document.get_memory_usage(self)
+        ret.update(self._caches_memory_usage)
+        return ret
+
+    def _set_cache_memory_usage(
+        self, cache_name: str, estimator: SizeEstimator, obj: Any
+    ) -> None:
+        caches_memory_usage = self._caches_memory_usage.copy()
+        if obj is None:
+            caches_memory_usage.pop(cache_name, None)
+        else:
+            caches_memory_usage[cache_name] = estimator.estimate(
+                obj, self._get_char_count()
+            )
+        self._caches_memory_usage = caches_memory_usage
+        self._notify_memory_usage_changed()
+
+    @property
+    def symbols_cache(self) -> Optional[ISymbolsCache]:
+        return self._symbols_cache
+
+    @symbols_cache.setter
+    def symbols_cache(self, symbols_cache: Optional[ISymbolsCache]) -> None:
+        self._symbols_cache = symbols_cache
+        self._set_cache_memory_usage(
+            "symbols", _SYMBOLS_CACHE_SIZE_ESTIMATOR, symbols_cache
+        )
+
     def get_type(self):
         path = self.path
         if not path:
@@ -709,6 +860,26 @@ class RobotDocument(Document):
 
         return self.TYPE_TEST_CASE
 
+    def set_incremental_parse_base(self, previous_doc: "RobotDocument") -> None:
+        """
+        Provides the previous version of this document so that the AST can be
+        generated by reparsing only what changed.
+        """
+        if not self._generate_ast:
+            return
+
+        ast_and_language_codes = previous_doc._ast_and_language_codes
+        if ast_and_language_codes is not None:
+            ast, language_codes = ast_and_language_codes
+            self._incremental_parse_base = (
+                ast,
+                previous_doc.get_internal_lines(),
+                language_codes,
+            )
+        else:
+            # The AST of the previous doc wasn't requested: use its base.
+            self._incremental_parse_base = previous_doc._incremental_parse_base
+
     @instance_cache
     def get_ast(self):
         if not self._generate_ast:
@@ -716,13 +887,126 @@ class RobotDocument(Document):
                 "The AST can only be accessed in the RobotFrameworkServerApi, not in the RobotFrameworkLanguageServer."
             )
 
-        return self.generate_ast_uncached()
+        ast_and_language_codes = None
+        incremental_parse_base = self._incremental_parse_base
+        if incremental_parse_base is not None:
+            self._incremental_parse_base = None
+            ast_and_language_codes = self._generate_ast_incrementally(
+                *incremental_parse_base
+            )
 
-    def generate_ast_uncached(self) -> None:
-        from robot.api import get_model, get_resource_model, get_init_model
+        if ast_and_language_codes is None:
+            ast_and_language_codes = self._generate_ast_and_language_codes()
+
+        self._ast_and_language_codes = ast_and_language_codes
+        ast = ast_and_language_codes[0]
+        self._set_cache_memory_usage("ast", _AST_SIZE_ESTIMATOR, ast)
+        return ast
+
+    def _get_parse_kwargs(self) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+        """
+        :return:
+            The kwargs to be passed to `get_model` and the language codes
+            used.
+        """
         from robotframework_ls.impl.robot_localization import (
             get_global_localization_info,
         )
+        from robotframework_ls.impl.robot_version import robot_version_supports_language
+
+        kwargs: Dict[str, Any] = {}
+        language_codes: Tuple[str, ...] = ()
+
+        if robot_version_supports_language():
+            try:
+                # Input localization
+                localization_info = get_global_localization_info()
+                from robot.api import Languages
+
+                languages = Languages()
+                for code in localization_info.language_codes:
+                    languages.add_language(code)
+
+                kwargs["lang"] = languages
+                language_codes = tuple(localization_info.language_codes)
+            except Exception:
+                log.exception(
+                    "Error: Unable to use expected language API in this version of Robot Framework."
+                )
+        return kwargs, language_codes
+
+    def _create_model(self, source: str, kwargs: Dict[str, Any]):
+        from robot.api import get_model, get_resource_model, get_init_model
+
+        t = self.get_type()
+        if t == self.TYPE_TEST_CASE:
+            return get_model(source, **kwargs)
+
+        elif t == self.TYPE_RESOURCE:
+            return get_resource_model(source, **kwargs)
+
+        elif t == self.TYPE_INIT:
+            return get_init_model(source, **kwargs)
+
+        else:
+            log.critical("Unrecognized section: %s", t)
+            return get_model(source, **kwargs)
+
+    def _generate_ast_incrementally(
+        self,
+        previous_ast,
+        previous_lines: Tuple[str, ...],
+        previous_language_codes: Tuple[str, ...],
+    ) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+        """
+        :return:
+            The AST and the language codes used or None if it wasn't possible
+            to generate it incrementally (and a full parse is needed).
+        """
+        from robotframework_ls.impl import ast_utils
+        from robotframework_ls.impl.robot_version import get_robot_major_version
+        from robotframework_ls.impl.robot_incremental_parse import (
+            parse_incrementally,
+        )
+
+        if get_robot_major_version() < 4:
+            return None
+
+        try:
+            kwargs, language_codes = self._get_parse_kwargs()
+            if language_codes != previous_language_codes:
+                return None
+
+            result = parse_incrementally(
+                previous_ast,
+                previous_lines,
+                self.get_internal_lines(),
+                lambda source: self._create_model(source, kwargs),
+            )
+            if result is None:
+                return None
+
+            ast = result.ast
+            if ast is not previous_ast:
+                ast.source = self.path
+                ast_utils.set_localization_info_in_model(
+                    ast,
+                    ast_utils.get_localization_info_from_model(previous_ast),
+                    result.new_nodes,
+                )
+            return ast, language_codes
+        except Exception:
+            log.exception(f"Error parsing {self.uri} incrementally.")
+            return None
+
+    def generate_ast_uncached(self):
+        """
+        Note: always does a full parse (so, the AST returned may be changed
+        by the caller).
+        """
+        return self._generate_ast_and_language_codes()[0]
+
+    def _generate_ast_and_language_codes(self) -> Tuple[Any, Tuple[str, ...]]:
         from robotframework_ls.impl import ast_utils
         from robotframework_ls.impl.robot_version import robot_version_supports_language
         from robotframework_ls.impl.robot_localization import LocalizationInfo
@@ -734,38 +1018,10 @@ class RobotDocument(Document):
             source = ""
 
         language_codes: List[str] = []
+        parse_language_codes: Tuple[str, ...] = ()
         try:
-            kwargs: Dict[str, Any] = {}
-
-            if robot_version_supports_language():
-                try:
-                    # Input localization
-                    localization_info = get_global_localization_info()
-                    from robot.api import Languages
-
-                    languages = Languages()
-                    for code in localization_info.language_codes:
-                        languages.add_language(code)
-
-                    kwargs["lang"] = languages
-                except Exception:
-                    log.exception(
-                        "Error: Unable to use expected language API in this version of Robot Framework."
-                    )
-
-            t = self.get_type()
-            if t == self.TYPE_TEST_CASE:
-                ast = get_model(source, **kwargs)
-
-            elif t == self.TYPE_RESOURCE:
-                ast = get_resource_model(source, **kwargs)
-
-            elif t == self.TYPE_INIT:
-                ast = get_init_model(source, **kwargs)
-
-            else:
-                log.critical("Unrecognized section: %s", t)
-                ast = get_model(source, **kwargs)
+            kwargs, parse_language_codes = self._get_parse_kwargs()
+            ast = self._create_model(source, kwargs)
 
             # Output localization
             if robot_version_supports_language():
@@ -775,8 +1031,10 @@ class RobotDocument(Document):
 
             ast.source = self.path
             ast_utils.set_localization_info_in_model(ast, localization_info)
-            return ast
+            return ast, parse_language_codes
         except:
+            from robot.api import get_model
+
             log.exception(f"Error parsing {self.uri}")
             # Note: we always want to return a valid AST here (the
             # AST itself should have the error).
@@ -785,7 +1043,7 @@ class RobotDocument(Document):
             localization_info = LocalizationInfo(tuple(language_codes))
             ast_utils.set_localization_info_in_model(ast, localization_info)
             ast.source = self.path
-            return ast
+            return ast, parse_language_codes
 
     @instance_cache
     def get_python_ast(self):
@@ -803,11 +1061,16 @@ class RobotDocument(Document):
         try:
             import ast as ast_module
 
-            return ast_module.parse(source)
+            python_ast = ast_module.parse(source)
         except:
             log.critical(f"Error parsing python file: {self.uri}")
             return None
 
+        self._set_cache_memory_usage(
+            "python_ast", _PYTHON_AST_SIZE_ESTIMATOR, python_ast
+        )
+        return python_ast
+
     @instance_cache
     def get_yaml_contents(self) -> Optional[Any]:
         try:
@@ -823,10 +1086,13 @@ class RobotDocument(Document):
             s = StringIO()
             s.write(source)
             s.seek(0)
-            return yaml_wrapper.load(s)
+            yaml_contents = yaml_wrapper.load(s)
         except:
             log.critical(f"Error parsing yaml file: {self.uri}")
             return None
 
+        self._set_cache_memory_usage("yaml", _YAML_SIZE_ESTIMATOR, yaml_contents)
+        return yaml_contents
+
     def __typecheckself__(self) -> None:
         _: IRobotDocument = check_implements(self)
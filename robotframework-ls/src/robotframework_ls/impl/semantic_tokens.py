@@ -1,13 +1,17 @@
+import ast as ast_module
 import itertools
 import os
-from typing import List, Tuple, Iterator, Optional, Any
+import sys
+import typing
+from typing import List, Tuple, Iterator, Optional, Any, Iterable
 
 from robocorp_ls_core.code_units import (
     compute_utf16_code_units_len,
     get_range_considering_utf16_code_units,
 )
-from robocorp_ls_core.protocols import IDocument
-from robotframework_ls.impl.protocols import ICompletionContext, IRobotToken
+from robocorp_ls_core.lsp import RangeTypedDict, SemanticTokensEditTypedDict
+from robocorp_ls_core.protocols import IDocument, IMonitor
+from robotframework_ls.impl.protocols import ICompletionContext, IRobotToken, INode
 from robotframework_ls.impl.robot_constants import (
     COMMENT,
     HEADER_TOKENS,
@@ -228,10 +232,6 @@ def _tokenize_variables(token: IRobotToken) -> Iterator[IRobotToken]:
         return token.tokenize_variables()
 
 
-def semantic_tokens_range(context, range):
-    return []
-
-
 def _tokenize_token(
     node, use_token, scope: "_SemanticTokensScope"
 ) -> Iterator[Tuple[IRobotToken, int]]:
@@ -538,34 +538,37 @@ class _SemanticTokensScope:
 
         self._gherkin_regexp = re.compile("".join(regexp), flags=re.IGNORECASE)
 
+        # The tokens cached for a node may only be reused if this key matches.
+        self.cache_key = (
+            frozenset(self.imported_libraries),
+            self._gherkin_regexp.pattern,
+        )
+
     def get_gherkin_regexp(self):
         "^((Given|When|Then|And|But)\s+)"
         return self._gherkin_regexp
 
 
-def semantic_tokens_full(context: ICompletionContext):
-    from robotframework_ls.impl import ast_utils_keyword_usage
-    from robotframework_ls.impl.ast_utils import get_localization_info_from_model
+# (line, col (in utf-16 code units), len (in utf-16 code units), token type)
+_AbsoluteToken = Tuple[int, int, int, int]
 
-    try:
-        ast = context.doc.get_ast()
-    except:
-        return []
+# Attribute used to cache the tokens computed for a node (nodes are shared
+# among ASTs created incrementally, so, the tokens for nodes which weren't
+# changed are reused).
+_SEMANTIC_TOKENS_CACHE_ATTRIBUTE = "__semantic_tokens__"
 
-    from robotframework_ls.impl import ast_utils
 
-    monitor = context.monitor
+def _compute_node_tokens(
+    nodes: Iterable[Tuple[List[INode], INode]],
+    scope: _SemanticTokensScope,
+    monitor: Optional[IMonitor],
+) -> List[_AbsoluteToken]:
+    from robotframework_ls.impl import ast_utils_keyword_usage
 
-    ret: List[int] = []
+    ret: List[_AbsoluteToken] = []
     append = ret.append
 
-    last_line = 0
-    last_column = 0
-
-    localization_info = get_localization_info_from_model(ast)
-
-    scope = _SemanticTokensScope(context, localization_info)
-    for stack, node in ast_utils.iter_all_nodes_recursive(ast):
+    for stack, node in nodes:
         if monitor:
             monitor.check_cancelled()
         tokens = getattr(node, "tokens", None)
@@ -574,35 +577,203 @@ def semantic_tokens_full(context: ICompletionContext):
                 ast_utils_keyword_usage.obtain_keyword_usage_handler(stack, node)
             )
             diff_in_line = 0
+            last_line = -1
 
             for token in tokens:
                 for token_part, token_type_index in _tokenize_token(node, token, scope):
                     lineno = token_part.lineno - 1
                     if lineno < 0:
                         lineno = 0
-                    append(lineno - last_line)
                     if lineno != last_line:
                         diff_in_line = 0
-                        last_column = token_part.col_offset
-                        if last_column < 0:
-                            last_column = 0
-                        append(last_column)
-                    else:
-                        col_delta = token_part.col_offset + diff_in_line - last_column
-                        append(col_delta)
-                        last_column += col_delta
 
                     len_unicode = len(token_part.value)
                     len_bytes = compute_utf16_code_units_len(token_part.value)
-                    append(len_bytes)
+                    append(
+                        (
+                            lineno,
+                            token_part.col_offset + diff_in_line,
+                            len_bytes,
+                            token_type_index,
+                        )
+                    )
                     diff_in_line += len_bytes - len_unicode
-                    append(token_type_index)
-                    append(0)  # i.e.: no modifier
                     last_line = lineno
+    return ret
+
+
+def _get_unit_tokens(
+    stack: List[INode],
+    unit: INode,
+    scope: _SemanticTokensScope,
+    monitor: Optional[IMonitor],
+) -> List[_AbsoluteToken]:
+    """
+    Provides the tokens for a node which is a direct child of a section
+    (along with all its children), caching it in the node.
+    """
+    from robotframework_ls.impl import ast_utils
+
+    cache_key = scope.cache_key
+    cached = getattr(unit, _SEMANTIC_TOKENS_CACHE_ATTRIBUTE, None)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+
+    unit_stack = stack + [unit]
+    nodes = itertools.chain(
+        ((stack, unit),), ast_utils.iter_all_nodes_recursive(unit, unit_stack)
+    )
+    tokens = _compute_node_tokens(nodes, scope, monitor)
+    setattr(unit, _SEMANTIC_TOKENS_CACHE_ATTRIBUTE, (cache_key, tokens))
+    return tokens
+
+
+def _get_node_lines(node) -> Tuple[int, int]:
+    """
+    :return:
+        The 0-based start and end lines of the node (or a range with all the
+        lines if it can't be computed).
+    """
+    try:
+        return node.lineno - 1, node.end_lineno - 1
+    except Exception:
+        return 0, sys.maxsize
+
+
+def _iter_absolute_tokens(
+    context: ICompletionContext,
+    start_line: int = 0,
+    end_line: int = sys.maxsize,
+) -> Iterator[_AbsoluteToken]:
+    """
+    Provides the tokens in the given (0-based, inclusive) lines.
+    """
+    from robotframework_ls.impl.ast_utils import get_localization_info_from_model
+
+    try:
+        ast = context.doc.get_ast()
+    except:
+        return
+
+    monitor = context.monitor
+    localization_info = get_localization_info_from_model(ast)
+    scope = _SemanticTokensScope(context, localization_info)
+
+    filter_lines = start_line > 0 or end_line != sys.maxsize
+
+    # The tokens are computed for each direct child of a section (so that they
+    # can be cached in the node).
+    for section in ast.sections:
+        if filter_lines:
+            section_start, section_end = _get_node_lines(section)
+            if section_end < start_line or section_start > end_line:
+                continue
+
+        yield from _compute_node_tokens((([], section),), scope, monitor)
+
+        stack = [section]
+        for _field, value in ast_module.iter_fields(section):
+            if isinstance(value, list):
+                units = value
+            else:
+                units = [value]
+
+            for unit in units:
+                if not isinstance(unit, ast_module.AST):
+                    continue
+                if filter_lines:
+                    unit_start, unit_end = _get_node_lines(unit)
+                    if unit_end < start_line or unit_start > end_line:
+                        continue
+
+                tokens = _get_unit_tokens(
+                    stack, typing.cast(INode, unit), scope, monitor
+                )
+                if filter_lines:
+                    for token in tokens:
+                        if start_line <= token[0] <= end_line:
+                            yield token
+                else:
+                    yield from tokens
+
+
+def _encode_tokens(tokens: Iterable[_AbsoluteToken]) -> List[int]:
+    ret: List[int] = []
+    append = ret.append
+
+    last_line = 0
+    last_column = 0
+
+    for lineno, col, len_bytes, token_type_index in tokens:
+        append(lineno - last_line)
+        if lineno != last_line:
+            last_column = col
+            if last_column < 0:
+                last_column = 0
+            append(last_column)
+        else:
+            append(col - last_column)
+            last_column = col
+
+        append(len_bytes)
+        append(token_type_index)
+        append(0)  # i.e.: no modifier
+        last_line = lineno
 
     return ret
 
 
+def semantic_tokens_full(context: ICompletionContext) -> List[int]:
+    return _encode_tokens(_iter_absolute_tokens(context))
+
+
+def semantic_tokens_range(
+    context: ICompletionContext, range: RangeTypedDict
+) -> List[int]:
+    """
+    Provides the semantic tokens in the given range (only the nodes in the
+    range are visited).
+    """
+    start_line = range["start"]["line"]
+    end_line = range["end"]["line"]
+    return _encode_tokens(_iter_absolute_tokens(context, start_line, end_line))
+
+
+def compute_semantic_tokens_edits(
+    previous_data: List[int], new_data: List[int]
+) -> List[SemanticTokensEditTypedDict]:
+    """
+    Computes the edits to transform the previous semantic tokens into the
+    new semantic tokens (a single edit with the changed part: usually a
+    change only affects the tokens of a few lines).
+    """
+    if previous_data == new_data:
+        return []
+
+    max_common = min(len(previous_data), len(new_data))
+
+    prefix = 0
+    while prefix < max_common and previous_data[prefix] == new_data[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = max_common - prefix
+    while (
+        suffix < max_suffix
+        and previous_data[len(previous_data) - suffix - 1]
+        == new_data[len(new_data) - suffix - 1]
+    ):
+        suffix += 1
+
+    return [
+        {
+            "start": prefix,
+            "deleteCount": len(previous_data) - suffix - prefix,
+            "data": new_data[prefix : len(new_data) - suffix],
+        }
+    ]
+
+
 def iter_decoded_semantic_tokens(semantic_tokens_as_int: List[int]):
     if not semantic_tokens_as_int:
         return
@@ -0,0 +1,490 @@
+"""
+Index to find the symbols (keywords and workspace symbols) from the symbols
+caches by (a part of) their name.
+
+The `SymbolsNameIndex` is kept by the `WorkspaceIndexer` and is fed by the
+symbols caches as those are computed (the documents/libraries changed are
+updated incrementally when the index is synchronized).
+
+The names are normalized (see: `normalize_robot_name`) and the n-grams (with
+up to 3 chars) of each name are kept in postings, so, a query only needs to
+check the names which have all the n-grams of the query (instead of checking
+all the names of all the symbols caches).
+"""
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+import threading
+import typing
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.protocols import (
+    IBaseCompletionContext,
+    ISymbolKeywordInfo,
+    ISymbolsCache,
+    ISymbolsJsonListEntry,
+    ISymbolsNameIndex,
+    SymbolsNameIndexEntry,
+)
+from robocorp_ls_core.protocols import check_implements
+
+log = get_logger(__name__)
+
+# The size of the n-grams indexed (names with up to this size are looked up
+# directly in the postings).
+NGRAM_SIZE = 3
+
+
+def _iter_ngrams(name: str, size: int) -> Iterator[str]:
+    for i in range(len(name) - size + 1):
+        yield name[i : i + size]
+
+
+def _get_name_ngrams(name: str) -> Set[str]:
+    ngrams: Set[str] = set()
+    for size in range(1, NGRAM_SIZE + 1):
+        ngrams.update(_iter_ngrams(name, size))
+    return ngrams
+
+
+def _get_fuzzy_match_score(query: str, name: str) -> Optional[int]:
+    """
+    :return:
+        None if the chars of the query aren't found in the name (in order) or
+        the number of chars skipped between the first and last char matched
+        (lower is better).
+    """
+    first = -1
+    pos = -1
+    for c in query:
+        pos = name.find(c, pos + 1)
+        if pos == -1:
+            return None
+        if first == -1:
+            first = pos
+    return pos - first + 1 - len(query)
+
+
+def get_match_rank(query: str, name: str, fuzzy: bool) -> Optional[tuple]:
+    """
+    :param query:
+        The normalized query.
+
+    :param name:
+        The normalized name.
+
+    :return:
+        A tuple to sort the matches (lower is better) or None if the name
+        doesn't match the query.
+
+        The order is: exact match, prefix match, substring match (earlier
+        matches first) and then fuzzy matches (with less chars between the
+        chars matched first). Shorter names are shown first on ties.
+    """
+    if name == query:
+        return (0, 0, len(name), name)
+
+    i = name.find(query)
+    if i == 0:
+        return (1, 0, len(name), name)
+
+    if i > 0:
+        return (2, i, len(name), name)
+
+    if fuzzy:
+        score = _get_fuzzy_match_score(query, name)
+        if score is not None:
+            return (3, score, len(name), name)
+
+    return None
+
+
+class _SymbolsCacheNames(object):
+    """
+    The names which a symbols cache added to the index.
+    """
+
+    __slots__ = [
+        "symbols_cache",
+        "names",
+        "keyword_name_to_infos",
+        "symbol_name_to_entries",
+    ]
+
+    def __init__(self, symbols_cache: ISymbolsCache):
+        from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+        self.symbols_cache = symbols_cache
+
+        keyword_name_to_infos: Dict[str, List[ISymbolKeywordInfo]] = {}
+        for keyword_info in symbols_cache.iter_keyword_info():
+            keyword_name_to_infos.setdefault(
+                normalize_robot_name(keyword_info.name), []
+            ).append(keyword_info)
+
+        symbol_name_to_entries: Dict[str, List[ISymbolsJsonListEntry]] = {}
+        for entry in symbols_cache.get_json_list():
+            symbol_name_to_entries.setdefault(
+                normalize_robot_name(entry["name"]), []
+            ).append(entry)
+
+        self.keyword_name_to_infos = keyword_name_to_infos
+        self.symbol_name_to_entries = symbol_name_to_entries
+        self.names: FrozenSet[str] = frozenset(keyword_name_to_infos).union(
+            symbol_name_to_entries
+        )
+
+
+class SymbolsNameIndex(object):
+    """
+    Maps the (normalized) names of the symbols to the symbols caches which
+    provide those.
+
+    Keys are the document uri for symbols caches computed from documents and
+    `("library", <source or name>)` for symbols caches computed from libraries.
+
+    Note: only one thread may synchronize the index at a time, but the
+    contents may be read from any thread (changes are done holding a lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._synchronize_lock = threading.Lock()
+
+        # The order in which keys are added is kept (and is the order in which
+        # entries for the same name are provided).
+        self._key_to_names: Dict[Hashable, _SymbolsCacheNames] = {}
+        self._name_to_keys: Dict[str, Dict[Hashable, bool]] = {}
+        self._ngram_to_names: Dict[str, Set[str]] = {}
+
+        # The uris which must still be (re)indexed.
+        self._pending_uris: Set[str] = set()
+        self._force_reindex = True
+        self._workspace_uris: Set[str] = set()
+
+        # The `LibspecManager.get_lib_infos_version()` when the libraries were
+        # last synchronized (and the number of full reindex requests, used to
+        # know whether a full reindex was requested while synchronizing).
+        self._libraries_version: Optional[int] = None
+        self._full_reindex_requests = 0
+
+        # Stats (see: get_stats()).
+        self._queries = 0
+        self._names_checked = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "indexed_keys": len(self._key_to_names),
+            "indexed_names": len(self._name_to_keys),
+            "ngrams": len(self._ngram_to_names),
+            "pending_uris": len(self._pending_uris),
+            "queries": self._queries,
+            "names_checked": self._names_checked,
+        }
+
+    def request_full_reindex(self) -> None:
+        with self._lock:
+            self._force_reindex = True
+            self._full_reindex_requests += 1
+            self._libraries_version = None
+
+    def notify_uri_changed(self, uri: str) -> None:
+        with self._lock:
+            self._pending_uris.add(uri)
+
+    def update(self, key: Hashable, symbols_cache: Optional[ISymbolsCache]) -> None:
+        """
+        Sets the symbols cache for the given key (None removes it).
+        """
+        with self._lock:
+            old = self._key_to_names.get(key)
+            if isinstance(key, str):
+                self._pending_uris.discard(key)
+
+            if old is not None and old.symbols_cache is symbols_cache:
+                return
+
+        # Computing the names may be slow (so, do it without the lock).
+        new: Optional[_SymbolsCacheNames] = None
+        if symbols_cache is not None:
+            new = _SymbolsCacheNames(symbols_cache)
+
+        with self._lock:
+            old = self._key_to_names.pop(key, None)
+            old_names: FrozenSet[str] = frozenset()
+            if old is not None:
+                old_names = old.names
+
+            new_names: FrozenSet[str] = frozenset()
+            if new is not None:
+                new_names = new.names
+                self._key_to_names[key] = new
+
+            for name in old_names.difference(new_names):
+                keys = self._name_to_keys.get(name)
+                if keys is not None:
+                    keys.pop(key, None)
+                    if not keys:
+                        del self._name_to_keys[name]
+                        self._remove_ngrams(name)
+
+            for name in new_names:
+                keys = self._name_to_keys.get(name)
+                if keys is None:
+                    keys = self._name_to_keys[name] = {}
+                    self._add_ngrams(name)
+                keys[key] = True
+
+    def _add_ngrams(self, name: str) -> None:
+        for ngram in _get_name_ngrams(name):
+            names = self._ngram_to_names.get(ngram)
+            if names is None:
+                names = self._ngram_to_names[ngram] = set()
+            names.add(name)
+
+    def _remove_ngrams(self, name: str) -> None:
+        for ngram in _get_name_ngrams(name):
+            names = self._ngram_to_names.get(ngram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._ngram_to_names[ngram]
+
+    def _get_candidate_names(self, query: str, fuzzy: bool) -> Iterable[str]:
+        ngram_to_names = self._ngram_to_names
+        if not query:
+            return list(self._name_to_keys)
+
+        if fuzzy:
+            # All the chars in the query must be in the name.
+            ngrams = set(query)
+        elif len(query) <= NGRAM_SIZE:
+            return set(ngram_to_names.get(query, ()))
+        else:
+            ngrams = set(_iter_ngrams(query, NGRAM_SIZE))
+
+        postings = []
+        for ngram in ngrams:
+            names = ngram_to_names.get(ngram)
+            if not names:
+                return ()
+            postings.append(names)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for names in postings[1:]:
+            candidates.intersection_update(names)
+            if not candidates:
+                break
+        return candidates
+
+    def find_names(self, normalized_query: str, fuzzy: bool = False) -> List[str]:
+        """
+        :param normalized_query:
+            The query (normalized with `normalize_robot_name`).
+
+        :param fuzzy:
+            If False only names containing the query are provided. If True
+            names with the chars of the query in the same order are also
+            provided.
+
+        :return:
+            The names matching the query (best matches first).
+        """
+        with self._lock:
+            candidates = self._get_candidate_names(normalized_query, fuzzy)
+
+            ranked = []
+            for name in candidates:
+                rank = get_match_rank(normalized_query, name, fuzzy)
+                if rank is not None:
+                    ranked.append(rank)
+
+            self._queries += 1
+            self._names_checked += len(ranked)
+
+        ranked.sort()
+        return [rank[-1] for rank in ranked]
+
+    def iter_entries(
+        self, normalized_names: Iterable[str]
+    ) -> Iterator[SymbolsNameIndexEntry]:
+        """
+        Provides the symbols caches with entries with the given names (in
+        the given order).
+        """
+        for name in normalized_names:
+            with self._lock:
+                keys = tuple(self._name_to_keys.get(name, ()))
+                symbols_cache_names = [self._key_to_names.get(key) for key in keys]
+
+            for key, names in zip(keys, symbols_cache_names):
+                if names is not None:
+                    yield SymbolsNameIndexEntry(
+                        key,
+                        names.symbols_cache,
+                        names.keyword_name_to_infos.get(name, []),
+                        names.symbol_name_to_entries.get(name, []),
+                    )
+
+    def iter_symbols_caches(self) -> Iterator[Tuple[Hashable, ISymbolsCache]]:
+        with self._lock:
+            items = list(self._key_to_names.items())
+        for key, names in items:
+            yield key, names.symbols_cache
+
+    def synchronize(
+        self,
+        context: IBaseCompletionContext,
+        initial_time: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Indexes the documents changed (and the libraries available).
+
+        :return:
+            True if all the documents were indexed and False if the timeout
+            elapsed before that (in which case the remaining documents are
+            indexed in the next call).
+        """
+        from robotframework_ls.impl.robot_workspace import RobotWorkspace
+        from robotframework_ls.impl.robot_constants import ROBOT_FILE_EXTENSIONS
+        import time
+
+        if initial_time is None:
+            initial_time = time.time()
+
+        workspace = typing.cast(Optional[RobotWorkspace], context.workspace)
+        if workspace is None or workspace.workspace_indexer is None:
+            return False
+
+        with self._synchronize_lock:
+            workspace_uris = set(
+                workspace.iter_all_doc_uris_in_workspace(ROBOT_FILE_EXTENSIONS)
+            )
+            open_docs_uris = set(workspace.get_open_docs_uris())
+            workspace_uris.update(open_docs_uris)
+
+            with self._lock:
+                if self._force_reindex:
+                    self._force_reindex = False
+                    self._pending_uris.update(workspace_uris)
+                    self._pending_uris.update(
+                        key for key in self._key_to_names if isinstance(key, str)
+                    )
+                else:
+                    self._pending_uris.update(
+                        workspace_uris.symmetric_difference(self._workspace_uris)
+                    )
+                self._workspace_uris = workspace_uris
+                pending_uris = set(self._pending_uris)
+
+            if not self._synchronize_libraries(workspace, initial_time, timeout):
+                return False
+
+            if not pending_uris:
+                return True
+
+            # Open documents are indexed first.
+            uris_to_iter = [uri for uri in pending_uris if uri in open_docs_uris]
+            uris_to_iter.extend(
+                sorted(uri for uri in pending_uris if uri not in open_docs_uris)
+            )
+
+            for (
+                uri,
+                symbols_cache,
+            ) in workspace.workspace_indexer.iter_uri_and_symbols_cache(
+                initial_time=initial_time,
+                timeout=timeout,
+                context=context,
+                uris_to_iter=uris_to_iter,
+            ):
+                if uri not in workspace_uris:
+                    # i.e.: it was removed (or closed and it's not in the workspace).
+                    symbols_cache = None
+                self.update(uri, symbols_cache)
+
+            with self._lock:
+                return not self._pending_uris
+
+    def _synchronize_libraries(
+        self, workspace, initial_time: float, timeout: Optional[float]
+    ) -> bool:
+        """
+        :return:
+            True if the libraries were synchronized and False if the timeout
+            elapsed before that (the symbols caches computed for libraries are
+            kept in the library doc, so, the next call continues from there).
+        """
+        from robotframework_ls.impl.robot_constants import RESERVED_LIB
+        from robotframework_ls.impl.workspace_symbols import (
+            _compute_symbols_from_library_info,
+        )
+        import time
+
+        libspec_manager = workspace.libspec_manager
+        if not libspec_manager:
+            return True
+
+        libraries_version = libspec_manager.get_lib_infos_version()
+        with self._lock:
+            full_reindex_requests = self._full_reindex_requests
+            if libraries_version == self._libraries_version:
+                return True
+
+        found_keys = set()
+        for lib_info in libspec_manager.iter_lib_info():
+            if timeout is not None and time.time() - initial_time > timeout:
+                return False
+
+            library_info = lib_info.library_doc
+            library_name = library_info.name
+            if library_name == RESERVED_LIB:
+                continue
+
+            key = ("library", library_info.source or library_name)
+            if key in found_keys:
+                continue
+            found_keys.add(key)
+
+            symbols_cache = library_info.symbols_cache
+            if symbols_cache is None:
+                symbols_cache = _compute_symbols_from_library_info(
+                    library_name, library_info
+                )
+                library_info.symbols_cache = symbols_cache
+            self.update(key, symbols_cache)
+
+        with self._lock:
+            removed_keys = [
+                k
+                for k in self._key_to_names
+                if not isinstance(k, str) and k not in found_keys
+            ]
+        for removed_key in removed_keys:
+            self.update(removed_key, None)
+
+        with self._lock:
+            if full_reindex_requests == self._full_reindex_requests:
+                self._libraries_version = libraries_version
+        return True
+
+    def dispose(self) -> None:
+        with self._lock:
+            self._key_to_names = {}
+            self._name_to_keys = {}
+            self._ngram_to_names = {}
+            self._pending_uris = set()
+
+    def __typecheckself__(self) -> None:
+        _: ISymbolsNameIndex = check_implements(self)
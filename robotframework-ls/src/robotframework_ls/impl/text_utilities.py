@@ -1,7 +1,7 @@
 from functools import lru_cache
 from robocorp_ls_core.robotframework_log import get_logger
 import re
-from typing import Sequence
+from typing import Sequence, Optional, Pattern
 from robocorp_ls_core.protocols import IDocument
 from robocorp_ls_core.lsp import Range
 
@@ -92,7 +92,22 @@ def matches_name_with_variables(name: str, name_with_variables: str) -> bool:
         The name which has variables.
         i.e.: some ${arg}
     """
+    compiled = compile_name_with_variables(name_with_variables)
+    if compiled is None:
+        return False
+
+    return bool(compiled.match(name))
 
+
+@lru_cache(2000)
+def compile_name_with_variables(name_with_variables: str) -> Optional[Pattern]:
+    """
+    Provides the regexp used to match a name against a name with variables
+    (see: matches_name_with_variables).
+
+    :return:
+        The compiled regexp or None if it wasn't possible to create it.
+    """
     from robotframework_ls.impl import ast_utils
     from robotframework_ls.impl.variable_resolve import extract_variable_base
 
@@ -116,7 +131,7 @@ def matches_name_with_variables(name: str, name_with_variables: str) -> bool:
                         log.exception(
                             f"Error formatting regexp: {custom_regexp} when matching: {name_with_variables}."
                         )
-                        return False
+                        return None
 
                     regexp.append(f"({pattern})")
 
@@ -134,9 +149,9 @@ def matches_name_with_variables(name: str, name_with_variables: str) -> bool:
         log.exception(
             f"Unable to compile regexp: {pattern} when matching: {name_with_variables}."
         )
-        return False
+        return None
 
-    return bool(compiled.match(name))
+    return compiled
 
 
 class _EmbeddedArgumentParser:
@@ -312,6 +312,10 @@ class ResolveVariablesContext:
                 collect_global_variables_from_document_dependencies(
                     completion_context, collector
                 )
+                # Note: the dependency graph is cached in the context.
+                completion_context.add_variables_dependency_graph(
+                    completion_context.collect_dependency_graph()
+                )
 
                 found = collector.var_name_to_var_found.get(normalized)
                 if found is not None:
@@ -11,6 +11,7 @@ from robotframework_ls.impl.protocols import (
     ILibraryDoc,
     IKeywordDoc,
     ISymbolKeywordInfo,
+    ISymbolsNameIndex,
 )
 from robotframework_ls.impl.robot_lsp_constants import (
     OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS,
@@ -32,12 +33,22 @@ if not USE_TIMEOUTS:
 
 
 def _add_to_ret(ret, symbols_cache: ISymbolsCache, query: Optional[str]):
-    # Note that we could filter it here based on the passed query, but
-    # this is not being done for now for simplicity (given that we'd need
-    # to do a fuzzy matching close to what the client already does anyways).
+    # Note: the query is only used to filter when the symbols name index is
+    # available (see: _workspace_symbols_from_index).
     ret.extend(symbols_cache.get_json_list())
 
 
+def get_workspace_symbols_timeout(timeout: Optional[float] = None, _called=[]) -> float:
+    if timeout is not None:
+        return timeout
+
+    if not _called:
+        _called.append(True)
+        return WORKSPACE_SYMBOLS_FIRST_TIMEOUT
+
+    return WORKSPACE_SYMBOLS_TIMEOUT
+
+
 class _SymbolKeywordInfoFromKeywordDoc:
     _documentation: MarkupContentTypedDict
 
@@ -147,16 +158,8 @@ def iter_symbols_caches(
     show_builtins: bool = True,
     force_all_docs_in_workspace: bool = False,
     timeout: Optional[float] = None,
-    _called=[],
 ) -> Iterator[ISymbolsCache]:
-    if timeout is not None:
-        TIMEOUT = timeout
-    else:
-        if not _called:
-            TIMEOUT = WORKSPACE_SYMBOLS_FIRST_TIMEOUT
-            _called.append(True)
-        else:
-            TIMEOUT = WORKSPACE_SYMBOLS_TIMEOUT
+    TIMEOUT = get_workspace_symbols_timeout(timeout)
 
     try:
         from robotframework_ls.impl.libspec_manager import LibspecManager
@@ -249,9 +252,62 @@ def iter_symbols_caches(
         raise
 
 
+def get_symbols_name_index(
+    context: IBaseCompletionContext, force_all_docs_in_workspace: bool = False
+) -> Optional[ISymbolsNameIndex]:
+    """
+    :return:
+        The index with the names of the symbols in the workspace or None if it
+        shouldn't be used (in which case `iter_symbols_caches` should be used).
+    """
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+    workspace: Optional[RobotWorkspace] = typing.cast(
+        Optional[RobotWorkspace], context.workspace
+    )
+    if not workspace or workspace.workspace_indexer is None:
+        return None
+
+    config = context.config
+    if config and not force_all_docs_in_workspace:
+        if config.get_setting(
+            OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS, bool, False
+        ):
+            return None
+
+    return workspace.workspace_indexer.symbols_name_index
+
+
+def _workspace_symbols_from_index(
+    query: Optional[str],
+    context: IBaseCompletionContext,
+    symbols_name_index: ISymbolsNameIndex,
+) -> List[SymbolInformationTypedDict]:
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    symbols_name_index.synchronize(context, timeout=get_workspace_symbols_timeout())
+
+    ret: List[SymbolInformationTypedDict] = []
+    normalized_query = normalize_robot_name(query) if query else ""
+    if not normalized_query:
+        for _key, symbols_cache in symbols_name_index.iter_symbols_caches():
+            _add_to_ret(ret, symbols_cache, query)
+        return ret
+
+    names = symbols_name_index.find_names(normalized_query, fuzzy=True)
+    for entry in symbols_name_index.iter_entries(names):
+        context.check_cancelled()
+        ret.extend(typing.cast(List[SymbolInformationTypedDict], entry.json_entries))
+    return ret
+
+
 def workspace_symbols(
     query: Optional[str], context: IBaseCompletionContext
 ) -> List[SymbolInformationTypedDict]:
+    symbols_name_index = get_symbols_name_index(context)
+    if symbols_name_index is not None:
+        return _workspace_symbols_from_index(query, context, symbols_name_index)
+
     ret: List[SymbolInformationTypedDict] = []
 
     for symbols_cache in iter_symbols_caches(query, context):
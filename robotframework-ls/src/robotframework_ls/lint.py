@@ -0,0 +1,476 @@
+"""
+Lints Robot Framework files without a language server (i.e.: in CI):
+
+    python -m robotframework_ls.lint [paths] [--root=<dir>] [--format=json|sarif]
+
+The diagnostics are the same ones provided by the language server (code
+analysis, syntax errors and Robocop if enabled in the settings) and the files
+are analyzed in parallel in a pool of worker processes.
+
+Results are cached (based on the contents of each file and of its
+dependencies -- resources, variables and libraries -- as well as on the
+settings and Robocop configuration files), so, files which didn't change are
+not analyzed again in a new run.
+
+The libspecs and caches are saved in the robotframework-ls home (set the
+`ROBOTFRAMEWORK_LS_USER_HOME` environment variable to change it, i.e.: to
+a dir which is cached among CI runs).
+
+Exit codes:
+    0: no errors found.
+    1: some error was found (diagnostics with warnings/information don't
+       affect the exit code).
+    2: invalid arguments.
+    3: some file couldn't be linted (i.e.: an internal error happened when
+       linting it). Such files are reported as failed in the output (and
+       this takes precedence over the exit code 1).
+"""
+import argparse
+import os
+import sys
+
+if __name__ == "__main__":
+    try:
+        import robotframework_ls  # @UnusedImport
+    except ImportError:
+        # Automatically add it to the path if executed directly.
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FORMAT_JSON = "json"
+FORMAT_SARIF = "sarif"
+
+_SARIF_LEVELS = {1: "error", 2: "warning", 3: "note", 4: "note"}
+
+# The files which Robocop searches (in the folder of the file linted or its
+# parents) to load its configuration.
+_ROBOCOP_CONFIG_FILENAMES = (".robocop", "pyproject.toml")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.description = "Lints Robot Framework files (.robot and .resource)."
+
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Files or folders to lint (folders are checked recursively). Default: the root folder.",
+    )
+    parser.add_argument(
+        "--root",
+        help="The root folder of the workspace (used to resolve imports). Default: the current folder.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=(FORMAT_JSON, FORMAT_SARIF),
+        default=FORMAT_JSON,
+        help="The output format.",
+    )
+    parser.add_argument(
+        "--output",
+        help="The file to write the output to. Default: the standard output.",
+    )
+    parser.add_argument(
+        "--settings",
+        help="A json file with the language server settings to be used (i.e.: "
+        + '{"robot": {"lint": {"robocop": {"enabled": true}}}}).',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes (0 or 1 means that the files are linted "
+        + "in the current process). Default: based on the number of files and cpus.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="The folder where the lint results are cached.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="If passed, cached results are not used (nor saved).",
+    )
+    parser.add_argument(
+        "--log-file",
+        help="Redirect logs to the given file instead of writing to stderr.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase verbosity of log output (i.e.: -vv).",
+    )
+
+
+def collect_paths_to_lint(paths):
+    """
+    :return: The .robot and .resource files in the given paths (sorted).
+    """
+    from pathlib import Path
+
+    found = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        if path.lower().endswith((".robot", ".resource")):
+            if os.path.isfile(path):
+                found.add(path)
+            continue
+
+        p = Path(path)
+        if not p.is_dir():
+            continue
+
+        for f in p.rglob("*"):
+            if f.suffix.lower() in (".robot", ".resource") and f.is_file():
+                found.add(str(f))
+    return sorted(found)
+
+
+def _iter_robocop_config_files(paths):
+    """
+    Provides the Robocop config files which may be used when linting the
+    given paths (i.e.: the ones in the folders of the paths or their parents).
+    """
+    checked = set()
+    for path in paths:
+        directory = os.path.dirname(path)
+        while directory not in checked:
+            checked.add(directory)
+            for config_name in _ROBOCOP_CONFIG_FILENAMES:
+                config_path = os.path.join(directory, config_name)
+                if os.path.isfile(config_path):
+                    yield config_path
+
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+
+def _get_environment_key(settings, paths):
+    import hashlib
+    from robotframework_ls import __version__
+    from robotframework_ls.impl.robot_version import get_robot_version
+
+    config_files = []
+    for config_path in sorted(_iter_robocop_config_files(paths)):
+        try:
+            with open(config_path, "rb") as stream:
+                digest = hashlib.sha256(stream.read()).hexdigest()
+        except OSError:
+            digest = None
+        config_files.append([config_path, digest])
+
+    return [__version__, get_robot_version(), sys.executable, settings, config_files]
+
+
+def lint_paths(
+    root_path,
+    paths,
+    settings=None,
+    workers=None,
+    cache_dir=None,
+    use_cache=True,
+):
+    """
+    :return:
+        A tuple(results, failed) where results is a list with
+        (path, diagnostics, cached) for each file linted and failed is a list
+        with (path, error message) for each file which couldn't be linted
+        (both sorted by path).
+    """
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+    from robocorp_ls_core.robotframework_log import get_logger
+    from robotframework_ls.impl import lint_pool
+    from robotframework_ls.impl.lint_result_cache import (
+        LintResultCache,
+        get_lint_result_cache_dir,
+    )
+
+    log = get_logger(__name__)
+
+    root_uri = uris.from_fs_path(root_path)
+    lint_result_cache = None
+    if use_cache:
+        lint_result_cache = LintResultCache(
+            cache_dir or get_lint_result_cache_dir(),
+            root_path,
+            _get_environment_key(settings, paths),
+        )
+        lint_result_cache.load()
+
+    path_to_result = {}
+    to_lint = []
+    for path in paths:
+        diagnostics = None
+        if lint_result_cache is not None:
+            diagnostics = lint_result_cache.get(path)
+        if diagnostics is not None:
+            path_to_result[path] = (path, diagnostics, True)
+        else:
+            to_lint.append(path)
+
+    log.info(
+        "Linting %s files (%s results from cache).", len(to_lint), len(path_to_result)
+    )
+
+    def on_linted(result):
+        doc_uri, diagnostics, dependencies = result
+        path = uris.to_fs_path(doc_uri)
+        path_to_result[path] = (path, diagnostics, False)
+        if lint_result_cache is not None:
+            lint_result_cache.put(path, diagnostics, dependencies)
+
+    path_to_error = {}
+
+    def on_error(doc_uri, error):
+        path = uris.to_fs_path(doc_uri)
+        path_to_error[path] = (path, error)
+
+    if to_lint:
+        doc_uris = [uris.from_fs_path(path) for path in to_lint]
+        if workers is None:
+            workers = lint_pool.compute_workers_count(len(to_lint))
+
+        if workers > 1:
+            pool = lint_pool.LintPool(root_uri, (), settings, workers)
+            try:
+                for result in pool.iter_lint_results(
+                    doc_uris, collect_dependencies=use_cache, on_error=on_error
+                ):
+                    on_linted(result)
+            finally:
+                pool.dispose()
+        else:
+            server_api = lint_pool.create_lint_server_api(root_uri, (), settings)
+            try:
+                for doc_uri in doc_uris:
+                    try:
+                        result = lint_pool.lint_document(
+                            server_api, doc_uri, Monitor(), use_cache
+                        )
+                    except Exception as e:
+                        log.exception("Error linting: %s", doc_uri)
+                        on_error(doc_uri, str(e) or e.__class__.__name__)
+                    else:
+                        on_linted(result)
+            finally:
+                server_api.m_shutdown()
+                server_api.m_exit()
+
+    if lint_result_cache is not None:
+        lint_result_cache.save()
+
+    return (
+        [path_to_result[path] for path in sorted(path_to_result)],
+        [path_to_error[path] for path in sorted(path_to_error)],
+    )
+
+
+def _relative_path(root_path, path):
+    relative = os.path.relpath(path, root_path)
+    if relative.startswith(".."):
+        return None
+    return relative.replace(os.sep, "/")
+
+
+def _get_rule_id(diagnostic):
+    code = diagnostic.get("code")
+    if code:
+        return str(code)
+    data = diagnostic.get("data")
+    if isinstance(data, dict) and data.get("kind"):
+        return str(data["kind"])
+    return str(diagnostic.get("source") or "robotframework")
+
+
+def create_json_output(root_path, results, failed=()):
+    files = []
+    for path, diagnostics, cached in results:
+        files.append(
+            {
+                "path": path,
+                "relativePath": _relative_path(root_path, path),
+                "cached": cached,
+                "diagnostics": diagnostics,
+            }
+        )
+
+    failed_files = []
+    for path, error in failed:
+        failed_files.append(
+            {
+                "path": path,
+                "relativePath": _relative_path(root_path, path),
+                "error": error,
+            }
+        )
+    return {
+        "version": 1,
+        "root": root_path,
+        "files": files,
+        "failed": failed_files,
+    }
+
+
+def _get_artifact_location(root_path, path):
+    from robocorp_ls_core import uris
+
+    relative = _relative_path(root_path, path)
+    if relative is not None:
+        return {"uri": relative, "uriBaseId": "%SRCROOT%"}
+    return {"uri": uris.from_fs_path(path)}
+
+
+def create_sarif_output(root_path, results, failed=()):
+    """
+    Creates the output in the SARIF (Static Analysis Results Interchange
+    Format) 2.1.0 format.
+    """
+    from robocorp_ls_core import uris
+    from robotframework_ls import __version__
+
+    rule_ids = set()
+    sarif_results = []
+    for path, diagnostics, _cached in results:
+        artifact_location = _get_artifact_location(root_path, path)
+        for diagnostic in diagnostics:
+            rule_id = _get_rule_id(diagnostic)
+            rule_ids.add(rule_id)
+            diagnostic_range = diagnostic["range"]
+            start = diagnostic_range["start"]
+            end = diagnostic_range["end"]
+            sarif_results.append(
+                {
+                    "ruleId": rule_id,
+                    "level": _SARIF_LEVELS.get(diagnostic.get("severity", 1), "error"),
+                    "message": {"text": diagnostic["message"]},
+                    "locations": [
+                        {
+                            "physicalLocation": {
+                                "artifactLocation": artifact_location,
+                                # Note: columns are in utf-16 code units (the
+                                # default in SARIF).
+                                "region": {
+                                    "startLine": start["line"] + 1,
+                                    "startColumn": start["character"] + 1,
+                                    "endLine": end["line"] + 1,
+                                    "endColumn": end["character"] + 1,
+                                },
+                            }
+                        }
+                    ],
+                }
+            )
+
+    root_uri = uris.from_fs_path(root_path)
+    if not root_uri.endswith("/"):
+        root_uri += "/"
+
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "robotframework-lsp",
+                        "version": __version__,
+                        "informationUri": "https://github.com/robocorp/robotframework-lsp",
+                        "rules": [{"id": rule_id} for rule_id in sorted(rule_ids)],
+                    }
+                },
+                "originalUriBaseIds": {"%SRCROOT%": {"uri": root_uri}},
+                "invocations": [
+                    {
+                        "executionSuccessful": not failed,
+                        "toolExecutionNotifications": [
+                            {
+                                "level": "error",
+                                "message": {"text": f"Unable to lint: {error}"},
+                                "locations": [
+                                    {
+                                        "physicalLocation": {
+                                            "artifactLocation": _get_artifact_location(
+                                                root_path, path
+                                            )
+                                        }
+                                    }
+                                ],
+                            }
+                            for path, error in failed
+                        ],
+                    }
+                ],
+                "results": sarif_results,
+            }
+        ],
+    }
+
+
+def main(args=None) -> int:
+    import json
+    import robotframework_ls
+
+    robotframework_ls.import_robocorp_ls_core()
+
+    from robocorp_ls_core.robotframework_log import configure_logger
+
+    parser = argparse.ArgumentParser(prog="python -m robotframework_ls.lint")
+    add_arguments(parser)
+    options = parser.parse_args(args=args if args is not None else sys.argv[1:])
+
+    configure_logger("lint", options.verbose, options.log_file or "")
+
+    root_path = os.path.abspath(options.root or os.getcwd())
+    if not os.path.isdir(root_path):
+        sys.stderr.write(f"Root folder: {root_path} does not exist.\n")
+        return 2
+
+    settings = None
+    if options.settings:
+        try:
+            with open(options.settings, "r", encoding="utf-8") as stream:
+                settings = json.load(stream)
+        except Exception as e:
+            sys.stderr.write(f"Unable to load settings from: {options.settings}: {e}\n")
+            return 2
+
+    paths = collect_paths_to_lint(options.paths or [root_path])
+    results, failed = lint_paths(
+        root_path,
+        paths,
+        settings=settings,
+        workers=options.workers,
+        cache_dir=options.cache_dir,
+        use_cache=not options.no_cache,
+    )
+
+    if options.format == FORMAT_SARIF:
+        output = create_sarif_output(root_path, results, failed)
+    else:
+        output = create_json_output(root_path, results, failed)
+
+    contents = json.dumps(output, indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as stream:
+            stream.write(contents)
+    else:
+        sys.stdout.write(contents)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    if failed:
+        for path, error in failed:
+            sys.stderr.write(f"Unable to lint: {path}: {error}\n")
+        return 3
+
+    for _path, diagnostics, _cached in results:
+        for diagnostic in diagnostics:
+            if diagnostic.get("severity", 1) == 1:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,7 @@ from robocorp_ls_core.basic import (
 import os
 import time
 from robocorp_ls_core.robotframework_log import get_logger
-from typing import Any, Optional, Dict, Union
+from typing import Any, Optional, Dict, Union, List, Sequence, Tuple
 from robocorp_ls_core.protocols import (
     IConfig,
     IWorkspace,
@@ -56,6 +56,7 @@ from robotframework_ls.commands import (
     ROBOT_START_INDEXING_INTERNAL,
     ROBOT_WAIT_FULL_TEST_COLLECTION_INTERNAL,
     ROBOT_RF_INFO_INTERNAL,
+    ROBOT_MEMORY_STATS_INTERNAL,
     ROBOT_LINT_WORKSPACE,
     ROBOT_LINT_EXPLORER,
     ROBOT_GENERATE_FLOW_EXPLORER_MODEL,
@@ -122,6 +123,43 @@ class _LintManager(BaseLintManager):
         self._server_manager: ServerManager = server_manager
         BaseLintManager.__init__(self, lsp_messages, endpoint, read_queue)
 
+        # The lint batch requests in progress (client, message matcher).
+        self._lint_batch_requests: List[
+            Tuple[IRobotFrameworkApiClient, IIdMessageMatcher]
+        ] = []
+
+    @overrides(BaseLintManager.schedule_manual_lint)
+    def schedule_manual_lint(self, lint_paths: Sequence[str]) -> None:
+        """
+        Lints the given paths with a `lintBatch` request to the lint api
+        (which spreads the files over a pool of worker processes and provides
+        the diagnostics as each file is linted).
+        """
+        # Note: this call must be done in the main thread.
+        for rf_lint_api_client, message_matcher in self._lint_batch_requests:
+            rf_lint_api_client.request_cancel(message_matcher.message_id)
+        del self._lint_batch_requests[:]
+
+        client_id_to_client_and_uris: Dict[
+            int, Tuple[IRobotFrameworkApiClient, List[str]]
+        ] = {}
+        for doc_uri in sorted(self._collect_uris_to_lint(lint_paths)):
+            client = self._server_manager.get_lint_rf_api_client(doc_uri)
+            if client is None:
+                log.info("Unable to get lint api for: %s", doc_uri)
+                continue
+            client_id_to_client_and_uris.setdefault(id(client), (client, []))[1].append(
+                doc_uri
+            )
+
+        for rf_lint_api_client, doc_uris in client_id_to_client_and_uris.values():
+            log.debug("Schedule lint batch for: %s files", len(doc_uris))
+            batch_message_matcher = rf_lint_api_client.request_lint_batch(doc_uris)
+            if batch_message_matcher is not None:
+                self._lint_batch_requests.append(
+                    (rf_lint_api_client, batch_message_matcher)
+                )
+
     @overrides(BaseLintManager._create_curr_lint_info)
     def _create_curr_lint_info(
         self, doc_uri: str, is_saved: bool, timeout: float
@@ -422,8 +460,8 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
                     "tokenTypes": TOKEN_TYPES,
                     "tokenModifiers": TOKEN_MODIFIERS,
                 },
-                "range": False,
-                "full": True,
+                "range": True,
+                "full": {"delta": True},
             },
         }
         log.debug("Server capabilities: %s", server_capabilities)
@@ -693,6 +731,28 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         log.info("Unable to get RF info (no api available).")
         return None
 
+    @command_dispatcher(ROBOT_MEMORY_STATS_INTERNAL)
+    def _get_memory_stats_internal(self, *arguments):
+        ws = self.workspace
+        memory_stats = {
+            "language_server": {
+                "pid": os.getpid(),
+                "workspace": ws.get_memory_stats() if ws else None,
+            }
+        }
+        api_clients = list(self._server_manager.iter_started_api_clients())
+
+        def func(monitor):
+            for name, rf_api_client in api_clients:
+                memory_stats[name] = self._threaded_api_request_no_doc(
+                    rf_api_client, "request_memory_stats", monitor=monitor
+                )
+            log.info("Memory stats: %s", memory_stats)
+            return memory_stats
+
+        func = require_monitor(func)
+        return func
+
     @command_dispatcher(ROBOT_GENERATE_FLOW_EXPLORER_MODEL)
     def _generate_flow_explorer_model(self, opts: Dict[str, Any]):
         """
@@ -1237,7 +1297,32 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         return []
 
     def m_text_document__semantic_tokens__range(self, textDocument=None, range=None):
-        raise RuntimeError("Not currently implemented!")
+        doc_uri = textDocument["uri"]
+
+        return self.async_api_forward(
+            "request_semantic_tokens_range",
+            "others",
+            doc_uri,
+            default_return={"resultId": None, "data": []},
+            text_document=textDocument,
+            range=range,
+            __add_doc_uri_in_args__=False,
+        )
+
+    def m_text_document__semantic_tokens__full__delta(
+        self, textDocument=None, previousResultId=None
+    ):
+        doc_uri = textDocument["uri"]
+
+        return self.async_api_forward(
+            "request_semantic_tokens_full_delta",
+            "others",
+            doc_uri,
+            default_return={"resultId": None, "data": []},
+            text_document=textDocument,
+            previous_result_id=previousResultId,
+            __add_doc_uri_in_args__=False,
+        )
 
     def m_text_document__semantic_tokens__full(self, textDocument=None):
         doc_uri = textDocument["uri"]
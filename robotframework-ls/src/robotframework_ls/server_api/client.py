@@ -8,6 +8,7 @@ from robocorp_ls_core.protocols import (
 )
 from robocorp_ls_core.lsp import (
     TextDocumentTypedDict,
+    RangeTypedDict,
     ResponseTypedDict,
     PositionTypedDict,
     CodeLensTypedDict,
@@ -124,6 +125,14 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         """
         return self.request_async(self._build_msg("lint", doc_uri=doc_uri))
 
+    def request_lint_batch(self, doc_uris: List[str]) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete (the diagnostics are provided in
+        `textDocument/publishDiagnostics` notifications as each document is
+        linted).
+        """
+        return self.request_async(self._build_msg("lintBatch", doc_uris=doc_uris))
+
     def request_semantic_tokens_full(
         self, text_document: TextDocumentTypedDict
     ) -> Optional[IIdMessageMatcher]:
@@ -136,6 +145,34 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
             )
         )
 
+    def request_semantic_tokens_full_delta(
+        self, text_document: TextDocumentTypedDict, previous_result_id: Optional[str]
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(
+            self._build_msg(
+                "textDocument/semanticTokens/full/delta",
+                textDocument=text_document,
+                previousResultId=previous_result_id,
+            )
+        )
+
+    def request_semantic_tokens_range(
+        self, text_document: TextDocumentTypedDict, range: RangeTypedDict
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(
+            self._build_msg(
+                "textDocument/semanticTokens/range",
+                textDocument=text_document,
+                range=range,
+            )
+        )
+
     def request_semantic_tokens_from_code_full(
         self, prefix: str, full_code: str, indent: str, uri: str
     ) -> Optional[IIdMessageMatcher]:
@@ -389,6 +426,12 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         """
         return self.request_async(self._build_msg("rfInfo", doc_uri=doc_uri))
 
+    def request_memory_stats(self) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(self._build_msg("memoryStats"))
+
     def request_hover(
         self, doc_uri: str, line: int, col: int
     ) -> Optional[IIdMessageMatcher]:
@@ -1,7 +1,7 @@
 from robocorp_ls_core.python_ls import PythonLanguageServer
 from robocorp_ls_core.basic import overrides
 from robocorp_ls_core.robotframework_log import get_logger, get_log_level
-from typing import Optional, List, Dict, Deque, Tuple, Sequence, Set
+from typing import Optional, List, Dict, Deque, Tuple, Sequence, Set, Union
 from robocorp_ls_core.protocols import (
     IConfig,
     IMonitor,
@@ -33,6 +33,8 @@ from robocorp_ls_core.lsp import (
     CodeActionTypedDict,
     DiagnosticsTypedDict,
     Position,
+    SemanticTokensTypedDict,
+    SemanticTokensDeltaTypedDict,
 )
 from robotframework_ls.impl.protocols import (
     IKeywordFound,
@@ -70,6 +72,9 @@ from robocorp_ls_core.code_units import (
 
 log = get_logger(__name__)
 
+# Max number of ints (from all the docs) kept to compute semantic tokens deltas.
+_SEMANTIC_TOKENS_CACHE_MAX_INTS = 5_000_000
+
 
 def complete_all(
     completion_context: ICompletionContext,
@@ -170,6 +175,16 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
         self._completion_contexts_saved_lock = threading.Lock()
         self._completion_contexts_saved: Deque[ICompletionContext] = deque()
+
+        from robocorp_ls_core.cache import LRUCache
+
+        # doc uri -> (result id, semantic tokens data) of the last semantic
+        # tokens computed for a doc (used to compute deltas).
+        self._semantic_tokens_results: LRUCache[str, Tuple[str, List[int]]] = LRUCache(
+            _SEMANTIC_TOKENS_CACHE_MAX_INTS, get_size=lambda v: len(v[1]) + 1
+        )
+        self._semantic_tokens_results_lock = threading.Lock()
+        self._next_semantic_tokens_result_id = partial(next, itertools.count(0))
         self._variables_from_arguments_files_loader: Sequence[
             IVariablesFromArgumentsFileLoader
         ] = []
@@ -177,6 +192,11 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             IVariablesFromVariablesFileLoader
         ] = []
 
+        # doc uri -> (file stat key, tests) of the files whose tests were
+        # listed from the filesystem (when listing the tests in a directory).
+        self._list_tests_cache: Dict[str, Tuple[tuple, List[ITestInfoTypedDict]]] = {}
+        self._list_tests_cache_lock = threading.Lock()
+
     @overrides(PythonLanguageServer._create_config)
     def _create_config(self) -> IConfig:
         from robotframework_ls.robot_config import RobotConfig
@@ -365,6 +385,9 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         self, root_uri: str, fs_observer: IFSObserver, workspace_folders
     ) -> IWorkspace:
         from robotframework_ls.impl.robot_workspace import RobotWorkspace
+        from robotframework_ls.impl._symbols_cache_persistence import (
+            get_symbols_cache_dir,
+        )
 
         # Note: note done because our caches are removed promptly
         # for this to work it should be invalidate but the info
@@ -391,6 +414,7 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             index_workspace=self._index_workspace,
             collect_tests=self._collect_tests,
             endpoint=self._endpoint,
+            symbols_cache_dir=get_symbols_cache_dir(),
         )
 
         return robot_workspace
@@ -500,6 +524,100 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             ]
             return ret
 
+    def m_lint_batch(self, doc_uris: List[str]):
+        error = self._compute_min_version_error((3, 2))
+        if error is not None:
+            from robocorp_ls_core.lsp import Error
+
+            diagnostics = [Error(error, (0, 0), (1, 0)).to_lsp_diagnostic()]
+            for doc_uri in doc_uris:
+                self._lsp_messages.publish_diagnostics(doc_uri, diagnostics)
+            return {"linted": 0, "cancelled": False}
+
+        func = partial(self._threaded_lint_batch, doc_uris)
+        func = require_monitor(func)
+        return func
+
+    def _threaded_lint_batch(self, doc_uris: List[str], monitor: IMonitor) -> dict:
+        """
+        Lints the given documents, providing the diagnostics of each document
+        with a `textDocument/publishDiagnostics` notification as it's linted.
+
+        Documents opened in the client are linted in this process (with the
+        contents from the client) and the other ones are linted from the
+        filesystem in a pool of worker processes (if there are enough documents
+        to make it worth it).
+        """
+        from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+        from robocorp_ls_core.progress_report import progress_context
+        from robotframework_ls.impl import lint_pool
+
+        from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+        open_docs_uris: Set[str] = set()
+        workspace = typing.cast(Optional[RobotWorkspace], self.workspace)
+        if workspace is not None:
+            open_docs_uris.update(workspace.get_open_docs_uris())
+
+        in_process_uris = [uri for uri in doc_uris if uri in open_docs_uris]
+        in_pool_uris = [uri for uri in doc_uris if uri not in open_docs_uris]
+
+        workers_count = lint_pool.compute_workers_count(len(in_pool_uris))
+        if workers_count <= 1:
+            in_process_uris.extend(in_pool_uris)
+            in_pool_uris = []
+
+        total = len(doc_uris)
+        linted = 0
+        cancelled = False
+        with progress_context(
+            self._endpoint, "Linting files", None, cancellable=True
+        ) as progress_reporter:
+
+            def on_linted(doc_uri, diagnostics):
+                nonlocal linted
+                self._lsp_messages.publish_diagnostics(doc_uri, diagnostics)
+                linted += 1
+                progress_reporter.set_additional_info(f"({linted} of {total})")
+                if progress_reporter.cancelled:
+                    monitor.cancel()
+
+            pool = None
+            try:
+                if in_pool_uris:
+                    log.info(
+                        "Linting %s files in %s worker processes.",
+                        len(in_pool_uris),
+                        workers_count,
+                    )
+                    pool = lint_pool.LintPool(
+                        workspace.root_uri if workspace is not None else "",
+                        [
+                            {"uri": folder.uri, "name": folder.name}
+                            for folder in workspace.iter_folders()
+                        ]
+                        if workspace is not None
+                        else [],
+                        self.config.get_full_settings(),
+                        workers_count,
+                    )
+
+                for doc_uri in in_process_uris:
+                    monitor.check_cancelled()
+                    on_linted(doc_uri, self._threaded_lint(doc_uri, monitor))
+
+                if pool is not None:
+                    for doc_uri, diagnostics in pool.iter_lint(in_pool_uris, monitor):
+                        on_linted(doc_uri, diagnostics)
+            except JsonRpcRequestCancelled:
+                log.info("Lint batch cancelled (linted %s of %s).", linted, total)
+                cancelled = True
+            finally:
+                if pool is not None:
+                    pool.dispose()
+
+        return {"linted": linted, "cancelled": cancelled}
+
     def m_resolve_completion_item(
         self,
         completion_item: CompletionItemTypedDict,
@@ -1052,25 +1170,186 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         tests: List[ITestInfoTypedDict]
         path = Path(uris.to_fs_path(doc_uri))
         if path.is_dir():
-            tests = []
-            for p in path.rglob("*.robot"):
-                doc_uri = uris.from_fs_path(str(p))
-                completion_context = self._create_completion_context(
-                    doc_uri, 0, 0, monitor
-                )
+            return self._list_tests_in_dir(str(path), monitor)
 
-                if completion_context is None:
-                    continue
+        completion_context = self._create_completion_context(doc_uri, 0, 0, monitor)
+        if completion_context is None:
+            return []
 
-                tests.extend(list_tests(completion_context))
-        else:
-            completion_context = self._create_completion_context(doc_uri, 0, 0, monitor)
-            if completion_context is None:
-                return []
+        tests = list_tests(completion_context)
+        return convert_tests_pos_to_client_inplace(completion_context.doc, tests)
+
+    def _get_cached_tests(
+        self, doc_uri: str, workspace
+    ) -> Tuple[Optional[tuple], Optional[List[ITestInfoTypedDict]]]:
+        """
+        :return:
+            A tuple(file stat key, tests) where the tests are None if they
+            still need to be computed.
+        """
+        from robotframework_ls.impl.robot_localization import (
+            get_global_localization_info,
+        )
 
-            tests = list_tests(completion_context)
+        try:
+            stat = os.stat(uris.to_fs_path(doc_uri))
+        except OSError:
+            return None, None
+
+        stat_key = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            get_global_localization_info().language_codes,
+        )
+        with self._list_tests_cache_lock:
+            cached = self._list_tests_cache.get(doc_uri)
+        if cached is not None and cached[0] == stat_key:
+            return stat_key, cached[1]
+
+        if workspace.workspace_indexer is not None:
+            # Reuse the test info from the symbols cache if the indexer already
+            # computed it (the document is only loaded, not parsed).
+            doc = workspace.get_document(doc_uri, accept_from_file=True)
+            if doc is not None:
+                symbols_cache = doc.symbols_cache
+                if symbols_cache is not None:
+                    test_info = symbols_cache.get_test_info()
+                    if test_info is not None:
+                        tests: List[ITestInfoTypedDict] = [
+                            {
+                                "uri": doc.uri,
+                                "path": doc.path,
+                                "name": t["name"],
+                                "range": {
+                                    "start": {
+                                        "line": t["range"]["start"]["line"],
+                                        "character": t["range"]["start"]["character"],
+                                    },
+                                    "end": {
+                                        "line": t["range"]["end"]["line"],
+                                        "character": t["range"]["end"]["character"],
+                                    },
+                                },
+                            }
+                            for t in test_info
+                        ]
+                        return stat_key, convert_tests_pos_to_client_inplace(doc, tests)
+
+        return stat_key, None
+
+    def _list_tests_in_dir(
+        self, dir_path: str, monitor: IMonitor
+    ) -> List[ITestInfoTypedDict]:
+        """
+        Lists the tests in the `.robot` files in the given directory (skipping
+        the ignored directories).
 
-        return convert_tests_pos_to_client_inplace(completion_context.doc, tests)
+        The tests of files which didn't change since the last time are reused
+        (as well as the tests from the symbols caches computed by the workspace
+        indexer) and the remaining files are parsed in a pool of worker
+        processes (if there are enough files to make it worth it).
+        """
+        from robotframework_ls.impl.code_lens import list_tests
+        from robotframework_ls.impl import list_tests_pool
+        from robotframework_ls.impl.robot_workspace import RobotWorkspace
+        from robocorp_ls_core.progress_report import progress_context
+
+        if not self._check_and_log_rf_dependency_version():
+            return []
+
+        workspace = typing.cast(Optional[RobotWorkspace], self.workspace)
+        if not workspace:
+            log.info("Workspace still not initialized.")
+            return []
+
+        doc_uris = [
+            uris.from_fs_path(p)
+            for p in list_tests_pool.iter_robot_files_in_dir(dir_path)
+        ]
+        open_docs_uris = set(workspace.get_open_docs_uris())
+
+        uri_to_tests: Dict[str, List[ITestInfoTypedDict]] = {}
+        uri_to_stat_key: Dict[str, tuple] = {}
+        misses: List[str] = []
+        for doc_uri in doc_uris:
+            monitor.check_cancelled()
+            if doc_uri in open_docs_uris:
+                # Use the contents from the client.
+                completion_context = self._create_completion_context(
+                    doc_uri, 0, 0, monitor
+                )
+                if completion_context is not None:
+                    uri_to_tests[doc_uri] = convert_tests_pos_to_client_inplace(
+                        completion_context.doc, list_tests(completion_context)
+                    )
+                continue
+
+            stat_key, tests = self._get_cached_tests(doc_uri, workspace)
+            if stat_key is None:
+                continue
+            uri_to_stat_key[doc_uri] = stat_key
+            if tests is not None:
+                uri_to_tests[doc_uri] = tests
+            else:
+                misses.append(doc_uri)
+
+        def on_tests_listed(chunk: List[list_tests_pool.ListTestsResult]):
+            with self._list_tests_cache_lock:
+                for doc_uri, tests in chunk:
+                    uri_to_tests[doc_uri] = tests
+                    self._list_tests_cache[doc_uri] = (uri_to_stat_key[doc_uri], tests)
+
+        if misses:
+            log.info(
+                "Listing tests in %s files (%s from cache).",
+                len(doc_uris),
+                len(doc_uris) - len(misses),
+            )
+            workers_count = list_tests_pool.compute_workers_count(len(misses))
+            with progress_context(
+                self._endpoint, "Listing tests", None, cancellable=True
+            ) as progress_reporter:
+                listed = len(doc_uris) - len(misses)
+                total = len(doc_uris)
+
+                def on_chunk(chunk):
+                    nonlocal listed
+                    on_tests_listed(chunk)
+                    listed += len(chunk)
+                    progress_reporter.set_additional_info(f"({listed} of {total})")
+                    if progress_reporter.cancelled:
+                        monitor.cancel()
+
+                if workers_count <= 1:
+                    for i in range(0, len(misses), list_tests_pool.CHUNK_SIZE):
+                        monitor.check_cancelled()
+                        on_chunk(
+                            list_tests_pool.list_tests_in_files(
+                                misses[i : i + list_tests_pool.CHUNK_SIZE]
+                            )
+                        )
+                else:
+                    pool = list_tests_pool.ListTestsPool(workers_count)
+                    try:
+                        for chunk in pool.iter_list_tests(misses, monitor):
+                            on_chunk(chunk)
+                    finally:
+                        pool.dispose()
+
+        # Files removed from the directory are removed from the cache.
+        dir_uri_prefix = uris.from_fs_path(dir_path).rstrip("/") + "/"
+        with self._list_tests_cache_lock:
+            for doc_uri in list(self._list_tests_cache):
+                if (
+                    doc_uri.startswith(dir_uri_prefix)
+                    and doc_uri not in uri_to_stat_key
+                ):
+                    del self._list_tests_cache[doc_uri]
+
+        ret: List[ITestInfoTypedDict] = []
+        for doc_uri in doc_uris:
+            ret.extend(uri_to_tests.get(doc_uri, ()))
+        return ret
 
     def m_collect_robot_documentation(
         self,
@@ -1137,6 +1416,13 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
         return {"version": get_robot_version(), "python": sys.executable}
 
+    def m_memory_stats(self):
+        workspace = self.workspace
+        return {
+            "pid": os.getpid(),
+            "workspace": workspace.get_memory_stats() if workspace else None,
+        }
+
     def _threaded_evaluatable_expression(
         self, doc_uri: str, position: PositionTypedDict, monitor: IMonitor
     ) -> Optional[EvaluatableExpressionTypedDict]:
@@ -1317,23 +1603,104 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         )
 
     def m_text_document__semantic_tokens__range(self, textDocument=None, range=None):
-        raise RuntimeError("Not currently implemented!")
+        func = partial(
+            self.threaded_semantic_tokens_range, textDocument=textDocument, range=range
+        )
+        func = require_monitor(func)
+        return func
+
+    def threaded_semantic_tokens_range(
+        self,
+        textDocument: TextDocumentTypedDict,
+        range: RangeTypedDict,
+        monitor: Optional[IMonitor] = None,
+    ) -> SemanticTokensTypedDict:
+        from robotframework_ls.impl.semantic_tokens import semantic_tokens_range
+
+        doc_uri = textDocument["uri"]
+        context = self._create_completion_context(doc_uri, -1, -1, monitor)
+        if context is None:
+            return {"resultId": None, "data": []}
+        return {"resultId": None, "data": semantic_tokens_range(context, range)}
 
     def m_text_document__semantic_tokens__full(self, textDocument=None):
         func = partial(self.threaded_semantic_tokens_full, textDocument=textDocument)
         func = require_monitor(func)
         return func
 
+    def _compute_semantic_tokens_full(
+        self, doc_uri: str, monitor: Optional[IMonitor]
+    ) -> Optional[Tuple[str, List[int]]]:
+        """
+        :return:
+            The result id and the semantic tokens computed (which are saved
+            to be used as the base for a delta afterwards).
+        """
+        from robotframework_ls.impl.semantic_tokens import semantic_tokens_full
+
+        context = self._create_completion_context(doc_uri, -1, -1, monitor)
+        if context is None:
+            return None
+
+        data = semantic_tokens_full(context)
+        result_id = str(self._next_semantic_tokens_result_id())
+        with self._semantic_tokens_results_lock:
+            key = uris.normalize_uri(doc_uri)
+            self._semantic_tokens_results.pop(key, None)
+            self._semantic_tokens_results[key] = (result_id, data)
+        return result_id, data
+
     def threaded_semantic_tokens_full(
         self, textDocument: TextDocumentTypedDict, monitor: Optional[IMonitor] = None
+    ) -> SemanticTokensTypedDict:
+        result = self._compute_semantic_tokens_full(textDocument["uri"], monitor)
+        if result is None:
+            return {"resultId": None, "data": []}
+        result_id, data = result
+        return {"resultId": result_id, "data": data}
+
+    def m_text_document__semantic_tokens__full__delta(
+        self, textDocument=None, previousResultId=None
     ):
-        from robotframework_ls.impl.semantic_tokens import semantic_tokens_full
+        func = partial(
+            self.threaded_semantic_tokens_full_delta,
+            textDocument=textDocument,
+            previousResultId=previousResultId,
+        )
+        func = require_monitor(func)
+        return func
+
+    def threaded_semantic_tokens_full_delta(
+        self,
+        textDocument: TextDocumentTypedDict,
+        previousResultId: Optional[str],
+        monitor: Optional[IMonitor] = None,
+    ) -> Union[SemanticTokensDeltaTypedDict, SemanticTokensTypedDict]:
+        """
+        :return:
+            The edits from the previous result or the full semantic tokens
+            if the previous result is no longer available.
+        """
+        from robotframework_ls.impl.semantic_tokens import (
+            compute_semantic_tokens_edits,
+        )
 
         doc_uri = textDocument["uri"]
-        context = self._create_completion_context(doc_uri, -1, -1, monitor)
-        if context is None:
+        with self._semantic_tokens_results_lock:
+            previous = self._semantic_tokens_results.get(uris.normalize_uri(doc_uri))
+
+        result = self._compute_semantic_tokens_full(doc_uri, monitor)
+        if result is None:
             return {"resultId": None, "data": []}
-        return {"resultId": None, "data": semantic_tokens_full(context)}
+        result_id, data = result
+
+        if previous is None or previous[0] != previousResultId:
+            return {"resultId": result_id, "data": data}
+
+        return {
+            "resultId": result_id,
+            "edits": compute_semantic_tokens_edits(previous[1], data),
+        }
 
     def m_monaco_completions_from_code_full(
         self,
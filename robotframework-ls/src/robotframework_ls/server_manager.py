@@ -296,6 +296,7 @@ class _ServerApi(object):
                         "$/customProgress",
                         "$/testsCollected",
                         "window/showMessage",
+                        "textDocument/publishDiagnostics",
                     ):
                         robot_framework_language_server = language_server_ref()
                         if robot_framework_language_server is not None:
@@ -698,3 +699,17 @@ class ServerManager(object):
         if api is not None:
             return api.get_robotframework_api_client()
         return None
+
+    def iter_started_api_clients(
+        self,
+    ) -> Iterable[Tuple[str, IRobotFrameworkApiClient]]:
+        """
+        Provides the (name, client) of the apis whose process was already
+        started (apis which weren't started aren't started by this function).
+        """
+        self._check_in_main_thread()
+        for api_id, apis in self._id_to_apis.items():
+            for api in apis:
+                client = api._robotframework_api_client
+                if client is not None:
+                    yield f"{api_id}{api._log_extension}", client
@@ -129,6 +129,7 @@ def test_keyword_completions_changes_user_library(
 ):
     from robotframework_ls.impl import keyword_completions
     from robotframework_ls.impl.completion_context import CompletionContext
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
     import time
     from os.path import os
 
@@ -155,15 +156,20 @@ def verify_changes(model=10):
 """
     with open(library_py, "w") as stream:
         stream.write(contents)
-    completions = keyword_completions.complete(
-        CompletionContext(doc, workspace=workspace.ws)
-    )
 
-    assert sorted(completion["label"] for completion in completions) == [
-        "Verify Another Model (case1_library)",
-        "Verify Changes (case1_library)",
-        "Verify Model (case1_library)",
-    ]
+    def check_changes():
+        completions = keyword_completions.complete(
+            CompletionContext(doc, workspace=workspace.ws)
+        )
+
+        return sorted(completion["label"] for completion in completions) == [
+            "Verify Another Model (case1_library)",
+            "Verify Changes (case1_library)",
+            "Verify Model (case1_library)",
+        ]
+
+    # The change in the library source is notified by the filesystem observer.
+    wait_for_test_condition(check_changes, sleep=1 / 5.0)
 
 
 @pytest.mark.parametrize(
@@ -373,3 +373,251 @@ def test_dependency_graph_invalidate_unresolved_with_vars_2(workspace):
     context = CompletionContext(robot_doc, workspace=workspace.ws)
     dependency_graph = context.collect_dependency_graph()
     assert caches.cache_hits == 2  # i.e. no hits...
+
+
+def test_dependency_graph_keyword_index(workspace, libspec_manager):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.collect_keywords import collect_keyword_index
+
+    workspace.set_root("case_deps", libspec_manager=libspec_manager)
+    original_source = workspace.get_doc("root2.robot").source
+    robot_doc = workspace.put_doc(
+        "root2.robot",
+        original_source
+        + """
+*** Keywords ***
+Log ${count} items
+    Log    ${count}
+""",
+    )
+    resource_doc = workspace.get_doc("some_resource.resource")
+
+    context = CompletionContext(robot_doc, workspace=workspace.ws)
+    keyword_index = collect_keyword_index(context)
+
+    found = keyword_index.get_keywords("keywordinresource")
+    assert len(found) == 1
+    assert found[0].resource_name == "some_resource"
+    assert found[0].completion_context.doc.uri == resource_doc.uri
+
+    found = keyword_index.get_keywords_matching("someresource.keywordinresource")
+    assert len(found) == 1
+    assert keyword_index.get_keywords("someresource.keywordinresource") == []
+
+    found = keyword_index.get_keywords("log22items")
+    assert len(found) == 1
+    assert found[0].completion_context is context
+
+    found = keyword_index.get_keywords_in_scope("builtin", "log")
+    assert [k.library_name for k in found] == ["BuiltIn"]
+
+    # The keywords from the dependencies are indexed only once per dependency
+    # graph.
+    dependency_graph = context.collect_dependency_graph()
+    cached = dependency_graph._keyword_index_and_key
+    assert cached is not None
+    collect_keyword_index(context)
+    assert dependency_graph._keyword_index_and_key is cached
+
+    # Changes in the root document are still seen.
+    robot_doc = workspace.put_doc(
+        "root2.robot",
+        original_source
+        + """
+*** Keywords ***
+Log ${count} things
+    Log    ${count}
+""",
+    )
+    context = CompletionContext(robot_doc, workspace=workspace.ws)
+    keyword_index = collect_keyword_index(context)
+    assert keyword_index.get_keywords("log22items") == []
+    assert len(keyword_index.get_keywords("log22things")) == 1
+
+
+def test_import_resolution_cache(workspace, tmpdir):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.completion_context_workspace_caches import (
+        CompletionContextWorkspaceCaches,
+    )
+    from robocorp_ls_core.basic import wait_for_condition
+    import os
+
+    workspace.set_root_writable_dir(tmpdir, "case_deps")
+    ws: IRobotWorkspace = workspace.ws
+    ws.wait_for_check_done(5)
+    caches = ws.completion_context_workspace_caches
+    assert isinstance(caches, CompletionContextWorkspaceCaches)
+    resolution_cache = caches._import_resolution_cache
+
+    doc = workspace.put_doc(
+        "root_new.robot",
+        "*** Settings ***\nResource    new_resource.robot\nResource    my_resource.robot\n",
+    )
+
+    def get_resolved_names():
+        context = CompletionContext(doc, workspace=ws)
+        return [
+            os.path.basename(resource_doc.path) if resource_doc else None
+            for _node, resource_doc in context.get_resource_imports_as_docs()
+        ]
+
+    assert get_resolved_names() == [None, "my_resource.robot"]
+    assert resolution_cache.misses == 2
+    assert resolution_cache.hits == 0
+
+    # Found and not found are both cached.
+    assert get_resolved_names() == [None, "my_resource.robot"]
+    assert resolution_cache.misses == 2
+    assert resolution_cache.hits == 2
+
+    # Creating the file invalidates the resolution.
+    with open(os.path.join(ws.root_path, "new_resource.robot"), "w") as stream:
+        stream.write("*** Keywords ***\nNew Keyword\n    No Operation\n")
+
+    wait_for_condition(
+        lambda: get_resolved_names() == ["new_resource.robot", "my_resource.robot"]
+    )
+
+    # Removing it invalidates it again.
+    os.remove(os.path.join(ws.root_path, "new_resource.robot"))
+    wait_for_condition(lambda: get_resolved_names() == [None, "my_resource.robot"])
+
+
+def test_import_resolution_cache_revalidation():
+    from robotframework_ls.impl.completion_context_workspace_caches import (
+        _ImportResolutionCache,
+    )
+
+    resolution_cache = _ImportResolutionCache()
+    found_paths = ("/a/found.robot", "/b/found.robot")
+    not_found_paths = ("/a/not_found.robot",)
+    for check_paths, resolved_path in (
+        (found_paths, "/b/found.robot"),
+        (not_found_paths, None),
+    ):
+        _found, _resolved, invalidation_count = resolution_cache.get(check_paths)
+        resolution_cache.put(check_paths, resolved_path, invalidation_count)
+
+    assert resolution_cache.get(found_paths)[:2] == (True, "/b/found.robot")
+    assert resolution_cache.get(not_found_paths)[:2] == (True, None)
+
+    # Both found and not found entries are revalidated after their timeout (as
+    # the paths checked may not be watched, i.e.: a file may be created in a
+    # folder from the sys.path which has a higher priority).
+    resolution_cache.NOT_FOUND_REVALIDATION_TIMEOUT = 0
+    assert resolution_cache.get(not_found_paths)[:2] == (False, None)
+    assert resolution_cache.get(found_paths)[:2] == (True, "/b/found.robot")
+
+    resolution_cache.FOUND_REVALIDATION_TIMEOUT = 0
+    assert resolution_cache.get(found_paths)[:2] == (False, None)
+
+
+def test_dependency_graph_shared_nodes(workspace):
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case_deps")
+    ws: IRobotWorkspace = workspace.ws
+    caches = ws.completion_context_workspace_caches
+
+    contents = "*** Settings ***\nResource    ./my_resource.robot\n"
+    doc_a = workspace.put_doc("suite_a.robot", contents)
+    doc_b = workspace.put_doc("suite_b.robot", contents)
+    doc_c = workspace.put_doc(
+        "suite_c.robot", "*** Settings ***\nLibrary    Collections\n"
+    )
+
+    def collect(doc):
+        return CompletionContext(doc, workspace=ws).collect_dependency_graph()
+
+    graph_a = collect(doc_a)
+    assert caches.node_cache_hits == 0
+
+    # The imports of `my_resource.robot` are reused from the node cached
+    # when the dependency graph for `suite_a.robot` was computed.
+    graph_b = collect(doc_b)
+    assert caches.node_cache_hits == 1
+    assert [d.uri for _n, d in graph_b.iter_all_resource_imports_with_docs()] == [
+        d.uri for _n, d in graph_a.iter_all_resource_imports_with_docs()
+    ]
+    assert len(list(graph_b.iter_all_variable_imports_as_docs())) == 1
+
+    collect(doc_c)
+    cache_hits = caches.cache_hits
+
+    # Changing the resource only invalidates the graphs which depend on it.
+    workspace.put_doc(
+        "my_resource.robot", workspace.get_doc("my_resource.robot").source
+    )
+    assert collect(doc_c) is not None
+    assert caches.cache_hits == cache_hits + 1
+
+    collect(doc_a)
+    collect(doc_b)
+    assert caches.cache_hits == cache_hits + 1
+
+
+def test_dependency_graph_import_with_var_from_dependency(workspace):
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case_deps")
+    ws: IRobotWorkspace = workspace.ws
+
+    workspace.put_doc(
+        "lib_a.resource", "*** Keywords ***\nKeyword A\n    No Operation\n"
+    )
+    workspace.put_doc(
+        "lib_b.resource", "*** Keywords ***\nKeyword B\n    No Operation\n"
+    )
+    workspace.put_doc(
+        "vars.resource", "*** Variables ***\n${LIB}    ${CURDIR}/lib_a.resource\n"
+    )
+    workspace.put_doc(
+        "all_vars.resource", "*** Settings ***\nResource    ./vars.resource\n"
+    )
+    # `${LIB}` comes from a transitively imported file.
+    workspace.put_doc(
+        "middle.resource",
+        "*** Settings ***\nResource    ./all_vars.resource\nResource    ${LIB}\n",
+    )
+    doc = workspace.put_doc(
+        "suite_with_var_import.robot",
+        "*** Settings ***\nResource    ./middle.resource\n",
+    )
+
+    def collect_resource_basenames(doc):
+        graph = CompletionContext(doc, workspace=ws).collect_dependency_graph()
+        return sorted(
+            d.uri.split("/")[-1]
+            for _n, d in graph.iter_all_resource_imports_with_docs()
+            if d is not None
+        )
+
+    assert collect_resource_basenames(doc) == [
+        "all_vars.resource",
+        "lib_a.resource",
+        "middle.resource",
+        "vars.resource",
+    ]
+
+    # While nothing changes the node for `middle.resource` is reused.
+    caches = ws.completion_context_workspace_caches
+    node_cache_hits = caches.node_cache_hits
+    doc2 = workspace.put_doc(
+        "suite_with_var_import2.robot",
+        "*** Settings ***\nResource    ./middle.resource\n",
+    )
+    assert "lib_a.resource" in collect_resource_basenames(doc2)
+    assert caches.node_cache_hits > node_cache_hits
+
+    # Changing the variable must change the resolution of the import (even
+    # though the node for `middle.resource` was cached).
+    workspace.put_doc(
+        "vars.resource", "*** Variables ***\n${LIB}    ${CURDIR}/lib_b.resource\n"
+    )
+    assert collect_resource_basenames(doc) == [
+        "all_vars.resource",
+        "lib_b.resource",
+        "middle.resource",
+        "vars.resource",
+    ]
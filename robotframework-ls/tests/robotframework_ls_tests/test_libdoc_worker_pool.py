@@ -0,0 +1,136 @@
+import os
+
+
+def _create_libspec(pool, cwd, libname, target):
+    returncode, output = pool.run_libdoc(
+        ["--format", "XML", "--specdocformat", "RAW", libname, target], cwd
+    )
+    assert returncode == 0, output
+    with open(target, "r", encoding="utf-8") as stream:
+        return stream.read()
+
+
+def test_libdoc_worker_pool(tmpdir):
+    from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
+
+    lib_dir = tmpdir.join("lib_dir")
+    lib_dir.mkdir()
+    lib_dir.join("my_lib.py").write_text(
+        """
+def first_keyword():
+    pass
+""",
+        "utf-8",
+    )
+    target = str(tmpdir.join("my_lib.libspec"))
+
+    pool = LibdocWorkerPool(max_workers=1, max_requests_per_worker=3)
+    try:
+        contents = _create_libspec(pool, str(lib_dir), "my_lib", target)
+        assert "First Keyword" in contents
+
+        # The library changed: it must be imported again.
+        lib_dir.join("my_lib.py").write_text(
+            """
+def second_keyword():
+    pass
+""",
+            "utf-8",
+        )
+        contents = _create_libspec(pool, str(lib_dir), "my_lib", target)
+        assert "First Keyword" not in contents
+        assert "Second Keyword" in contents
+
+        # Errors are reported in the output (and the worker is still usable).
+        returncode, output = pool.run_libdoc(
+            ["--format", "XML", "does_not_exist_lib", target], str(lib_dir)
+        )
+        assert returncode != 0
+        assert "does_not_exist_lib" in output
+        assert pool.workers_created == 1
+        assert pool.workers_recycled == 1  # 3 requests handled.
+
+        contents = _create_libspec(pool, str(lib_dir), "my_lib", target)
+        assert "Second Keyword" in contents
+        assert pool.workers_created == 2
+    finally:
+        pool.dispose()
+
+
+def test_libdoc_worker_pool_stale_modules(tmpdir, monkeypatch):
+    from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
+
+    # The library is found in the PYTHONPATH of the worker (so, it's not
+    # unloaded after each request as it's not in the cwd nor in a `-P` path).
+    pythonpath_dir = tmpdir.join("pythonpath_dir")
+    pythonpath_dir.mkdir()
+    lib_py = pythonpath_dir.join("my_pythonpath_lib.py")
+    lib_py.write_text(
+        """
+def first_keyword():
+    pass
+""",
+        "utf-8",
+    )
+    monkeypatch.setenv("PYTHONPATH", str(pythonpath_dir))
+    cwd = tmpdir.join("cwd")
+    cwd.mkdir()
+    target = str(tmpdir.join("my_pythonpath_lib.libspec"))
+
+    pool = LibdocWorkerPool(max_workers=1)
+    try:
+        contents = _create_libspec(pool, str(cwd), "my_pythonpath_lib", target)
+        assert "First Keyword" in contents
+
+        # Unchanged: the same worker is reused.
+        contents = _create_libspec(pool, str(cwd), "my_pythonpath_lib", target)
+        assert "First Keyword" in contents
+        assert pool.workers_created == 1
+
+        lib_py.write_text(
+            """
+def second_keyword():
+    pass
+""",
+            "utf-8",
+        )
+        mtime = os.path.getmtime(str(lib_py)) + 10
+        os.utime(str(lib_py), (mtime, mtime))
+
+        # Changed: the worker with the stale module is replaced.
+        contents = _create_libspec(pool, str(cwd), "my_pythonpath_lib", target)
+        assert "First Keyword" not in contents
+        assert "Second Keyword" in contents
+        assert pool.workers_created == 2
+        assert pool.workers_stale == 1
+    finally:
+        pool.dispose()
+
+
+def test_libspec_manager_without_libdoc_workers(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    from robotframework_ls.impl.libdoc_worker_pool import ENV_LIBDOC_WORKERS
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robocorp_ls_core import uris
+
+    monkeypatch.setenv(ENV_LIBDOC_WORKERS, "0")
+
+    os.makedirs(workspace_dir, exist_ok=True)
+    with open(os.path.join(workspace_dir, "my_lib.py"), "w") as stream:
+        stream.write(
+            """
+def my_keyword():
+    pass
+"""
+        )
+
+    libspec_manager.add_additional_pythonpath_folder(workspace_dir)
+    uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+    library_doc = libspec_manager.get_library_doc_or_error(
+        "my_lib", True, CompletionContext(RobotDocument(uri, ""))
+    ).library_doc
+    assert library_doc is not None
+    assert [k.name for k in library_doc.keywords] == ["My Keyword"]
+    assert libspec_manager._libdoc_worker_pool is None
@@ -0,0 +1,160 @@
+import os
+
+import pytest
+
+
+_BUILTIN_LIBS_DIR = os.path.join(
+    os.path.dirname(__file__), "_resources", "builtin_libs"
+)
+_SPEC_DOC_BUILDER_DIR = os.path.join(os.path.dirname(__file__), "test_spec_doc_builder")
+
+
+@pytest.mark.parametrize(
+    "spec_filename",
+    [
+        os.path.join(_SPEC_DOC_BUILDER_DIR, "case_v2.libspec"),
+        os.path.join(_SPEC_DOC_BUILDER_DIR, "case_v3.libspec"),
+        os.path.join(_SPEC_DOC_BUILDER_DIR, "case_v4.libspec"),
+        os.path.join(_BUILTIN_LIBS_DIR, "BuiltIn.libspec"),
+    ],
+)
+def test_libspec_compact_cache(tmpdir, spec_filename):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compact_cache
+
+    library_doc = SpecDocBuilder().build(spec_filename)
+    target = str(tmpdir.join("target.compact"))
+    libspec_compact_cache.write_compact_version(target, library_doc, 10.0)
+
+    assert (
+        libspec_compact_cache.read_compact_version(target, spec_filename, 11.0) is None
+    )
+
+    compact = libspec_compact_cache.read_compact_version(target, spec_filename, 10.0)
+    assert compact is not None
+
+    # The docs are only loaded when requested.
+    assert all(kw._doc is None for kw in compact.keywords)
+    assert compact.to_dictionary() == library_doc.to_dictionary()
+    assert [kw.deprecated for kw in compact.keywords] == [
+        kw.deprecated for kw in library_doc.keywords
+    ]
+    assert all(kw._doc is None for kw in compact.keywords)
+
+    # Conversions still work (the doc is kept in memory after being set).
+    library_doc.convert_docs_to_markdown()
+    compact.convert_docs_to_markdown()
+    assert compact.to_dictionary() == library_doc.to_dictionary()
+
+
+def test_libspec_compact_cache_file_changed(tmpdir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compact_cache
+
+    spec_filename = os.path.join(_BUILTIN_LIBS_DIR, "BuiltIn.libspec")
+    library_doc = SpecDocBuilder().build(spec_filename)
+    target = str(tmpdir.join("target.compact"))
+    libspec_compact_cache.write_compact_version(target, library_doc, 10.0)
+
+    compact = libspec_compact_cache.read_compact_version(target, spec_filename, 10.0)
+    assert compact is not None
+    keyword = compact.keywords[0]
+    assert keyword.doc == library_doc.keywords[0].doc
+
+    # Rewritten (i.e.: by another process): the old offsets are not used.
+    libspec_compact_cache.write_compact_version(target, library_doc, 12.0)
+    assert keyword.doc == ""
+
+    # The library doc is kept in memory (it's not read from the file).
+    assert compact.doc == library_doc.doc
+
+    # Corrupted file.
+    with open(target, "wb") as stream:
+        stream.write(b"invalid")
+    assert (
+        libspec_compact_cache.read_compact_version(target, spec_filename, 12.0) is None
+    )
+
+
+def test_libspec_manager_uses_compact_cache(libspec_manager):
+    from robotframework_ls.impl import libspec_compact_cache
+    from robotframework_ls.impl.libspec_manager import _load_library_doc_and_mtime
+
+    spec_filename = os.path.join(_BUILTIN_LIBS_DIR, "BuiltIn.libspec")
+
+    # A copy always loads the raw version.
+    libspec_manager_copy = libspec_manager.create_copy()
+    try:
+        libdoc, mtime = _load_library_doc_and_mtime(libspec_manager_copy, spec_filename)
+        target = libspec_compact_cache.get_compact_version_filename(
+            libspec_manager_copy, spec_filename, libspec_compact_cache.KIND_RAW
+        )
+        assert os.path.exists(target)
+        assert not isinstance(libdoc, libspec_compact_cache._CompactLibraryDoc)
+
+        libdoc2, mtime2 = _load_library_doc_and_mtime(
+            libspec_manager_copy, spec_filename
+        )
+        assert isinstance(libdoc2, libspec_compact_cache._CompactLibraryDoc)
+        assert mtime == mtime2
+        assert libdoc2.to_dictionary() == libdoc.to_dictionary()
+    finally:
+        libspec_manager_copy.dispose()
+
+
+def test_libspec_compact_cache_benchmark(tmpdir):
+    """
+    Compares loading the libspecs from the xml vs loading the compact version
+    (the time and the memory allocated by python which is still alive after
+    loading -- as traced by `tracemalloc`, so, this isn't the RSS -- are
+    printed, run with `-s` to see it).
+    """
+    import time
+    import tracemalloc
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl import libspec_compact_cache
+
+    spec_filenames = [
+        os.path.join(_BUILTIN_LIBS_DIR, name)
+        for name in sorted(os.listdir(_BUILTIN_LIBS_DIR))
+        if name.endswith(".libspec")
+    ]
+
+    targets = []
+    for i, spec_filename in enumerate(spec_filenames):
+        target = str(tmpdir.join(f"{i}.compact"))
+        libspec_compact_cache.write_compact_version(
+            target, SpecDocBuilder().build(spec_filename), 1.0
+        )
+        targets.append(target)
+
+    def load_xml():
+        return [SpecDocBuilder().build(f) for f in spec_filenames]
+
+    def load_compact():
+        return [
+            libspec_compact_cache.read_compact_version(target, f, 1.0)
+            for target, f in zip(targets, spec_filenames)
+        ]
+
+    results = {}
+    for name, func in (("xml", load_xml), ("compact", load_compact)):
+        tracemalloc.start()
+        try:
+            initial_time = time.perf_counter()
+            loaded = func()
+            elapsed = time.perf_counter() - initial_time
+            traced_memory, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(loaded) == len(spec_filenames)
+        results[name] = (elapsed, traced_memory)
+        del loaded
+
+    for name, (elapsed, traced_memory) in results.items():
+        print(
+            f"{name}: {elapsed:.3f}s, traced python allocations: {traced_memory / 1024:.1f} KB"
+        )
+
+    # Docs are not loaded in memory in the compact version.
+    assert results["compact"][1] < results["xml"][1]
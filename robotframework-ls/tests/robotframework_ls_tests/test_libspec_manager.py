@@ -488,3 +488,114 @@ def test_libspec_manager_basic(workspace, libspec_manager):
 
     assert get_library_doc_or_error("case1_library", create=False).library_doc is None
     assert get_library_doc_or_error("case1_library").library_doc is not None
+
+
+def test_libspec_manager_sources_sync_cache(
+    libspec_manager, workspace_dir, monkeypatch
+):
+    import time
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl.libspec_manager import _LibInfo
+
+    os.makedirs(workspace_dir)
+    library_py = os.path.join(workspace_dir, "my_library.py")
+    with open(library_py, "w") as stream:
+        stream.write("def keyword_1():\n    pass\n")
+
+    libspec_manager.add_workspace_folder(uris.from_fs_path(workspace_dir))
+    uri = uris.from_fs_path(os.path.join(workspace_dir, "case.robot"))
+
+    def get_keyword_names():
+        library_doc = libspec_manager.get_library_doc_or_error(
+            "my_library", True, CompletionContext(RobotDocument(uri, ""))
+        ).library_doc
+        return [kw.name for kw in library_doc.keywords]
+
+    assert get_keyword_names() == ["Keyword 1"]
+
+    # The index provides the same (first) match from the linear search.
+    for name in libspec_manager.get_library_names():
+        for lib_info in libspec_manager.iter_lib_info():
+            if lib_info.library_doc.name == name:
+                break
+        index = libspec_manager._get_lib_info_index(False)
+        found = next(index.iter_lib_infos(index.get_positions_by_name(name.lower())))
+        assert found is lib_info
+
+    verified = []
+    original_verify_sources_sync = _LibInfo.verify_sources_sync
+
+    def verify_sources_sync(lib_info):
+        verified.append(lib_info)
+        return original_verify_sources_sync(lib_info)
+
+    monkeypatch.setattr(_LibInfo, "verify_sources_sync", verify_sources_sync)
+
+    def check_sources_sync_cached():
+        del verified[:]
+        get_keyword_names()
+        return not verified
+
+    # Note: the _LibInfo is recreated when the generated .libspec change is
+    # notified, so, wait until the sources are no longer verified.
+    wait_for_test_condition(check_sources_sync_cached, sleep=1 / 5.0)
+    for _i in range(5):
+        assert get_keyword_names() == ["Keyword 1"]
+    assert not verified
+
+    # Make sure that the mtime changes enough in the filesystem.
+    time.sleep(1)
+    with open(library_py, "w") as stream:
+        stream.write("def keyword_1():\n    pass\n\ndef keyword_2():\n    pass\n")
+
+    # The source change is notified by the filesystem observer.
+    wait_for_test_condition(
+        lambda: get_keyword_names() == ["Keyword 1", "Keyword 2"], sleep=1 / 5.0
+    )
+
+
+def test_libspec_manager_sources_sync_cache_untracked_extensions(tmpdir):
+    from robocorp_ls_core.watchdog_wrapper import create_observer, create_notifier
+    from robotframework_ls.impl.libspec_manager import _LibrarySourcesSyncCache
+
+    class _LibraryDoc(object):
+        keywords = ()
+
+        def __init__(self, source):
+            self.source = source
+
+    class _LibInfo(object):
+        def __init__(self, source):
+            self.library_doc = _LibraryDoc(source)
+            self.verified = 0
+
+        def verify_sources_sync(self):
+            self.verified += 1
+            return True
+
+    observer = create_observer("dummy", ())
+    assert not observer.notifies_changes()
+
+    notifier = create_notifier(lambda *args: None, timeout=0.5)
+    sync_cache = _LibrarySourcesSyncCache(observer, notifier, enabled=True)
+    try:
+        py_lib_info = _LibInfo(str(tmpdir.join("my_lib.py")))
+        jar_lib_info = _LibInfo(str(tmpdir.join("my_lib.jar")))
+        for _i in range(3):
+            assert sync_cache.verify_sources_sync(py_lib_info)
+            assert sync_cache.verify_sources_sync(jar_lib_info)
+
+        # Only verified once (afterwards changes are notified).
+        assert py_lib_info.verified == 1
+
+        # Changes aren't tracked: verified on each access.
+        assert jar_lib_info.verified == 3
+
+        sync_cache.on_source_changed(py_lib_info.library_doc.source)
+        assert sync_cache.verify_sources_sync(py_lib_info)
+        assert py_lib_info.verified == 2
+    finally:
+        sync_cache.dispose()
+        notifier.dispose()
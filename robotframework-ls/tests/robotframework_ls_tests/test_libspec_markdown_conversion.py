@@ -32,3 +32,65 @@ def test_libspec_markdown_conversion(cases, libspec_manager):
         libspec_manager, spec_filename, os.path.getmtime(spec_filename)
     )
     assert loaded is not None
+
+
+def test_libspec_markdown_conversion_batch(cases, libspec_manager, monkeypatch):
+    from robotframework_ls.impl import libspec_markdown_conversion
+    from robocorp_ls_core.basic import wait_for_non_error_condition
+    from robocorp_ls_core.basic import normalize_filename
+    from robotframework_ls.impl.libspec_markdown_conversion import (
+        load_markdown_json_version,
+    )
+
+    monkeypatch.setattr(libspec_markdown_conversion._ConversionThread, "MAX_WORKERS", 1)
+
+    converted = []
+    original_convert = libspec_markdown_conversion._ConversionWorker.convert
+
+    def convert(self, spec_filename, target_json):
+        converted.append(os.path.basename(spec_filename))
+        return original_convert(self, spec_filename, target_json)
+
+    monkeypatch.setattr(
+        libspec_markdown_conversion._ConversionWorker, "convert", convert
+    )
+
+    spec_filenames = [
+        cases.get_path(f"builtin_libs/{name}.libspec")
+        for name in ("BuiltIn", "Collections", "DateTime", "Easter")
+    ]
+
+    conversion = libspec_markdown_conversion.LibspecMarkdownConversion(libspec_manager)
+    conversion.prioritize(normalize_filename(os.path.realpath(spec_filenames[-1])))
+
+    target_jsons = []
+    for spec_filename in spec_filenames:
+        target_jsons.append(conversion.schedule_conversion_to_markdown(spec_filename))
+
+    def generate_error_or_none():
+        for target_json in target_jsons:
+            if not os.path.exists(target_json):
+                return f"{target_json} still not created."
+
+    wait_for_non_error_condition(generate_error_or_none)
+
+    # All converted in a single process (prioritized first).
+    assert conversion._conversion_thread.workers_created == 1
+    assert converted == [
+        "Easter.libspec",
+        "BuiltIn.libspec",
+        "Collections.libspec",
+        "DateTime.libspec",
+    ]
+    for spec_filename in spec_filenames:
+        loaded = load_markdown_json_version(
+            libspec_manager, spec_filename, os.path.getmtime(spec_filename)
+        )
+        assert loaded is not None
+
+    # Up to date targets aren't converted again.
+    for spec_filename, target_json in zip(spec_filenames, target_jsons):
+        assert not libspec_markdown_conversion._is_conversion_needed(
+            spec_filename, target_json
+        )
+    conversion.dispose()
@@ -0,0 +1,214 @@
+import json
+
+
+def _create_workspace(root):
+    root.join("res.resource").write_text(
+        """
+*** Keywords ***
+My Keyword
+    Log    From resource
+""",
+        encoding="utf-8",
+    )
+    root.join("main.robot").write_text(
+        """
+*** Settings ***
+Resource    res.resource
+
+*** Test Cases ***
+Test
+    My Keyword
+    Undefined Keyword
+""",
+        encoding="utf-8",
+    )
+
+
+def _run_lint(root, cache_dir, *args, workers=0):
+    from robotframework_ls.lint import main
+
+    output = root.join("output.json")
+    exit_code = main(
+        [
+            str(root),
+            "--root",
+            str(root),
+            "--workers",
+            str(workers),
+            "--cache-dir",
+            str(cache_dir),
+            "--output",
+            str(output),
+        ]
+        + list(args)
+    )
+    return exit_code, json.loads(output.read_text("utf-8"))
+
+
+def _get_messages(output, basename):
+    for file_info in output["files"]:
+        if file_info["relativePath"] == basename:
+            return file_info["cached"], sorted(
+                d["message"] for d in file_info["diagnostics"]
+            )
+    raise AssertionError(f"{basename} not found in: {output}")
+
+
+def test_lint_cli_cache(tmpdir):
+    root = tmpdir.join("root")
+    root.mkdir()
+    cache_dir = tmpdir.join("cache")
+    _create_workspace(root)
+
+    exit_code, output = _run_lint(root, cache_dir)
+    assert exit_code == 1
+    assert _get_messages(output, "main.robot") == (
+        False,
+        ["Undefined keyword: Undefined Keyword."],
+    )
+    assert _get_messages(output, "res.resource") == (False, [])
+
+    # Nothing changed: everything is gotten from the cache.
+    exit_code, output = _run_lint(root, cache_dir)
+    assert exit_code == 1
+    assert _get_messages(output, "main.robot") == (
+        True,
+        ["Undefined keyword: Undefined Keyword."],
+    )
+    assert _get_messages(output, "res.resource") == (True, [])
+
+    # A dependency changed: the file which depends on it is linted again.
+    root.join("res.resource").write_text(
+        """
+*** Keywords ***
+Undefined Keyword
+    Log    From resource
+""",
+        encoding="utf-8",
+    )
+    exit_code, output = _run_lint(root, cache_dir)
+    assert exit_code == 1
+    assert _get_messages(output, "main.robot") == (
+        False,
+        ["Undefined keyword: My Keyword."],
+    )
+    assert _get_messages(output, "res.resource") == (False, [])
+
+    # Without the cache everything is linted.
+    exit_code, output = _run_lint(root, cache_dir, "--no-cache")
+    assert _get_messages(output, "main.robot")[0] is False
+    assert _get_messages(output, "res.resource")[0] is False
+
+
+def test_lint_cli_sarif(tmpdir):
+    root = tmpdir.join("root")
+    root.mkdir()
+    _create_workspace(root)
+
+    exit_code, output = _run_lint(
+        root, tmpdir.join("cache"), "--format", "sarif", "--no-cache"
+    )
+    assert exit_code == 1
+    assert output["version"] == "2.1.0"
+    (run,) = output["runs"]
+    assert run["tool"]["driver"]["name"] == "robotframework-lsp"
+    assert run["originalUriBaseIds"]["%SRCROOT%"]["uri"].endswith("/root/")
+
+    (result,) = run["results"]
+    assert result["level"] == "error"
+    assert result["message"]["text"] == "Undefined keyword: Undefined Keyword."
+    assert result["ruleId"] in set(r["id"] for r in run["tool"]["driver"]["rules"])
+    location = result["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"] == {
+        "uri": "main.robot",
+        "uriBaseId": "%SRCROOT%",
+    }
+    assert location["region"] == {
+        "startLine": 8,
+        "startColumn": 5,
+        "endLine": 8,
+        "endColumn": 22,
+    }
+
+
+def test_lint_cli_workers(tmpdir):
+    root = tmpdir.join("root")
+    root.mkdir()
+    cache_dir = tmpdir.join("cache")
+    _create_workspace(root)
+
+    exit_code, output = _run_lint(root, cache_dir, workers=2)
+    assert exit_code == 1
+    assert output["failed"] == []
+    assert _get_messages(output, "main.robot") == (
+        False,
+        ["Undefined keyword: Undefined Keyword."],
+    )
+    assert _get_messages(output, "res.resource") == (False, [])
+
+    # The results from the workers are cached.
+    exit_code, output = _run_lint(root, cache_dir, workers=2)
+    assert exit_code == 1
+    assert _get_messages(output, "main.robot")[0] is True
+
+
+def test_lint_cli_failure(tmpdir, monkeypatch):
+    from robotframework_ls.impl import lint_pool
+
+    root = tmpdir.join("root")
+    root.mkdir()
+    root.join("ok.robot").write_text(
+        """
+*** Test Cases ***
+Test
+    Log    Ok
+""",
+        encoding="utf-8",
+    )
+    root.join("broken.robot").write_text("", encoding="utf-8")
+
+    original_lint_document = lint_pool.lint_document
+
+    def lint_document(server_api, doc_uri, *args, **kwargs):
+        if doc_uri.endswith("broken.robot"):
+            raise RuntimeError("Error on purpose")
+        return original_lint_document(server_api, doc_uri, *args, **kwargs)
+
+    monkeypatch.setattr(lint_pool, "lint_document", lint_document)
+
+    exit_code, output = _run_lint(root, tmpdir.join("cache"))
+    assert exit_code == 3
+    assert _get_messages(output, "ok.robot") == (False, [])
+    (failed,) = output["failed"]
+    assert failed["relativePath"] == "broken.robot"
+    assert failed["error"] == "Error on purpose"
+
+    exit_code, output = _run_lint(
+        root, tmpdir.join("cache"), "--format", "sarif", "--no-cache"
+    )
+    assert exit_code == 3
+    (invocation,) = output["runs"][0]["invocations"]
+    assert invocation["executionSuccessful"] is False
+    (notification,) = invocation["toolExecutionNotifications"]
+    location = notification["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "broken.robot"
+
+
+def test_lint_cli_environment_key_robocop_config(tmpdir):
+    from robotframework_ls.lint import _get_environment_key
+
+    root = tmpdir.join("root")
+    sub = root.join("sub")
+    sub.ensure(dir=True)
+    paths = [str(sub.join("case.robot"))]
+
+    initial_key = _get_environment_key(None, paths)
+    root.join(".robocop").write_text("--exclude 0201", encoding="utf-8")
+    key_with_config = _get_environment_key(None, paths)
+    assert key_with_config != initial_key
+
+    sub.join("pyproject.toml").write_text("[tool.robocop]", encoding="utf-8")
+    assert _get_environment_key(None, paths) != key_with_config
+
+    root.join(".robocop").write_text("--exclude 0202", encoding="utf-8")
+    assert _get_environment_key(None, paths) != key_with_config
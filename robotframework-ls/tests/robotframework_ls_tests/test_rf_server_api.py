@@ -1,4 +1,5 @@
 import pytest
+import os
 
 
 @pytest.fixture
@@ -51,3 +52,182 @@ Some task
             )
     finally:
         workspace.dispose()
+
+
+def test_semantic_tokens_delta(rf_server_api, tmpdir):
+    from robocorp_ls_core import uris
+    from robotframework_ls.impl.semantic_tokens import iter_decoded_semantic_tokens
+
+    api = rf_server_api
+    uri = uris.from_fs_path(str(tmpdir.join("case.robot")))
+    text = """*** Test Cases ***
+Test 1
+    Log    Something
+
+Test 2
+    Log    Other
+"""
+    api.m_text_document__did_open(textDocument={"uri": uri, "version": 1, "text": text})
+    text_document = {"uri": uri}
+
+    full = api.threaded_semantic_tokens_full(text_document)
+    assert full["resultId"] is not None
+
+    api.m_text_document__did_change(
+        textDocument={"uri": uri, "version": 2},
+        contentChanges=[
+            {
+                "range": {
+                    "start": {"line": 2, "character": 4},
+                    "end": {"line": 2, "character": 4},
+                },
+                "text": "No Operation\n    ",
+            }
+        ],
+    )
+    delta = api.threaded_semantic_tokens_full_delta(text_document, full["resultId"])
+    assert "data" not in delta
+    assert delta["resultId"] != full["resultId"]
+
+    data = list(full["data"])
+    for edit in delta["edits"]:
+        data[edit["start"] : edit["start"] + edit["deleteCount"]] = edit["data"]
+        # Only the changed part is sent.
+        assert len(edit["data"]) < len(data)
+
+    new_full = api.threaded_semantic_tokens_full(text_document)
+    assert data == new_full["data"]
+
+    # Unknown result id: the full data is returned.
+    result = api.threaded_semantic_tokens_full_delta(text_document, "unknown")
+    assert result["data"] == new_full["data"]
+
+    # Range: only the tokens from the given lines.
+    result = api.threaded_semantic_tokens_range(
+        text_document,
+        {"start": {"line": 5, "character": 0}, "end": {"line": 6, "character": 0}},
+    )
+
+    def as_absolute(data):
+        return [
+            (info["line"], info["col"], info["len"], info["type"])
+            for info in iter_decoded_semantic_tokens(data)
+        ]
+
+    range_tokens = as_absolute(result["data"])
+    assert range_tokens
+    assert range_tokens == [t for t in as_absolute(new_full["data"]) if 5 <= t[0] <= 6]
+
+
+def test_lint_batch(rf_server_api, tmpdir, monkeypatch):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+    from robotframework_ls.impl import lint_pool
+
+    api = rf_server_api
+    monkeypatch.setenv(lint_pool.ENV_LINT_WORKERS, "2")
+
+    doc_uris = []
+    for i in range(2 * lint_pool.MIN_DOCS_PER_WORKER + 1):
+        tmpdir.join(f"case{i}.robot").write_text(
+            f"""*** Test Cases ***
+Test {i}
+    Undefined keyword {i}
+""",
+            encoding="utf-8",
+        )
+        doc_uris.append(uris.from_fs_path(str(tmpdir.join(f"case{i}.robot"))))
+
+    # An open document is linted with the contents from the client.
+    api.m_text_document__did_open(
+        textDocument={
+            "uri": doc_uris[0],
+            "version": 1,
+            "text": "*** Test Cases ***\nTest 0\n    Undefined keyword in client\n",
+        }
+    )
+
+    published = {}
+
+    def publish_diagnostics(doc_uri, diagnostics):
+        assert doc_uri not in published
+        published[doc_uri] = diagnostics
+
+    monkeypatch.setattr(api._lsp_messages, "publish_diagnostics", publish_diagnostics)
+    result = api._threaded_lint_batch(doc_uris, Monitor())
+    assert result == {"linted": len(doc_uris), "cancelled": False}
+    assert set(published) == set(doc_uris)
+
+    for i, doc_uri in enumerate(doc_uris):
+        messages = [d["message"] for d in published[doc_uri]]
+        if i == 0:
+            assert messages == ["Undefined keyword: Undefined keyword in client."]
+        else:
+            assert messages == [f"Undefined keyword: Undefined keyword {i}."]
+            # The same diagnostics are provided when linting in this process.
+            assert published[doc_uri] == api._threaded_lint(doc_uri, Monitor())
+
+    # When cancelled, the documents not linted are skipped.
+    published.clear()
+    monitor = Monitor()
+    monitor.cancel()
+    result = api._threaded_lint_batch(doc_uris, monitor)
+    assert result == {"linted": 0, "cancelled": True}
+    assert not published
+
+
+def test_list_tests_in_dir(rf_server_api, tmpdir, monkeypatch):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.jsonrpc.monitor import Monitor
+    from robotframework_ls.impl import list_tests_pool
+
+    api = rf_server_api
+    monkeypatch.setenv(list_tests_pool.ENV_LIST_TESTS_WORKERS, "2")
+
+    expected = []
+    for i in range(2 * list_tests_pool.MIN_DOCS_PER_WORKER + 1):
+        sub = tmpdir.join(f"sub{i % 3}")
+        sub.ensure(dir=True)
+        p = sub.join(f"case{i:03}.robot")
+        p.write_text(
+            f"""*** Test Cases ***
+Test {i}
+    Log    {i}
+""",
+            encoding="utf-8",
+        )
+        expected.append((str(p), f"Test {i}"))
+
+    # Ignored directories are skipped.
+    tmpdir.join("node_modules").ensure(dir=True).join("ignored.robot").write_text(
+        "*** Test Cases ***\nIgnored\n    Log    1\n", encoding="utf-8"
+    )
+
+    def list_tests():
+        tests = api._threaded_list_tests(uris.from_fs_path(str(tmpdir)), Monitor())
+        return sorted((t["path"], t["name"]) for t in tests)
+
+    expected.sort()
+    assert list_tests() == expected
+    assert len(api._list_tests_cache) == len(expected)
+
+    # The cached tests are used for files which didn't change and files
+    # removed aren't listed anymore.
+    def fail(*args, **kwargs):
+        raise AssertionError("Files should not be parsed again.")
+
+    monkeypatch.setattr(list_tests_pool, "ListTestsPool", fail)
+    monkeypatch.setattr(list_tests_pool, "list_tests_in_files", fail)
+    path, _name = expected.pop()
+    os.remove(path)
+    assert list_tests() == expected
+    assert len(api._list_tests_cache) == len(expected)
+
+    # A changed file is parsed again (in this process as it's a single file).
+    monkeypatch.undo()
+    path, _name = expected.pop(0)
+    with open(path, "w", encoding="utf-8") as stream:
+        stream.write("*** Test Cases ***\nChanged test\n    Log    1\n")
+    expected.append((path, "Changed test"))
+    expected.sort()
+    assert list_tests() == expected
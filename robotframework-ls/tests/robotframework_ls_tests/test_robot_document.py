@@ -10,10 +10,70 @@ def test_get_ast():
     assert d.get_ast() is not ast
 
 
+def test_memory_usage():
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    source = "*** Keywords ***\nMy Keyword\n    Log    Something\n" * 20
+    d = RobotDocument(uri="unkwown", source=source)
+    usage = d.get_memory_usage()
+    assert usage["source"] > len(source)
+    assert "ast" not in usage
+
+    ast = d.get_ast()
+    d.symbols_cache = object()
+    usage = d.get_memory_usage()
+    assert usage["ast"] > usage["source"]
+    assert usage["symbols"] > 0
+
+    # The AST is released (and recomputed if needed) but the symbols are kept.
+    d.release_derived_caches()
+    usage = d.get_memory_usage()
+    assert "ast" not in usage
+    assert usage["symbols"] > 0
+    assert d.symbols_cache is not None
+    assert d.source == source
+
+    assert d.get_ast() is not ast
+    assert "ast" in d.get_memory_usage()
+
+
+def test_ast_collectable_after_release(libspec_manager):
+    import gc
+    import weakref
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.robot_workspace import (
+        RobotDocument,
+        _compute_symbols_from_ast,
+    )
+
+    source = """
+*** Keywords ***
+My Keyword
+    [Documentation]    Some docs.
+    [Arguments]    ${arg}
+    Log    ${arg}
+"""
+    d = RobotDocument(uri="unkwown", source=source)
+    ast_ref = weakref.ref(d.get_ast())
+    d.symbols_cache = _compute_symbols_from_ast(CompletionContext(d))
+    keyword_info = next(iter(d.symbols_cache.iter_keyword_info()))
+
+    # The symbols cache (which is kept) must not keep the AST alive.
+    d.release_derived_caches()
+    gc.collect()
+    assert ast_ref() is None
+
+    assert keyword_info.name == "My Keyword"
+    docs = keyword_info.get_documentation()["value"]
+    assert "Some docs." in docs
+    assert "${arg}" in docs
+
+
 def test_document_from_file(workspace, workspace_dir, cases):
     from os.path import os
     from robocorp_ls_core import uris
     from robocorp_ls_core.lsp import TextDocumentItem
+    from robocorp_ls_core.basic import wait_for_condition
 
     cases.copy_to("case1", workspace_dir)
     workspace.set_root(workspace_dir)
@@ -34,7 +94,11 @@ def test_document_from_file(workspace, workspace_dir, cases):
         stream.write("new contents")
     assert "*** Settings ***" in cached_doc.source  # i.e.: Unchanged
 
-    # When we get it again it verifies the filesystem.
+    # When we get it again (after the change is notified) it's reloaded from
+    # the filesystem.
+    wait_for_condition(
+        lambda: ws.get_document(case1_doc_uri, accept_from_file=True) is not cached_doc
+    )
     cached_doc2 = ws.get_document(case1_doc_uri, accept_from_file=True)
     assert cached_doc is not cached_doc2
 
@@ -62,8 +126,9 @@ def test_document_from_file(workspace, workspace_dir, cases):
     assert cached_doc3.source == "new contents"
 
     os.remove(case1_file)
-    cached_doc4 = ws.get_document(case1_doc_uri, accept_from_file=True)
-    assert cached_doc4 is None
+    wait_for_condition(
+        lambda: ws.get_document(case1_doc_uri, accept_from_file=True) is None
+    )
 
     # The old one in memory doesn't change after the file is removed
     assert cached_doc3.source == "new contents"
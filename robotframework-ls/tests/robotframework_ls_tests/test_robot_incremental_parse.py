@@ -0,0 +1,202 @@
+import ast as ast_module
+import random
+
+
+_BASE_CONTENTS = """*** Settings ***
+Library    Collections
+Resource    my_resource.resource
+...    some continuation
+
+*** Variables ***
+${VAR}    10
+@{LIST}    a    b
+...    c
+
+*** Test Cases ***
+First test
+    [Documentation]    Some doc.
+    Log    ${VAR}
+    FOR    ${i}    IN RANGE    10
+        Log    ${i}
+    END
+
+Second test
+    My Keyword    arg
+
+# Comment before keywords
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}
+    IF    $arg == 1
+        Log    one
+    ELSE
+        Log    other
+    END
+    # Comment in keyword
+
+Another Keyword
+    No Operation
+
+*** Comments ***
+Some comment
+"""
+
+_LINES_TO_INSERT = [
+    "New Keyword\n",
+    "    Log    new line\n",
+    "    ...    continuation\n",
+    "...    continuation\n",
+    "\n",
+    "# comment\n",
+    "    FOR    ${x}    IN    a    b\n",
+    "    END\n",
+    "    [Arguments]    ${a}\n",
+    "${NEW_VAR}    20\n",
+    "Library    OperatingSystem\n",
+    "  \n",
+]
+
+
+def _dump(ast):
+    ret = []
+    for node in ast_module.walk(ast):
+        tokens = tuple(
+            (t.type, t.value, t.lineno, t.col_offset, t.error)
+            for t in getattr(node, "tokens", ())
+        )
+        ret.append(
+            (node.__class__.__name__, tokens, tuple(getattr(node, "errors", ())))
+        )
+    return ret
+
+
+def _check_incremental(previous_doc, new_source):
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robotframework_ls.impl import ast_utils
+
+    new_doc = RobotDocument(previous_doc.uri, new_source)
+    new_doc.set_incremental_parse_base(previous_doc)
+    ast = new_doc.get_ast()
+
+    full_ast = new_doc.generate_ast_uncached()
+    assert _dump(ast) == _dump(full_ast), f"Mismatch for source:\n{new_source}"
+
+    for section in ast.sections:
+        assert ast_utils.get_localization_info_from_model(section) is not None
+        for _stack, node in ast_utils.iter_all_nodes_recursive(section):
+            assert ast_utils.get_localization_info_from_model(node) is not None
+    return new_doc
+
+
+def _apply_edit(lines, line, remove_count, insert):
+    lines = list(lines)
+    lines[line : line + remove_count] = insert
+    return lines
+
+
+def test_robot_incremental_parse_differential(tmpdir):
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robocorp_ls_core import uris
+
+    uri = uris.from_fs_path(str(tmpdir.join("case.robot")))
+    doc = RobotDocument(uri, _BASE_CONTENTS)
+    doc.get_ast()
+
+    rnd = random.Random(0)
+    lines = _BASE_CONTENTS.splitlines(True)
+    shared_first_section = 0
+    for _i in range(300):
+        if len(lines) < 10:
+            # Too many lines removed: start again.
+            lines = _BASE_CONTENTS.splitlines(True)
+
+        line = rnd.randint(0, len(lines))
+        kind = rnd.choice(("insert", "remove", "replace", "change_chars"))
+        if kind == "insert":
+            lines = _apply_edit(lines, line, 0, [rnd.choice(_LINES_TO_INSERT)])
+        elif kind == "remove":
+            lines = _apply_edit(lines, line, rnd.randint(1, 3), [])
+        elif kind == "replace":
+            lines = _apply_edit(lines, line, 1, [rnd.choice(_LINES_TO_INSERT)])
+        elif line < len(lines):
+            contents = lines[line]
+            col = rnd.randint(0, len(contents.rstrip("\n")))
+            lines = _apply_edit(
+                lines, line, 1, [contents[:col] + rnd.choice(" x$") + contents[col:]]
+            )
+
+        if rnd.random() < 0.2:
+            # Sometimes the AST is not requested for a given version.
+            new_doc = RobotDocument(uri, "".join(lines))
+            new_doc.set_incremental_parse_base(doc)
+            doc = new_doc
+            continue
+
+        previous_ast = doc.get_ast()
+        doc = _check_incremental(doc, "".join(lines))
+        if doc.get_ast().sections[:1] == previous_ast.sections[:1]:
+            shared_first_section += 1
+
+    # Most changes shouldn't require a full parse.
+    assert shared_first_section > 100
+
+
+def test_robot_incremental_parse_reuses_nodes(tmpdir):
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+    from robocorp_ls_core import uris
+
+    uri = uris.from_fs_path(str(tmpdir.join("case.robot")))
+    doc = RobotDocument(uri, _BASE_CONTENTS)
+    ast = doc.get_ast()
+
+    # Change inside "My Keyword".
+    new_source = _BASE_CONTENTS.replace("Log    one", "Log    one    two")
+    new_doc = _check_incremental(doc, new_source)
+    new_ast = new_doc.get_ast()
+
+    assert new_ast is not ast
+    # Sections before the change are shared.
+    assert new_ast.sections[:3] == ast.sections[:3]
+    keyword_section = new_ast.sections[3]
+    assert keyword_section is not ast.sections[3]
+    # Only the keyword changed was created again.
+    assert keyword_section.body[0] is not ast.sections[3].body[0]
+    assert keyword_section.body[1] is ast.sections[3].body[1]
+    # The number of lines didn't change.
+    assert new_ast.sections[4] is ast.sections[4]
+
+    # Add a line: the nodes afterwards have the lines updated.
+    new_source2 = new_source.replace("Second test\n", "Second test\n    Log    added\n")
+    new_doc2 = _check_incremental(new_doc, new_source2)
+    new_ast2 = new_doc2.get_ast()
+    assert new_ast2.sections[:2] == new_ast.sections[:2]
+    assert new_ast2.sections[4] is not new_ast.sections[4]
+    assert new_ast2.sections[4].lineno == new_ast.sections[4].lineno + 1
+
+    # Changing the header requires a full parse (nothing is shared).
+    new_source3 = new_source2.replace("*** Comments ***", "*** Keywords ***")
+    new_doc3 = _check_incremental(new_doc2, new_source3)
+    new_ast3 = new_doc3.get_ast()
+    assert new_ast3.sections[0] is not new_ast2.sections[0]
+
+
+def test_robot_incremental_parse_workspace(workspace):
+    workspace.set_root("case1")
+    doc = workspace.put_doc("case_incremental.robot", _BASE_CONTENTS)
+    ast = doc.get_ast()
+
+    ws = workspace.ws
+    new_doc = ws.update_document(
+        {"uri": doc.uri, "version": 2},
+        {
+            "range": {
+                "start": {"line": 13, "character": 0},
+                "end": {"line": 13, "character": 0},
+            },
+            "text": "    Log    added\n",
+        },
+    )
+    new_ast = new_doc.get_ast()
+    assert new_ast.sections[0] is ast.sections[0]
+    assert _dump(new_ast) == _dump(new_doc.generate_ast_uncached())
@@ -1502,3 +1502,60 @@ def _decode(semantic_tokens):
         lst.append(f"col={info['col']}")
         lst.append(f"len={info['len']}")
     return "\n".join(lst)
+
+
+def test_semantic_highlighting_cached_on_incremental_changes(workspace):
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.semantic_tokens import semantic_tokens_full
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    source = """*** Test Cases ***
+Test 1
+    Log    Something
+
+Test 2
+    Log    Other
+"""
+    workspace.set_root("case1")
+    doc = workspace.put_doc("case_cached.robot", source)
+    ws = workspace.ws
+    semantic_tokens_full(CompletionContext(doc, workspace=ws))
+    first_test = doc.get_ast().sections[0].body[0]
+    assert getattr(first_test, "__semantic_tokens__", None) is not None
+
+    # Add a line in the first test (the second test has its lines shifted).
+    doc = ws.update_document(
+        {"uri": doc.uri, "version": 2},
+        {
+            "range": {
+                "start": {"line": 2, "character": 0},
+                "end": {"line": 2, "character": 0},
+            },
+            "text": "    No Operation\n",
+        },
+    )
+    found = semantic_tokens_full(CompletionContext(doc, workspace=ws))
+    expected = semantic_tokens_full(
+        CompletionContext(RobotDocument(doc.uri, doc.source), workspace=ws)
+    )
+    assert found == expected
+
+    # Change only the second test (the first test is reused).
+    doc = ws.update_document(
+        {"uri": doc.uri, "version": 3},
+        {
+            "range": {
+                "start": {"line": 6, "character": 11},
+                "end": {"line": 6, "character": 16},
+            },
+            "text": "Changed",
+        },
+    )
+    first_test = doc.get_ast().sections[0].body[0]
+    cached = getattr(first_test, "__semantic_tokens__")
+    found = semantic_tokens_full(CompletionContext(doc, workspace=ws))
+    assert getattr(first_test, "__semantic_tokens__") is cached
+    expected = semantic_tokens_full(
+        CompletionContext(RobotDocument(doc.uri, doc.source), workspace=ws)
+    )
+    assert found == expected
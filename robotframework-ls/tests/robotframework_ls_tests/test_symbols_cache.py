@@ -69,35 +69,95 @@ Some Keyword
     reverse_index = context.obtain_symbols_cache_reverse_index()
     assert reverse_index is symbols_cache_reverse_index
     assert reverse_index.has_global_variable("someglobalvar")
-    assert reverse_index._reindex_count == 1
+    assert reverse_index._full_reindex_count == 1
 
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 1
+    assert reverse_index._full_reindex_count == 1
+    assert reverse_index._incremental_reindex_count == 0
 
+    # Changes to the current doc aren't applied.
     symbols_cache_reverse_index.notify_uri_changed(doc.uri)
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 1
+    assert reverse_index._full_reindex_count == 1
+    assert reverse_index._incremental_reindex_count == 0
 
     symbols_cache_reverse_index.notify_uri_changed("foo")
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 2
+    assert reverse_index._full_reindex_count == 1
+    assert reverse_index._incremental_reindex_count == 1
 
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 2
+    assert reverse_index._incremental_reindex_count == 1
 
     symbols_cache_reverse_index.notify_uri_changed("foo")
+    symbols_cache_reverse_index.notify_uri_changed("bar")
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 3
+    assert reverse_index._full_reindex_count == 1
+    assert reverse_index._incremental_reindex_count == 2
 
     symbols_cache_reverse_index.request_full_reindex()
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 4
+    assert reverse_index._full_reindex_count == 2
 
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 4
+    assert reverse_index._full_reindex_count == 2
 
     reverse_index.synchronize(context)
-    assert reverse_index._reindex_count == 4
+    assert reverse_index._full_reindex_count == 2
+    assert reverse_index.has_global_variable("someglobalvar")
+
+    stats = reverse_index.get_stats()
+    assert stats["full_reindex_count"] == 2
+    assert stats["incremental_reindex_count"] == 2
+
+
+def test_symbols_cache_inverse_index_incremental(workspace, libspec_manager):
+    from robocorp_ls_core.config import Config
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case2", libspec_manager=libspec_manager, index_workspace=True)
+    doc = workspace.put_doc("case2.robot")
+    doc.source = """
+*** Test Cases ***
+Some Test Case
+    Log    ${SOME_GLOBAL_VAR}
+"""
+
+    doc2 = workspace.put_doc("case2a.robot")
+    doc2.source = """
+*** Keywords ***
+Some Keyword
+    Set Global Variable    ${some globalvar}
+    Another keyword
+"""
+
+    config = Config()
+    context = CompletionContext(doc, workspace=workspace.ws, config=config)
+    reverse_index = context.obtain_symbols_cache_reverse_index()
+    assert reverse_index is not None
+    assert reverse_index.has_global_variable("someglobalvar")
+    assert reverse_index.get_keyword_usage_uris("anotherkeyword") == {doc2.uri}
+
+    doc2 = workspace.put_doc(
+        "case2a.robot",
+        """
+*** Keywords ***
+Some Keyword
+    Set Global Variable    ${other globalvar}
+    Log ${count} items
+""",
+    )
+    reverse_index.notify_uri_changed(doc2.uri)
+    reverse_index.synchronize(context)
+
+    assert reverse_index._full_reindex_count == 1
+    assert reverse_index._incremental_reindex_count == 1
+    assert not reverse_index.has_global_variable("someglobalvar")
+    assert reverse_index.get_global_variable_uri_definitions("otherglobalvar") == {
+        doc2.uri
+    }
+    assert reverse_index.get_keyword_usage_uris("anotherkeyword") == set()
+    assert reverse_index.get_keyword_usage_uris("log${count}items") == {doc2.uri}
 
 
 def test_symbols_cache_reindex_on_demand(workspace, libspec_manager):
@@ -171,3 +231,524 @@ New Keyword
     assert new_uri_to_cache[doc2.uri].has_keyword_usage(
         normalize_robot_name("new keyword")
     )
+
+
+def test_symbols_cache_persisted(workspace, libspec_manager, tmpdir):
+    import os
+    from robotframework_ls.impl._symbols_cache_persistence import (
+        _SymbolsCacheFromPersisted,
+    )
+    from robotframework_ls.impl.robot_workspace import _SymbolsCacheForAST
+
+    ws_dir = tmpdir.join("ws")
+    ws_dir.mkdir()
+    ws_dir.join("my.robot").write_text(
+        """
+*** Test Cases ***
+Some Test Case
+    Log    ${SOME_GLOBAL_VAR}
+    Some Keyword
+""",
+        encoding="utf-8",
+    )
+    ws_dir.join("my.resource").write_text(
+        """
+*** Keywords ***
+Some Keyword
+    [Documentation]    Some keyword docs.
+    Set Global Variable    ${some globalvar}
+""",
+        encoding="utf-8",
+    )
+
+    workspace.set_absolute_path_root(
+        str(ws_dir),
+        libspec_manager=libspec_manager,
+        symbols_cache_dir=str(tmpdir.join("symbols_cache")),
+    )
+    workspace.ws.setup_workspace_indexer()
+    workspace_indexer = workspace.ws.workspace_indexer
+    robot_uri = workspace.get_doc_uri("my.robot")
+    resource_uri = workspace.get_doc_uri("my.resource")
+
+    def collect():
+        return dict(
+            workspace_indexer.iter_uri_and_symbols_cache(
+                uris_to_iter={robot_uri, resource_uri}
+            )
+        )
+
+    def clear_filesystem_docs():
+        # i.e.: simulate a new session where the docs must be loaded again.
+        workspace.ws._filesystem_docs.clear()
+
+    first = collect()
+    for symbols_cache in first.values():
+        assert isinstance(symbols_cache, _SymbolsCacheForAST)
+
+    clear_filesystem_docs()
+    second = collect()
+    for uri, symbols_cache in second.items():
+        assert isinstance(symbols_cache, _SymbolsCacheFromPersisted)
+        initial = first[uri]
+        assert symbols_cache.get_json_list() == initial.get_json_list()
+        assert symbols_cache.get_test_info() == initial.get_test_info()
+        assert symbols_cache._keywords_used == initial._keywords_used
+        assert (
+            symbols_cache._global_variables_defined == initial._global_variables_defined
+        )
+        assert symbols_cache._variable_references == initial._variable_references
+        assert [
+            (k.name, k.get_documentation()) for k in symbols_cache.iter_keyword_info()
+        ] == [(k.name, k.get_documentation()) for k in initial.iter_keyword_info()]
+
+    assert second[resource_uri].has_global_variable_definition("someglobalvar")
+    assert second[robot_uri].has_keyword_usage("somekeyword")
+    assert [x["name"] for x in second[robot_uri].get_test_info()] == ["Some Test Case"]
+
+    # Change one file: only that one must be parsed again.
+    resource_path = str(ws_dir.join("my.resource"))
+    ws_dir.join("my.resource").write_text(
+        """
+*** Keywords ***
+Another Keyword
+    No Operation
+""",
+        encoding="utf-8",
+    )
+    mtime = os.path.getmtime(resource_path) + 10
+    os.utime(resource_path, (mtime, mtime))
+
+    clear_filesystem_docs()
+    third = collect()
+    assert isinstance(third[robot_uri], _SymbolsCacheFromPersisted)
+    assert isinstance(third[resource_uri], _SymbolsCacheForAST)
+    assert [x.name for x in third[resource_uri].iter_keyword_info()] == [
+        "Another Keyword"
+    ]
+
+
+def test_symbols_cache_persistence_prune(tmpdir, monkeypatch):
+    import os
+    import time
+    from robotframework_ls.impl import _symbols_cache_persistence
+    from robotframework_ls.impl._symbols_cache_persistence import (
+        SymbolsCachePersistence,
+    )
+
+    cache_dir = str(tmpdir.join("symbols_cache"))
+    persistence = SymbolsCachePersistence(cache_dir)
+    persistence._dir_cache.store(("symbols_cache", "old.robot"), {})
+    persistence._dir_cache.store(("symbols_cache", "new.robot"), {})
+    old_filename = persistence._dir_cache._get_file_for_key(
+        ("symbols_cache", "old.robot")
+    )
+    old_mtime = time.time() - 100
+    os.utime(old_filename, (old_mtime, old_mtime))
+
+    monkeypatch.setattr(_symbols_cache_persistence, "_MAX_CACHE_AGE", 50)
+    persistence.prune()
+    assert os.listdir(cache_dir) == [
+        os.path.basename(
+            persistence._dir_cache._get_file_for_key(("symbols_cache", "new.robot"))
+        )
+    ]
+
+    monkeypatch.setattr(_symbols_cache_persistence, "_MAX_CACHE_SIZE", 0)
+    persistence.prune()
+    assert os.listdir(cache_dir) == []
+
+
+def test_symbols_cache_inverse_index_keywords(workspace, libspec_manager):
+    from robocorp_ls_core.config import Config
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case2", libspec_manager=libspec_manager, index_workspace=True)
+    doc = workspace.put_doc("case2.robot")
+    doc.source = """
+*** Test Cases ***
+Some Test Case
+    Some Keyword
+    Log 22 items
+"""
+
+    doc2 = workspace.put_doc("case2a.robot")
+    doc2.source = """
+*** Keywords ***
+Some Keyword
+    Another keyword
+
+Another keyword
+    Log    something
+"""
+
+    doc3 = workspace.put_doc("case2b.robot")
+    doc3.source = """
+*** Keywords ***
+Log ${count} items
+    Log    ${count}
+"""
+
+    config = Config()
+    context = CompletionContext(doc3, workspace=workspace.ws, config=config)
+
+    reverse_index = context.obtain_symbols_cache_reverse_index()
+    assert reverse_index is not None
+
+    assert reverse_index.get_keyword_usage_uris("somekeyword") == {doc.uri}
+    assert reverse_index.get_keyword_usage_uris("anotherkeyword") == {doc2.uri}
+    assert reverse_index.get_keyword_usage_uris("log") == {doc2.uri, doc3.uri}
+    assert reverse_index.get_keyword_usage_uris("notused") == set()
+    assert not reverse_index.has_keyword_usage("notused")
+
+    # Embedded arguments must be matched against the names used.
+    assert reverse_index.get_keyword_usage_uris("log${count}items") == {doc.uri}
+    assert reverse_index.get_keyword_usage_uris("log${count}things") == set()
+
+
+def test_symbols_cache_shared_for_open_docs(libspec_manager, tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robocorp_ls_core.watchdog_wrapper import create_observer
+    from robotframework_ls.impl._symbols_cache_persistence import (
+        _SymbolsCacheFromPersisted,
+    )
+    from robotframework_ls.impl.robot_workspace import (
+        RobotWorkspace,
+        _SymbolsCacheForAST,
+    )
+
+    ws_dir = tmpdir.join("ws")
+    ws_dir.mkdir()
+    root_uri = uris.from_fs_path(str(ws_dir))
+    doc_uri = uris.from_fs_path(str(ws_dir.join("my.robot")))
+    symbols_cache_dir = str(tmpdir.join("symbols_cache"))
+
+    # i.e.: the `.api` and the `.lint.api` processes (which receive the same
+    # document changes).
+    workspaces = [
+        RobotWorkspace(
+            root_uri,
+            create_observer("dummy", ()),
+            libspec_manager=libspec_manager,
+            symbols_cache_dir=symbols_cache_dir,
+        )
+        for _i in range(2)
+    ]
+
+    for ws in workspaces:
+        ws.setup_workspace_indexer()
+
+    def collect(ws):
+        return dict(
+            ws.workspace_indexer.iter_uri_and_symbols_cache(uris_to_iter={doc_uri})
+        )[doc_uri]
+
+    contents = """
+*** Test Cases ***
+Some Test Case
+    Some Keyword
+
+*** Keywords ***
+Some Keyword
+    [Documentation]    Some keyword docs.
+    Log    ${SOME_VAR}
+"""
+    try:
+        workspaces[0].put_document(TextDocumentItem(doc_uri, text=contents))
+        computed = collect(workspaces[0])
+        assert isinstance(computed, _SymbolsCacheForAST)
+        # i.e.: the document isn't changed for a while.
+        workspaces[0].workspace_indexer._symbols_cache_persistence.flush_open_docs()
+
+        workspaces[1].put_document(TextDocumentItem(doc_uri, text=contents))
+
+        doc = workspaces[1].get_document(doc_uri, accept_from_file=False)
+        shared = collect(workspaces[1])
+        assert isinstance(shared, _SymbolsCacheFromPersisted)
+        # The sibling didn't need to parse the document.
+        assert doc._ast_and_language_codes is None
+        assert shared.get_json_list() == computed.get_json_list()
+        assert shared.get_test_info() == computed.get_test_info()
+        assert shared._keywords_used == computed._keywords_used
+        assert shared._variable_references == computed._variable_references
+        assert [
+            (k.name, k.get_documentation()) for k in shared.iter_keyword_info()
+        ] == [(k.name, k.get_documentation()) for k in computed.iter_keyword_info()]
+
+        # After a change in the sibling the entry is no longer valid.
+        workspaces[1].update_document(
+            {"uri": doc_uri, "version": 2},
+            {"text": contents.replace("Some Keyword\n    [", "Other Keyword\n    [")},
+        )
+        changed = collect(workspaces[1])
+        assert isinstance(changed, _SymbolsCacheForAST)
+        assert [x.name for x in changed.iter_keyword_info()] == ["Other Keyword"]
+    finally:
+        for ws in workspaces:
+            ws.dispose()
+
+
+def test_symbols_cache_open_docs_stored_when_idle(libspec_manager, tmpdir, monkeypatch):
+    """
+    Measures the entries written for an open document which is edited many
+    times in a row: previously each edit wrote an entry (with a hash of the
+    whole contents), now a single entry is written once the document isn't
+    changed for a while and it's removed when the document is closed.
+    """
+    import os
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+    from robocorp_ls_core.watchdog_wrapper import create_observer
+    from robotframework_ls.impl import _symbols_cache_persistence
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+    monkeypatch.setattr(_symbols_cache_persistence, "OPEN_DOC_STORE_DELAY", 0.3)
+
+    ws_dir = tmpdir.join("ws")
+    ws_dir.mkdir()
+    doc_uri = uris.from_fs_path(str(ws_dir.join("my.robot")))
+    symbols_cache_dir = str(tmpdir.join("symbols_cache"))
+
+    ws = RobotWorkspace(
+        uris.from_fs_path(str(ws_dir)),
+        create_observer("dummy", ()),
+        libspec_manager=libspec_manager,
+        symbols_cache_dir=symbols_cache_dir,
+    )
+    ws.setup_workspace_indexer()
+    persistence = ws.workspace_indexer._symbols_cache_persistence
+
+    def collect():
+        dict(ws.workspace_indexer.iter_uri_and_symbols_cache(uris_to_iter={doc_uri}))
+
+    try:
+        ws.put_document(TextDocumentItem(doc_uri, text="*** Keywords ***\n"))
+        collect()
+        edits = 50
+        for i in range(edits):
+            ws.update_document(
+                {"uri": doc_uri, "version": i + 2},
+                {"text": f"*** Keywords ***\nKeyword {i}\n    No Operation\n"},
+            )
+            collect()
+
+        # Nothing written while the document is being edited.
+        assert persistence.stored_entries == 0
+
+        wait_for_test_condition(lambda: persistence.stored_entries == 1)
+        assert len(os.listdir(symbols_cache_dir)) == 1
+
+        ws.remove_document(doc_uri)
+        assert os.listdir(symbols_cache_dir) == []
+    finally:
+        ws.dispose()
+
+
+def _get_rss() -> int:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+
+    # Note: in Linux ru_maxrss is in kilobytes (in Mac it's in bytes).
+    import resource
+    import sys
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return maxrss
+    return maxrss * 1024
+
+
+def _measure_edits_in_sibling(
+    index, root_uri, doc_uri, symbols_cache_dir, sources, share, barrier, queue
+):
+    """
+    Simulates one of the `.api`, `.lint.api` and `.others.api` processes
+    receiving the same edits. For each edit, the first process computes the
+    symbols cache and stores it (as if the document was idle) and only then
+    the siblings handle the same edit.
+
+    Besides the symbols cache (which is what's shared), the AST of the
+    document is also computed in each process, as each one needs it for its
+    own requests (lint, semantic tokens, document symbols, etc.).
+    """
+    import time
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robocorp_ls_core.watchdog_wrapper import create_observer
+    from robotframework_ls.impl._symbols_cache_persistence import (
+        SymbolsCachePersistence,
+        _SymbolsCacheFromPersisted,
+    )
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+    if not share:
+        SymbolsCachePersistence._load_open_doc = lambda *args: None
+        SymbolsCachePersistence._schedule_store_open_doc = lambda *args: None
+
+    ws = RobotWorkspace(
+        root_uri, create_observer("dummy", ()), symbols_cache_dir=symbols_cache_dir
+    )
+    ws.setup_workspace_indexer()
+    persistence = ws.workspace_indexer._symbols_cache_persistence
+
+    shared = 0
+    lookup_cpu_time = 0.0
+    initial_cpu_time = time.process_time()
+    for i, source in enumerate(sources):
+        if index != 0:
+            barrier.wait()
+
+        initial_lookup_time = time.process_time()
+        if i == 0:
+            ws.put_document(TextDocumentItem(doc_uri, text=source))
+        else:
+            ws.update_document({"uri": doc_uri, "version": i + 1}, {"text": source})
+        symbols_cache = dict(
+            ws.workspace_indexer.iter_uri_and_symbols_cache(uris_to_iter={doc_uri})
+        )[doc_uri]
+        if isinstance(symbols_cache, _SymbolsCacheFromPersisted):
+            shared += 1
+        if index == 0:
+            persistence.flush_open_docs()
+        lookup_cpu_time += time.process_time() - initial_lookup_time
+
+        ws.get_document(doc_uri, accept_from_file=False).get_ast()
+
+        if index == 0:
+            barrier.wait()
+        barrier.wait()
+
+    cpu_time = time.process_time() - initial_cpu_time
+    queue.put((index, shared, lookup_cpu_time, cpu_time, _get_rss()))
+    ws.dispose()
+
+
+def test_symbols_cache_shared_for_open_docs_benchmark(tmpdir):
+    """
+    Measures the CPU time per edit and the RSS of 3 sibling processes which
+    receive the same edits with and without sharing the symbols cache of the
+    open document (the results are printed, run with `-s` to see it).
+
+    Note: only the symbols cache is shared, each process still parses the
+    document (so, the total CPU time per edit is only reduced by the time
+    to compute the symbols cache from the AST).
+    """
+    import multiprocessing
+    from robocorp_ls_core import uris
+
+    ws_dir = tmpdir.join("ws")
+    ws_dir.mkdir()
+    root_uri = uris.from_fs_path(str(ws_dir))
+    doc_uri = uris.from_fs_path(str(ws_dir.join("my.robot")))
+
+    keywords = "".join(
+        f"Keyword {i}\n    [Documentation]    Docs {i}.\n"
+        f"    Log    ${{VAR {i}}}\n    Keyword {i + 1}\n\n"
+        for i in range(300)
+    )
+    edits = 10
+    sources = [
+        f"*** Keywords ***\nEdited {i}\n    No Operation\n\n{keywords}"
+        for i in range(edits)
+    ]
+    processes_count = 3
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for share in (False, True):
+        barrier = ctx.Barrier(processes_count)
+        queue = ctx.Queue()
+        symbols_cache_dir = str(tmpdir.join(f"symbols_cache_{share}"))
+        processes = [
+            ctx.Process(
+                target=_measure_edits_in_sibling,
+                args=(
+                    index,
+                    root_uri,
+                    doc_uri,
+                    symbols_cache_dir,
+                    sources,
+                    share,
+                    barrier,
+                    queue,
+                ),
+            )
+            for index in range(processes_count)
+        ]
+        for process in processes:
+            process.start()
+        results[share] = sorted(queue.get(timeout=120) for _p in processes)
+        for process in processes:
+            process.join(30)
+
+    for share, process_results in results.items():
+        lookup_cpu_time = sum(r[2] for r in process_results)
+        cpu_time = sum(r[3] for r in process_results)
+        rss = sum(r[4] for r in process_results)
+        print(
+            f"shared: {share}: "
+            f"symbols cache cpu per edit: {lookup_cpu_time / edits * 1000:.1f}ms, "
+            f"total cpu per edit: {cpu_time / edits * 1000:.1f}ms, "
+            f"total rss: {rss / (1024 * 1024):.1f}MB "
+            f"(in {processes_count} processes)"
+        )
+
+    # Without sharing each process computes its own symbols cache.
+    assert [r[1] for r in results[False]] == [0] * processes_count
+    # With sharing the siblings load the one computed by the first process.
+    assert [r[1] for r in results[True]] == [0] + [edits] * (processes_count - 1)
+
+
+def test_symbols_cache_inverse_index_files_version(workspace, libspec_manager):
+    import os
+    from robocorp_ls_core.config import Config
+    from robocorp_ls_core.basic import wait_for_condition
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case2", libspec_manager=libspec_manager, index_workspace=True)
+    doc = workspace.put_doc("case2.robot")
+    ws = workspace.ws
+
+    listed = []
+    original_iter_all_doc_uris_in_workspace = ws.iter_all_doc_uris_in_workspace
+
+    def iter_all_doc_uris_in_workspace(extensions):
+        listed.append(1)
+        return original_iter_all_doc_uris_in_workspace(extensions)
+
+    ws.iter_all_doc_uris_in_workspace = iter_all_doc_uris_in_workspace
+
+    ws.wait_for_check_done(5)
+    context = CompletionContext(doc, workspace=ws, config=Config())
+    reverse_index = context.obtain_symbols_cache_reverse_index()
+    assert reverse_index is not None
+    reverse_index.synchronize(context)
+    del listed[:]
+
+    # No files added/removed: the workspace files aren't listed again.
+    files_version = ws.get_files_version()
+    reverse_index.synchronize(context)
+    reverse_index.synchronize(context)
+    assert len(listed) == 0
+
+    with open(os.path.join(ws.root_path, "new_file.robot"), "w") as stream:
+        stream.write(
+            """
+*** Keywords ***
+New Keyword
+    Set Global Variable    ${new global var}
+"""
+        )
+
+    wait_for_condition(lambda: ws.get_files_version() != files_version)
+    reverse_index.synchronize(context)
+    assert len(listed) == 1
+    assert reverse_index.has_global_variable("newglobalvar")
+
+    reverse_index.synchronize(context)
+    assert len(listed) == 1
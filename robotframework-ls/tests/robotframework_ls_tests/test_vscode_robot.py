@@ -1522,6 +1522,30 @@ Log It2
     assert found["python"] == sys.executable
 
 
+def test_memory_stats_integrated(
+    language_server_io: ILanguageServerClient, ws_root_path
+):
+    language_server = language_server_io
+
+    language_server.initialize(ws_root_path, process_id=os.getpid())
+    uri = "untitled:Untitled-1"
+    language_server.open_doc(uri, 1, "*** Test Case ***\nLog It\n    Log    1\n")
+
+    # Start the server api.
+    language_server.execute_command("robot.rfInfo.internal", [{"uri": uri}])
+
+    ret = language_server.execute_command("robot.memoryStats.internal", [])
+    found = ret["result"]
+    assert isinstance(found["language_server"]["pid"], int)
+    open_documents = found["language_server"]["workspace"]["open_documents"]
+    assert open_documents["documents"] == 1
+    assert open_documents["current_size"] > 0
+
+    server_api_stats = found["default.others.api"]
+    assert server_api_stats["pid"] != found["language_server"]["pid"]
+    assert "filesystem_documents" in server_api_stats["workspace"]
+
+
 def test_document_symbol_integrated(
     language_server_io: ILanguageServerClient, ws_root_path, data_regression
 ):
@@ -38,8 +38,17 @@ def test_workspace_symbols(workspace, libspec_manager):
         "Yet Another Equal", BaseContext(workspace.ws, config, NULL)
     )
 
-    # i.e.: Expect the client to filter it afterwards.
-    assert symbols == symbols3
+    # i.e.: Filtered (and ranked) in the server.
+    assert 0 < len(symbols3) < len(symbols)
+    assert symbols3[0]["name"] == "Yet Another Equal Redefined"
+    check_symbol(symbols3, "Yet Another Equal Redefined")
+    for symbol in symbols3:
+        assert "yetanotherequal" in symbol["name"].lower().replace(" ", "")
+
+    # Fuzzy matches are also accepted.
+    symbols4 = workspace_symbols("YAER", BaseContext(workspace.ws, config, NULL))
+    check_symbol(symbols4, "Yet Another Equal Redefined")
+    assert len(symbols4) < len(symbols)
 
 
 def test_workspace_symbols_same_basename(workspace, libspec_manager):
@@ -71,3 +80,125 @@ def test_workspace_symbols_same_basename(workspace, libspec_manager):
 
     check_symbol(symbols, "In Lib 1")
     check_symbol(symbols, "In Lib 2")
+
+
+class _FakeKeywordInfo(object):
+    def __init__(self, name):
+        self.name = name
+
+    def get_documentation(self):
+        return {"kind": "markdown", "value": ""}
+
+
+class _FakeSymbolsCache(object):
+    def __init__(self, *names):
+        self._names = names
+
+    def iter_keyword_info(self):
+        for name in self._names:
+            yield _FakeKeywordInfo(name)
+
+    def get_json_list(self):
+        return [{"name": name} for name in self._names]
+
+
+def test_symbols_name_index():
+    from robotframework_ls.impl.symbols_name_index import SymbolsNameIndex
+
+    index = SymbolsNameIndex()
+    cache1 = _FakeSymbolsCache("Log Many", "Log", "Should Be Equal")
+    cache2 = _FakeSymbolsCache("My Log", "Yet Another Equal Redefined")
+    index.update("uri1", cache1)
+    index.update(("library", "lib2"), cache2)
+
+    # Exact, prefix and substring matches (in that order).
+    assert index.find_names("log") == ["log", "logmany", "mylog"]
+    assert index.find_names("equal") == ["shouldbeequal", "yetanotherequalredefined"]
+    assert index.find_names("another") == ["yetanotherequalredefined"]
+    assert index.find_names("notthere") == []
+
+    # Fuzzy matches only when requested (after substring matches).
+    assert index.find_names("yaer") == []
+    assert index.find_names("yaer", fuzzy=True) == ["yetanotherequalredefined"]
+    assert index.find_names("lgm", fuzzy=True) == ["logmany"]
+
+    entries = list(index.iter_entries(["log", "mylog"]))
+    assert [(e.key, [k.name for k in e.keyword_infos]) for e in entries] == [
+        ("uri1", ["Log"]),
+        (("library", "lib2"), ["My Log"]),
+    ]
+    assert entries[0].symbols_cache is cache1
+    assert entries[1].json_entries == [{"name": "My Log"}]
+
+    # Names are removed when the symbols cache changes/is removed.
+    index.update("uri1", _FakeSymbolsCache("Log"))
+    assert index.find_names("log") == ["log", "mylog"]
+    index.update(("library", "lib2"), None)
+    assert index.find_names("log") == ["log"]
+    assert index.find_names("equal") == []
+    assert index.get_stats()["indexed_keys"] == 1
+
+
+def test_symbols_name_index_synchronize_libraries():
+    import time
+    from robotframework_ls.impl.symbols_name_index import SymbolsNameIndex
+
+    class _LibraryDoc(object):
+        def __init__(self, name, *keyword_names):
+            self.name = name
+            self.source = None
+            self.symbols_cache = _FakeSymbolsCache(*keyword_names)
+
+    class _LibInfo(object):
+        def __init__(self, library_doc):
+            self.library_doc = library_doc
+
+    class _LibspecManager(object):
+        version = 1
+        iterated = 0
+
+        def __init__(self):
+            self.lib_infos = [
+                _LibInfo(_LibraryDoc("lib1", "Keyword 1")),
+                _LibInfo(_LibraryDoc("lib2", "Keyword 2")),
+            ]
+
+        def get_lib_infos_version(self):
+            return self.version
+
+        def iter_lib_info(self):
+            for lib_info in self.lib_infos:
+                self.iterated += 1
+                yield lib_info
+
+    class _Workspace(object):
+        libspec_manager = _LibspecManager()
+
+    workspace = _Workspace()
+    libspec_manager = workspace.libspec_manager
+    index = SymbolsNameIndex()
+
+    # Timeout elapsed: nothing is synchronized.
+    assert not index._synchronize_libraries(workspace, time.time() - 10, 1)
+    assert index.find_names("keyword1") == []
+    libspec_manager.iterated = 0
+
+    assert index._synchronize_libraries(workspace, time.time(), None)
+    assert index.find_names("keyword") == ["keyword1", "keyword2"]
+    assert libspec_manager.iterated == 2
+
+    # Libraries didn't change: they're not iterated again.
+    assert index._synchronize_libraries(workspace, time.time(), None)
+    assert libspec_manager.iterated == 2
+
+    # Changed: synchronized again.
+    del libspec_manager.lib_infos[0]
+    libspec_manager.version = 2
+    assert index._synchronize_libraries(workspace, time.time(), None)
+    assert libspec_manager.iterated == 3
+    assert index.find_names("keyword") == ["keyword2"]
+
+    # A full reindex also synchronizes the libraries.
+    index.request_full_reindex()
+    assert index._synchronize_libraries(workspace, time.time(), None)
+    assert libspec_manager.iterated == 4